@@ -0,0 +1,211 @@
+"""Watch the advisory file (`input.md`) without re-reading it every tick.
+
+Both loops used to read and compare the whole file on every poll.
+`AdvisoryWatcher` asks the kernel instead. On Linux it watches the file's
+directory with inotify (through libc via ctypes, so nothing extra is
+installed); a background thread wakes only when the file is written, moved
+into place or deleted. Elsewhere, or if inotify cannot be set up, it falls
+back to a `stat` check every `poll_interval_sec`, which reads the file only
+when its mtime, size or inode changed.
+
+Either way, the actual read happens on the loop thread through the
+scheduler. It runs `debounce_sec` after the last notification, since every
+notification re-arms the same keyed timer, so a burst of saves costs one
+read. `on_change` then receives an `AdvisoryChange` carrying the content
+hash, and only when the hash differs from the last one: touching or
+re-saving the file unchanged never triggers a refresh. With inotify, a slow
+stat check (`SAFETY_INTERVAL_SEC`) still runs in case an event is missed.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import hashlib
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+from .scheduler import Scheduler
+
+DEFAULT_DEBOUNCE_SEC = 0.25
+DEFAULT_POLL_INTERVAL_SEC = 5.0
+SAFETY_INTERVAL_SEC = 60.0
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; followed by `len` bytes of name
+
+Signature = Optional[Tuple[int, int, int]]
+
+
+@dataclass(frozen=True)
+class AdvisoryChange:
+    """New advisory content; `content` and `digest` are None when the file is gone."""
+
+    content: Optional[str]
+    digest: Optional[str]
+
+
+def _libc() -> Any:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not (hasattr(libc, "inotify_init1") and hasattr(libc, "inotify_add_watch")):
+        return None
+    return libc
+
+
+def _signature(path: Path) -> Signature:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class AdvisoryWatcher:
+    """Reports changes to one file's content to `on_change`, via `scheduler`."""
+
+    def __init__(
+        self,
+        path: Path,
+        scheduler: Scheduler,
+        on_change: Callable[[AdvisoryChange], None],
+        debounce_sec: float = DEFAULT_DEBOUNCE_SEC,
+        poll_interval_sec: float = DEFAULT_POLL_INTERVAL_SEC,
+        use_inotify: Optional[bool] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.debounce_sec = debounce_sec
+        self.poll_interval_sec = poll_interval_sec
+        self.current = AdvisoryChange(None, None)
+        self.reads = 0
+        self._scheduler = scheduler
+        self._on_change = on_change
+        self._use_inotify = use_inotify
+        self._log = logger or logging.getLogger("agent.advisory")
+        self._signature: Signature = None
+        self._checked = False
+        self._fd: Optional[int] = None
+        self._stop_r: Optional[int] = None
+        self._stop_w: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self.mode = "stopped"
+
+    def start(self) -> None:
+        """Report the current content, then start watching."""
+        self._scheduler.call_soon(self._key, self.check)
+        if self._use_inotify is not False and self._start_inotify():
+            self.mode = "inotify"
+            interval = max(self.poll_interval_sec, SAFETY_INTERVAL_SEC)
+        else:
+            if self._use_inotify:
+                self._log.warning("inotify unavailable; watching %s with stat checks", self.path)
+            self.mode = "stat"
+            interval = self.poll_interval_sec
+        self._scheduler.every(interval, self._key + ":stat", self.check, first=self._scheduler.now() + interval)
+
+    def close(self) -> None:
+        self._scheduler.cancel(self._key)
+        self._scheduler.cancel(self._key + ":stat")
+        if self._stop_w is not None:
+            os.write(self._stop_w, b"x")
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        for fd in (self._fd, self._stop_r, self._stop_w):
+            if fd is not None:
+                os.close(fd)
+        self._fd = self._stop_r = self._stop_w = self._thread = None
+        self.mode = "stopped"
+
+    def __enter__(self) -> "AdvisoryWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def notify(self) -> None:
+        """The file may have changed: (re)arm the debounced check. Thread-safe."""
+        self._scheduler.after(self.debounce_sec, self._key, self.check)
+
+    def check(self) -> Optional[AdvisoryChange]:
+        """Re-read the file if its stat changed; report and return it if the content did."""
+        signature = _signature(self.path)
+        if self._checked and signature == self._signature:
+            return None
+        self._checked, self._signature = True, signature
+        content: Optional[str] = None
+        if signature is not None:
+            try:
+                content = self.path.read_text(encoding="utf-8")
+                self.reads += 1
+            except OSError:
+                content = None
+        digest = None if content is None else hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if digest == self.current.digest:
+            return None
+        self.current = AdvisoryChange(content, digest)
+        self._on_change(self.current)
+        return self.current
+
+    @property
+    def _key(self) -> str:
+        return f"advisory:{self.path}"
+
+    # ------------------------------------------------------------------ inotify
+
+    def _start_inotify(self) -> bool:
+        libc = _libc()
+        if libc is None:
+            return False
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return False
+        directory = str(self.path.parent.resolve()).encode()
+        if libc.inotify_add_watch(fd, directory, _WATCH_MASK) < 0:
+            self._log.debug("inotify_add_watch(%s) failed: errno %d", directory, ctypes.get_errno())
+            os.close(fd)
+            return False
+        self._fd = fd
+        self._stop_r, self._stop_w = os.pipe()
+        self._thread = threading.Thread(target=self._watch, name="advisory-watcher", daemon=True)
+        self._thread.start()
+        return True
+
+    def _watch(self) -> None:
+        name = self.path.name.encode()
+        while True:
+            ready, _, _ = select.select([self._fd, self._stop_r], [], [])
+            if self._stop_r in ready:
+                return
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            offset, touched = 0, False
+            while offset + _EVENT.size <= len(data):
+                _, _, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                touched = touched or data[offset:offset + length].rstrip(b"\0") == name
+                offset += length
+            if touched:
+                self.notify()
@@ -0,0 +1,274 @@
+"""asyncio SpaceTraders client built on httpx.AsyncClient.
+
+The generated client is synchronous (urllib3), so state refreshes that need
+several endpoints pay for each round trip in turn. This module offers async
+equivalents of the read helpers in `spacetraders_client` so callers can fan
+out with `asyncio.gather`. Every request still goes through the shared rate
+limiter, which bounds the fan-out to what the server will accept.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Dict, Optional, Tuple, TypeVar
+from urllib.parse import urlencode
+
+import httpx
+
+from .cache import ResponseCache, get_response_cache
+from .ratelimit import RateLimiter, get_rate_limiter, lane_for_method
+from .retry import (
+    RATE_LIMITED,
+    TRANSIENT_STATUSES,
+    RetryPolicy,
+    get_retry_policy,
+    record_give_up,
+    record_retry,
+)
+from .singleflight import SingleFlight, flight_key, get_single_flight
+from .spacetraders_client import (
+    DEFAULT_BASE_URL,
+    DEFAULT_POOL_MAXSIZE,
+    ENV_API_KEY,
+    ENV_CASSETTE,
+    ENV_HTTP2,
+    ENV_LOG_API,
+    ENV_POOL_MAXSIZE,
+    APIResult,
+    _env_flag,
+    _parse_response,
+    default_base_url,
+)
+from .transport import http2_available
+
+DEFAULT_TIMEOUT_SEC = 30.0
+
+T = TypeVar("T")
+
+
+class AsyncSpaceTradersClient:
+    """Thin async wrapper returning the same `APIResult` as the sync helpers."""
+
+    def __init__(
+        self,
+        token: str,
+        base_url: str = DEFAULT_BASE_URL,
+        limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        flight: Optional[SingleFlight] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        timeout: float = DEFAULT_TIMEOUT_SEC,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        http2: bool = False,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.limiter = limiter
+        self.cache = cache
+        self.flight = flight
+        self.retry_policy = retry_policy
+        self._token = token
+        self._http = http_client or httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {token}", "Accept": "application/json"},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize),
+            http2=http2 and http2_available(),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncSpaceTradersClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Optional[Dict[str, Any]] = None,
+        logger: Optional[logging.Logger] = None,
+        fresh: bool = False,
+    ) -> APIResult:
+        """Issue one rate-limited request and parse it into an APIResult.
+
+        `fresh` skips the cache lookup (the response is still cached), for
+        callers that know the cached copy is out of date.
+        """
+
+        endpoint = f"{method.upper()} {path}"
+        if params:
+            endpoint += "?" + "&".join(f"{k}={v}" for k, v in params.items())
+        if logger and os.getenv(ENV_LOG_API, "").lower() in ("true", "1"):
+            logger.info("API Request [%s]", endpoint)
+
+        cache = self.cache or get_response_cache()
+        query = urlencode(params or {})
+        if cache is not None and not fresh:
+            hit = cache.lookup(self._token, method, path, query)
+            if hit is not None:
+                return _parse_response(hit.to_http_response(), endpoint=endpoint, logger=logger)
+
+        async def send() -> APIResult:
+            limiter = self.limiter or get_rate_limiter()
+            policy = self.retry_policy or get_retry_policy()
+            attempt = 1
+            while True:
+                # Sleeping here only parks this task; gathered siblings keep going.
+                await limiter.acquire_async(lane_for_method(method))
+                try:
+                    resp = await self._http.request(method.upper(), path, params=params, json=json_body)
+                except httpx.HTTPError as exc:
+                    if not policy.should_retry(method, 0, attempt):
+                        if attempt >= policy.max_attempts:
+                            record_give_up()
+                        return APIResult(ok=False, status=-1, json=None, raw=None, error=f"{endpoint}: {exc}")
+                    status, delay = 0, policy.backoff(attempt)
+                else:
+                    status = resp.status_code
+                    if not policy.should_retry(method, status, attempt):
+                        break
+                    delay = policy.delay(status, attempt, resp.content, resp.headers)
+                record_retry(status, delay)
+                if logger:
+                    logger.info("%s -> %s; retrying in %.2fs (attempt %d)", endpoint, status or "network error", delay, attempt + 1)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+            if status == RATE_LIMITED or status in TRANSIENT_STATUSES:
+                record_give_up()
+            if cache is not None:
+                cache.store(self._token, method, path, query, resp.status_code, resp.content, resp.headers.get("content-type"))
+            return _parse_response(resp, endpoint=endpoint, logger=logger)
+
+        # Identical GETs already in flight share one round trip and one APIResult.
+        flight = self.flight or get_single_flight()
+        result, _ = await flight.do_async(flight_key(self._token, method, path, query), send)
+        return result
+
+    async def fetch_my_agent(self, logger: Optional[logging.Logger] = None) -> APIResult:
+        return await self.request("GET", "/my/agent", logger=logger)
+
+    async def fetch_my_ships(self, page: int = 1, limit: int = 20, logger: Optional[logging.Logger] = None) -> APIResult:
+        return await self.request("GET", "/my/ships", params={"page": page, "limit": limit}, logger=logger)
+
+    async def fetch_ship(self, ship_symbol: str, logger: Optional[logging.Logger] = None, fresh: bool = False) -> APIResult:
+        return await self.request("GET", f"/my/ships/{ship_symbol}", logger=logger, fresh=fresh)
+
+    async def fetch_my_contracts(self, page: int = 1, limit: int = 20, logger: Optional[logging.Logger] = None) -> APIResult:
+        return await self.request("GET", "/my/contracts", params={"page": page, "limit": limit}, logger=logger)
+
+    async def fetch_waypoint(self, system_symbol: str, waypoint_symbol: str, logger: Optional[logging.Logger] = None) -> APIResult:
+        return await self.request("GET", f"/systems/{system_symbol}/waypoints/{waypoint_symbol}", logger=logger)
+
+    async def fetch_market(self, system_symbol: str, waypoint_symbol: str, logger: Optional[logging.Logger] = None) -> APIResult:
+        return await self.request("GET", f"/systems/{system_symbol}/waypoints/{waypoint_symbol}/market", logger=logger)
+
+
+def build_async_client(
+    token: Optional[str] = None,
+    base_url: Optional[str] = None,
+    pool_maxsize: Optional[int] = None,
+    http2: Optional[bool] = None,
+) -> Optional[AsyncSpaceTradersClient]:
+    """Create an AsyncSpaceTradersClient using the bearer token from env if not given."""
+    tok = token or os.getenv(ENV_API_KEY)
+    if not tok:
+        return None
+    pool_maxsize = pool_maxsize or int(os.getenv(ENV_POOL_MAXSIZE, DEFAULT_POOL_MAXSIZE))
+    http2 = _env_flag(ENV_HTTP2) if http2 is None else http2
+    transport: Optional[httpx.AsyncBaseTransport] = None
+    if os.getenv(ENV_CASSETTE):
+        from .cassette import RecordingTransport, ReplayTransport, cassette_mode, shared_cassette, shared_player
+
+        if cassette_mode() == "record":
+            # Limits belong to the transport once we supply our own.
+            limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+            inner = httpx.AsyncHTTPTransport(limits=limits, http2=http2 and http2_available())
+            transport = RecordingTransport(inner, shared_cassette())
+        else:
+            transport = ReplayTransport(shared_player())
+    return AsyncSpaceTradersClient(
+        tok,
+        base_url=base_url or default_base_url(),
+        pool_maxsize=pool_maxsize,
+        http2=http2,
+        transport=transport,
+    )
+
+
+class _LoopThread:
+    """A private event loop on a daemon thread.
+
+    httpx.AsyncClient connections belong to the loop that opened them, so a
+    long-lived client needs a long-lived loop; `asyncio.run` per call would
+    throw the pool away every time.
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="spacetraders-async", daemon=True)
+        self.thread.start()
+
+    def run(self, coro: Awaitable[T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+_loop_thread: Optional[_LoopThread] = None
+_async_clients: Dict[Tuple[str, str], AsyncSpaceTradersClient] = {}
+_async_lock = threading.Lock()
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine on the shared client loop and wait for its result."""
+    global _loop_thread
+    with _async_lock:
+        if _loop_thread is None:
+            _loop_thread = _LoopThread()
+        loop_thread = _loop_thread
+    return loop_thread.run(coro)
+
+
+def get_async_client(token: Optional[str] = None, base_url: Optional[str] = None) -> Optional[AsyncSpaceTradersClient]:
+    """Return the long-lived async client for this token and base URL.
+
+    Use it via `run_sync` (or from coroutines already running on that loop).
+    """
+    tok = token or os.getenv(ENV_API_KEY)
+    if not tok:
+        return None
+    base_url = base_url or default_base_url()
+    key = (tok, base_url)
+    with _async_lock:
+        client = _async_clients.get(key)
+        if client is None:
+            client = build_async_client(tok, base_url)
+            _async_clients[key] = client
+        return client
+
+
+def close_async_clients() -> None:
+    """Close pooled async clients and stop the shared loop thread."""
+    global _loop_thread
+    with _async_lock:
+        clients = list(_async_clients.values())
+        _async_clients.clear()
+        loop_thread, _loop_thread = _loop_thread, None
+    if loop_thread is None:
+        return
+    for client in clients:
+        loop_thread.run(client.aclose())
+    loop_thread.stop()
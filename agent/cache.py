@@ -0,0 +1,348 @@
+"""Tiered response cache for SpaceTraders GET requests.
+
+Endpoints are grouped by how quickly their data goes stale:
+
+* STATIC   - systems, waypoints, jump gates, factions, supply chain. These are
+             fixed for the lifetime of a server reset.
+* MARKET   - markets, shipyards, construction sites. These drift over minutes.
+* VOLATILE - agent, ships, nav, cargo, cooldown, contracts. These change with
+             every action, so they only live for a few seconds.
+
+Entries sit in an in-memory LRU. STATIC and MARKET entries are also written
+to SQLite when a `db_path` is given, so a restarted agent does not refetch the
+map. Successful mutations bust the entries they affect. The data they return
+(nav, cargo, cooldown, agent, contract) is written straight into the matching
+GET entries, so a `navigate_ship` response refreshes the cached ship nav with
+no extra request.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+import urllib3
+
+ENV_CACHE = "SPACETRADERS_CACHE"  # "0"/"false" disables the response cache
+ENV_CACHE_DB = "SPACETRADERS_CACHE_DB"
+DEFAULT_CACHE_DB = Path("api_cache.db")
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class CacheTier(str, Enum):
+    STATIC = "static"
+    MARKET = "market"
+    VOLATILE = "volatile"
+
+
+DEFAULT_TTLS: Dict[CacheTier, float] = {
+    CacheTier.STATIC: 24 * 3600.0,
+    CacheTier.MARKET: 120.0,
+    CacheTier.VOLATILE: 10.0,
+}
+
+_PERSISTED_TIERS = (CacheTier.STATIC, CacheTier.MARKET)
+
+_SEG = r"[^/]+"
+_TIER_ROUTES: List[Tuple["re.Pattern[str]", CacheTier]] = [
+    (re.compile(rf"^/systems/{_SEG}/waypoints/{_SEG}/(market|shipyard|construction)$"), CacheTier.MARKET),
+    (re.compile(rf"^/systems/{_SEG}/waypoints/{_SEG}/jump-gate$"), CacheTier.STATIC),
+    (re.compile(rf"^/systems(/{_SEG}(/waypoints(/{_SEG})?)?)?$"), CacheTier.STATIC),
+    (re.compile(rf"^/factions(/{_SEG})?$"), CacheTier.STATIC),
+    (re.compile(r"^/market/supply-chain$"), CacheTier.STATIC),
+    (re.compile(rf"^/my/ships(/{_SEG}(/(nav|cargo|cooldown|mounts|modules))?)?$"), CacheTier.VOLATILE),
+    (re.compile(rf"^/my/contracts(/{_SEG})?$"), CacheTier.VOLATILE),
+    (re.compile(r"^/my/agent$"), CacheTier.VOLATILE),
+]
+
+_SHIP_PATH = re.compile(rf"^/my/ships/({_SEG})(/.*)?$")
+_CONTRACT_PATH = re.compile(rf"^/my/contracts/({_SEG})/")
+
+# Fields of a mutation response that mirror a GET endpoint of the same ship.
+_SHIP_SUBRESOURCES = ("nav", "cargo", "cooldown")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_cache (
+    key TEXT PRIMARY KEY,
+    tier TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    content_type TEXT,
+    body BLOB NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def tier_for(method: str, path: str) -> Optional[CacheTier]:
+    """Return the cache tier for a request, or None if it must not be cached."""
+
+    if method.upper() != "GET":
+        return None
+    for pattern, tier in _TIER_ROUTES:
+        if pattern.match(path):
+            return tier
+    return None
+
+
+def normalize_query(query: str) -> str:
+    return urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+
+
+def system_of(waypoint_symbol: str) -> str:
+    """X1-DF55-20250Z -> X1-DF55"""
+
+    return "-".join(waypoint_symbol.split("-")[:2])
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    body: bytes
+    content_type: Optional[str]
+    expires_at: float
+
+    def to_http_response(self) -> urllib3.HTTPResponse:
+        headers = {"content-type": self.content_type} if self.content_type else {}
+        return urllib3.HTTPResponse(body=self.body, headers=headers, status=self.status, preload_content=True)
+
+
+class ResponseCache:
+    """In-memory LRU with optional SQLite backing; safe to share across threads."""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttls: Optional[Dict[CacheTier, float]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._counters: Dict[str, Dict[str, int]] = {t.value: {"hits": 0, "misses": 0} for t in CacheTier}
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path is not None:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL;")
+            self._conn.executescript(SCHEMA)
+            self._conn.execute("DELETE FROM api_cache WHERE expires_at <= ?", (self._clock(),))
+            self._conn.commit()
+
+    # -- keys ---------------------------------------------------------------
+
+    @staticmethod
+    def _scope(token: Optional[str]) -> str:
+        return hashlib.sha1((token or "").encode("utf-8")).hexdigest()[:12]
+
+    def key(self, token: Optional[str], path: str, query: str = "") -> str:
+        query = normalize_query(query)
+        return f"{self._scope(token)}|{path}" + (f"?{query}" if query else "")
+
+    # -- reads --------------------------------------------------------------
+
+    def lookup(self, token: Optional[str], method: str, path: str, query: str = "") -> Optional[CachedResponse]:
+        tier = tier_for(method, path)
+        if tier is None:
+            return None
+        key = self.key(token, path, query)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._conn is not None and tier in _PERSISTED_TIERS:
+                row = self._conn.execute(
+                    "SELECT status, body, content_type, expires_at FROM api_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = CachedResponse(status=row[0], body=row[1], content_type=row[2], expires_at=row[3])
+                    self._remember(key, entry)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self._counters[tier.value]["hits"] += 1
+                return entry
+            if entry is not None:
+                self._forget([key])
+            self._counters[tier.value]["misses"] += 1
+            return None
+
+    # -- writes -------------------------------------------------------------
+
+    def store(
+        self,
+        token: Optional[str],
+        method: str,
+        path: str,
+        query: str,
+        status: int,
+        body: bytes,
+        content_type: Optional[str] = "application/json",
+    ) -> None:
+        """Record a response: cache successful GETs, bust/refresh on mutations."""
+
+        if not 200 <= status < 300:
+            return
+        if method.upper() == "GET":
+            tier = tier_for(method, path)
+            if tier is not None:
+                self._put(self.key(token, path, query), tier, status, body, content_type)
+            return
+        self._apply_mutation(token, path, body)
+
+    def _put(self, key: str, tier: CacheTier, status: int, body: bytes, content_type: Optional[str]) -> None:
+        entry = CachedResponse(status=status, body=body, content_type=content_type, expires_at=self._clock() + self.ttls[tier])
+        with self._lock:
+            self._remember(key, entry)
+            if self._conn is not None and tier in _PERSISTED_TIERS:
+                self._conn.execute(
+                    "REPLACE INTO api_cache (key, tier, status, content_type, body, expires_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, tier.value, status, content_type, body, entry.expires_at),
+                )
+                self._conn.commit()
+
+    def _put_data(self, token: Optional[str], path: str, data: Any) -> None:
+        tier = tier_for("GET", path)
+        if tier is not None:
+            body = json.dumps({"data": data}).encode("utf-8")
+            self._put(self.key(token, path), tier, 200, body, "application/json")
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _forget(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        for key in keys:
+            self._entries.pop(key, None)
+        if self._conn is not None and keys:
+            self._conn.executemany("DELETE FROM api_cache WHERE key = ?", [(k,) for k in keys])
+            self._conn.commit()
+
+    def invalidate(self, token: Optional[str], path: str, include_children: bool = False) -> None:
+        """Drop cached entries for `path` (any query string), optionally its sub-paths."""
+
+        base = f"{self._scope(token)}|{path}"
+
+        def matches(key: str) -> bool:
+            if key == base or key.startswith(base + "?"):
+                return True
+            return include_children and key.startswith(base + "/")
+
+        with self._lock:
+            doomed = [k for k in self._entries if matches(k)]
+            for key in doomed:
+                self._entries.pop(key, None)
+            if self._conn is not None:
+                clauses = "key = ? OR substr(key, 1, ?) = ?"
+                params: List[Any] = [base, len(base) + 1, base + "?"]
+                if include_children:
+                    clauses += " OR substr(key, 1, ?) = ?"
+                    params += [len(base) + 1, base + "/"]
+                self._conn.execute(f"DELETE FROM api_cache WHERE {clauses}", params)
+                self._conn.commit()
+
+    def _apply_mutation(self, token: Optional[str], path: str, body: bytes) -> None:
+        try:
+            data = (json.loads(body.decode("utf-8")) if body else {}).get("data") or {}
+        except (ValueError, AttributeError):
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+
+        ship = _SHIP_PATH.match(path)
+        if ship is not None:
+            symbol = ship.group(1)
+            self.invalidate(token, f"/my/ships/{symbol}", include_children=True)
+            self.invalidate(token, "/my/ships")
+            for field in _SHIP_SUBRESOURCES:
+                if isinstance(data.get(field), dict):
+                    self._put_data(token, f"/my/ships/{symbol}/{field}", data[field])
+        elif path == "/my/ships":
+            self.invalidate(token, "/my/ships")
+
+        if _CONTRACT_PATH.match(path) or path.endswith("/negotiate/contract"):
+            self.invalidate(token, "/my/contracts", include_children=True)
+        contract = data.get("contract")
+        if isinstance(contract, dict) and contract.get("id"):
+            self._put_data(token, f"/my/contracts/{contract['id']}", contract)
+
+        agent = data.get("agent")
+        if isinstance(agent, dict):
+            self._put_data(token, "/my/agent", agent)
+        else:
+            self.invalidate(token, "/my/agent")
+
+        # Trades and refuels move market prices at the ship's waypoint.
+        transaction = data.get("transaction")
+        if isinstance(transaction, dict) and transaction.get("waypointSymbol"):
+            waypoint = transaction["waypointSymbol"]
+            self.invalidate(token, f"/systems/{system_of(waypoint)}/waypoints/{waypoint}/market")
+
+    # -- housekeeping -------------------------------------------------------
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM api_cache")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "tiers": {k: dict(v) for k, v in self._counters.items()}}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_configured = False
+_default_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide cache (memory-only unless configured), or None if disabled."""
+
+    global _default_cache, _default_configured
+    with _default_lock:
+        if not _default_configured:
+            disabled = os.getenv(ENV_CACHE, "").lower() in ("0", "false")
+            _default_cache = None if disabled else ResponseCache()
+            _default_configured = True
+        return _default_cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    """Install `cache` as the process-wide cache (None disables caching)."""
+
+    global _default_cache, _default_configured
+    with _default_lock:
+        _default_cache = cache
+        _default_configured = True
+
+
+def configure_response_cache(db_path: Optional[Path] = None) -> Optional[ResponseCache]:
+    """Install a SQLite-backed process-wide cache unless caching is disabled."""
+
+    if os.getenv(ENV_CACHE, "").lower() in ("0", "false"):
+        set_response_cache(None)
+        return None
+    path = db_path or Path(os.getenv(ENV_CACHE_DB, str(DEFAULT_CACHE_DB)))
+    cache = ResponseCache(db_path=path)
+    set_response_cache(cache)
+    return cache
@@ -0,0 +1,335 @@
+"""Record/replay of SpaceTraders HTTP traffic for deterministic benchmarks.
+
+Recording wraps the transport of either client: the generated ApiClient's
+`rest_client`, or the async client's httpx transport. Every request and
+response is appended, with its timing, to a cassette file. Replay serves the
+responses back from the cassette with no network, either instantly or at the
+original speed scaled by `speed`. As a result, `refresh_state`, parsing and
+the loops can be profiled against the same captured traffic before and after
+a change.
+
+A cassette is JSON Lines: one header line, then one line per interaction.
+Responses are matched on method, path and normalized query, in recorded
+order per key. Once a key's recordings are used up, its last response is
+served again, so a replayed loop can run longer than the capture did.
+
+Enable with environment variables (read by `build_client` and `build_async_client`):
+
+    SPACETRADERS_CASSETTE=traffic.jsonl
+    SPACETRADERS_CASSETTE_MODE=record | replay
+    SPACETRADERS_CASSETTE_SPEED=0        # replay: 0 = no delay, 1 = real time, 10 = 10x
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+import urllib3
+
+from .cache import normalize_query
+from .spacetraders_client import ENV_CASSETTE
+
+from spacetraders_api_client import rest
+
+ENV_CASSETTE_MODE = "SPACETRADERS_CASSETTE_MODE"
+ENV_CASSETTE_SPEED = "SPACETRADERS_CASSETTE_SPEED"
+
+CASSETTE_VERSION = 1
+# Response headers worth keeping; the rest is noise for replay purposes.
+_KEPT_HEADERS = ("content-type", "retry-after")
+
+
+class CassetteMiss(LookupError):
+    """Replay was asked for a request the cassette never recorded."""
+
+
+@dataclass
+class Interaction:
+    method: str
+    path: str
+    query: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    offset: float  # seconds since recording started
+    elapsed: float  # request round-trip time
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.method, self.path, self.query)
+
+    def to_json(self) -> Dict[str, Any]:
+        record: Dict[str, Any] = {
+            "m": self.method,
+            "p": self.path,
+            "q": self.query,
+            "s": self.status,
+            "h": self.headers,
+            "t": round(self.offset, 4),
+            "d": round(self.elapsed, 4),
+        }
+        try:
+            record["b"] = self.body.decode("utf-8")
+        except UnicodeDecodeError:
+            record["b64"] = base64.b64encode(self.body).decode("ascii")
+        return record
+
+    @classmethod
+    def from_json(cls, record: Dict[str, Any]) -> "Interaction":
+        body = base64.b64decode(record["b64"]) if "b64" in record else record.get("b", "").encode("utf-8")
+        return cls(
+            method=record["m"],
+            path=record["p"],
+            query=record.get("q", ""),
+            status=record["s"],
+            headers=record.get("h") or {},
+            body=body,
+            offset=record.get("t", 0.0),
+            elapsed=record.get("d", 0.0),
+        )
+
+
+def _request_key(method: str, url: str) -> Tuple[str, str, str]:
+    parts = urlsplit(str(url))
+    return method.upper(), parts.path, normalize_query(parts.query)
+
+
+def _kept_headers(headers: Any) -> Dict[str, str]:
+    kept = {}
+    for name, value in headers.items():
+        lower = name.lower()
+        if lower in _KEPT_HEADERS or lower.startswith("x-ratelimit-"):
+            kept[lower] = value
+    return kept
+
+
+class Cassette:
+    """Append-only cassette writer; safe to share between threads and clients."""
+
+    def __init__(self, path: Path, clock: Callable[[], float] = time.monotonic) -> None:
+        self.path = Path(path)
+        self._clock = clock
+        self._started = clock()
+        self._lock = threading.Lock()
+        fresh = not self.path.exists() or self.path.stat().st_size == 0
+        self._fh = self.path.open("a", encoding="utf-8")
+        if fresh:
+            header = {"cassette": CASSETTE_VERSION, "recorded": datetime.now(timezone.utc).isoformat()}
+            self._write(header)
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._fh.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._fh.flush()
+
+    def now(self) -> float:
+        return self._clock()
+
+    def record(self, method: str, url: str, started: float, status: int, headers: Any, body: bytes) -> None:
+        method, path, query = _request_key(method, url)
+        interaction = Interaction(
+            method=method,
+            path=path,
+            query=query,
+            status=status,
+            headers=_kept_headers(headers),
+            body=body or b"",
+            offset=started - self._started,
+            elapsed=self._clock() - started,
+        )
+        with self._lock:
+            self._write(interaction.to_json())
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
+
+
+def load_interactions(path: Path) -> List[Interaction]:
+    interactions = []
+    with Path(path).open("r", encoding="utf-8") as fh:
+        for line in fh:
+            record = json.loads(line)
+            if "cassette" in record:
+                continue
+            interactions.append(Interaction.from_json(record))
+    return interactions
+
+
+class CassettePlayer:
+    """Serves recorded interactions by request key, in recorded order."""
+
+    def __init__(self, interactions: List[Interaction], speed: float = 0.0) -> None:
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._queues: Dict[Tuple[str, str, str], Deque[Interaction]] = defaultdict(deque)
+        self._last: Dict[Tuple[str, str, str], Interaction] = {}
+        for interaction in interactions:
+            self._queues[interaction.key].append(interaction)
+        self.served = 0
+        self.misses = 0
+
+    @classmethod
+    def from_file(cls, path: Path, speed: float = 0.0) -> "CassettePlayer":
+        return cls(load_interactions(path), speed=speed)
+
+    def next(self, method: str, url: str) -> Interaction:
+        key = _request_key(method, url)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                interaction = self._last[key] = queue.popleft()
+            elif key in self._last:
+                interaction = self._last[key]
+            else:
+                self.misses += 1
+                raise CassetteMiss(f"{key[0]} {key[1]}{'?' + key[2] if key[2] else ''} not in cassette")
+            self.served += 1
+        return interaction
+
+    def delay(self, interaction: Interaction) -> float:
+        return interaction.elapsed / self.speed if self.speed > 0 else 0.0
+
+
+# -- sync (generated ApiClient) ----------------------------------------------
+
+
+def _http_response(interaction: Interaction) -> urllib3.HTTPResponse:
+    return urllib3.HTTPResponse(
+        body=interaction.body,
+        headers=interaction.headers,
+        status=interaction.status,
+        preload_content=True,
+    )
+
+
+class RecordingRESTClient:
+    """Wraps a `rest.RESTClientObject`-compatible client and records its traffic."""
+
+    def __init__(self, inner: Any, cassette: Cassette) -> None:
+        self.inner = inner
+        self.cassette = cassette
+
+    def request(self, method, url, headers=None, body=None, post_params=None, _request_timeout=None):
+        started = self.cassette.now()
+        response = self.inner.request(
+            method, url, headers=headers, body=body, post_params=post_params, _request_timeout=_request_timeout
+        )
+        self.cassette.record(method, url, started, response.status, response.headers, response.read())
+        return response
+
+    def close(self) -> None:
+        if hasattr(self.inner, "close"):
+            self.inner.close()
+        elif hasattr(self.inner, "pool_manager"):
+            self.inner.pool_manager.clear()
+
+
+class ReplayRESTClient:
+    """Stands in for `rest.RESTClientObject`, answering from a cassette."""
+
+    def __init__(self, player: CassettePlayer, sleep: Callable[[float], None] = time.sleep) -> None:
+        self.player = player
+        self._sleep = sleep
+
+    def request(self, method, url, headers=None, body=None, post_params=None, _request_timeout=None):
+        interaction = self.player.next(method, url)
+        delay = self.player.delay(interaction)
+        if delay:
+            self._sleep(delay)
+        return rest.RESTResponse(_http_response(interaction))
+
+    def close(self) -> None:
+        pass
+
+
+# -- async (httpx) -------------------------------------------------------------
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, cassette: Cassette) -> None:
+        self.inner = inner
+        self.cassette = cassette
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = self.cassette.now()
+        response = await self.inner.handle_async_request(request)
+        body = await response.aread()
+        self.cassette.record(request.method, str(request.url), started, response.status_code, response.headers, body)
+        return httpx.Response(response.status_code, headers=response.headers, content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, player: CassettePlayer) -> None:
+        self.player = player
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        interaction = self.player.next(request.method, str(request.url))
+        delay = self.player.delay(interaction)
+        if delay:
+            await asyncio.sleep(delay)
+        return httpx.Response(interaction.status, headers=interaction.headers, content=interaction.body, request=request)
+
+
+# -- environment wiring --------------------------------------------------------
+
+_cassettes: Dict[Path, Cassette] = {}
+_players: Dict[Path, CassettePlayer] = {}
+_registry_lock = threading.Lock()
+
+
+def cassette_mode() -> Optional[str]:
+    """'record', 'replay' or None, from the environment."""
+
+    if not os.getenv(ENV_CASSETTE):
+        return None
+    mode = os.getenv(ENV_CASSETTE_MODE, "replay").lower()
+    if mode not in ("record", "replay"):
+        raise ValueError(f"{ENV_CASSETTE_MODE} must be 'record' or 'replay', not {mode!r}")
+    return mode
+
+
+def shared_cassette(path: Optional[Path] = None) -> Cassette:
+    """The process-wide recorder for `path` (so sync and async share one file)."""
+
+    path = Path(path or os.environ[ENV_CASSETTE]).resolve()
+    with _registry_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None:
+            cassette = _cassettes[path] = Cassette(path)
+        return cassette
+
+
+def shared_player(path: Optional[Path] = None, speed: Optional[float] = None) -> CassettePlayer:
+    """The process-wide player for `path`, so both clients consume one timeline."""
+
+    path = Path(path or os.environ[ENV_CASSETTE]).resolve()
+    with _registry_lock:
+        player = _players.get(path)
+        if player is None:
+            if speed is None:
+                speed = float(os.getenv(ENV_CASSETTE_SPEED, "0") or 0)
+            player = _players[path] = CassettePlayer.from_file(path, speed=speed)
+        return player
+
+
+def close_cassettes() -> None:
+    with _registry_lock:
+        cassettes = list(_cassettes.values())
+        _cassettes.clear()
+        _players.clear()
+    for cassette in cassettes:
+        cassette.close()
@@ -4,18 +4,18 @@ import logging
 from typing import Optional
 
 from .intents import Intent, IntentType
-from .persistence.sqlite import SQLitePersistence
-from .spacetraders_client import build_client
+from .persistence.base import PersistenceBackend
+from .spacetraders_client import get_client
 
 
-def execute_intent(intent: Intent, store: SQLitePersistence, logger: Optional[logging.Logger] = None) -> None:
+def execute_intent(intent: Intent, store: PersistenceBackend, logger: Optional[logging.Logger] = None) -> None:
     """Execute the intent via Python-controlled paths.
 
     This is a minimal stub; it logs execution and gathers extra data for
     GATHER_MARKET_DATA when possible. Other intents are left as TODOs.
     """
     log = logger or logging.getLogger("agent.executor")
-    client = build_client()
+    client = get_client()
     if client is None:
         log.warning("No API client available; skipping execution for %s", intent.summary())
         return
@@ -0,0 +1,193 @@
+"""Fast construction of generated models from trusted API responses.
+
+The generated `from_dict` methods build every nested model and then hand
+the result to `model_validate`, which validates the whole tree again. On a
+full fleet listing that doubles the work, and almost all of it is spent
+checking data the server has already validated.
+
+`construct(cls, data)` builds the same model tree with `model_construct`. It
+uses one converter per model, compiled once from the field annotations. Enums,
+datetimes, lists and nested models are converted, and nothing is revalidated.
+`LazyModel` goes further: it wraps the raw dict and only converts a field
+the first time it is read.
+
+Only use these for 2xx server responses; anything user-supplied should go
+through the generated `from_dict` so validation errors still surface.
+"""
+from __future__ import annotations
+
+import datetime
+import enum
+import threading
+import types
+import typing
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+Converter = Callable[[Any], Any]
+
+_constructors: Dict[type, Converter] = {}
+_field_tables: Dict[type, Dict[str, Tuple[str, Converter]]] = {}
+_lock = threading.Lock()
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _parse_datetime(value: Any) -> Any:
+    if isinstance(value, str):
+        return datetime.datetime.fromisoformat(value)
+    return value
+
+
+def _converter_for(annotation: Any) -> Converter:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is typing.Annotated:
+        return _converter_for(args[0])
+    if origin in (typing.Union, types.UnionType):
+        non_none = [a for a in args if a is not type(None)]
+        if len(non_none) == 1:
+            return _converter_for(non_none[0])
+        return _identity
+    if origin in (list, List):
+        item = _converter_for(args[0]) if args else _identity
+        if item is _identity:
+            return _identity
+        return lambda value: [None if v is None else item(v) for v in value] if isinstance(value, list) else value
+    if origin in (dict, Dict):
+        item = _converter_for(args[1]) if len(args) == 2 else _identity
+        if item is _identity:
+            return _identity
+        return lambda value: {k: None if v is None else item(v) for k, v in value.items()} if isinstance(value, dict) else value
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            # Resolved lazily so self-referencing models do not recurse at compile time.
+            return lambda value: constructor_for(annotation)(value)
+        if issubclass(annotation, enum.Enum):
+            return lambda value: annotation(value) if not isinstance(value, annotation) else value
+        if annotation is datetime.datetime:
+            return _parse_datetime
+    return _identity
+
+
+def _field_table(cls: Type[BaseModel]) -> Dict[str, Tuple[str, Converter]]:
+    """Map JSON key -> (attribute name, converter) for a model class."""
+
+    table = _field_tables.get(cls)
+    if table is None:
+        table = {}
+        for name, field in cls.model_fields.items():
+            table[field.alias or name] = (name, _converter_for(field.annotation))
+        with _lock:
+            _field_tables[cls] = table
+    return table
+
+
+def _needs_validation(cls: Type[BaseModel]) -> bool:
+    # oneOf/anyOf wrappers pick their variant inside from_dict/from_json.
+    return "actual_instance" in cls.model_fields
+
+
+def constructor_for(cls: Type[BaseModel]) -> Converter:
+    """Return (and memoize) the fast constructor for a generated model class."""
+
+    ctor = _constructors.get(cls)
+    if ctor is not None:
+        return ctor
+
+    if _needs_validation(cls):
+        def ctor(data: Any) -> Any:
+            return cls.from_dict(data)
+    else:
+        table = _field_table(cls)
+
+        def ctor(data: Any) -> Any:
+            if not isinstance(data, dict):
+                return data
+            values = {}
+            for key, value in data.items():
+                entry = table.get(key)
+                if entry is not None:
+                    name, convert = entry
+                    values[name] = None if value is None else convert(value)
+            return cls.model_construct(**values)
+
+    with _lock:
+        _constructors[cls] = ctor
+    return ctor
+
+
+def construct(cls: Type[BaseModel], data: Any) -> Any:
+    """Build `cls` from trusted JSON data without pydantic validation."""
+
+    if data is None:
+        return None
+    return constructor_for(cls)(data)
+
+
+class LazyModel:
+    """Read-only view over a JSON dict that converts fields on first access.
+
+    Attribute names match the generated model (snake_case); nested models come
+    back as further `LazyModel` views. Call `materialize()` for a real model.
+    """
+
+    __slots__ = ("_cls", "_data", "_cache")
+
+    def __init__(self, cls: Type[BaseModel], data: Dict[str, Any]) -> None:
+        object.__setattr__(self, "_cls", cls)
+        object.__setattr__(self, "_data", data)
+        object.__setattr__(self, "_cache", {})
+
+    def __getattr__(self, name: str) -> Any:
+        cache = self._cache
+        if name in cache:
+            return cache[name]
+        field = self._cls.model_fields.get(name)
+        if field is None:
+            raise AttributeError(f"{self._cls.__name__} has no field {name!r}")
+        value = self._data.get(field.alias or name)
+        if value is not None:
+            value = _lazy_converter_for(field.annotation)(value)
+        cache[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("LazyModel is read-only")
+
+    def __repr__(self) -> str:
+        return f"LazyModel[{self._cls.__name__}]({self._data!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
+
+    def materialize(self) -> Any:
+        return construct(self._cls, self._data)
+
+
+def _lazy_converter_for(annotation: Any) -> Converter:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Annotated:
+        return _lazy_converter_for(args[0])
+    if origin in (typing.Union, types.UnionType):
+        non_none = [a for a in args if a is not type(None)]
+        return _lazy_converter_for(non_none[0]) if len(non_none) == 1 else _identity
+    if origin in (list, List) and args:
+        item = _lazy_converter_for(args[0])
+        return lambda value: [None if v is None else item(v) for v in value] if isinstance(value, list) else value
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel) and not _needs_validation(annotation):
+        return lambda value: LazyModel(annotation, value) if isinstance(value, dict) else value
+    return _converter_for(annotation)
+
+
+def lazy_view(cls: Type[BaseModel], data: Optional[Dict[str, Any]]) -> Optional[LazyModel]:
+    """Wrap trusted JSON data in a `LazyModel` of `cls`."""
+
+    if data is None:
+        return None
+    return LazyModel(cls, data)
@@ -1,28 +1,30 @@
 from __future__ import annotations
 
 import logging
-import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+from .advisory import AdvisoryChange, AdvisoryWatcher
+from .async_client import close_async_clients
+from .cache import configure_response_cache
+from .cassette import close_cassettes
 from .executor import execute_intent
-from .persistence.sqlite import SQLitePersistence
+from .persistence.base import create_backend
+from .persistence.writebehind import write_behind_enabled
+from .ratelimit import get_rate_limiter
+from .retry import retry_stats
+from .singleflight import get_single_flight
+from .spacetraders_client import close_clients, get_client
 from .reasoning import plan_next_intent
-from .state import refresh_state, analyze_fleet_readiness
+from .readiness import ReadinessTracker
+from .refresh import IncrementalRefresher, fetched_markets
+from .scheduler import Scheduler
 
 
 DEFAULT_INPUT_PATH = Path("input.md")
 DEFAULT_POLL_INTERVAL_SEC = 5.0
-
-
-def _read_input(path: Path) -> Optional[str]:
-    if not path.exists():
-        return None
-    try:
-        return path.read_text(encoding="utf-8")
-    except OSError:
-        return None
+HOUSEKEEPING_INTERVAL_SEC = 60.0
 
 
 def run_loop(
@@ -35,54 +37,129 @@ def run_loop(
     """Headless control loop stub.
 
     Watches the advisory file for new guidance, invokes reasoning to pick
-    an intent, and delegates execution (to be implemented). In production
-    this will enforce cooldowns, persistence, and scheduling.
+    an intent, and delegates execution (to be implemented). Work is driven
+    by a `Scheduler`: a planning pass runs when the advisory changes or a
+    ship becomes idle (its arrival or cooldown timer fires), and sleeps
+    through closed rate-limit windows; between events the loop is idle.
     """
 
-    store = SQLitePersistence(Path("agent.db"))
+    store = create_backend(Path("agent.db"), write_behind=write_behind_enabled())
     store.connect()
     log = logger or logging.getLogger("agent.loop")
     log.info("Starting run_loop input=%s poll=%.2fs once=%s", input_path, poll_interval_sec, once)
 
-    last_seen = None
-    while True:
-        advisory = _read_input(input_path)
-        if advisory != last_seen:
-            last_seen = advisory
-            log.info("Advisory updated len=%s", len(advisory) if advisory else 0)
-            # Refresh authoritative state
-            snapshot = refresh_state(logger=log)
-            ts = datetime.now(timezone.utc).isoformat()
-            store.save_state_snapshot(ts, payload=str(snapshot))
-            if advisory:
-                store.append_log(ts, "advisory", advisory)
-                log.info("Logged advisory at %s", ts)
-            if snapshot.get("errors"):
-                log.warning("State errors: %s", snapshot.get("errors"))
-            else:
-                log.info("State refreshed (agent=%s ships=%s)", bool(snapshot.get("agent")), len(snapshot.get("ships") or [] if snapshot.get("ships") else 0))
-            
-            # Analyze fleet readiness
-            readiness = analyze_fleet_readiness(snapshot)
-            log.info("Fleet readiness: total=%d idle=%d busy=%d ready=%s", 
-                     readiness["total_ships"], readiness["idle_ships"], readiness["busy_ships"], 
-                     readiness["ready_for_action"])
-
-            intent = plan_next_intent(state_snapshot=snapshot, advisory_input=advisory, logger=log, prompt_debug=prompt_debug)
-            store.append_log(ts, "intent", intent.summary())
-            log.info("Selected intent: %s", intent.summary())
-            # Execute intent (stubbed)
-            execute_intent(intent, store, logger=log)
-            
-            # Adjust next sleep based on fleet readiness
-            # If ships are idle, check sooner; if busy, we can wait longer
-            effective_poll_interval = poll_interval_sec
-            if not readiness["ready_for_action"]:
-                # Ships are busy; increase wait time since we can't act yet
-                effective_poll_interval = min(poll_interval_sec * 2, 60.0)
-                log.info("Ships busy; increasing poll interval to %.1fs", effective_poll_interval)
-        
+    # Open the pooled API client and the persistent response cache up front
+    # so the first refresh reuses them; release both when the loop exits.
+    cache = configure_response_cache()
+    get_client()
+    refresher = IncrementalRefresher()
+    tracker = ReadinessTracker()
+    tracker.attach(refresher.world)
+    scheduler = Scheduler(logger=log)
+    limiter = get_rate_limiter()
+    advisory: Optional[str] = None
+    advisory_changed = False
+
+    def on_advisory(change: AdvisoryChange) -> None:
+        # Only called when the content hash changed, so a touched file costs nothing
+        nonlocal advisory, advisory_changed
+        advisory, advisory_changed = change.content, True
+        log.info("Advisory updated len=%s", len(advisory) if advisory else 0)
+        scheduler.call_soon("plan", plan)
+
+    watcher = AdvisoryWatcher(
+        input_path, scheduler, on_advisory, poll_interval_sec=poll_interval_sec, use_inotify=False if once else None, logger=log
+    )
+
+    def ships_ready() -> None:
+        # Arrivals and cooldown expiries, straight off the readiness timer heap
+        became_idle = sorted(event.ship_symbol for event in tracker.poll() if event.idle)
+        if became_idle:
+            log.info("Ships became idle: %s", ", ".join(became_idle))
+            scheduler.call_soon("plan", plan)
+        arm_ready_timer()
+
+    def arm_ready_timer() -> None:
+        ready_at = tracker.next_ready_at()
+        if ready_at is None:
+            scheduler.cancel("ships_ready")
+        else:
+            scheduler.at(ready_at, "ships_ready", ships_ready)
+
+    def plan() -> None:
+        try:
+            plan_pass()
+        finally:
+            # Sleep until the next ship is ready rather than polling while they are busy.
+            # Re-armed even if the pass raised, since the scheduler only logs the error.
+            arm_ready_timer()
+
+    def plan_pass() -> None:
+        nonlocal advisory_changed
+        # Out of request tokens: come back when the window reopens instead of blocking in acquire
+        wait = limiter.seconds_until_available()
+        if wait > 0:
+            log.info("Rate limit window closed; planning again in %.2fs", wait)
+            scheduler.after(wait, "plan", plan)
+            return
+
+        # Refresh authoritative state: only ships whose timers elapsed, plus a periodic full sweep
+        snapshot = refresher.refresh(logger=log)
+        tracker.poll()  # this pass already sees whatever the refresh changed
+        ts = datetime.now(timezone.utc).isoformat()
+        store.save_snapshot(ts, snapshot)
+        store.save_world(ts, snapshot)
+        # Only markets fetched by this pass; cached ones were recorded when they were fetched
+        store.record_market_prices(ts, fetched_markets(snapshot))
+        if advisory and advisory_changed:
+            store.append_log(ts, "advisory", advisory)
+            log.info("Logged advisory at %s", ts)
+        advisory_changed = False
+        if snapshot.get("errors"):
+            log.warning("State errors: %s", snapshot.get("errors"))
+        else:
+            log.info("State refreshed (agent=%s ships=%s)", bool(snapshot.get("agent")), len(snapshot.get("ships") or [] if snapshot.get("ships") else 0))
+
+        # Analyze fleet readiness
+        readiness = tracker.summary()
+        log.info("Fleet readiness: total=%d idle=%d busy=%d ready=%s",
+                 readiness["total_ships"], readiness["idle_ships"], readiness["busy_ships"],
+                 readiness["ready_for_action"])
+
+        intent = plan_next_intent(state_snapshot=snapshot, advisory_input=advisory, logger=log, prompt_debug=prompt_debug)
+        store.append_log(ts, "intent", intent.summary())
+        log.info("Selected intent: %s", intent.summary())
+        # Execute intent (stubbed)
+        execute_intent(intent, store, logger=log)
+        # The action may have moved the ship or spent credits; re-read them next time
+        ship_symbol = intent.details.get("ship_symbol")
+        refresher.mark_dirty(*([ship_symbol] if isinstance(ship_symbol, str) else []))
+
+    def housekeeping() -> None:
+        compacted = store.maybe_compact()
+        if compacted:
+            log.info("Compacted agent.db: %s", compacted)
+        log.debug("Rate limiter stats: %s", limiter.stats())
+        if cache is not None:
+            log.debug("Response cache stats: %s", cache.stats())
+        log.debug("Request coalescing stats: %s", get_single_flight().stats())
+        log.debug("Retry stats: %s", retry_stats())
+
+    try:
+        watcher.start()
+        log.info("Watching %s (%s)", input_path, watcher.mode)
+        scheduler.every(HOUSEKEEPING_INTERVAL_SEC, "housekeeping", housekeeping)
         if once:
-            break
-        
-        time.sleep(poll_interval_sec)
+            scheduler.run_pending()
+            # A pass deferred by the rate limit still runs before exiting.
+            scheduler.run(until=lambda: scheduler.pending("plan") is None)
+        else:
+            scheduler.run()
+    finally:
+        watcher.close()
+        close_clients()
+        close_async_clients()
+        close_cassettes()
+        if cache is not None:
+            cache.close()
+        store.close()
@@ -0,0 +1,686 @@
+"""In-process stand-in for the SpaceTraders API, for offline tests and benchmarks.
+
+`MockSpaceTradersServer` serves a small generated universe over real HTTP on
+localhost, so the whole client stack runs unchanged: the generated ApiClient,
+the async client, pagination, caching and retries. Point
+`SPACETRADERS_BASE_URL` (or a client's `base_url`) at `server.base_url`.
+
+Payloads are built from the generated OpenAPI models. `example_for` fills every
+required field of a model from its annotations, and `conform` validates the
+result through the model's `from_dict`. As a result, the fixtures track the
+spec whenever the client is regenerated.
+
+The server enforces the same 2 req/s + 30-per-60s burst limit as the live
+API and answers 429 with the real error body and `x-ratelimit-*` headers.
+`MockServerConfig` can add latency and random 5xx errors.
+"""
+from __future__ import annotations
+
+import datetime as dt
+import enum
+import json
+import random
+import re
+import threading
+import time
+import types
+import typing
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from urllib.parse import parse_qs, urlsplit
+
+from pydantic import BaseModel, ValidationError
+
+from .ratelimit import DEFAULT_BURST_CAPACITY, DEFAULT_BURST_WINDOW_SEC, DEFAULT_RATE_PER_SEC, _TokenBucket
+from .spacetraders_client import ApiClient  # noqa: F401  (ensures codegen is on sys.path)
+
+from spacetraders_api_client import models
+
+API_PREFIX = "/v2"
+MAX_PAGE_LIMIT = 20
+DEFAULT_TOKEN = "mock-token"
+
+_ENUM_ERROR_RE = re.compile(r"must be one of enum values \('([^']+)'")
+
+
+# -- model-driven fixtures ---------------------------------------------------
+
+
+def _utcnow() -> dt.datetime:
+    return dt.datetime.now(dt.timezone.utc)
+
+
+def _isoformat(value: dt.datetime) -> str:
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, dt.datetime):
+        return _isoformat(value)
+    if isinstance(value, dt.date):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"not JSON serializable: {type(value).__name__}")
+
+
+def _constraints(metadata: List[Any]) -> Dict[str, Any]:
+    found: Dict[str, Any] = {}
+    for item in metadata:
+        for attr in ("ge", "gt", "le", "lt", "min_length", "max_length"):
+            value = getattr(item, attr, None)
+            if value is not None:
+                found[attr] = value
+        found.update(_constraints(list(getattr(item, "metadata", []) or [])))
+    return found
+
+
+def _example_value(annotation: Any, metadata: List[Any], depth: int) -> Any:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Annotated:
+        return _example_value(args[0], metadata + list(args[1:]), depth)
+    if origin in (typing.Union, types.UnionType):
+        return _example_value(next(a for a in args if a is not type(None)), metadata, depth)
+    if origin in (list, List):
+        return [_example_value(args[0], [], depth + 1)] if args and depth < 4 else []
+    if origin in (dict, Dict):
+        return {}
+
+    limits = _constraints(metadata)
+    if annotation is bool:
+        return False
+    if annotation in (int, float):
+        low = limits.get("ge", limits.get("gt", 0))
+        high = limits.get("le", limits.get("lt", max(low, 1) * 10))
+        return annotation(min(max(1, low), high))
+    if annotation is str:
+        text = "MOCK"
+        return text.ljust(limits.get("min_length", 0), "X")[: limits.get("max_length", len(text)) or None]
+    if annotation is dt.datetime:
+        return _isoformat(_utcnow())
+    if annotation is dt.date:
+        return _utcnow().date().isoformat()
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return next(iter(annotation)).value
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return example_for(annotation, depth=depth + 1)
+    return None
+
+
+def example_for(cls: Type[BaseModel], overrides: Optional[Dict[str, Any]] = None, depth: int = 0) -> Dict[str, Any]:
+    """A JSON dict holding every required field of `cls`, keyed by alias."""
+
+    overrides = overrides or {}
+    data: Dict[str, Any] = {}
+    for name, info in cls.model_fields.items():
+        key = info.alias or name
+        if key in overrides:
+            data[key] = overrides[key]
+        elif info.is_required():
+            data[key] = _example_value(info.annotation, list(info.metadata), depth)
+    for key, value in overrides.items():
+        data.setdefault(key, value)
+    return data
+
+
+def _conform_nested(annotation: Any, value: Any) -> Any:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Annotated:
+        return _conform_nested(args[0], value)
+    if origin in (typing.Union, types.UnionType):
+        non_none = [a for a in args if a is not type(None)]
+        return _conform_nested(non_none[0], value) if len(non_none) == 1 else value
+    if origin in (list, List) and args and isinstance(value, list):
+        return [_conform_nested(args[0], item) for item in value]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel) and isinstance(value, dict):
+        if "actual_instance" in annotation.model_fields:
+            return value
+        return conform(annotation, value)
+    return value
+
+
+def conform(cls: Type[BaseModel], data: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill missing required fields and validate `data` as `cls`.
+
+    String fields the spec constrains with a custom enum validator (e.g.
+    `Contract.type`) are repaired from the validator's error message. The
+    result is a plain JSON-ready dict.
+    """
+
+    data = example_for(cls, data)
+    # Nested models validate inside their own from_dict, so error locations
+    # are relative to them; conform them first, innermost out.
+    for name, info in cls.model_fields.items():
+        key = info.alias or name
+        if data.get(key) is not None:
+            data[key] = _conform_nested(info.annotation, data[key])
+    for _ in range(8):
+        try:
+            instance = cls.from_dict(data)
+            break
+        except ValidationError as exc:
+            fixed = False
+            for err in exc.errors():
+                match = _ENUM_ERROR_RE.search(str(err.get("msg", "")))
+                loc = err.get("loc") or ()
+                if match and loc:
+                    target = data
+                    for part in loc[:-1]:
+                        target = target[part]
+                    target[loc[-1]] = match.group(1)
+                    fixed = True
+            if not fixed:
+                raise
+    else:  # pragma: no cover - only if the spec grows validators we cannot repair
+        raise ValueError(f"could not build a valid {cls.__name__}")
+    return json.loads(json.dumps(instance.to_dict(), default=_json_default))
+
+
+# -- the simulated universe --------------------------------------------------
+
+_WAYPOINT_TYPES = ["PLANET", "MOON", "ASTEROID", "ORBITAL_STATION", "GAS_GIANT", "ENGINEERED_ASTEROID"]
+_TRADE_GOODS = ["FUEL", "IRON_ORE", "COPPER_ORE", "ALUMINUM_ORE", "QUARTZ_SAND", "ICE_WATER", "SILICON_CRYSTALS", "FOOD"]
+_SHIP_ROLES = ["COMMAND", "EXCAVATOR", "HAULER", "SATELLITE"]
+
+
+class MockWorld:
+    """Agent, fleet, contracts, waypoints and markets for one system.
+
+    Ship navigation is simulated: in-transit ships flip to IN_ORBIT once their
+    arrival time passes, and market prices take a small random walk each time
+    a market is read.
+    """
+
+    def __init__(
+        self,
+        agent_symbol: str = "MOCK",
+        system_symbol: str = "X1-MOCK",
+        ships: int = 4,
+        waypoints: int = 12,
+        markets: int = 4,
+        contracts: int = 2,
+        seed: int = 0,
+    ) -> None:
+        self.rng = random.Random(seed)
+        self.lock = threading.RLock()
+        self.system_symbol = system_symbol
+        self.waypoints: Dict[str, Dict[str, Any]] = {}
+        self.markets: Dict[str, Dict[str, Any]] = {}
+        self.ships: Dict[str, Dict[str, Any]] = {}
+        self.contracts: List[Dict[str, Any]] = []
+
+        for i in range(waypoints):
+            symbol = f"{system_symbol}-A{i + 1}"
+            traits = [{"symbol": "MARKETPLACE", "name": "Marketplace", "description": "Trade hub"}] if i < markets else []
+            self.waypoints[symbol] = conform(models.Waypoint, {
+                "symbol": symbol,
+                "type": _WAYPOINT_TYPES[i % len(_WAYPOINT_TYPES)],
+                "systemSymbol": system_symbol,
+                "x": self.rng.randint(-100, 100),
+                "y": self.rng.randint(-100, 100),
+                "orbitals": [],
+                "traits": traits,
+                "isUnderConstruction": False,
+            })
+            if traits:
+                self.markets[symbol] = self._build_market(symbol)
+
+        hq = next(iter(self.waypoints))
+        self.agent = conform(models.Agent, {
+            "symbol": agent_symbol,
+            "headquarters": hq,
+            "credits": 175_000,
+            "startingFaction": "COSMIC",
+            "shipCount": ships,
+        })
+        for i in range(ships):
+            symbol = f"{agent_symbol}-{i + 1}"
+            self.ships[symbol] = self._build_ship(symbol, _SHIP_ROLES[i % len(_SHIP_ROLES)], hq, docked=i % 2 == 0)
+        for i in range(contracts):
+            self.contracts.append(conform(models.Contract, {
+                "id": f"contract-{i + 1}",
+                "factionSymbol": "COSMIC",
+                "type": "PROCUREMENT",
+                "accepted": i == 0,
+                "fulfilled": False,
+                "expiration": _isoformat(_utcnow() + dt.timedelta(days=7)),
+                "terms": example_for(models.ContractTerms, {
+                    "deadline": _isoformat(_utcnow() + dt.timedelta(days=7)),
+                    "payment": {"onAccepted": 10_000, "onFulfilled": 50_000},
+                    "deliver": [{
+                        "tradeSymbol": _TRADE_GOODS[1 + i],
+                        "destinationSymbol": hq,
+                        "unitsRequired": 60,
+                        "unitsFulfilled": 0,
+                    }],
+                }),
+            }))
+
+    def _build_market(self, symbol: str) -> Dict[str, Any]:
+        goods = self.rng.sample(_TRADE_GOODS, 4)
+        trade_goods = []
+        for index, good in enumerate(goods):
+            price = self.rng.randint(20, 400)
+            trade_goods.append({
+                "symbol": good,
+                "type": ("EXPORT", "IMPORT", "EXCHANGE")[index % 3],
+                "tradeVolume": self.rng.choice([10, 20, 60]),
+                "supply": self.rng.choice(["SCARCE", "LIMITED", "MODERATE", "HIGH", "ABUNDANT"]),
+                "purchasePrice": price,
+                "sellPrice": max(1, int(price * 0.9)),
+            })
+        return conform(models.Market, {
+            "symbol": symbol,
+            "exports": [{"symbol": g["symbol"], "name": g["symbol"], "description": ""} for g in trade_goods if g["type"] == "EXPORT"],
+            "imports": [{"symbol": g["symbol"], "name": g["symbol"], "description": ""} for g in trade_goods if g["type"] == "IMPORT"],
+            "exchange": [{"symbol": g["symbol"], "name": g["symbol"], "description": ""} for g in trade_goods if g["type"] == "EXCHANGE"],
+            "tradeGoods": trade_goods,
+        })
+
+    def _route_waypoint(self, symbol: str) -> Dict[str, Any]:
+        wp = self.waypoints[symbol]
+        return {"symbol": symbol, "type": wp["type"], "systemSymbol": wp["systemSymbol"], "x": wp["x"], "y": wp["y"]}
+
+    def _build_ship(self, symbol: str, role: str, waypoint: str, docked: bool) -> Dict[str, Any]:
+        now = _isoformat(_utcnow())
+        return conform(models.Ship, {
+            "symbol": symbol,
+            "registration": {"name": symbol, "factionSymbol": "COSMIC", "role": role},
+            "nav": {
+                "systemSymbol": self.system_symbol,
+                "waypointSymbol": waypoint,
+                "route": {
+                    "destination": self._route_waypoint(waypoint),
+                    "origin": self._route_waypoint(waypoint),
+                    "departureTime": now,
+                    "arrival": now,
+                },
+                "status": "DOCKED" if docked else "IN_ORBIT",
+                "flightMode": "CRUISE",
+            },
+            "cooldown": {"shipSymbol": symbol, "totalSeconds": 0, "remainingSeconds": 0},
+            "cargo": {"capacity": 40, "units": 0, "inventory": []},
+            "fuel": {"current": 400, "capacity": 400},
+        })
+
+    # -- simulation ---------------------------------------------------------
+
+    def tick(self) -> None:
+        """Land ships whose arrival time has passed."""
+
+        now = _utcnow()
+        with self.lock:
+            for ship in self.ships.values():
+                nav = ship["nav"]
+                if nav["status"] == "IN_TRANSIT":
+                    arrival = dt.datetime.fromisoformat(nav["route"]["arrival"].replace("Z", "+00:00"))
+                    if arrival <= now:
+                        nav["status"] = "IN_ORBIT"
+
+    def market(self, symbol: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            market = self.markets.get(symbol)
+            if market is None:
+                return None
+            for good in market.get("tradeGoods") or []:
+                step = self.rng.randint(-3, 3)
+                good["purchasePrice"] = max(1, good["purchasePrice"] + step)
+                good["sellPrice"] = max(1, int(good["purchasePrice"] * 0.9))
+            return json.loads(json.dumps(market))
+
+    def set_nav_status(self, ship_symbol: str, status: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            ship = self.ships.get(ship_symbol)
+            if ship is None:
+                return None
+            ship["nav"]["status"] = status
+            return json.loads(json.dumps(ship["nav"]))
+
+    def navigate(self, ship_symbol: str, destination: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            ship = self.ships.get(ship_symbol)
+            if ship is None or destination not in self.waypoints:
+                return None
+            nav = ship["nav"]
+            origin = self.waypoints[nav["waypointSymbol"]]
+            target = self.waypoints[destination]
+            distance = ((origin["x"] - target["x"]) ** 2 + (origin["y"] - target["y"]) ** 2) ** 0.5
+            now = _utcnow()
+            nav["route"] = {
+                "origin": self._route_waypoint(nav["waypointSymbol"]),
+                "destination": self._route_waypoint(destination),
+                "departureTime": _isoformat(now),
+                "arrival": _isoformat(now + dt.timedelta(seconds=max(1.0, distance / 10))),
+            }
+            nav["waypointSymbol"] = destination
+            nav["status"] = "IN_TRANSIT"
+            ship["fuel"]["current"] = max(0, ship["fuel"]["current"] - int(distance))
+            return json.loads(json.dumps({"fuel": ship["fuel"], "nav": nav, "events": []}))
+
+
+# -- HTTP server -------------------------------------------------------------
+
+
+@dataclass
+class MockServerConfig:
+    """Behaviour knobs for `MockSpaceTradersServer`."""
+
+    latency_sec: float = 0.0
+    latency_jitter_sec: float = 0.0
+    error_rate: float = 0.0
+    error_statuses: Tuple[int, ...] = (502, 503)
+    enforce_rate_limit: bool = True
+    rate_per_sec: float = DEFAULT_RATE_PER_SEC
+    burst_capacity: int = DEFAULT_BURST_CAPACITY
+    burst_window_sec: float = DEFAULT_BURST_WINDOW_SEC
+    seed: int = 0
+
+
+@dataclass
+class _ServerStats:
+    requests: int = 0
+    by_status: Dict[int, int] = field(default_factory=dict)
+    by_route: Dict[str, int] = field(default_factory=dict)
+
+
+class _ServerRateLimit:
+    """Server-side view of the SpaceTraders limit: reject rather than wait."""
+
+    def __init__(self, config: MockServerConfig, clock: Callable[[], float] = time.monotonic) -> None:
+        self.config = config
+        self._clock = clock
+        now = clock()
+        burst_refill = config.burst_capacity / config.burst_window_sec if config.burst_window_sec > 0 else 0.0
+        self._steady = _TokenBucket(config.rate_per_sec, config.rate_per_sec, config.rate_per_sec, now)
+        self._burst = _TokenBucket(float(config.burst_capacity), burst_refill, float(config.burst_capacity), now)
+        self._lock = threading.Lock()
+
+    def check(self) -> Tuple[bool, Dict[str, str], float]:
+        """Return (allowed, headers, retry_after_sec)."""
+
+        with self._lock:
+            now = self._clock()
+            self._steady.refill(now)
+            self._burst.refill(now)
+            allowed = True
+            if self._steady.tokens >= 1.0:
+                self._steady.tokens -= 1.0
+            elif self._burst.tokens >= 1.0:
+                self._burst.tokens -= 1.0
+            else:
+                allowed = False
+            retry_after = min(self._steady.seconds_until_token(), self._burst.seconds_until_token())
+            remaining = int(self._steady.tokens) + int(self._burst.tokens)
+        reset = _utcnow() + dt.timedelta(seconds=retry_after)
+        headers = {
+            "x-ratelimit-type": "IP-based",
+            "x-ratelimit-limit-per-second": str(int(self.config.rate_per_sec)),
+            "x-ratelimit-limit-burst": str(self.config.burst_capacity),
+            "x-ratelimit-remaining": str(remaining),
+            "x-ratelimit-reset": _isoformat(reset),
+        }
+        return allowed, headers, retry_after
+
+
+Route = Tuple[str, "re.Pattern[str]", str]
+
+_ROUTES: List[Route] = [
+    ("GET", re.compile(r"^/my/agent$"), "_get_agent"),
+    ("GET", re.compile(r"^/my/ships$"), "_list_ships"),
+    ("GET", re.compile(r"^/my/ships/(?P<ship>[^/]+)$"), "_get_ship"),
+    ("GET", re.compile(r"^/my/ships/(?P<ship>[^/]+)/nav$"), "_get_nav"),
+    ("POST", re.compile(r"^/my/ships/(?P<ship>[^/]+)/orbit$"), "_orbit"),
+    ("POST", re.compile(r"^/my/ships/(?P<ship>[^/]+)/dock$"), "_dock"),
+    ("POST", re.compile(r"^/my/ships/(?P<ship>[^/]+)/navigate$"), "_navigate"),
+    ("GET", re.compile(r"^/my/contracts$"), "_list_contracts"),
+    ("GET", re.compile(r"^/systems/(?P<system>[^/]+)/waypoints$"), "_list_waypoints"),
+    ("GET", re.compile(r"^/systems/(?P<system>[^/]+)/waypoints/(?P<waypoint>[^/]+)$"), "_get_waypoint"),
+    ("GET", re.compile(r"^/systems/(?P<system>[^/]+)/waypoints/(?P<waypoint>[^/]+)/market$"), "_get_market"),
+]
+
+
+class MockSpaceTradersServer:
+    """Threaded localhost HTTP server speaking a subset of the SpaceTraders API.
+
+    Use as a context manager, or call `start()`/`stop()` yourself.
+    """
+
+    def __init__(
+        self,
+        world: Optional[MockWorld] = None,
+        config: Optional[MockServerConfig] = None,
+        token: Optional[str] = DEFAULT_TOKEN,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.config = config or MockServerConfig()
+        self.world = world or MockWorld(seed=self.config.seed)
+        self.token = token
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._limit = _ServerRateLimit(self.config)
+        self._stats = _ServerStats()
+        self._stats_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "MockSpaceTradersServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-spacetraders", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockSpaceTradersServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "requests": self._stats.requests,
+                "by_status": dict(self._stats.by_status),
+                "by_route": dict(self._stats.by_route),
+            }
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats = _ServerStats()
+
+    # -- request handling ---------------------------------------------------
+
+    def _record(self, route: str, status: int) -> None:
+        with self._stats_lock:
+            self._stats.requests += 1
+            self._stats.by_status[status] = self._stats.by_status.get(status, 0) + 1
+            self._stats.by_route[route] = self._stats.by_route.get(route, 0) + 1
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                pass
+
+            def _serve(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                status, payload, headers, route = server.handle(method, self.path, self.headers.get("Authorization"), raw)
+                body = json.dumps(payload, default=_json_default).encode("utf-8") if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+                server._record(route, status)
+
+            def do_GET(self) -> None:
+                self._serve("GET")
+
+            def do_POST(self) -> None:
+                self._serve("POST")
+
+            def do_PATCH(self) -> None:
+                self._serve("PATCH")
+
+        return Handler
+
+    def _delay(self) -> None:
+        if self.config.latency_sec <= 0 and self.config.latency_jitter_sec <= 0:
+            return
+        with self._rng_lock:
+            jitter = self._rng.uniform(0, self.config.latency_jitter_sec)
+        time.sleep(self.config.latency_sec + jitter)
+
+    def _inject_error(self) -> Optional[int]:
+        if self.config.error_rate <= 0:
+            return None
+        with self._rng_lock:
+            if self._rng.random() >= self.config.error_rate:
+                return None
+            return self._rng.choice(self.config.error_statuses)
+
+    def handle(
+        self, method: str, target: str, authorization: Optional[str], raw_body: bytes = b""
+    ) -> Tuple[int, Any, Dict[str, str], str]:
+        """Route one request; returns (status, JSON payload, headers, route label)."""
+
+        parts = urlsplit(target)
+        path = parts.path[len(API_PREFIX):] if parts.path.startswith(API_PREFIX) else parts.path
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        self._delay()
+
+        for route_method, pattern, handler_name in _ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                break
+        else:
+            return 404, _error(404, f"No route for {method} {path}"), {}, "unmatched"
+        route = f"{method} {pattern.pattern}"
+
+        if self.token is not None and authorization != f"Bearer {self.token}":
+            return 401, _error(401, "Missing or invalid token"), {}, route
+
+        if self.config.enforce_rate_limit:
+            allowed, headers, retry_after = self._limit.check()
+            if not allowed:
+                data = {
+                    "type": "IP-based",
+                    "retryAfter": round(retry_after, 3),
+                    "limitBurst": self.config.burst_capacity,
+                    "limitPerSecond": self.config.rate_per_sec,
+                    "remaining": 0,
+                    "reset": headers["x-ratelimit-reset"],
+                }
+                headers["retry-after"] = str(max(1, int(retry_after + 0.999)))
+                return 429, _error(429, "You have reached your API limit.", data), headers, route
+        else:
+            headers = {}
+
+        injected = self._inject_error()
+        if injected is not None:
+            return injected, _error(injected, "Injected mock failure"), headers, route
+
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+        except ValueError:
+            return 400, _error(400, "Invalid JSON body"), headers, route
+        self.world.tick()
+        status, payload = getattr(self, handler_name)(query=query, body=body, **match.groupdict())
+        return status, payload, headers, route
+
+    # -- routes ---------------------------------------------------------------
+
+    def _get_agent(self, **_: Any) -> Tuple[int, Any]:
+        return 200, {"data": self.world.agent}
+
+    # Ship dicts are mutated under `world.lock` by tick() and navigate(), so
+    # handlers copy what they return while holding it; the response is
+    # serialized after the lock is released.
+
+    def _list_ships(self, query: Dict[str, str], **_: Any) -> Tuple[int, Any]:
+        with self.world.lock:
+            return _page(json.loads(json.dumps(list(self.world.ships.values()))), query)
+
+    def _get_ship(self, ship: str, **_: Any) -> Tuple[int, Any]:
+        with self.world.lock:
+            found = json.loads(json.dumps(self.world.ships.get(ship)))
+        return (200, {"data": found}) if found else (404, _error(404, f"Ship {ship} not found"))
+
+    def _get_nav(self, ship: str, **_: Any) -> Tuple[int, Any]:
+        with self.world.lock:
+            found = json.loads(json.dumps(self.world.ships.get(ship)))
+        return (200, {"data": found["nav"]}) if found else (404, _error(404, f"Ship {ship} not found"))
+
+    def _orbit(self, ship: str, **_: Any) -> Tuple[int, Any]:
+        nav = self.world.set_nav_status(ship, "IN_ORBIT")
+        return (200, {"data": {"nav": nav}}) if nav else (404, _error(404, f"Ship {ship} not found"))
+
+    def _dock(self, ship: str, **_: Any) -> Tuple[int, Any]:
+        nav = self.world.set_nav_status(ship, "DOCKED")
+        return (200, {"data": {"nav": nav}}) if nav else (404, _error(404, f"Ship {ship} not found"))
+
+    def _navigate(self, ship: str, body: Dict[str, Any], **_: Any) -> Tuple[int, Any]:
+        result = self.world.navigate(ship, body.get("waypointSymbol", ""))
+        return (200, {"data": result}) if result else (400, _error(400, "Invalid navigation target"))
+
+    def _list_contracts(self, query: Dict[str, str], **_: Any) -> Tuple[int, Any]:
+        return _page(self.world.contracts, query)
+
+    def _list_waypoints(self, system: str, query: Dict[str, str], **_: Any) -> Tuple[int, Any]:
+        items = [wp for wp in self.world.waypoints.values() if wp["systemSymbol"] == system]
+        if "type" in query:
+            items = [wp for wp in items if wp["type"] == query["type"]]
+        if "traits" in query:
+            items = [wp for wp in items if any(t["symbol"] == query["traits"] for t in wp["traits"])]
+        return _page(items, query)
+
+    def _get_waypoint(self, system: str, waypoint: str, **_: Any) -> Tuple[int, Any]:
+        found = self.world.waypoints.get(waypoint)
+        if found is None or found["systemSymbol"] != system:
+            return 404, _error(404, f"Waypoint {waypoint} not found")
+        return 200, {"data": found}
+
+    def _get_market(self, system: str, waypoint: str, **_: Any) -> Tuple[int, Any]:
+        market = self.world.market(waypoint)
+        return (200, {"data": market}) if market else (404, _error(404, f"No market at {waypoint}"))
+
+
+def _error(code: int, message: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    error: Dict[str, Any] = {"message": message, "code": code}
+    if data is not None:
+        error["data"] = data
+    return {"error": error}
+
+
+def _page(items: List[Dict[str, Any]], query: Dict[str, str]) -> Tuple[int, Any]:
+    try:
+        page = max(1, int(query.get("page", 1)))
+        limit = int(query.get("limit", 10))
+    except ValueError:
+        return 400, _error(400, "page and limit must be integers")
+    if not 1 <= limit <= MAX_PAGE_LIMIT:
+        return 400, _error(400, f"limit must be between 1 and {MAX_PAGE_LIMIT}")
+    start = (page - 1) * limit
+    return 200, {"data": items[start:start + limit], "meta": {"total": len(items), "page": page, "limit": limit}}
@@ -0,0 +1,212 @@
+"""Auto-paginating iterators for SpaceTraders list endpoints.
+
+Every list endpoint caps `limit` at 20 and reports the total in `meta`. These
+helpers fetch page 1, read `Meta.total`, then request the remaining pages
+concurrently and yield records as pages arrive (so order across pages is not
+guaranteed). Pass `until` to stop early: iteration ends after the first
+record for which it returns True, and outstanding page requests are dropped.
+
+Sync helpers accept a generated `ApiClient` and yield model instances; async
+helpers accept an `AsyncSpaceTradersClient` and yield raw JSON dicts, matching
+what each client returns elsewhere.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+# spacetraders_client puts the generated package on sys.path, so it goes first.
+from .spacetraders_client import APIResult
+from .async_client import AsyncSpaceTradersClient
+
+# API classes are resolved at call time through the lazy `api` package, so
+# importing this module does not pull in every endpoint's models.
+from spacetraders_api_client import ApiClient
+from spacetraders_api_client import api as generated_api
+from spacetraders_api_client.models.meta import Meta
+
+MAX_PAGE_LIMIT = 20
+DEFAULT_MAX_WORKERS = 4
+
+Predicate = Callable[[Any], bool]
+
+
+def _unpack(resp: Any, page: int) -> Tuple[List[Any], Meta]:
+    """Split a page response into (records, Meta) for models or APIResults."""
+
+    if isinstance(resp, APIResult):
+        if not resp.ok or resp.json is None:
+            raise RuntimeError(f"page {page}: {resp.error or resp.status}")
+        return list(resp.json.get("data") or []), Meta.from_dict(resp.json["meta"])
+    return list(resp.data or []), resp.meta
+
+
+def _page_count(meta: Meta, limit: int) -> int:
+    return max(1, math.ceil(meta.total / limit))
+
+
+def iter_pages(
+    fetch_page: Callable[[int, int], Any],
+    limit: int = MAX_PAGE_LIMIT,
+    until: Optional[Predicate] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> Iterator[Any]:
+    """Yield every record from a paginated endpoint.
+
+    `fetch_page(page, limit)` must return a generated `*200Response` model
+    (with `.data` and `.meta`) or an `APIResult`.
+    """
+
+    records, meta = _unpack(fetch_page(1, limit), 1)
+    for record in records:
+        yield record
+        if until is not None and until(record):
+            return
+
+    pages = _page_count(meta, limit)
+    if pages <= 1:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, pages - 1)))
+    try:
+        pending = {executor.submit(fetch_page, page, limit): page for page in range(2, pages + 1)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                page = pending.pop(future)
+                records, _ = _unpack(future.result(), page)
+                for record in records:
+                    yield record
+                    if until is not None and until(record):
+                        return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def aiter_pages(
+    fetch_page: Callable[[int, int], Awaitable[Any]],
+    limit: int = MAX_PAGE_LIMIT,
+    until: Optional[Predicate] = None,
+) -> AsyncIterator[Any]:
+    """Async variant of `iter_pages`; remaining pages are gathered as tasks."""
+
+    records, meta = _unpack(await fetch_page(1, limit), 1)
+    for record in records:
+        yield record
+        if until is not None and until(record):
+            return
+
+    pages = _page_count(meta, limit)
+    if pages <= 1:
+        return
+
+    tasks = {asyncio.ensure_future(fetch_page(page, limit)): page for page in range(2, pages + 1)}
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                records, _ = _unpack(task.result(), tasks[task])
+                for record in records:
+                    yield record
+                    if until is not None and until(record):
+                        return
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+# -- generated-client helpers -------------------------------------------------
+
+
+def iter_my_ships(client: ApiClient, until: Optional[Predicate] = None) -> Iterator[Any]:
+    api = generated_api.FleetApi(client)
+    return iter_pages(lambda page, limit: api.get_my_ships(page=page, limit=limit), until=until)
+
+
+def iter_my_contracts(client: ApiClient, until: Optional[Predicate] = None) -> Iterator[Any]:
+    api = generated_api.ContractsApi(client)
+    return iter_pages(lambda page, limit: api.get_contracts(page=page, limit=limit), until=until)
+
+
+def iter_systems(client: ApiClient, until: Optional[Predicate] = None) -> Iterator[Any]:
+    api = generated_api.SystemsApi(client)
+    return iter_pages(lambda page, limit: api.get_systems(page=page, limit=limit), until=until)
+
+
+def iter_system_waypoints(
+    client: ApiClient,
+    system_symbol: str,
+    type: Optional[Any] = None,
+    traits: Optional[Any] = None,
+    until: Optional[Predicate] = None,
+) -> Iterator[Any]:
+    api = generated_api.SystemsApi(client)
+    return iter_pages(
+        lambda page, limit: api.get_system_waypoints(system_symbol, page=page, limit=limit, type=type, traits=traits),
+        until=until,
+    )
+
+
+def iter_agents(client: ApiClient, until: Optional[Predicate] = None) -> Iterator[Any]:
+    api = generated_api.AgentsApi(client)
+    return iter_pages(lambda page, limit: api.get_agents(page=page, limit=limit), until=until)
+
+
+def iter_factions(client: ApiClient, until: Optional[Predicate] = None) -> Iterator[Any]:
+    api = generated_api.FactionsApi(client)
+    return iter_pages(lambda page, limit: api.get_factions(page=page, limit=limit), until=until)
+
+
+# -- async-client helpers -----------------------------------------------------
+
+
+def aiter_endpoint(
+    client: AsyncSpaceTradersClient,
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    until: Optional[Predicate] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Paginate any GET list endpoint through the async client."""
+
+    async def fetch_page(page: int, limit: int) -> APIResult:
+        return await client.request("GET", path, params={**(params or {}), "page": page, "limit": limit})
+
+    return aiter_pages(fetch_page, until=until)
+
+
+def aiter_my_ships(client: AsyncSpaceTradersClient, until: Optional[Predicate] = None) -> AsyncIterator[Dict[str, Any]]:
+    return aiter_endpoint(client, "/my/ships", until=until)
+
+
+def aiter_my_contracts(client: AsyncSpaceTradersClient, until: Optional[Predicate] = None) -> AsyncIterator[Dict[str, Any]]:
+    return aiter_endpoint(client, "/my/contracts", until=until)
+
+
+def aiter_systems(client: AsyncSpaceTradersClient, until: Optional[Predicate] = None) -> AsyncIterator[Dict[str, Any]]:
+    return aiter_endpoint(client, "/systems", until=until)
+
+
+def aiter_system_waypoints(
+    client: AsyncSpaceTradersClient,
+    system_symbol: str,
+    params: Optional[Dict[str, Any]] = None,
+    until: Optional[Predicate] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    return aiter_endpoint(client, f"/systems/{system_symbol}/waypoints", params=params, until=until)
+
+
+def aiter_agents(client: AsyncSpaceTradersClient, until: Optional[Predicate] = None) -> AsyncIterator[Dict[str, Any]]:
+    return aiter_endpoint(client, "/agents", until=until)
+
+
+def aiter_factions(client: AsyncSpaceTradersClient, until: Optional[Predicate] = None) -> AsyncIterator[Dict[str, Any]]:
+    return aiter_endpoint(client, "/factions", until=until)
+
+
+async def collect(iterator: AsyncIterator[Any]) -> List[Any]:
+    """Drain an async iterator into a list."""
+
+    return [item async for item in iterator]
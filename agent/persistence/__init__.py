@@ -1 +1 @@
-"""Persistence layer package for SQLite-backed storage."""
+"""Persistence backends: SQLite (durable), in-memory and null; see base.py."""
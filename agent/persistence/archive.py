@@ -0,0 +1,330 @@
+"""Compaction of old log and snapshot rows into an attached archive database.
+
+`immutable_log`, `state_snapshot` and `state_history` are append-only, so
+without compaction `agent.db` keeps growing. That slows checkpoints, backups
+and page-cache hit rates. `Compactor.compact()` moves rows older than the
+policy's age limits into a second SQLite file, by default `agent.archive.db`
+next to the hot database, and then frees the space with an incremental
+vacuum. The hot database stays about the size of the retention window.
+
+Archive layout:
+
+- `log_segments` / `snapshot_segments`: one compressed JSON segment per
+  day per compaction run, indexed by day. Each log segment lists its
+  categories, so lookups skip segments that cannot match.
+- `state_history`: delta-encoded history rows, copied verbatim. They are
+  cut only at a keyframe, so the chains left in both databases still
+  start with one.
+
+Rows are written to the archive before they are deleted from the hot
+database. A crash between the two steps can leave a duplicate but never
+loses a row.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence
+
+from .snapshots import decompress, compress, default_codec
+
+log = logging.getLogger("agent.persistence")
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive.log_segments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day TEXT NOT NULL,
+    first_ts TEXT NOT NULL,
+    last_ts TEXT NOT NULL,
+    first_id INTEGER NOT NULL,
+    last_id INTEGER NOT NULL,
+    row_count INTEGER NOT NULL,
+    categories TEXT NOT NULL,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS archive.log_segments_day ON log_segments (day);
+
+CREATE TABLE IF NOT EXISTS archive.snapshot_segments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day TEXT NOT NULL,
+    first_ts TEXT NOT NULL,
+    last_ts TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS archive.snapshot_segments_day ON snapshot_segments (day);
+
+CREATE TABLE IF NOT EXISTS archive.state_history (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    keyframe INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS archive.state_history_ts ON state_history (ts);
+"""
+
+
+@dataclass(frozen=True)
+class CompactionPolicy:
+    log_age_sec: int = 7 * 86400
+    snapshot_age_sec: int = 3 * 86400
+    # SQLitePersistence.maybe_compact runs a compaction at most this often,
+    # the first one a full interval after connecting (never at startup).
+    interval_sec: int = 6 * 3600
+    # Rows moved per transaction, so a large backlog does not hold the write lock for long.
+    batch_rows: int = 20_000
+    # Free pages released per run by PRAGMA incremental_vacuum (0 = all).
+    vacuum_pages: int = 2_000
+    # Let compaction run the one-off full VACUUM that converts a database
+    # created before incremental auto-vacuum. Off by default because it blocks
+    # for as long as rewriting the whole file takes; see tools/vacuum_db.py.
+    convert_vacuum: bool = False
+    archive_path: Optional[Path] = None
+
+
+def default_archive_path(db_path: Path) -> Path:
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.stem}.archive{db_path.suffix or '.db'}")
+
+
+def enable_incremental_vacuum(conn: sqlite3.Connection) -> None:
+    """Switch a database to incremental auto-vacuum.
+
+    On a new database this is free. An existing one also needs a single full
+    VACUUM: `Compactor.convert_vacuum()`, run by tools/vacuum_db.py or by
+    compaction when `CompactionPolicy.convert_vacuum` is set.
+    """
+
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+
+
+def _cutoff(now: float, age_sec: int) -> str:
+    return (datetime.fromtimestamp(now, timezone.utc) - timedelta(seconds=age_sec)).isoformat()
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone() is not None
+
+
+class Compactor:
+    """Moves aged rows from the hot database into the archive."""
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        db_path: Path,
+        policy: CompactionPolicy = CompactionPolicy(),
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.conn = conn
+        self.db_path = Path(db_path)
+        self.policy = policy
+        self.archive_path = Path(policy.archive_path or default_archive_path(db_path))
+        self._clock = clock
+        self._attached = False
+        # Counted from construction, so a restart does not compact (or run the
+        # one-off VACUUM of an older database) before the loop has done anything.
+        self._last_run = clock()
+        self._warned_vacuum = False
+        self.codec = default_codec()
+
+    def attach(self) -> None:
+        if not self._attached:
+            self.conn.execute("ATTACH DATABASE ? AS archive", (str(self.archive_path),))
+            self.conn.executescript(ARCHIVE_SCHEMA)
+            self._attached = True
+
+    def due(self) -> bool:
+        return self._clock() - self._last_run >= self.policy.interval_sec
+
+    def compact(self) -> dict:
+        """Run one compaction; returns counts of rows moved and pages freed."""
+
+        now = self._clock()
+        self._last_run = now
+        self.attach()
+        log_cutoff = _cutoff(now, self.policy.log_age_sec)
+        snapshot_cutoff = _cutoff(now, self.policy.snapshot_age_sec)
+        result = {
+            "logs": self._move_logs(log_cutoff),
+            "snapshots": self._move_snapshots(snapshot_cutoff) if _table_exists(self.conn, "state_snapshot") else 0,
+            "history": self._move_history(snapshot_cutoff) if _table_exists(self.conn, "state_history") else 0,
+        }
+        result["freed_pages"] = self._vacuum()
+        self.conn.execute("PRAGMA main.wal_checkpoint(TRUNCATE);")
+        return result
+
+    # -- moves -----------------------------------------------------------------
+
+    def _move_logs(self, cutoff: str) -> int:
+        moved = 0
+        while True:
+            rows = self.conn.execute(
+                "SELECT id, ts, category, message FROM main.immutable_log WHERE ts < ? ORDER BY id LIMIT ?",
+                (cutoff, self.policy.batch_rows),
+            ).fetchall()
+            if not rows:
+                return moved
+            with self.conn:
+                for day, group in groupby(sorted(rows, key=lambda r: (r[1][:10], r[0])), key=lambda r: r[1][:10]):
+                    group = list(group)
+                    self.conn.execute(
+                        "INSERT INTO archive.log_segments (day, first_ts, last_ts, first_id, last_id, row_count,"
+                        " categories, codec, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            day,
+                            min(r[1] for r in group),
+                            max(r[1] for r in group),
+                            group[0][0],
+                            group[-1][0],
+                            len(group),
+                            json.dumps(sorted({r[2] for r in group})),
+                            self.codec,
+                            self._pack(group),
+                        ),
+                    )
+                self.conn.execute(
+                    "DELETE FROM main.immutable_log WHERE id <= ? AND ts < ?",
+                    (rows[-1][0], cutoff),
+                )
+            moved += len(rows)
+
+    def _move_snapshots(self, cutoff: str) -> int:
+        moved = 0
+        while True:
+            rows = self.conn.execute(
+                "SELECT id, ts, payload FROM main.state_snapshot WHERE ts < ? ORDER BY id LIMIT ?",
+                (cutoff, self.policy.batch_rows),
+            ).fetchall()
+            if not rows:
+                return moved
+            with self.conn:
+                for day, group in groupby(sorted(rows, key=lambda r: (r[1][:10], r[0])), key=lambda r: r[1][:10]):
+                    group = list(group)
+                    self.conn.execute(
+                        "INSERT INTO archive.snapshot_segments (day, first_ts, last_ts, row_count, codec, data)"
+                        " VALUES (?, ?, ?, ?, ?, ?)",
+                        (day, min(r[1] for r in group), max(r[1] for r in group), len(group), self.codec, self._pack(group)),
+                    )
+                self.conn.execute("DELETE FROM main.state_snapshot WHERE id <= ? AND ts < ?", (rows[-1][0], cutoff))
+            moved += len(rows)
+
+    def _move_history(self, cutoff: str) -> int:
+        # Keep the newest keyframe before the cutoff hot, so the hot chain still starts with one.
+        (boundary,) = self.conn.execute(
+            "SELECT MAX(id) FROM main.state_history WHERE keyframe = 1 AND ts < ?",
+            (cutoff,),
+        ).fetchone()
+        if boundary is None:
+            return 0
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO archive.state_history (id, ts, keyframe, codec, data)"
+                " SELECT id, ts, keyframe, codec, data FROM main.state_history WHERE id < ?",
+                (boundary,),
+            )
+            cursor = self.conn.execute("DELETE FROM main.state_history WHERE id < ?", (boundary,))
+        return cursor.rowcount
+
+    def _pack(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        return compress(json.dumps([list(r) for r in rows], separators=(",", ":")).encode("utf-8"), self.codec)
+
+    def incremental_vacuum_enabled(self) -> bool:
+        (mode,) = self.conn.execute("PRAGMA main.auto_vacuum").fetchone()
+        return mode == 2
+
+    def convert_vacuum(self) -> bool:
+        """Convert a database created before incremental vacuum; returns False if already done.
+
+        This is a full VACUUM: it rewrites the whole file and blocks writers
+        while it runs.
+        """
+
+        if self.incremental_vacuum_enabled():
+            return False
+        enable_incremental_vacuum(self.conn)
+        self.conn.execute("VACUUM main")
+        return True
+
+    def _vacuum(self) -> int:
+        if not self.incremental_vacuum_enabled():
+            if self.policy.convert_vacuum:
+                self.convert_vacuum()
+            elif not self._warned_vacuum:
+                self._warned_vacuum = True
+                log.warning(
+                    "%s predates incremental vacuum; compaction will not shrink it until "
+                    "tools/vacuum_db.py is run (or CompactionPolicy.convert_vacuum is set)",
+                    self.db_path,
+                )
+            return 0
+        (free_before,) = self.conn.execute("PRAGMA main.freelist_count").fetchone()
+        # The pragma frees one page per step; executescript steps it to completion.
+        self.conn.executescript(f"PRAGMA main.incremental_vacuum({int(self.policy.vacuum_pages)});")
+        (free_after,) = self.conn.execute("PRAGMA main.freelist_count").fetchone()
+        return free_before - free_after
+
+    # -- lookups ---------------------------------------------------------------
+
+    def archived_logs(
+        self,
+        since: str,
+        until: str,
+        category: Optional[str] = None,
+        text: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[tuple]:
+        """(ts, category, message) rows in [since, until), newest first.
+
+        Only segments for the days in range are read (via the day index).
+        Segments whose category list cannot match are skipped.
+
+        Archived rows have no FTS5 index, so `text` is a case-insensitive
+        substring rather than `search_logs`' phrase of whole tokens. They
+        mostly agree; "navigate_ship" also matches "navigate ship" in the hot
+        table but not here, and a fragment such as "navig" only matches here.
+        """
+
+        needle = text.casefold() if text else None
+        self.attach()
+        segments = self.conn.execute(
+            "SELECT categories, codec, data FROM archive.log_segments"
+            " WHERE day >= ? AND day <= ? AND last_ts >= ? AND first_ts < ? ORDER BY day DESC, last_id DESC",
+            (since[:10], until[:10], since, until),
+        ).fetchall()
+        found: List[tuple] = []
+        for categories, codec, data in segments:
+            if category and category not in json.loads(categories):
+                continue
+            for _, ts, cat, message in json.loads(decompress(data, codec)):
+                if since <= ts < until and (not category or cat == category) and (not needle or needle in message.casefold()):
+                    found.append((ts, cat, message))
+        found.sort(key=lambda row: row[0], reverse=True)
+        return found[:limit]
+
+    def archived_snapshots(self, since: str, until: str) -> List[tuple]:
+        """Legacy (ts, payload) state_snapshot rows in [since, until), oldest first."""
+
+        self.attach()
+        segments = self.conn.execute(
+            "SELECT codec, data FROM archive.snapshot_segments"
+            " WHERE day >= ? AND day <= ? AND last_ts >= ? AND first_ts < ? ORDER BY day, id",
+            (since[:10], until[:10], since, until),
+        ).fetchall()
+        found = [
+            (ts, payload)
+            for codec, data in segments
+            for _, ts, payload in json.loads(decompress(data, codec))
+            if since <= ts < until
+        ]
+        found.sort(key=lambda row: row[0])
+        return found
@@ -0,0 +1,121 @@
+"""The persistence interface the loops depend on, and backend selection.
+
+`PersistenceBackend` lists what the agent needs from storage: logs,
+strategy notes, state snapshots, error context, and the world and price
+tables. There are three implementations:
+
+- `sqlite`: `SQLitePersistence`, the durable store (`agent.db`).
+- `memory`: `MemoryPersistence`, with the same results for the same calls
+  but no file and no fsyncs, for tests, simulations and benchmarks.
+- `null`: `NullPersistence` accepts every write and remembers nothing.
+
+Pick one with `create_backend`, or set `AGENT_PERSISTENCE` to choose one
+without code changes.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Iterable, Optional, Protocol, runtime_checkable
+
+ENV_BACKEND = "AGENT_PERSISTENCE"
+BACKENDS = ("sqlite", "memory", "null")
+
+
+@runtime_checkable
+class PersistenceBackend(Protocol):
+    def connect(self) -> None: ...
+
+    def flush(self) -> None: ...
+
+    def close(self) -> None: ...
+
+    # -- logs --
+    def append_log(self, ts: str, category: str, message: str) -> None: ...
+
+    def fetch_logs(self, limit: int = 100) -> Iterable[tuple]: ...
+
+    def search_logs(
+        self,
+        text: Optional[str] = None,
+        category: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 20,
+    ) -> list: ...
+
+    # -- strategy notes --
+    def save_strategy_notes(self, ts: str, content: str) -> None: ...
+
+    def fetch_strategy_notes(self) -> Optional[str]: ...
+
+    def notes_history(self, limit: int = 20) -> list: ...
+
+    def notes_revision(self, digest: str) -> Optional[str]: ...
+
+    def notes_at(self, ts: str) -> Optional[str]: ...
+
+    # -- snapshots --
+    def save_state_snapshot(self, ts: str, payload: str) -> None: ...
+
+    def save_snapshot(self, ts: str, state: Any) -> None: ...
+
+    def snapshot_at(self, ts: Optional[str] = None) -> Optional[Any]: ...
+
+    # -- error context --
+    def save_error_context(self, ts: str, intent_summary: str, error_message: str, details: str) -> None: ...
+
+    def fetch_error_context(self) -> Optional[tuple]: ...
+
+    def clear_error_context(self) -> None: ...
+
+    # -- world tables --
+    def save_world(self, ts: str, snapshot: dict) -> None: ...
+
+    def cheapest_purchase(self, trade_symbol: str, system_symbol: str, limit: int = 5) -> list: ...
+
+    def best_sell(self, trade_symbol: str, system_symbol: str, limit: int = 5) -> list: ...
+
+    def ships_with_status(self, status: str) -> list: ...
+
+    def waypoints_of_type(self, system_symbol: str, waypoint_type: str) -> list: ...
+
+    # -- market prices --
+    def record_market_prices(self, ts: Any, markets: Iterable[Any]) -> None: ...
+
+    def price_history(self, waypoint_symbol: str, trade_symbol: str, start: Any, end: Any, resolution: int = 0) -> list: ...
+
+    def latest_price(self, waypoint_symbol: str, trade_symbol: str) -> Optional[tuple]: ...
+
+    def latest_prices(self, trade_symbol: str, since: Any = 0) -> list: ...
+
+    # -- maintenance --
+    def maybe_compact(self) -> Optional[dict]: ...
+
+
+def backend_kind(default: str = "sqlite") -> str:
+    """The backend named by AGENT_PERSISTENCE, or `default` when unset."""
+
+    value = os.getenv(ENV_BACKEND, "").strip().lower() or default
+    if value not in BACKENDS:
+        raise ValueError(f"{ENV_BACKEND} must be one of {', '.join(BACKENDS)}, got {value!r}")
+    return value
+
+
+def create_backend(db_path: Path, kind: Optional[str] = None, **options: Any) -> PersistenceBackend:
+    """A backend of `kind` (default: `backend_kind()`); `options` go to `SQLitePersistence`."""
+
+    kind = kind or backend_kind()
+    if kind == "sqlite":
+        from .sqlite import SQLitePersistence
+
+        return SQLitePersistence(db_path, **options)
+    if kind == "memory":
+        from .memory import MemoryPersistence
+
+        return MemoryPersistence()
+    if kind == "null":
+        from .null import NullPersistence
+
+        return NullPersistence()
+    raise ValueError(f"unknown persistence backend {kind!r}; expected one of {', '.join(BACKENDS)}")
@@ -0,0 +1,110 @@
+"""Indexed and full-text search over `immutable_log`.
+
+`immutable_log` is append-mostly and grows without bound, so "last N rows"
+is the only cheap query it supports on its own. This module adds:
+
+- composite indexes on (category, ts) and on ts, for category/time filters
+  that walk an index instead of the table
+- an external-content FTS5 table over `message`, kept in sync by triggers,
+  for "entries mentioning navigate_ship"
+
+`search_query` builds one statement for any mix of filters. Free text is
+matched as a phrase, so user input never reaches the FTS5 query syntax.
+If this SQLite build lacks FTS5, text filters fall back to LIKE.
+"""
+from __future__ import annotations
+
+import sqlite3
+from typing import Any, List, Optional, Tuple
+
+LOG_INDEX_SCHEMA = """
+CREATE INDEX IF NOT EXISTS immutable_log_category_ts ON immutable_log (category, ts);
+CREATE INDEX IF NOT EXISTS immutable_log_ts ON immutable_log (ts);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS immutable_log_fts USING fts5(
+    message,
+    content='immutable_log',
+    content_rowid='id'
+);
+
+CREATE TRIGGER IF NOT EXISTS immutable_log_fts_insert AFTER INSERT ON immutable_log BEGIN
+    INSERT INTO immutable_log_fts (rowid, message) VALUES (new.id, new.message);
+END;
+
+CREATE TRIGGER IF NOT EXISTS immutable_log_fts_delete AFTER DELETE ON immutable_log BEGIN
+    INSERT INTO immutable_log_fts (immutable_log_fts, rowid, message) VALUES ('delete', old.id, old.message);
+END;
+
+CREATE TRIGGER IF NOT EXISTS immutable_log_fts_update AFTER UPDATE OF message ON immutable_log BEGIN
+    INSERT INTO immutable_log_fts (immutable_log_fts, rowid, message) VALUES ('delete', old.id, old.message);
+    INSERT INTO immutable_log_fts (rowid, message) VALUES (new.id, new.message);
+END;
+"""
+
+
+def ensure_log_index(conn: sqlite3.Connection) -> bool:
+    """Create the indexes and FTS table; returns whether FTS5 is available.
+
+    A database that already has log rows gets its FTS index rebuilt once,
+    when the FTS table is first created.
+    """
+
+    conn.executescript(LOG_INDEX_SCHEMA)
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'immutable_log_fts'"
+    ).fetchone()
+    try:
+        conn.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError as exc:
+        if "fts5" in str(exc):
+            return False
+        raise
+    if not exists:
+        conn.execute("INSERT INTO immutable_log_fts (immutable_log_fts) VALUES ('rebuild')")
+    conn.commit()
+    return True
+
+
+def phrase(text: str) -> str:
+    """Quote free text as a single FTS5 phrase."""
+
+    return '"' + text.replace('"', '""') + '"'
+
+
+def search_query(
+    fts: bool,
+    text: Optional[str] = None,
+    category: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = 20,
+) -> Tuple[str, List[Any]]:
+    """SQL and parameters returning (ts, category, message), newest first."""
+
+    clauses: List[str] = []
+    params: List[Any] = []
+    if text and fts:
+        source = "immutable_log_fts JOIN immutable_log l ON l.id = immutable_log_fts.rowid"
+        clauses.append("immutable_log_fts MATCH ?")
+        params.append(phrase(text))
+    else:
+        source = "immutable_log l"
+        if text:
+            clauses.append("l.message LIKE ? ESCAPE '\\'")
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+    if category:
+        clauses.append("l.category = ?")
+        params.append(category)
+    if since:
+        clauses.append("l.ts >= ?")
+        params.append(since)
+    if until:
+        clauses.append("l.ts < ?")
+        params.append(until)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"SELECT l.ts, l.category, l.message FROM {source}{where} ORDER BY l.ts DESC, l.id DESC LIMIT ?"
+    params.append(limit)
+    return sql, params
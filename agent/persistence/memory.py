@@ -0,0 +1,306 @@
+"""A pure in-memory `PersistenceBackend`.
+
+`MemoryPersistence` gives the same results as `SQLitePersistence` for the
+same sequence of calls, but it keeps everything in dicts and lists: no file,
+no transactions, no fsyncs. Use it for tests, offline simulations and
+benchmarks, where SQLite's durability is pure overhead.
+
+The one deliberate difference is log text search. SQLite matches a phrase
+of whole FTS5 tokens; here `text` is a case-insensitive substring. The two
+mostly agree, but not always: FTS5 splits on punctuation, so
+"navigate_ship" also matches "navigate ship" there and not here, while a
+word fragment such as "navig" matches here and not there.
+
+Data lives as long as the object. `close()` keeps it, like a file on disk.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..spacetraders_client import models
+from . import timeseries, world
+from .notes import content_hash
+from .snapshots import to_json
+from .world import _view
+
+# Rollup values: first_ts, last_ts, purchase o/h/l/c, sell o/h/l/c, samples.
+_Rollup = List[int]
+
+
+def _head(rows: list, limit: int) -> list:
+    # SQL LIMIT semantics: 0 returns nothing, a negative limit returns everything.
+    return rows if limit < 0 else rows[:limit]
+
+
+class MemoryPersistence:
+    """Dict-backed storage with the `SQLitePersistence` query surface."""
+
+    def __init__(self, retention: timeseries.Retention = timeseries.Retention()) -> None:
+        self.retention = retention
+        self._lock = threading.RLock()
+        self._logs: List[Tuple[int, str, str, str]] = []
+        self._notes: Optional[str] = None
+        self._revisions: Dict[str, str] = {}
+        self._notes_history: List[Tuple[str, str]] = []
+        self._state_snapshots: List[Tuple[str, str]] = []
+        self._history: List[Tuple[str, Any]] = []
+        self._error_context: Optional[tuple] = None
+        self._nav: Dict[str, tuple] = {}
+        self._waypoints: Dict[str, tuple] = {}
+        self._goods: Dict[Tuple[str, str], tuple] = {}
+        self._points: Dict[Tuple[str, str, int], tuple] = {}
+        self._rollups: Dict[Tuple[int, str, str, int], _Rollup] = {}
+        self._last_prune: Optional[int] = None
+
+    def connect(self) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    # -- logs ------------------------------------------------------------------
+
+    def append_log(self, ts: str, category: str, message: str) -> None:
+        with self._lock:
+            self._logs.append((len(self._logs) + 1, ts, category, message))
+
+    def fetch_logs(self, limit: int = 100) -> Iterable[tuple]:
+        with self._lock:
+            return [(ts, category, message) for _, ts, category, message in _head(self._logs[::-1], limit)]
+
+    def search_logs(
+        self,
+        text: Optional[str] = None,
+        category: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 20,
+    ) -> list:
+        needle = text.casefold() if text else None
+        with self._lock:
+            rows = [
+                row
+                for row in self._logs
+                if (not needle or needle in row[3].casefold())
+                and (not category or row[2] == category)
+                and (not since or row[1] >= since)
+                and (not until or row[1] < until)
+            ]
+        rows.sort(key=lambda row: (row[1], row[0]), reverse=True)
+        return [(ts, category, message) for _, ts, category, message in _head(rows, limit)]
+
+    # -- strategy notes --------------------------------------------------------
+
+    def save_strategy_notes(self, ts: str, content: str) -> None:
+        digest = content_hash(content)
+        with self._lock:
+            self._notes = content
+            self._revisions.setdefault(digest, content)
+            self._notes_history.append((ts, digest))
+
+    def fetch_strategy_notes(self) -> Optional[str]:
+        return self._notes
+
+    def notes_history(self, limit: int = 20) -> list:
+        """(ts, hash, size, depth) rows, newest first. Nothing is delta-encoded, so depth is 0."""
+        with self._lock:
+            return [
+                (ts, digest, len(self._revisions[digest]), 0)
+                for ts, digest in _head(self._notes_history[::-1], limit)
+            ]
+
+    def notes_revision(self, digest: str) -> Optional[str]:
+        return self._revisions.get(digest)
+
+    def notes_at(self, ts: str) -> Optional[str]:
+        with self._lock:
+            found = _latest_at(self._notes_history, ts)
+            return self._revisions[found[1]] if found else None
+
+    # -- snapshots -------------------------------------------------------------
+
+    def save_state_snapshot(self, ts: str, payload: str) -> None:
+        with self._lock:
+            self._state_snapshots.append((ts, payload))
+
+    def save_snapshot(self, ts: str, state: Any) -> None:
+        # Stored as JSON values, exactly as SQLite would give them back.
+        state = to_json(state)
+        with self._lock:
+            self._history.append((ts, state))
+
+    def snapshot_at(self, ts: Optional[str] = None) -> Optional[Any]:
+        with self._lock:
+            if ts is None:
+                found = self._history[-1] if self._history else None
+            else:
+                found = _latest_at(self._history, ts)
+        return to_json(found[1]) if found else None
+
+    # -- error context ---------------------------------------------------------
+
+    def save_error_context(self, ts: str, intent_summary: str, error_message: str, details: str) -> None:
+        self._error_context = (ts, intent_summary, error_message, details)
+
+    def fetch_error_context(self) -> Optional[tuple]:
+        return self._error_context
+
+    def clear_error_context(self) -> None:
+        self._error_context = None
+
+    # -- world tables ----------------------------------------------------------
+
+    def save_world(self, ts: str, snapshot: dict) -> None:
+        """Apply a `refresh_state` snapshot with the rules of `world.snapshot_statements`."""
+        with self._lock:
+            ships = snapshot.get("ships")
+            if ships is not None:
+                listed = {world._symbol(ship, "symbol") for ship in ships}
+                self._nav = {symbol: row for symbol, row in self._nav.items() if symbol in listed}
+                for raw in ships:
+                    ship = _view(models.Ship, raw)
+                    if ship.nav is not None:
+                        self._nav[ship.symbol] = world.nav_row(ship.symbol, ship.nav, ts)
+            for raw in (snapshot.get("waypoints") or {}).values():
+                if raw:
+                    waypoint = _view(models.Waypoint, raw)
+                    self._waypoints[waypoint.symbol] = world.waypoint_row(waypoint, ts)
+            for raw in (snapshot.get("markets") or {}).values():
+                if raw:
+                    self._save_market(_view(models.Market, raw), ts)
+
+    def _save_market(self, market: Any, ts: str) -> None:
+        rows = world.trade_good_rows(market, ts)
+        priced = market.trade_goods is not None
+        for key in [key for key in self._goods if key[0] == market.symbol and (priced or key[1] not in rows)]:
+            del self._goods[key]
+        for trade_symbol, row in rows.items():
+            old = self._goods.get((market.symbol, trade_symbol))
+            if old is not None:
+                # Listing only: keep the last prices seen, update the kind.
+                row = old[:3] + (row[3],) + old[4:]
+            self._goods[(market.symbol, trade_symbol)] = row
+
+    def _goods_for(self, trade_symbol: str, system_symbol: str, column: int) -> List[tuple]:
+        with self._lock:
+            return [
+                row
+                for (_, symbol), row in self._goods.items()
+                if symbol == trade_symbol and row[2] == system_symbol and row[column] is not None
+            ]
+
+    def cheapest_purchase(self, trade_symbol: str, system_symbol: str, limit: int = 5) -> list:
+        rows = sorted(self._goods_for(trade_symbol, system_symbol, 7), key=lambda row: row[7])
+        return [(row[0], row[7], row[5], row[4], row[9]) for row in _head(rows, limit)]
+
+    def best_sell(self, trade_symbol: str, system_symbol: str, limit: int = 5) -> list:
+        rows = sorted(self._goods_for(trade_symbol, system_symbol, 8), key=lambda row: row[8], reverse=True)
+        return [(row[0], row[8], row[5], row[4], row[9]) for row in _head(rows, limit)]
+
+    def ships_with_status(self, status: str) -> list:
+        with self._lock:
+            rows = sorted(row for row in self._nav.values() if row[3] == status)
+        return [(row[0], row[1], row[2], row[5], row[6]) for row in rows]
+
+    def waypoints_of_type(self, system_symbol: str, waypoint_type: str) -> list:
+        with self._lock:
+            rows = sorted(row for row in self._waypoints.values() if row[1] == system_symbol and row[2] == waypoint_type)
+        return [(row[0], row[3], row[4], row[5]) for row in rows]
+
+    # -- market prices ---------------------------------------------------------
+
+    def record_market_prices(self, ts: timeseries.Timestamp, markets: Iterable[Any]) -> None:
+        with self._lock:
+            for point in timeseries.price_points(markets, ts):
+                waypoint, symbol, epoch, purchase, sell = point[:5]
+                if (waypoint, symbol, epoch) in self._points:
+                    continue  # one observation per second, as in SQLite
+                self._points[(waypoint, symbol, epoch)] = point[3:]
+                for resolution in timeseries.RESOLUTIONS:
+                    self._roll_up((resolution, waypoint, symbol, epoch - epoch % resolution), epoch, purchase, sell)
+        now = timeseries.to_epoch(ts)
+        if self._last_prune is None or now - self._last_prune >= self.retention.prune_interval_sec:
+            self.prune_market_history(now)
+
+    def _roll_up(self, key: Tuple[int, str, str, int], epoch: int, purchase: int, sell: int) -> None:
+        rollup = self._rollups.get(key)
+        if rollup is None:
+            self._rollups[key] = [epoch, epoch, purchase, purchase, purchase, purchase, sell, sell, sell, sell, 1]
+            return
+        first_ts, last_ts = rollup[0], rollup[1]
+        if epoch < first_ts:
+            rollup[2], rollup[6] = purchase, sell
+        if epoch >= last_ts:
+            rollup[5], rollup[9] = purchase, sell
+        rollup[3], rollup[4] = max(rollup[3], purchase), min(rollup[4], purchase)
+        rollup[7], rollup[8] = max(rollup[7], sell), min(rollup[8], sell)
+        rollup[0], rollup[1] = min(first_ts, epoch), max(last_ts, epoch)
+        rollup[10] += 1
+
+    def prune_market_history(self, now: timeseries.Timestamp) -> None:
+        now = timeseries.to_epoch(now)
+        cutoffs = {
+            timeseries.FIVE_MINUTES: now - self.retention.five_min_sec,
+            timeseries.HOURLY: now - self.retention.hourly_sec,
+        }
+        with self._lock:
+            raw_cutoff = now - self.retention.raw_sec
+            self._points = {key: point for key, point in self._points.items() if key[2] >= raw_cutoff}
+            self._rollups = {key: rollup for key, rollup in self._rollups.items() if key[3] >= cutoffs[key[0]]}
+            self._last_prune = now
+
+    def price_history(
+        self,
+        waypoint_symbol: str,
+        trade_symbol: str,
+        start: timeseries.Timestamp,
+        end: timeseries.Timestamp,
+        resolution: int = 0,
+    ) -> list:
+        start, end = timeseries.to_epoch(start), timeseries.to_epoch(end)
+        with self._lock:
+            if not resolution:
+                return sorted(
+                    (key[2],) + point
+                    for key, point in self._points.items()
+                    if key[0] == waypoint_symbol and key[1] == trade_symbol and start <= key[2] < end
+                )
+            if resolution not in timeseries.RESOLUTIONS:
+                raise ValueError(f"resolution must be 0 or one of {timeseries.RESOLUTIONS}")
+            start -= start % resolution
+            return sorted(
+                (key[3],) + tuple(rollup[2:])
+                for key, rollup in self._rollups.items()
+                if key[:3] == (resolution, waypoint_symbol, trade_symbol) and start <= key[3] < end
+            )
+
+    def latest_price(self, waypoint_symbol: str, trade_symbol: str) -> Optional[tuple]:
+        rows = self.price_history(waypoint_symbol, trade_symbol, 0, 2**62)
+        return rows[-1] if rows else None
+
+    def latest_prices(self, trade_symbol: str, since: timeseries.Timestamp = 0) -> list:
+        since = timeseries.to_epoch(since)
+        latest: Dict[str, tuple] = {}
+        with self._lock:
+            for (waypoint, symbol, epoch), point in self._points.items():
+                if symbol == trade_symbol and epoch >= since and (waypoint not in latest or epoch > latest[waypoint][1]):
+                    latest[waypoint] = (waypoint, epoch) + point
+        return sorted(latest.values(), key=lambda row: row[2])
+
+    # -- maintenance -----------------------------------------------------------
+
+    def maybe_compact(self) -> Optional[dict]:
+        return None
+
+
+def _latest_at(rows: List[Tuple[str, Any]], ts: str) -> Optional[Tuple[str, Any]]:
+    """The last-added row with the greatest timestamp <= `ts`."""
+    found = None
+    for row in rows:
+        if row[0] <= ts and (found is None or row[0] >= found[0]):
+            found = row
+    return found
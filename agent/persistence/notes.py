@@ -0,0 +1,191 @@
+"""Versioned, content-addressed strategy notes.
+
+`strategy_notes` keeps only the current document (`id = 1`). This module
+adds a revision store beside it:
+
+- `notes_revisions` holds one row per distinct document, keyed by its
+  SHA-256. Saving text that was seen before stores nothing new.
+- Most revisions are a compressed line delta against their parent. Every
+  `MAX_CHAIN`-th revision is stored in full, and so is any revision whose
+  delta would not be much smaller, so materializing a revision decodes at
+  most `MAX_CHAIN` rows.
+- `notes_history` records every save: (ts, hash), in order.
+
+A line delta is a list of ops applied to the parent's lines:
+`["=", i, j]` copies parent lines i..j and `["+", [lines]]` inserts new ones.
+"""
+from __future__ import annotations
+
+import difflib
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .snapshots import compress, decompress, default_codec
+from .writebehind import Statement
+
+MAX_CHAIN = 16
+# Store a full copy when the delta is more than this fraction of the text.
+MAX_DELTA_RATIO = 0.5
+_CACHE_SIZE = 32
+
+NOTES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes_revisions (
+    hash TEXT PRIMARY KEY,
+    parent_hash TEXT,
+    depth INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS notes_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notes_history_ts ON notes_history (ts);
+"""
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def line_delta(old: str, new: str) -> List[Any]:
+    a = old.splitlines(keepends=True)
+    b = new.splitlines(keepends=True)
+    ops: List[Any] = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == "equal":
+            ops.append(["=", i1, i2])
+        elif j2 > j1:
+            ops.append(["+", b[j1:j2]])
+    return ops
+
+
+def apply_delta(old: str, ops: List[Any]) -> str:
+    a = old.splitlines(keepends=True)
+    out: List[str] = []
+    for op in ops:
+        if op[0] == "=":
+            out.extend(a[op[1]:op[2]])
+        else:
+            out.extend(op[1])
+    return "".join(out)
+
+
+class NotesHistory:
+    """Builds revision rows for saves and materializes stored revisions.
+
+    Tracks the current head in memory, so a save costs at most one primary
+    key lookup. The head is loaded from the database once, by `load_head`.
+    """
+
+    def __init__(self) -> None:
+        self.codec = default_codec()
+        self._head: Optional[Tuple[str, str, int]] = None  # (hash, text, depth)
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Depths of revisions written through this instance (possibly still queued).
+        self._written: Dict[str, int] = {}
+
+    def load_head(self, conn: sqlite3.Connection) -> None:
+        row = conn.execute("SELECT content FROM strategy_notes WHERE id = 1").fetchone()
+        self._head = None
+        if row is None:
+            return
+        digest = content_hash(row[0])
+        stored = conn.execute("SELECT depth FROM notes_revisions WHERE hash = ?", (digest,)).fetchone()
+        if stored is not None:
+            self._head = (digest, row[0], stored[0])
+
+    def _stored_depth(self, conn: sqlite3.Connection, digest: str) -> Optional[int]:
+        if digest in self._written:
+            return self._written[digest]
+        row = conn.execute("SELECT depth FROM notes_revisions WHERE hash = ?", (digest,)).fetchone()
+        return row[0] if row else None
+
+    def save_statements(self, conn: sqlite3.Connection, ts: str, content: str) -> List[Statement]:
+        """Statements recording a save of `content`: the revision (if new) and the history entry."""
+
+        digest = content_hash(content)
+        statements: List[Statement] = []
+        if self._head is not None and self._head[0] == digest:
+            pass
+        elif (depth := self._stored_depth(conn, digest)) is not None:
+            # Seen before: point the head at the existing revision.
+            self._head = (digest, content, depth)
+        else:
+            parent = self._head
+            full = compress(json.dumps(content).encode("utf-8"), self.codec)
+            depth, parent_hash, data = 0, None, full
+            if parent is not None and parent[2] + 1 < MAX_CHAIN:
+                delta = compress(json.dumps(line_delta(parent[1], content)).encode("utf-8"), self.codec)
+                if len(delta) <= MAX_DELTA_RATIO * len(full):
+                    depth, parent_hash, data = parent[2] + 1, parent[0], delta
+            statements.append((
+                "INSERT OR IGNORE INTO notes_revisions (hash, parent_hash, depth, size, codec, data)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (digest, parent_hash, depth, len(content), self.codec, data),
+            ))
+            self._head = (digest, content, depth)
+            self._written[digest] = depth
+            self._remember(digest, content)
+        statements.append(("INSERT INTO notes_history (ts, hash) VALUES (?, ?)", (ts, digest)))
+        return statements
+
+    def materialize(self, conn: sqlite3.Connection, digest: str) -> Optional[str]:
+        """The text of revision `digest`, or None if it was never stored."""
+
+        cached = self._cached(digest)
+        if cached is not None:
+            return cached
+        chain = []
+        current: Optional[str] = digest
+        text: Optional[str] = None
+        while current is not None:
+            text = self._cached(current)
+            if text is not None:
+                break
+            row = conn.execute(
+                "SELECT parent_hash, codec, data FROM notes_revisions WHERE hash = ?", (current,)
+            ).fetchone()
+            if row is None:
+                return None
+            parent_hash, codec, data = row
+            chain.append((parent_hash, json.loads(decompress(data, codec))))
+            current = parent_hash
+        for parent_hash, payload in reversed(chain):
+            text = payload if parent_hash is None else apply_delta(text, payload)
+        self._remember(digest, text)
+        return text
+
+    def _cached(self, digest: str) -> Optional[str]:
+        with self._cache_lock:
+            if digest not in self._cache:
+                return None
+            self._cache.move_to_end(digest)
+            return self._cache[digest]
+
+    def _remember(self, digest: str, text: str) -> None:
+        with self._cache_lock:
+            self._cache[digest] = text
+            self._cache.move_to_end(digest)
+            while len(self._cache) > _CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+
+HISTORY = """
+SELECT ts, notes_history.hash, size, depth
+FROM notes_history JOIN notes_revisions ON notes_revisions.hash = notes_history.hash
+ORDER BY notes_history.id DESC
+LIMIT ?
+"""
+
+HASH_AT = """
+SELECT hash FROM notes_history WHERE ts <= ? ORDER BY ts DESC, id DESC LIMIT 1
+"""
@@ -0,0 +1,101 @@
+"""A `PersistenceBackend` that stores nothing.
+
+Writes are accepted and dropped, and reads return what an empty database
+would. Use it for runs that only care about API traffic or planning, such
+as load tests and benchmarks of the loop itself.
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+
+class NullPersistence:
+    """Accepts every write and returns empty results."""
+
+    def connect(self) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def append_log(self, ts: str, category: str, message: str) -> None:
+        pass
+
+    def fetch_logs(self, limit: int = 100) -> Iterable[tuple]:
+        return []
+
+    def search_logs(
+        self,
+        text: Optional[str] = None,
+        category: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 20,
+    ) -> list:
+        return []
+
+    def save_strategy_notes(self, ts: str, content: str) -> None:
+        pass
+
+    def fetch_strategy_notes(self) -> Optional[str]:
+        return None
+
+    def notes_history(self, limit: int = 20) -> list:
+        return []
+
+    def notes_revision(self, digest: str) -> Optional[str]:
+        return None
+
+    def notes_at(self, ts: str) -> Optional[str]:
+        return None
+
+    def save_state_snapshot(self, ts: str, payload: str) -> None:
+        pass
+
+    def save_snapshot(self, ts: str, state: Any) -> None:
+        pass
+
+    def snapshot_at(self, ts: Optional[str] = None) -> Optional[Any]:
+        return None
+
+    def save_error_context(self, ts: str, intent_summary: str, error_message: str, details: str) -> None:
+        pass
+
+    def fetch_error_context(self) -> Optional[tuple]:
+        return None
+
+    def clear_error_context(self) -> None:
+        pass
+
+    def save_world(self, ts: str, snapshot: dict) -> None:
+        pass
+
+    def cheapest_purchase(self, trade_symbol: str, system_symbol: str, limit: int = 5) -> list:
+        return []
+
+    def best_sell(self, trade_symbol: str, system_symbol: str, limit: int = 5) -> list:
+        return []
+
+    def ships_with_status(self, status: str) -> list:
+        return []
+
+    def waypoints_of_type(self, system_symbol: str, waypoint_type: str) -> list:
+        return []
+
+    def record_market_prices(self, ts: Any, markets: Iterable[Any]) -> None:
+        pass
+
+    def price_history(self, waypoint_symbol: str, trade_symbol: str, start: Any, end: Any, resolution: int = 0) -> list:
+        return []
+
+    def latest_price(self, waypoint_symbol: str, trade_symbol: str) -> Optional[tuple]:
+        return None
+
+    def latest_prices(self, trade_symbol: str, since: Any = 0) -> list:
+        return []
+
+    def maybe_compact(self) -> Optional[dict]:
+        return None
@@ -0,0 +1,101 @@
+"""A pool of read-only connections to a WAL database.
+
+`SQLitePersistence` has one writer connection. In WAL mode, readers on
+other connections see the last committed state and never wait for the
+writer, so queries can run on any thread while the agent keeps writing.
+`ReaderPool` hands those connections out.
+
+- Connections open with `mode=ro` and `PRAGMA query_only`, so a query
+  routed here cannot write by accident.
+- They are opened lazily, up to `size`. A checkout beyond that waits up to
+  `timeout` for one to be returned.
+- Every checkout is one read transaction. All statements inside a
+  `with pool.connection()` block see the same snapshot, even while the
+  writer commits.
+- `aquery` / `arun` run the same work on the default executor, so
+  asyncio callers do not block their loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Sequence, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_READERS = 4
+
+
+class ReaderPool:
+    """Thread-safe pool of read-only connections to `db_path`."""
+
+    def __init__(self, db_path: Path, size: int = DEFAULT_READERS, timeout: float = 30.0) -> None:
+        if size < 1:
+            raise ValueError("ReaderPool needs at least one connection")
+        self.uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        self.size = size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.uri, uri=True, timeout=self.timeout, check_same_thread=False, isolation_level=None
+        )
+        conn.execute("PRAGMA query_only=ON;")
+        return conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if not self._closed:
+                self._idle.put(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Check out a connection holding one read transaction for the block."""
+        if self._closed:
+            raise RuntimeError("ReaderPool is closed")
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"no reader connection free within {self.timeout}s")
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._open()
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.execute("ROLLBACK")
+                self._release(conn)
+        finally:
+            self._slots.release()
+
+    def run(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        with self.connection() as conn:
+            return fn(conn)
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> list:
+        with self.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    async def arun(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        return await asyncio.get_running_loop().run_in_executor(None, self.run, fn)
+
+    async def aquery(self, sql: str, params: Sequence[Any] = ()) -> list:
+        return await asyncio.get_running_loop().run_in_executor(None, self.query, sql, params)
+
+    def close(self) -> None:
+        """Close idle connections now; checked-out ones are closed when returned."""
+        with self._lock:
+            self._closed = True
+            while not self._idle.empty():
+                self._idle.get_nowait().close()
@@ -0,0 +1,190 @@
+"""Compressed, delta-encoded state snapshots.
+
+A state snapshot is mostly the same as the one before it: the same ships,
+waypoints and markets, with a few fields changed. Each one is stored as
+compact JSON. Every `keyframe_interval`-th snapshot is stored whole (a
+keyframe). The snapshots between keyframes store only a structural diff
+against their predecessor. Both kinds are compressed with zstd when the
+optional `zstandard` package is installed, and with zlib otherwise; the
+codec is recorded per row, so a database can mix them.
+
+Deltas are nested lists tagged by their first element:
+
+    ["=", value]                     replace with value
+    ["d", {key: delta}, [removed]]   patch a dict
+    ["l", length, {index: delta}]    patch a list (resized to length)
+
+`diff(old, new)` returns None when nothing changed, and
+`patch(diff(a, b), a) == b` holds for any JSON values.
+"""
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Iterable, List, Optional, Tuple
+
+try:  # optional: pip install zstandard
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+CODEC_ZLIB = "zlib"
+CODEC_ZSTD = "zstd"
+
+DEFAULT_KEYFRAME_INTERVAL = 50
+# A delta bigger than this fraction of the full state is stored as a keyframe.
+MAX_DELTA_RATIO = 0.5
+
+
+def default_codec() -> str:
+    return CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+
+
+def to_json(value: Any) -> Any:
+    """Round-trip through JSON so datetimes, enums etc. become plain values."""
+
+    return json.loads(dumps(value))
+
+
+def dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), sort_keys=True, default=str)
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd snapshots need the zstandard package")
+        return zstandard.ZstdCompressor(level=9).compress(data)
+    if codec == CODEC_ZLIB:
+        return zlib.compress(data, 9)
+    raise ValueError(f"Unknown snapshot codec {codec!r}")
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstd snapshots need the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown snapshot codec {codec!r}")
+
+
+def encode(value: Any, codec: str) -> bytes:
+    return compress(dumps(value).encode("utf-8"), codec)
+
+
+def decode(data: bytes, codec: str) -> Any:
+    return json.loads(decompress(data, codec))
+
+
+def diff(old: Any, new: Any) -> Optional[List[Any]]:
+    """Structural delta turning `old` into `new`, or None if they are equal."""
+
+    if old == new and type(old) is type(new):
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = {}
+        for key, value in new.items():
+            if key not in old:
+                changed[key] = ["=", value]
+            else:
+                delta = diff(old[key], value)
+                if delta is not None:
+                    changed[key] = delta
+        removed = [key for key in old if key not in new]
+        return ["d", changed, removed]
+    if isinstance(old, list) and isinstance(new, list):
+        changed = {}
+        for index, value in enumerate(new):
+            if index >= len(old):
+                changed[str(index)] = ["=", value]
+            else:
+                delta = diff(old[index], value)
+                if delta is not None:
+                    changed[str(index)] = delta
+        return ["l", len(new), changed]
+    return ["=", new]
+
+
+def patch(delta: Optional[List[Any]], value: Any) -> Any:
+    """Apply a delta from `diff`; the input is not modified."""
+
+    if delta is None:
+        return value
+    tag = delta[0]
+    if tag == "=":
+        return delta[1]
+    if tag == "d":
+        result = dict(value)
+        for key in delta[2]:
+            result.pop(key, None)
+        for key, sub in delta[1].items():
+            result[key] = patch(sub, result.get(key))
+        return result
+    if tag == "l":
+        result = list(value[: delta[1]])
+        result.extend([None] * (delta[1] - len(result)))
+        for index, sub in delta[2].items():
+            result[int(index)] = patch(sub, result[int(index)])
+        return result
+    raise ValueError(f"Unknown snapshot delta tag {tag!r}")
+
+
+class SnapshotEncoder:
+    """Decides keyframe vs delta for a stream of states and encodes each row.
+
+    Holds only the previous state, so it is cheap to keep on the store.
+    """
+
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL, codec: Optional[str] = None) -> None:
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.codec = codec or default_codec()
+        self._previous: Any = None
+        self._since_keyframe = 0
+        self._started = False
+
+    def encode(self, state: Any) -> Tuple[bool, str, bytes]:
+        """Returns (keyframe, codec, data) for the next row."""
+
+        state = to_json(state)
+        keyframe = not self._started or self._since_keyframe + 1 >= self.keyframe_interval
+        data = None
+        if not keyframe:
+            delta_json = dumps(diff(self._previous, state))
+            if len(delta_json) <= MAX_DELTA_RATIO * len(dumps(state)):
+                data = compress(delta_json.encode("utf-8"), self.codec)
+            else:
+                keyframe = True
+        if keyframe:
+            data = encode(state, self.codec)
+            self._since_keyframe = 0
+        else:
+            self._since_keyframe += 1
+        self._previous = state
+        self._started = True
+        return keyframe, self.codec, data
+
+    def reset(self) -> None:
+        """Start the next row with a keyframe."""
+
+        self._previous = None
+        self._since_keyframe = 0
+        self._started = False
+
+
+def replay(rows: Iterable[Tuple[bool, str, bytes]]) -> Any:
+    """Rebuild a state from a keyframe row followed by its delta rows."""
+
+    state: Any = None
+    started = False
+    for keyframe, codec, data in rows:
+        decoded = decode(data, codec)
+        if keyframe:
+            state, started = decoded, True
+        elif not started:
+            raise ValueError("Snapshot delta without a preceding keyframe")
+        else:
+            state = patch(decoded, state)
+    return state
+
@@ -1,8 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 import sqlite3
+import threading
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Any, Callable, Iterable, Optional, Sequence, TypeVar
+
+from . import timeseries, world
+from .archive import CompactionPolicy, Compactor, enable_incremental_vacuum
+from .logindex import ensure_log_index, search_query
+from .notes import HASH_AT, HISTORY, NOTES_SCHEMA, NotesHistory
+from .readers import DEFAULT_READERS, ReaderPool
+from .snapshots import DEFAULT_KEYFRAME_INTERVAL, SnapshotEncoder, replay
+from .writebehind import WriteBehindWriter
+
+T = TypeVar("T")
 
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS immutable_log (
@@ -23,61 +35,390 @@ CREATE TABLE IF NOT EXISTS state_snapshot (
     ts TEXT NOT NULL,
     payload TEXT NOT NULL
 );
+
+-- Compressed JSON states: keyframes, and deltas against the previous row.
+CREATE TABLE IF NOT EXISTS state_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    keyframe INTEGER NOT NULL,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS state_history_ts ON state_history (ts);
+
+CREATE TABLE IF NOT EXISTS error_context (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    ts TEXT NOT NULL,
+    intent_summary TEXT,
+    error_message TEXT NOT NULL,
+    details TEXT NOT NULL
+);
 """
 
 
 class SQLitePersistence:
     """Minimal SQLite wrapper for logs, notes, and state snapshots."""
 
-    def __init__(self, db_path: Path) -> None:
+    def __init__(
+        self,
+        db_path: Path,
+        write_behind: bool = False,
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+        retention: timeseries.Retention = timeseries.Retention(),
+        compaction: CompactionPolicy = CompactionPolicy(),
+        readers: int = DEFAULT_READERS,
+        read_your_writes: bool = True,
+        **writer_options: Any,
+    ) -> None:
+        """`write_behind` queues writes for a background group-commit thread
+        (see `writebehind.py`); the default commits each write in place.
+
+        Reads run on a pool of `readers` read-only connections (see
+        `readers.py`) and are safe from any thread. With `read_your_writes`
+        a read first waits for queued writes; turn it off for dashboards and
+        workers that should never wait behind the writer.
+        """
         self.db_path = db_path
+        self.write_behind = write_behind
+        self._writer_options = writer_options
         self._conn: Optional[sqlite3.Connection] = None
+        self._writer: Optional[WriteBehindWriter] = None
+        self._fts = False
+        self.reader_count = readers
+        self.read_your_writes = read_your_writes
+        self._readers: Optional[ReaderPool] = None
+        # Serializes use of the writer connection (`_conn`) across threads.
+        self._write_lock = threading.RLock()
+        self.compaction = compaction
+        self._compactor: Optional[Compactor] = None
+        self._notes = NotesHistory()
+        self._snapshots = SnapshotEncoder(keyframe_interval)
+        self.retention = retention
+        self._last_prune: Optional[int] = None
 
     def connect(self) -> None:
         if self._conn is None:
-            self._conn = sqlite3.connect(self.db_path)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            enable_incremental_vacuum(self._conn)
             self._conn.execute("PRAGMA journal_mode=WAL;")
             self._conn.execute("PRAGMA foreign_keys=ON;")
             self._conn.executescript(SCHEMA)
+            self._conn.executescript(NOTES_SCHEMA)
+            self._conn.executescript(world.WORLD_SCHEMA)
+            self._conn.executescript(timeseries.TIMESERIES_SCHEMA)
             self._conn.commit()
+            self._fts = ensure_log_index(self._conn)
+            self._notes.load_head(self._conn)
+            self._readers = ReaderPool(self.db_path, self.reader_count)
+            self._compactor = Compactor(self._conn, self.db_path, self.compaction)
+            if self.write_behind:
+                self._writer = WriteBehindWriter(self.db_path, **self._writer_options)
 
-    def append_log(self, ts: str, category: str, message: str) -> None:
+    def _write(self, sql: str, params: Sequence[Any]) -> None:
         if self._conn is None:
             raise RuntimeError("Persistence not connected")
-        self._conn.execute(
+        if self._writer is not None:
+            self._writer.submit(sql, params)
+            return
+        with self._write_lock:
+            self._conn.execute(sql, params)
+            self._conn.commit()
+
+    def _write_many(self, statements: Sequence[world.Statement]) -> None:
+        """Run `statements` as one transaction (one group commit in write-behind mode)."""
+        if self._conn is None:
+            raise RuntimeError("Persistence not connected")
+        if self._writer is not None:
+            self._writer.submit_many(statements)
+            return
+        with self._write_lock, self._conn:
+            for sql, params in statements:
+                self._conn.execute(sql, params)
+
+    def flush(self) -> None:
+        """Block until queued writes are committed (no-op when synchronous)."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def read(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run `fn` on a pooled read-only connection; all its queries see one snapshot."""
+        if self._readers is None:
+            raise RuntimeError("Persistence not connected")
+        if self.read_your_writes:
+            self.flush()
+        return self._readers.run(fn)
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> list:
+        """Rows of a read-only query. Writes are rejected by the connection."""
+        return self.read(lambda conn: conn.execute(sql, params).fetchall())
+
+    async def aread(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """`read` on the default executor, for asyncio callers."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.read, fn)
+
+    async def aquery(self, sql: str, params: Sequence[Any] = ()) -> list:
+        """`query` on the default executor, for asyncio callers."""
+        return await asyncio.get_running_loop().run_in_executor(None, self.query, sql, params)
+
+    def append_log(self, ts: str, category: str, message: str) -> None:
+        self._write(
             "INSERT INTO immutable_log (ts, category, message) VALUES (?, ?, ?)",
             (ts, category, message),
         )
-        self._conn.commit()
 
     def save_strategy_notes(self, ts: str, content: str) -> None:
+        """Replace the current notes and record the save as a revision (see notes.py)."""
         if self._conn is None:
             raise RuntimeError("Persistence not connected")
-        self._conn.execute(
-            "REPLACE INTO strategy_notes (id, updated_ts, content) VALUES (1, ?, ?)",
-            (ts, content),
+        with self._write_lock:
+            self._write_many(
+                [("REPLACE INTO strategy_notes (id, updated_ts, content) VALUES (1, ?, ?)", (ts, content))]
+                + self._notes.save_statements(self._conn, ts, content)
+            )
+
+    def fetch_strategy_notes(self) -> Optional[str]:
+        """Fetch the current strategy notes content, if any."""
+        rows = self.query("SELECT content FROM strategy_notes WHERE id = 1")
+        return rows[0][0] if rows else None
+
+    def notes_history(self, limit: int = 20) -> list:
+        """Recent notes saves, newest first: (ts, hash, size, depth) rows."""
+        return self.query(HISTORY, (limit,))
+
+    def notes_revision(self, digest: str) -> Optional[str]:
+        """The notes text stored under content hash `digest`, if any."""
+        return self.read(lambda conn: self._notes.materialize(conn, digest))
+
+    def notes_at(self, ts: str) -> Optional[str]:
+        """The strategy notes as they were at `ts`, or None before the first save."""
+        def at(conn: sqlite3.Connection) -> Optional[str]:
+            row = conn.execute(HASH_AT, (ts,)).fetchone()
+            return self._notes.materialize(conn, row[0]) if row else None
+
+        return self.read(at)
+
+    def save_error_context(self, ts: str, intent_summary: str, error_message: str, details: str) -> None:
+        """Save error context for the current iteration.
+        
+        This replaces any previous error context (id=1) to keep only the most recent failure.
+        Errors are separate from the immutable log and are meant to inform the next LLM iteration.
+        """
+        self._write(
+            "REPLACE INTO error_context (id, ts, intent_summary, error_message, details) VALUES (1, ?, ?, ?, ?)",
+            (ts, intent_summary, error_message, details),
         )
-        self._conn.commit()
+
+    def fetch_error_context(self) -> Optional[tuple]:
+        """Fetch the current error context, if any.
+        
+        Returns a tuple of (ts, intent_summary, error_message, details) or None.
+        """
+        rows = self.query("SELECT ts, intent_summary, error_message, details FROM error_context WHERE id = 1")
+        return rows[0] if rows else None
+
+    def clear_error_context(self) -> None:
+        """Clear the current error context after a successful iteration."""
+        self._write("DELETE FROM error_context WHERE id = 1", ())
 
     def save_state_snapshot(self, ts: str, payload: str) -> None:
-        if self._conn is None:
-            raise RuntimeError("Persistence not connected")
-        self._conn.execute(
+        self._write(
             "INSERT INTO state_snapshot (ts, payload) VALUES (?, ?)",
             (ts, payload),
         )
-        self._conn.commit()
 
-    def fetch_logs(self, limit: int = 100) -> Iterable[tuple]:
+    def save_snapshot(self, ts: str, state: Any) -> None:
+        """Store `state` as compressed JSON: a keyframe or a delta (see snapshots.py)."""
         if self._conn is None:
             raise RuntimeError("Persistence not connected")
-        cursor = self._conn.execute(
+        # Deltas chain on the previous row, so encoding and queueing must not interleave.
+        with self._write_lock:
+            keyframe, codec, data = self._snapshots.encode(state)
+            self._write(
+                "INSERT INTO state_history (ts, keyframe, codec, data) VALUES (?, ?, ?, ?)",
+                (ts, int(keyframe), codec, data),
+            )
+
+    def snapshot_at(self, ts: Optional[str] = None) -> Optional[Any]:
+        """The state as of `ts` (the latest one when None), or None before the first.
+
+        Timestamps compare as text, so use the same ISO-8601 form as `save_snapshot`.
+        """
+        state = self.read(lambda conn: self._history_at(conn, "main", ts))
+        if state is None and ts is not None and self._compactor.archive_path.exists():
+            # The archive is attached to the writer connection only.
+            with self._write_lock:
+                self._compactor.attach()
+                state = self._history_at(self._conn, "archive", ts)
+        return state
+
+    @staticmethod
+    def _history_at(conn: sqlite3.Connection, schema: str, ts: Optional[str]) -> Optional[Any]:
+        table = f"{schema}.state_history"
+        if ts is None:
+            row = conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()
+        else:
+            row = conn.execute(
+                f"SELECT id FROM {table} WHERE ts <= ? ORDER BY ts DESC, id DESC LIMIT 1",
+                (ts,),
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        target = row[0]
+        (base,) = conn.execute(
+            f"SELECT MAX(id) FROM {table} WHERE keyframe = 1 AND id <= ?",
+            (target,),
+        ).fetchone()
+        if base is None:
+            return None
+        rows = conn.execute(
+            f"SELECT keyframe, codec, data FROM {table} WHERE id BETWEEN ? AND ? ORDER BY id",
+            (base, target),
+        ).fetchall()
+        return replay((bool(keyframe), codec, data) for keyframe, codec, data in rows)
+
+    def save_world(self, ts: str, snapshot: dict) -> None:
+        """Update the normalized world tables (see world.py) from a `refresh_state` snapshot."""
+        self._write_many(world.snapshot_statements(snapshot, ts))
+
+    def cheapest_purchase(self, trade_symbol: str, system_symbol: str, limit: int = 5) -> list:
+        """(waypoint, purchase_price, supply, trade_volume, updated_ts), cheapest first."""
+        return self.query(world.CHEAPEST_PURCHASE, (trade_symbol, system_symbol, limit))
+
+    def best_sell(self, trade_symbol: str, system_symbol: str, limit: int = 5) -> list:
+        """(waypoint, sell_price, supply, trade_volume, updated_ts), best price first."""
+        return self.query(world.BEST_SELL, (trade_symbol, system_symbol, limit))
+
+    def ships_with_status(self, status: str) -> list:
+        """(ship, system, waypoint, destination, arrival) for ships in nav `status`."""
+        return self.query(world.SHIPS_WITH_STATUS, (status,))
+
+    def waypoints_of_type(self, system_symbol: str, waypoint_type: str) -> list:
+        """(symbol, x, y, orbits) for waypoints of `waypoint_type` in a system."""
+        return self.query(world.WAYPOINTS_OF_TYPE, (system_symbol, waypoint_type))
+
+    def record_market_prices(self, ts: timeseries.Timestamp, markets: Iterable[Any]) -> None:
+        """Add price points (and rollups, see timeseries.py) for priced markets; prunes hourly."""
+        self._write_many(timeseries.observation_statements(markets, ts))
+        now = timeseries.to_epoch(ts)
+        if self._last_prune is None or now - self._last_prune >= self.retention.prune_interval_sec:
+            self.prune_market_history(now)
+
+    def prune_market_history(self, now: timeseries.Timestamp) -> None:
+        """Drop points and rollups older than their retention."""
+        self._write_many(timeseries.prune_statements(now, self.retention))
+        self._last_prune = timeseries.to_epoch(now)
+
+    def price_history(
+        self,
+        waypoint_symbol: str,
+        trade_symbol: str,
+        start: timeseries.Timestamp,
+        end: timeseries.Timestamp,
+        resolution: int = 0,
+    ) -> list:
+        """Points in [start, end): raw rows when `resolution` is 0, else 300/3600-second OHLC rows.
+
+        Raw: (ts, purchase, sell, supply, activity, trade_volume). OHLC: (bucket, purchase
+        open/high/low/close, sell open/high/low/close, samples). Times are epoch seconds.
+        """
+        start, end = timeseries.to_epoch(start), timeseries.to_epoch(end)
+        if not resolution:
+            return self.query(timeseries.RAW_RANGE, (waypoint_symbol, trade_symbol, start, end))
+        if resolution not in timeseries.RESOLUTIONS:
+            raise ValueError(f"resolution must be 0 or one of {timeseries.RESOLUTIONS}")
+        return self.query(
+            timeseries.ROLLUP_RANGE,
+            (resolution, waypoint_symbol, trade_symbol, start - start % resolution, end),
+        )
+
+    def latest_price(self, waypoint_symbol: str, trade_symbol: str) -> Optional[tuple]:
+        """(ts, purchase, sell, supply, activity, trade_volume) of the newest point, or None."""
+        rows = self.query(timeseries.LATEST_PRICE, (waypoint_symbol, trade_symbol))
+        return rows[0] if rows else None
+
+    def latest_prices(self, trade_symbol: str, since: timeseries.Timestamp = 0) -> list:
+        """Newest point per market for a good, cheapest purchase first:
+        (waypoint, ts, purchase, sell, supply, activity, trade_volume)."""
+        return self.query(timeseries.LATEST_PRICES, (trade_symbol, timeseries.to_epoch(since)))
+
+    def fetch_logs(self, limit: int = 100) -> Iterable[tuple]:
+        return self.query(
             "SELECT ts, category, message FROM immutable_log ORDER BY id DESC LIMIT ?",
             (limit,),
         )
-        return cursor.fetchall()
+
+    def search_logs(
+        self,
+        text: Optional[str] = None,
+        category: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 20,
+    ) -> list:
+        """Filtered log retrieval, newest first: (ts, category, message) rows.
+
+        `text` is matched as a phrase through the FTS5 index (see logindex.py),
+        e.g. search_logs("navigate_ship", category="tool_error").
+        """
+        return self.query(*search_query(self._fts, text, category, since, until, limit))
+
+    def compact(self) -> dict:
+        """Move aged log/snapshot rows into the archive database now (see archive.py)."""
+        if self._conn is None:
+            raise RuntimeError("Persistence not connected")
+        self.flush()
+        with self._write_lock:
+            return self._compactor.compact()
+
+    def convert_vacuum(self) -> bool:
+        """Run the one-off full VACUUM that enables incremental vacuum on an older database.
+
+        Blocks for as long as rewriting the file takes; meant for maintenance
+        (tools/vacuum_db.py), not the loop. Returns False if already converted.
+        """
+        if self._conn is None:
+            raise RuntimeError("Persistence not connected")
+        self.flush()
+        with self._write_lock:
+            return self._compactor.convert_vacuum()
+
+    def maybe_compact(self) -> Optional[dict]:
+        """Compact if the policy interval has passed since the last run; cheap to call every iteration."""
+        if self._conn is None:
+            raise RuntimeError("Persistence not connected")
+        if self._compactor.due():
+            return self.compact()
+        return None
+
+    def archived_logs(
+        self,
+        since: str,
+        until: str,
+        category: Optional[str] = None,
+        text: Optional[str] = None,
+        limit: int = 100,
+    ) -> list:
+        """(ts, category, message) rows from the archive in [since, until), newest first.
+
+        `text` is a case-insensitive substring here, not an FTS5 phrase as in
+        `search_logs` (see Compactor.archived_logs).
+        """
+        if self._conn is None:
+            raise RuntimeError("Persistence not connected")
+        with self._write_lock:
+            return self._compactor.archived_logs(since, until, category, text, limit)
 
     def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._snapshots.reset()
+        self._last_prune = None
+        self._compactor = None
+        if self._readers is not None:
+            self._readers.close()
+            self._readers = None
         if self._conn:
             self._conn.close()
             self._conn = None
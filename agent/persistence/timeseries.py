@@ -0,0 +1,198 @@
+"""Market price time series with 5-minute and hourly OHLC rollups.
+
+Each `MarketTradeGood` seen in a market response becomes one raw point:
+purchase/sell price, supply, activity and trade volume for a (market,
+symbol) at a time. The same write also updates the open/high/low/close
+rows of the point's 5-minute and hourly buckets, so the rollups are always
+current and never need a batch job. A second observation in the same second
+is dropped, from the raw table and the rollups alike, so `samples` and the
+high/low always describe the stored points.
+
+Raw points are kept for `Retention.raw_sec`, 5-minute buckets for
+`Retention.five_min_sec`, and hourly buckets for `Retention.hourly_sec`.
+Times are stored as integer epoch seconds, and every query is a range scan
+on a primary key or index:
+
+    raw:     (waypoint_symbol, trade_symbol, ts)   and (trade_symbol, ts)
+    rollups: (resolution, waypoint_symbol, trade_symbol, bucket)
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterable, Iterator, List, Union
+
+from ..spacetraders_client import models
+from .world import _attr, _view
+from .writebehind import Statement
+
+FIVE_MINUTES = 300
+HOURLY = 3600
+RESOLUTIONS = (FIVE_MINUTES, HOURLY)
+
+Timestamp = Union[str, datetime, int, float]
+
+TIMESERIES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS market_prices (
+    waypoint_symbol TEXT NOT NULL,
+    trade_symbol TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    purchase_price INTEGER NOT NULL,
+    sell_price INTEGER NOT NULL,
+    supply TEXT,
+    activity TEXT,
+    trade_volume INTEGER,
+    PRIMARY KEY (waypoint_symbol, trade_symbol, ts)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS market_prices_symbol_ts ON market_prices (trade_symbol, ts);
+
+CREATE TABLE IF NOT EXISTS market_price_rollups (
+    resolution INTEGER NOT NULL,
+    waypoint_symbol TEXT NOT NULL,
+    trade_symbol TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    first_ts INTEGER NOT NULL,
+    last_ts INTEGER NOT NULL,
+    purchase_open INTEGER NOT NULL,
+    purchase_high INTEGER NOT NULL,
+    purchase_low INTEGER NOT NULL,
+    purchase_close INTEGER NOT NULL,
+    sell_open INTEGER NOT NULL,
+    sell_high INTEGER NOT NULL,
+    sell_low INTEGER NOT NULL,
+    sell_close INTEGER NOT NULL,
+    samples INTEGER NOT NULL,
+    PRIMARY KEY (resolution, waypoint_symbol, trade_symbol, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS market_price_rollups_bucket ON market_price_rollups (resolution, bucket);
+"""
+
+INSERT_POINT = (
+    "INSERT OR IGNORE INTO market_prices (waypoint_symbol, trade_symbol, ts, purchase_price, sell_price,"
+    " supply, activity, trade_volume) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# In an upsert's SET clause, bare column names are the old row's values. It
+# runs before INSERT_POINT and does nothing if that point is already stored.
+UPSERT_ROLLUP = """
+INSERT INTO market_price_rollups (resolution, waypoint_symbol, trade_symbol, bucket, first_ts, last_ts,
+    purchase_open, purchase_high, purchase_low, purchase_close,
+    sell_open, sell_high, sell_low, sell_close, samples)
+SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1
+WHERE NOT EXISTS (SELECT 1 FROM market_prices WHERE waypoint_symbol = ? AND trade_symbol = ? AND ts = ?)
+ON CONFLICT (resolution, waypoint_symbol, trade_symbol, bucket) DO UPDATE SET
+    purchase_open = CASE WHEN excluded.first_ts < first_ts THEN excluded.purchase_open ELSE purchase_open END,
+    sell_open = CASE WHEN excluded.first_ts < first_ts THEN excluded.sell_open ELSE sell_open END,
+    purchase_close = CASE WHEN excluded.last_ts >= last_ts THEN excluded.purchase_close ELSE purchase_close END,
+    sell_close = CASE WHEN excluded.last_ts >= last_ts THEN excluded.sell_close ELSE sell_close END,
+    purchase_high = MAX(purchase_high, excluded.purchase_high),
+    purchase_low = MIN(purchase_low, excluded.purchase_low),
+    sell_high = MAX(sell_high, excluded.sell_high),
+    sell_low = MIN(sell_low, excluded.sell_low),
+    first_ts = MIN(first_ts, excluded.first_ts),
+    last_ts = MAX(last_ts, excluded.last_ts),
+    samples = samples + 1
+"""
+
+RAW_RANGE = """
+SELECT ts, purchase_price, sell_price, supply, activity, trade_volume
+FROM market_prices
+WHERE waypoint_symbol = ? AND trade_symbol = ? AND ts >= ? AND ts < ?
+ORDER BY ts
+"""
+
+ROLLUP_RANGE = """
+SELECT bucket, purchase_open, purchase_high, purchase_low, purchase_close,
+       sell_open, sell_high, sell_low, sell_close, samples
+FROM market_price_rollups
+WHERE resolution = ? AND waypoint_symbol = ? AND trade_symbol = ? AND bucket >= ? AND bucket < ?
+ORDER BY bucket
+"""
+
+LATEST_PRICE = """
+SELECT ts, purchase_price, sell_price, supply, activity, trade_volume
+FROM market_prices
+WHERE waypoint_symbol = ? AND trade_symbol = ?
+ORDER BY ts DESC
+LIMIT 1
+"""
+
+# SQLite returns the other columns from the row holding MAX(ts).
+LATEST_PRICES = """
+SELECT waypoint_symbol, MAX(ts), purchase_price, sell_price, supply, activity, trade_volume
+FROM market_prices
+WHERE trade_symbol = ? AND ts >= ?
+GROUP BY waypoint_symbol
+ORDER BY purchase_price
+"""
+
+
+@dataclass(frozen=True)
+class Retention:
+    """How long each resolution is kept, in seconds."""
+
+    raw_sec: int = 2 * 86400
+    five_min_sec: int = 30 * 86400
+    hourly_sec: int = 365 * 86400
+    # Pruning runs from the write path at most this often.
+    prune_interval_sec: int = 3600
+
+
+def to_epoch(ts: Timestamp) -> int:
+    """Epoch seconds from an ISO-8601 string, a datetime, or a number."""
+
+    if isinstance(ts, (int, float)):
+        return int(ts)
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp())
+
+
+def price_points(markets: Iterable[Any], ts: Timestamp) -> Iterator[tuple]:
+    """`market_prices` rows for every priced trade good in `markets`.
+
+    Markets seen without a ship present have no `tradeGoods` and add nothing.
+    """
+
+    epoch = to_epoch(ts)
+    for raw in markets:
+        market = _view(models.Market, raw)
+        if market is None:
+            continue
+        for good in market.trade_goods or []:
+            purchase = _attr(good, "purchase_price")
+            sell = _attr(good, "sell_price")
+            if purchase is None or sell is None:
+                continue
+            yield (market.symbol, _attr(good, "symbol"), epoch, purchase, sell,
+                   _attr(good, "supply"), _attr(good, "activity"), _attr(good, "trade_volume"))
+
+
+def observation_statements(markets: Iterable[Any], ts: Timestamp) -> List[Statement]:
+    """Raw points plus rollup upserts for every priced trade good in `markets`."""
+
+    statements: List[Statement] = []
+    for point in price_points(markets, ts):
+        waypoint, symbol, epoch, purchase, sell = point[:5]
+        for resolution in RESOLUTIONS:
+            statements.append((
+                UPSERT_ROLLUP,
+                (resolution, waypoint, symbol, epoch - epoch % resolution, epoch, epoch,
+                 purchase, purchase, purchase, purchase, sell, sell, sell, sell, waypoint, symbol, epoch),
+            ))
+        statements.append((INSERT_POINT, point))
+    return statements
+
+
+def prune_statements(now: Timestamp, retention: Retention) -> List[Statement]:
+    epoch = to_epoch(now)
+    return [
+        ("DELETE FROM market_prices WHERE ts < ?", (epoch - retention.raw_sec,)),
+        (
+            "DELETE FROM market_price_rollups WHERE resolution = ? AND bucket < ?",
+            (FIVE_MINUTES, epoch - retention.five_min_sec),
+        ),
+        ("DELETE FROM market_price_rollups WHERE resolution = ? AND bucket < ?", (HOURLY, epoch - retention.hourly_sec)),
+    ]
@@ -0,0 +1,444 @@
+"""Normalized world-state tables: ships, waypoints, markets, contracts, surveys.
+
+`immutable_log` and the snapshot history hold free text and opaque blobs.
+The tables here hold the latest known state of each object, one row per
+ship, waypoint, trade good and so on, indexed so planners can ask questions
+like "cheapest FUEL in this system" with one query instead of scanning JSON.
+
+Rows are built from the generated models. Plain API dicts are read through
+`fastmodels.lazy_view`, so they are not validated and only the fields stored
+here are converted. Each `*_statements` function returns the statements that
+replace the stored state of the objects it is given. `SQLitePersistence.save_world`
+submits them as a single transaction.
+"""
+from __future__ import annotations
+
+import enum
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+from ..cache import system_of
+from ..fastmodels import lazy_view
+from ..spacetraders_client import models  # also puts the generated client on sys.path
+from .writebehind import Statement
+
+
+WORLD_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ships (
+    symbol TEXT PRIMARY KEY,
+    role TEXT,
+    faction_symbol TEXT,
+    frame TEXT,
+    cargo_capacity INTEGER,
+    cargo_units INTEGER,
+    fuel_current INTEGER,
+    fuel_capacity INTEGER,
+    updated_ts TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS ship_nav (
+    ship_symbol TEXT PRIMARY KEY,
+    system_symbol TEXT NOT NULL,
+    waypoint_symbol TEXT NOT NULL,
+    status TEXT NOT NULL,
+    flight_mode TEXT,
+    destination_symbol TEXT,
+    arrival TEXT,
+    updated_ts TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ship_nav_ship_status ON ship_nav (ship_symbol, status);
+CREATE INDEX IF NOT EXISTS ship_nav_status ON ship_nav (status, system_symbol);
+CREATE INDEX IF NOT EXISTS ship_nav_location ON ship_nav (system_symbol, waypoint_symbol);
+
+CREATE TABLE IF NOT EXISTS cargo_items (
+    ship_symbol TEXT NOT NULL,
+    trade_symbol TEXT NOT NULL,
+    name TEXT,
+    units INTEGER NOT NULL,
+    PRIMARY KEY (ship_symbol, trade_symbol)
+);
+CREATE INDEX IF NOT EXISTS cargo_items_trade_symbol ON cargo_items (trade_symbol);
+
+CREATE TABLE IF NOT EXISTS waypoints (
+    symbol TEXT PRIMARY KEY,
+    system_symbol TEXT NOT NULL,
+    type TEXT NOT NULL,
+    x INTEGER,
+    y INTEGER,
+    orbits TEXT,
+    faction_symbol TEXT,
+    updated_ts TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS waypoints_system_type ON waypoints (system_symbol, type);
+
+CREATE TABLE IF NOT EXISTS waypoint_traits (
+    waypoint_symbol TEXT NOT NULL,
+    trait TEXT NOT NULL,
+    PRIMARY KEY (waypoint_symbol, trait)
+);
+CREATE INDEX IF NOT EXISTS waypoint_traits_trait ON waypoint_traits (trait, waypoint_symbol);
+
+CREATE TABLE IF NOT EXISTS markets (
+    waypoint_symbol TEXT PRIMARY KEY,
+    system_symbol TEXT NOT NULL,
+    updated_ts TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS markets_system ON markets (system_symbol);
+
+-- Prices are NULL until a ship has been at the market (listing only).
+CREATE TABLE IF NOT EXISTS market_trade_goods (
+    waypoint_symbol TEXT NOT NULL,
+    trade_symbol TEXT NOT NULL,
+    system_symbol TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    trade_volume INTEGER,
+    supply TEXT,
+    activity TEXT,
+    purchase_price INTEGER,
+    sell_price INTEGER,
+    updated_ts TEXT NOT NULL,
+    PRIMARY KEY (waypoint_symbol, trade_symbol)
+);
+CREATE INDEX IF NOT EXISTS market_goods_purchase ON market_trade_goods (trade_symbol, system_symbol, purchase_price);
+CREATE INDEX IF NOT EXISTS market_goods_sell ON market_trade_goods (trade_symbol, system_symbol, sell_price);
+
+CREATE TABLE IF NOT EXISTS contracts (
+    id TEXT PRIMARY KEY,
+    faction_symbol TEXT,
+    type TEXT,
+    accepted INTEGER NOT NULL,
+    fulfilled INTEGER NOT NULL,
+    deadline TEXT,
+    deadline_to_accept TEXT,
+    payment_on_accepted INTEGER,
+    payment_on_fulfilled INTEGER,
+    updated_ts TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS contracts_open ON contracts (fulfilled, accepted);
+
+CREATE TABLE IF NOT EXISTS contract_deliveries (
+    contract_id TEXT NOT NULL,
+    trade_symbol TEXT NOT NULL,
+    destination_symbol TEXT NOT NULL,
+    units_required INTEGER NOT NULL,
+    units_fulfilled INTEGER NOT NULL,
+    PRIMARY KEY (contract_id, trade_symbol, destination_symbol)
+);
+CREATE INDEX IF NOT EXISTS contract_deliveries_trade_symbol ON contract_deliveries (trade_symbol);
+
+CREATE TABLE IF NOT EXISTS surveys (
+    signature TEXT PRIMARY KEY,
+    waypoint_symbol TEXT NOT NULL,
+    size TEXT,
+    expiration TEXT,
+    updated_ts TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS surveys_waypoint ON surveys (waypoint_symbol, expiration);
+
+CREATE TABLE IF NOT EXISTS survey_deposits (
+    signature TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    trade_symbol TEXT NOT NULL,
+    PRIMARY KEY (signature, position)
+);
+CREATE INDEX IF NOT EXISTS survey_deposits_trade_symbol ON survey_deposits (trade_symbol);
+"""
+
+
+def _view(cls: type, value: Any) -> Any:
+    """A generated model (as given) or a lazy view of an API dict."""
+
+    if value is None or isinstance(value, BaseModel):
+        return value
+    return lazy_view(cls, value)
+
+
+def _scalar(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _attr(obj: Any, *path: str) -> Any:
+    for name in path:
+        if obj is None:
+            return None
+        try:
+            obj = getattr(obj, name, None)
+        except ValueError:
+            # An enum value newer than the generated client: store it as sent.
+            field = obj._cls.model_fields[name]
+            obj = obj.to_dict().get(field.alias or name)
+    return _scalar(obj)
+
+
+def nav_row(ship_symbol: str, nav: Any, ts: str) -> tuple:
+    """A `ship_nav` row."""
+
+    return (
+        ship_symbol,
+        _attr(nav, "system_symbol"),
+        _attr(nav, "waypoint_symbol"),
+        _attr(nav, "status"),
+        _attr(nav, "flight_mode"),
+        _attr(nav, "route", "destination", "symbol"),
+        _attr(nav, "route", "arrival"),
+        ts,
+    )
+
+
+def waypoint_row(waypoint: Any, ts: str) -> tuple:
+    """A `waypoints` row."""
+
+    return (
+        waypoint.symbol,
+        _attr(waypoint, "system_symbol") or system_of(waypoint.symbol),
+        _attr(waypoint, "type"),
+        _attr(waypoint, "x"),
+        _attr(waypoint, "y"),
+        _attr(waypoint, "orbits"),
+        _attr(waypoint, "faction", "symbol"),
+        ts,
+    )
+
+
+def trade_good_rows(market: Any, ts: str) -> Dict[str, tuple]:
+    """`market_trade_goods` rows by trade symbol.
+
+    Listings come from exports/imports/exchange; prices from trade_goods when present.
+    """
+
+    symbol = market.symbol
+    system = system_of(symbol)
+    rows = {}
+    for kind, goods in (("EXPORT", market.exports), ("IMPORT", market.imports), ("EXCHANGE", market.exchange)):
+        for good in goods or []:
+            trade_symbol = _attr(good, "symbol")
+            rows[trade_symbol] = (symbol, trade_symbol, system, kind, None, None, None, None, None, ts)
+    for good in market.trade_goods or []:
+        trade_symbol = _attr(good, "symbol")
+        rows[trade_symbol] = (
+            symbol,
+            trade_symbol,
+            system,
+            _attr(good, "type"),
+            _attr(good, "trade_volume"),
+            _attr(good, "supply"),
+            _attr(good, "activity"),
+            _attr(good, "purchase_price"),
+            _attr(good, "sell_price"),
+            ts,
+        )
+    return rows
+
+
+def ship_statements(ships: Iterable[Any], ts: str) -> List[Statement]:
+    statements: List[Statement] = []
+    for raw in ships:
+        ship = _view(models.Ship, raw)
+        symbol = ship.symbol
+        statements.append((
+            "REPLACE INTO ships (symbol, role, faction_symbol, frame, cargo_capacity, cargo_units,"
+            " fuel_current, fuel_capacity, updated_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                symbol,
+                _attr(ship, "registration", "role"),
+                _attr(ship, "registration", "faction_symbol"),
+                _attr(ship, "frame", "symbol"),
+                _attr(ship, "cargo", "capacity"),
+                _attr(ship, "cargo", "units"),
+                _attr(ship, "fuel", "current"),
+                _attr(ship, "fuel", "capacity"),
+                ts,
+            ),
+        ))
+        if ship.nav is not None:
+            statements.append((
+                "REPLACE INTO ship_nav (ship_symbol, system_symbol, waypoint_symbol, status, flight_mode,"
+                " destination_symbol, arrival, updated_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                nav_row(symbol, ship.nav, ts),
+            ))
+        statements.append(("DELETE FROM cargo_items WHERE ship_symbol = ?", (symbol,)))
+        for item in _attr(ship, "cargo", "inventory") or []:
+            statements.append((
+                "INSERT INTO cargo_items (ship_symbol, trade_symbol, name, units) VALUES (?, ?, ?, ?)",
+                (symbol, _attr(item, "symbol"), _attr(item, "name"), _attr(item, "units")),
+            ))
+    return statements
+
+
+def waypoint_statements(waypoints: Iterable[Any], ts: str) -> List[Statement]:
+    statements: List[Statement] = []
+    for raw in waypoints:
+        waypoint = _view(models.Waypoint, raw)
+        symbol = waypoint.symbol
+        statements.append((
+            "REPLACE INTO waypoints (symbol, system_symbol, type, x, y, orbits, faction_symbol, updated_ts)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            waypoint_row(waypoint, ts),
+        ))
+        statements.append(("DELETE FROM waypoint_traits WHERE waypoint_symbol = ?", (symbol,)))
+        for trait in waypoint.traits or []:
+            statements.append((
+                "INSERT OR IGNORE INTO waypoint_traits (waypoint_symbol, trait) VALUES (?, ?)",
+                (symbol, _attr(trait, "symbol")),
+            ))
+    return statements
+
+
+def market_statements(markets: Iterable[Any], ts: str) -> List[Statement]:
+    statements: List[Statement] = []
+    for raw in markets:
+        market = _view(models.Market, raw)
+        symbol = market.symbol
+        statements.append((
+            "REPLACE INTO markets (waypoint_symbol, system_symbol, updated_ts) VALUES (?, ?, ?)",
+            (symbol, system_of(symbol), ts),
+        ))
+        rows = trade_good_rows(market, ts)
+        if market.trade_goods is None:
+            # Listing only: keep the last prices seen for goods still listed.
+            statements.append((
+                "DELETE FROM market_trade_goods WHERE waypoint_symbol = ? AND trade_symbol NOT IN"
+                " (SELECT value FROM json_each(?))",
+                (symbol, _json_list(rows)),
+            ))
+            insert = (
+                "INSERT INTO market_trade_goods (waypoint_symbol, trade_symbol, system_symbol, kind, trade_volume,"
+                " supply, activity, purchase_price, sell_price, updated_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (waypoint_symbol, trade_symbol) DO UPDATE SET kind = excluded.kind"
+            )
+        else:
+            statements.append(("DELETE FROM market_trade_goods WHERE waypoint_symbol = ?", (symbol,)))
+            insert = (
+                "INSERT INTO market_trade_goods (waypoint_symbol, trade_symbol, system_symbol, kind, trade_volume,"
+                " supply, activity, purchase_price, sell_price, updated_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+            )
+        statements.extend((insert, row) for row in rows.values())
+    return statements
+
+
+def contract_statements(contracts: Iterable[Any], ts: str) -> List[Statement]:
+    statements: List[Statement] = []
+    for raw in contracts:
+        contract = _view(models.Contract, raw)
+        statements.append((
+            "REPLACE INTO contracts (id, faction_symbol, type, accepted, fulfilled, deadline, deadline_to_accept,"
+            " payment_on_accepted, payment_on_fulfilled, updated_ts) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                contract.id,
+                _attr(contract, "faction_symbol"),
+                _attr(contract, "type"),
+                int(bool(contract.accepted)),
+                int(bool(contract.fulfilled)),
+                _attr(contract, "terms", "deadline"),
+                _attr(contract, "deadline_to_accept"),
+                _attr(contract, "terms", "payment", "on_accepted"),
+                _attr(contract, "terms", "payment", "on_fulfilled"),
+                ts,
+            ),
+        ))
+        statements.append(("DELETE FROM contract_deliveries WHERE contract_id = ?", (contract.id,)))
+        for good in _attr(contract, "terms", "deliver") or []:
+            statements.append((
+                "INSERT OR REPLACE INTO contract_deliveries (contract_id, trade_symbol, destination_symbol,"
+                " units_required, units_fulfilled) VALUES (?, ?, ?, ?, ?)",
+                (
+                    contract.id,
+                    _attr(good, "trade_symbol"),
+                    _attr(good, "destination_symbol"),
+                    _attr(good, "units_required"),
+                    _attr(good, "units_fulfilled"),
+                ),
+            ))
+    return statements
+
+
+def survey_statements(surveys: Iterable[Any], ts: str) -> List[Statement]:
+    statements: List[Statement] = []
+    for raw in surveys:
+        survey = _view(models.Survey, raw)
+        statements.append((
+            "REPLACE INTO surveys (signature, waypoint_symbol, size, expiration, updated_ts) VALUES (?, ?, ?, ?, ?)",
+            (survey.signature, survey.symbol, _attr(survey, "size"), _attr(survey, "expiration"), ts),
+        ))
+        statements.append(("DELETE FROM survey_deposits WHERE signature = ?", (survey.signature,)))
+        for position, deposit in enumerate(survey.deposits or []):
+            statements.append((
+                "INSERT INTO survey_deposits (signature, position, trade_symbol) VALUES (?, ?, ?)",
+                (survey.signature, position, _attr(deposit, "symbol")),
+            ))
+    return statements
+
+
+def snapshot_statements(snapshot: dict, ts: str) -> List[Statement]:
+    """Statements for everything in a `refresh_state` snapshot.
+
+    Ships and contracts are full listings, so rows for ships and contracts
+    missing from them are removed. Waypoints and markets are partial views of
+    the universe and are only upserted.
+    """
+
+    statements: List[Statement] = []
+    ships = snapshot.get("ships")
+    if ships is not None:
+        symbols = _json_list(_symbol(ship, "symbol") for ship in ships)
+        for table, column in (("ships", "symbol"), ("ship_nav", "ship_symbol"), ("cargo_items", "ship_symbol")):
+            statements.append((f"DELETE FROM {table} WHERE {column} NOT IN (SELECT value FROM json_each(?))", (symbols,)))
+        statements.extend(ship_statements(ships, ts))
+    contracts = snapshot.get("contracts")
+    if contracts is not None:
+        ids = _json_list(_symbol(contract, "id") for contract in contracts)
+        for table, column in (("contracts", "id"), ("contract_deliveries", "contract_id")):
+            statements.append((f"DELETE FROM {table} WHERE {column} NOT IN (SELECT value FROM json_each(?))", (ids,)))
+        statements.extend(contract_statements(contracts, ts))
+    statements.extend(waypoint_statements((w for w in (snapshot.get("waypoints") or {}).values() if w), ts))
+    statements.extend(market_statements((m for m in (snapshot.get("markets") or {}).values() if m), ts))
+    statements.extend(survey_statements(snapshot.get("surveys") or [], ts))
+    return statements
+
+
+def _symbol(value: Any, name: str) -> Optional[str]:
+    return value.get(name) if isinstance(value, dict) else getattr(value, name, None)
+
+
+def _json_list(values: Iterable[Any]) -> str:
+    return json.dumps([value for value in values if value is not None])
+
+
+# -- queries -------------------------------------------------------------------
+
+CHEAPEST_PURCHASE = """
+SELECT waypoint_symbol, purchase_price, supply, trade_volume, updated_ts
+FROM market_trade_goods
+WHERE trade_symbol = ? AND system_symbol = ? AND purchase_price IS NOT NULL
+ORDER BY purchase_price
+LIMIT ?
+"""
+
+BEST_SELL = """
+SELECT waypoint_symbol, sell_price, supply, trade_volume, updated_ts
+FROM market_trade_goods
+WHERE trade_symbol = ? AND system_symbol = ? AND sell_price IS NOT NULL
+ORDER BY sell_price DESC
+LIMIT ?
+"""
+
+SHIPS_WITH_STATUS = """
+SELECT ship_symbol, system_symbol, waypoint_symbol, destination_symbol, arrival
+FROM ship_nav
+WHERE status = ?
+ORDER BY ship_symbol
+"""
+
+WAYPOINTS_OF_TYPE = """
+SELECT symbol, x, y, orbits
+FROM waypoints
+WHERE system_symbol = ? AND type = ?
+ORDER BY symbol
+"""
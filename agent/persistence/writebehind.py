@@ -0,0 +1,276 @@
+"""Write-behind queue with group commit for SQLite persistence.
+
+Committing after every log line costs an fsync per line, which shows up in
+loop latency as soon as several ship workers log concurrently. In
+write-behind mode, writes are put on a bounded queue and return at once. A
+single writer thread, with its own connection, drains the queue. Runs of the
+same statement go through one `executemany`, and the batch is committed when
+it reaches `batch_size` statements or has been open for `max_delay_sec`.
+
+`flush()` blocks until everything queued so far is committed, so a reader
+that needs its own writes can flush first. `close()` drains the queue and
+commits before it returns. It is also registered with `atexit`, so an
+interrupted loop does not lose its last writes. A full queue blocks the
+producer instead of dropping writes.
+
+If a commit fails outright (disk full, I/O error), the writer thread logs the
+error and stops. Later `submit`, `submit_many` and `flush` calls re-raise it
+instead of queueing writes that nothing will commit.
+
+The loops enable write-behind; it can be turned off with
+AGENT_WRITE_BEHIND=false. Tests and other direct users get synchronous
+commits unless they ask for it.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+log = logging.getLogger("agent.persistence")
+
+ENV_WRITE_BEHIND = "AGENT_WRITE_BEHIND"
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_MAX_DELAY_SEC = 0.05
+DEFAULT_QUEUE_SIZE = 10_000
+
+Statement = Tuple[str, Sequence[Any]]
+
+
+def write_behind_enabled(default: bool = True) -> bool:
+    value = os.getenv(ENV_WRITE_BEHIND)
+    if value is None or value == "":
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+class _Flush:
+    __slots__ = ("done",)
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class WriteBehindWriter:
+    """Background writer thread that batches statements into group commits."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_delay_sec: float = DEFAULT_MAX_DELAY_SEC,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.max_delay_sec = max_delay_sec
+        self._clock = clock
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._ready = threading.Event()
+        self._start_error: Optional[BaseException] = None
+        self._error: Optional[BaseException] = None
+        self.commits = 0
+        self.statements = 0
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name="sqlite-write-behind", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._start_error is not None:
+            raise self._start_error
+        # The thread is a daemon; make sure an interrupted loop still commits.
+        atexit.register(self.close)
+
+    def submit(self, sql: str, params: Sequence[Any] = ()) -> None:
+        if self._closed:
+            raise RuntimeError("Persistence not connected")
+        self._put((sql, tuple(params)))
+
+    def submit_many(self, statements: Sequence[Statement]) -> None:
+        """Queue statements that are committed together or not at all (never split across batches)."""
+
+        if self._closed:
+            raise RuntimeError("Persistence not connected")
+        if statements:
+            self._put([(sql, tuple(params)) for sql, params in statements])
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every statement submitted so far is committed."""
+
+        self._raise_failure()
+        if self._closed or not self._thread.is_alive():
+            return True
+        marker = _Flush()
+        self._put(marker)
+        done = marker.done.wait(timeout)
+        self._raise_failure()
+        return done
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "statements": self.statements,
+            "commits": self.commits,
+            "errors": self.errors,
+            "failed": self._error is not None,
+        }
+
+    def _put(self, item: Any) -> None:
+        # A failed writer drains the queue once, which also unblocks a put on
+        # a full queue; anything queued after that drain is caught by the
+        # second check instead of waiting forever.
+        self._raise_failure()
+        self._queue.put(item)
+        self._raise_failure()
+
+    def _raise_failure(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    # -- writer thread ---------------------------------------------------------
+
+    def _run(self) -> None:
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL;")
+        except BaseException as exc:  # surfaced to the constructor
+            self._start_error = exc
+            self._ready.set()
+            return
+        self._ready.set()
+
+        # Queued writes, one list per submit/submit_many call; a group is
+        # committed or dropped as a whole.
+        pending: List[List[Statement]] = []
+        size = 0
+        waiters: List[_Flush] = []
+        opened = 0.0
+        stopping = False
+        try:
+            while not stopping:
+                timeout = None
+                if pending:
+                    timeout = max(0.0, opened + self.max_delay_sec - self._clock())
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, _Flush):
+                    waiters.append(item)
+                elif item is not None:
+                    if not pending:
+                        opened = self._clock()
+                    size += _add(pending, item)
+                    # Take whatever else is already queued without waiting.
+                    while size < self.batch_size:
+                        try:
+                            item = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if item is _STOP:
+                            stopping = True
+                            break
+                        if isinstance(item, _Flush):
+                            waiters.append(item)
+                            break
+                        size += _add(pending, item)
+
+                due = pending and (
+                    stopping
+                    or waiters
+                    or size >= self.batch_size
+                    or self._clock() - opened >= self.max_delay_sec
+                )
+                if due:
+                    self._commit(conn, pending)
+                    pending, size = [], 0
+                if waiters and not pending:
+                    for waiter in waiters:
+                        waiter.done.set()
+                    waiters = []
+            if pending:
+                self._commit(conn, pending)
+        except BaseException as exc:
+            self._error = exc
+            log.error("Write-behind writer stopped; %d queued statements were not committed: %s", size, exc)
+        finally:
+            # Wake flushes and blocked producers; they check `_error` next.
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, _Flush):
+                    waiters.append(item)
+            for waiter in waiters:
+                waiter.done.set()
+            conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, groups: List[List[Statement]]) -> None:
+        batch = [statement for group in groups for statement in group]
+        try:
+            for sql, rows in _group(batch):
+                conn.executemany(sql, rows)
+            conn.commit()
+        except sqlite3.Error:
+            # One bad row must not take the rest of the batch with it, nor be
+            # split from its own group: replay each group under a savepoint,
+            # as synchronous mode's `with conn` would have committed it.
+            conn.rollback()
+            conn.execute("BEGIN")
+            for group in groups:
+                conn.execute("SAVEPOINT write_group")
+                try:
+                    for sql, params in group:
+                        conn.execute(sql, params)
+                except sqlite3.Error as exc:
+                    conn.execute("ROLLBACK TO write_group")
+                    self.errors += 1
+                    log.error(
+                        "Write-behind group of %d dropped: %s (%s)", len(group), exc, sql.split("(")[0].strip()
+                    )
+                conn.execute("RELEASE write_group")
+            conn.commit()
+        self.commits += 1
+        self.statements += len(batch)
+
+
+def _add(pending: List[List[Statement]], item: Any) -> int:
+    group = item if isinstance(item, list) else [item]  # a list comes from submit_many
+    pending.append(group)
+    return len(group)
+
+
+def _group(batch: List[Statement]) -> List[Tuple[str, List[Sequence[Any]]]]:
+    """Consecutive runs of the same SQL, in submission order."""
+
+    groups: List[Tuple[str, List[Sequence[Any]]]] = []
+    for sql, params in batch:
+        if groups and groups[-1][0] == sql:
+            groups[-1][1].append(params)
+        else:
+            groups.append((sql, [params]))
+    return groups
@@ -0,0 +1,254 @@
+"""Client-side rate limiting for SpaceTraders API calls.
+
+SpaceTraders allows a steady 2 requests/second per account plus a burst pool
+of 30 requests that refills over 60 seconds. Exceeding both yields a 429, so
+we model the same two buckets locally and make callers wait *before* sending.
+
+Waiters are queued in priority lanes: ship actions (POST/PATCH) always go
+ahead of background reads, so a state refresh never delays a navigate.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from enum import Enum
+from itertools import count
+from typing import Any, Callable, Deque, Dict, Optional
+
+DEFAULT_RATE_PER_SEC = 2.0
+DEFAULT_BURST_CAPACITY = 30
+DEFAULT_BURST_WINDOW_SEC = 60.0
+
+# Bounds on how long a blocked waiter sleeps before re-checking.
+_MIN_WAIT_SEC = 0.005
+_MAX_WAIT_SEC = 1.0
+
+
+class Lane(str, Enum):
+    """Priority lanes, highest priority first."""
+
+    SHIP_ACTION = "ship_action"
+    BACKGROUND = "background"
+
+
+_LANE_ORDER = (Lane.SHIP_ACTION, Lane.BACKGROUND)
+
+
+def lane_for_method(method: str) -> Lane:
+    """Reads go to the background lane; anything that mutates is a ship action."""
+
+    return Lane.BACKGROUND if method.upper() in ("GET", "HEAD", "OPTIONS") else Lane.SHIP_ACTION
+
+
+@dataclass
+class _TokenBucket:
+    capacity: float
+    refill_per_sec: float
+    tokens: float
+    updated: float
+
+    def refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_sec)
+        self.updated = now
+
+    def seconds_until_token(self) -> float:
+        if self.tokens >= 1.0:
+            return 0.0
+        if self.refill_per_sec <= 0:
+            return float("inf")
+        return (1.0 - self.tokens) / self.refill_per_sec
+
+
+@dataclass
+class LaneStats:
+    """Counters for one priority lane."""
+
+    queue_depth: int = 0
+    acquired: int = 0
+    waited: int = 0
+    total_wait_sec: float = 0.0
+    max_wait_sec: float = 0.0
+
+    @property
+    def avg_wait_sec(self) -> float:
+        return self.total_wait_sec / self.acquired if self.acquired else 0.0
+
+
+class RateLimiter:
+    """Thread-safe token-bucket limiter with priority lanes.
+
+    A request consumes a steady-rate token when one is available and falls
+    back to the burst pool otherwise. Both sync (`acquire`) and asyncio
+    (`acquire_async`) callers share the same buckets and queues.
+    """
+
+    def __init__(
+        self,
+        rate_per_sec: float = DEFAULT_RATE_PER_SEC,
+        burst_capacity: int = DEFAULT_BURST_CAPACITY,
+        burst_window_sec: float = DEFAULT_BURST_WINDOW_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        now = clock()
+        self._steady = _TokenBucket(rate_per_sec, rate_per_sec, rate_per_sec, now)
+        burst_refill = burst_capacity / burst_window_sec if burst_window_sec > 0 else 0.0
+        self._burst = _TokenBucket(float(burst_capacity), burst_refill, float(burst_capacity), now)
+        self._cond = threading.Condition(threading.Lock())
+        self._tickets = count()
+        self._queues: Dict[Lane, Deque[int]] = {lane: deque() for lane in _LANE_ORDER}
+        self._stats: Dict[Lane, LaneStats] = {lane: LaneStats() for lane in _LANE_ORDER}
+
+    # -- internal helpers (caller holds the lock) ---------------------------
+
+    def _seconds_until_token(self) -> float:
+        now = self._clock()
+        self._steady.refill(now)
+        self._burst.refill(now)
+        wait = min(self._steady.seconds_until_token(), self._burst.seconds_until_token())
+        return min(max(wait, _MIN_WAIT_SEC), _MAX_WAIT_SEC)
+
+    def _try_take(self, lane: Lane, ticket: int) -> float:
+        """Return 0.0 if `ticket` was granted a token, else seconds to wait."""
+
+        blocked = self._queues[lane][0] != ticket or any(
+            self._queues[higher] for higher in _LANE_ORDER[: _LANE_ORDER.index(lane)]
+        )
+        wait = self._seconds_until_token()
+        if blocked:
+            return wait
+        if self._steady.tokens >= 1.0:
+            self._steady.tokens -= 1.0
+            return 0.0
+        if self._burst.tokens >= 1.0:
+            self._burst.tokens -= 1.0
+            return 0.0
+        return wait
+
+    def _enqueue(self, lane: Lane) -> int:
+        ticket = next(self._tickets)
+        self._queues[lane].append(ticket)
+        return ticket
+
+    def _dequeue(self, lane: Lane, ticket: int, waited: Optional[float]) -> None:
+        self._queues[lane].remove(ticket)
+        if waited is not None:
+            stats = self._stats[lane]
+            stats.acquired += 1
+            if waited > 0:
+                stats.waited += 1
+                stats.total_wait_sec += waited
+                stats.max_wait_sec = max(stats.max_wait_sec, waited)
+        self._cond.notify_all()
+
+    # -- public API ---------------------------------------------------------
+
+    def try_acquire(self, lane: Lane = Lane.BACKGROUND) -> bool:
+        """Take a token without waiting; returns False if none is available."""
+
+        with self._cond:
+            ticket = self._enqueue(lane)
+            granted = self._try_take(lane, ticket) == 0.0
+            self._dequeue(lane, ticket, 0.0 if granted else None)
+            return granted
+
+    def acquire(self, lane: Lane = Lane.BACKGROUND, timeout: Optional[float] = None) -> float:
+        """Block until a token is available. Returns the time spent waiting.
+
+        Raises TimeoutError if `timeout` elapses first.
+        """
+
+        start = self._clock()
+        with self._cond:
+            ticket = self._enqueue(lane)
+            waited: Optional[float] = None
+            try:
+                while True:
+                    wait = self._try_take(lane, ticket)
+                    if wait == 0.0:
+                        waited = self._clock() - start
+                        return waited
+                    if timeout is not None:
+                        remaining = timeout - (self._clock() - start)
+                        if remaining <= 0:
+                            raise TimeoutError(f"rate limiter: no token within {timeout:.2f}s")
+                        wait = min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._dequeue(lane, ticket, waited)
+
+    async def acquire_async(self, lane: Lane = Lane.BACKGROUND) -> float:
+        """asyncio variant of `acquire`; yields to the event loop while waiting."""
+
+        start = self._clock()
+        with self._cond:
+            ticket = self._enqueue(lane)
+        waited: Optional[float] = None
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_take(lane, ticket)
+                if wait == 0.0:
+                    waited = self._clock() - start
+                    return waited
+                await asyncio.sleep(wait)
+        finally:
+            with self._cond:
+                self._dequeue(lane, ticket, waited)
+
+    def seconds_until_available(self) -> float:
+        """Seconds until a request could go out without waiting (0.0 if one can now).
+
+        Unlike `acquire`, this neither takes a token nor caps the answer, so a
+        scheduler can sleep through an exhausted burst window in one step.
+        """
+
+        with self._cond:
+            now = self._clock()
+            self._steady.refill(now)
+            self._burst.refill(now)
+            return min(self._steady.seconds_until_token(), self._burst.seconds_until_token())
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and wait-time counters per lane."""
+
+        with self._cond:
+            now = self._clock()
+            self._steady.refill(now)
+            self._burst.refill(now)
+            lanes: Dict[str, Any] = {}
+            for lane in _LANE_ORDER:
+                stats = self._stats[lane]
+                stats.queue_depth = len(self._queues[lane])
+                lanes[lane.value] = {**asdict(stats), "avg_wait_sec": stats.avg_wait_sec}
+            return {
+                "steady_tokens": self._steady.tokens,
+                "burst_tokens": self._burst.tokens,
+                "lanes": lanes,
+            }
+
+
+_default_limiter: Optional[RateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter shared by every API client."""
+
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter()
+        return _default_limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """Replace the process-wide limiter (None resets to a fresh default)."""
+
+    global _default_limiter
+    with _default_lock:
+        _default_limiter = limiter
@@ -0,0 +1,147 @@
+"""Event-driven fleet readiness.
+
+`analyze_fleet_readiness` recounts the fleet on every call and treats a
+ship in transit as busy until something re-fetches it, even after its
+arrival time has passed. `ReadinessTracker` follows a `WorldModel` instead.
+Each upserted ship is classified once, and a busy ship with a known end
+time (its `route.arrival` or cooldown `expiration`, whichever is later)
+gets a timer on a heap. `poll()` pops the timers that have passed, moves
+those ships to idle, and returns the resulting `ReadinessEvent`s. Counts,
+idle sets and transitions are all kept current; nothing rescans the fleet.
+
+A ship with no nav status, or in transit without an arrival time, stays
+busy until a fetch says otherwise.
+"""
+from __future__ import annotations
+
+import heapq
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
+
+from .worldmodel import WorldModel
+
+
+def timestamp(value: Any) -> Optional[float]:
+    """Epoch seconds from an API ISO-8601 string, or None if missing or malformed."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def busy_until(ship: Mapping[str, Any], now: float) -> Tuple[bool, Optional[float]]:
+    """(busy, until): whether `ship` is busy at `now` and, if known, when that ends."""
+    nav = ship.get("nav") or {}
+    status = str(nav.get("status") or "").upper()
+    if not status:
+        return True, None
+    times = []
+    if status == "IN_TRANSIT":
+        arrival = timestamp((nav.get("route") or {}).get("arrival"))
+        if arrival is None:
+            return True, None
+        times.append(arrival)
+    expiration = timestamp((ship.get("cooldown") or {}).get("expiration"))
+    if expiration is not None:
+        times.append(expiration)
+    until = max(times, default=None)
+    if until is None or until <= now:
+        return False, None
+    return True, until
+
+
+@dataclass(frozen=True)
+class ReadinessEvent:
+    """A ship changed between busy and idle at epoch time `at`."""
+
+    ship_symbol: str
+    idle: bool
+    at: float
+
+
+class ReadinessTracker:
+    """Idle/busy sets for the fleet, updated from ship changes and timers."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._ships: Set[str] = set()
+        self._idle: Set[str] = set()
+        self._until: Dict[str, float] = {}
+        self._timers: List[Tuple[float, str]] = []
+        self._events: Deque[ReadinessEvent] = deque()
+
+    def attach(self, world: WorldModel) -> None:
+        """Follow `world`'s ships, starting with the ones it already holds."""
+        for ship in world.fleet():
+            self.observe(ship["symbol"], ship)
+        world.add_ship_listener(self.observe)
+
+    def observe(self, symbol: str, ship: Optional[Mapping[str, Any]]) -> None:
+        """Classify a fetched ship; None means it left the fleet."""
+        now = self._clock()
+        if ship is None:
+            self._ships.discard(symbol)
+            self._idle.discard(symbol)
+            self._until.pop(symbol, None)
+            return
+        busy, until = busy_until(ship, now)
+        # A new ship reports only if it is idle; busy is where it would start anyway.
+        self._ships.add(symbol)
+        if until is None:
+            self._until.pop(symbol, None)
+        elif self._until.get(symbol) != until:
+            self._until[symbol] = until
+            heapq.heappush(self._timers, (until, symbol))
+        self._set(symbol, not busy, now)
+
+    def poll(self, now: Optional[float] = None) -> List[ReadinessEvent]:
+        """Fire the timers that have passed and return every event since the last poll."""
+        now = self._clock() if now is None else now
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            until, symbol = heapq.heappop(timers)
+            if self._until.get(symbol) == until:  # otherwise superseded by a later observe
+                del self._until[symbol]
+                self._set(symbol, True, until)
+        events = list(self._events)
+        self._events.clear()
+        return events
+
+    def next_ready_at(self) -> Optional[float]:
+        """Epoch time of the next busy-to-idle timer, if any."""
+        timers = self._timers
+        while timers and self._until.get(timers[0][1]) != timers[0][0]:
+            heapq.heappop(timers)
+        return timers[0][0] if timers else None
+
+    @property
+    def idle_ships(self) -> FrozenSet[str]:
+        return frozenset(self._idle)
+
+    @property
+    def busy_ships(self) -> FrozenSet[str]:
+        return frozenset(self._ships - self._idle)
+
+    def summary(self) -> Dict[str, Any]:
+        """The `analyze_fleet_readiness` dict, from the current counts."""
+        idle = len(self._idle)
+        return {
+            "total_ships": len(self._ships),
+            "idle_ships": idle,
+            "busy_ships": len(self._ships) - idle,
+            "ready_for_action": idle > 0,
+        }
+
+    def _set(self, symbol: str, idle: bool, at: float) -> None:
+        if idle == (symbol in self._idle):
+            return
+        if idle:
+            self._idle.add(symbol)
+        else:
+            self._idle.discard(symbol)
+        self._events.append(ReadinessEvent(symbol, idle, at))
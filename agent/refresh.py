@@ -0,0 +1,207 @@
+"""Incremental state refresh driven by arrival and cooldown timers.
+
+`refresh_state` re-downloads the agent, every page of ships and every
+contract. Most of that is wasted: a ship in transit cannot change until its
+`ShipNavRoute.arrival`, and a ship on cooldown not before its
+`Cooldown.expiration`. `IncrementalRefresher` keeps the last snapshot and
+re-fetches only:
+
+- ships whose arrival or cooldown expiry passed since they were last fetched
+- ships (and the agent) marked dirty with `mark_dirty` after a mutation
+- markets where a re-fetched ship now sits, plus any waypoint not yet known
+
+The results are merged into `world` (a `WorldModel`) and into the cached
+snapshot. `snapshot["fresh_at"]` holds an ISO-8601 stamp for the agent, the
+contracts and every ship, waypoint and market. `snapshot["refresh"]["markets"]`
+lists the markets fetched by this pass (see `fetched_markets`). A full
+`refresh_state_async` sweep still runs on the first call and every
+`full_interval_sec`, and also after `invalidate()`. The sweep catches
+anything the timers cannot predict, such as new contracts, purchased ships
+and events.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .async_client import AsyncSpaceTradersClient, get_async_client, run_sync
+from .readiness import timestamp
+from .state import _store_result, fetch_locations, refresh_state_async, ship_locations
+from .worldmodel import WorldModel
+
+DEFAULT_FULL_INTERVAL_SEC = 900.0
+
+
+def next_change(ship: Dict[str, Any]) -> Optional[float]:
+    """Epoch seconds at which `ship` next changes on its own, or None if it is idle."""
+
+    times = []
+    nav = ship.get("nav") or {}
+    if nav.get("status") == "IN_TRANSIT":
+        times.append(timestamp((nav.get("route") or {}).get("arrival")))
+    cooldown = ship.get("cooldown") or {}
+    if cooldown.get("remainingSeconds"):
+        times.append(timestamp(cooldown.get("expiration")))
+    times = [t for t in times if t is not None]
+    return min(times) if times else None
+
+
+class IncrementalRefresher:
+    """Keeps a cached snapshot and refreshes only what may have changed."""
+
+    def __init__(
+        self,
+        full_interval_sec: float = DEFAULT_FULL_INTERVAL_SEC,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.full_interval_sec = full_interval_sec
+        self._clock = clock
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.world = WorldModel()
+        self._fetched: Dict[str, float] = {}
+        self._dirty: Set[str] = set()
+        self._agent_dirty = False
+        self._last_full: Optional[float] = None
+
+    def mark_dirty(self, *ship_symbols: str, agent: bool = True) -> None:
+        """Re-fetch these ships (and, by default, the agent) on the next refresh."""
+        self._dirty.update(ship_symbols)
+        self._agent_dirty = self._agent_dirty or agent
+
+    def invalidate(self) -> None:
+        """Make the next refresh a full sweep."""
+        self._last_full = None
+
+    def due_ships(self, now: Optional[float] = None) -> List[str]:
+        """Ships to re-fetch: dirty ones, and ones whose timer elapsed since their last fetch."""
+        now = self._clock() if now is None else now
+        due = []
+        for ship in self.world.ships():
+            symbol = ship["symbol"]
+            change = next_change(ship)
+            elapsed = change is not None and self._fetched.get(symbol, 0.0) < change <= now
+            if symbol in self._dirty or elapsed:
+                due.append(symbol)
+        return due
+
+    async def refresh_async(self, client: AsyncSpaceTradersClient, logger: Optional[logging.Logger] = None) -> Dict[str, Any]:
+        now = self._clock()
+        if self.snapshot is None or self._last_full is None or now - self._last_full >= self.full_interval_sec:
+            return await self._full(client, now, logger)
+        return await self._incremental(client, now, logger)
+
+    def refresh(self, logger: Optional[logging.Logger] = None) -> Dict[str, Any]:
+        """Synchronous `refresh_async` on the shared client (see `state.refresh_state`)."""
+        client = get_async_client()
+        if client is None:
+            return {
+                "source": "SpaceTraders",
+                "agent": None,
+                "ships": None,
+                "errors": ["No SPACETRADERS_TOKEN configured or client unavailable"],
+            }
+        return run_sync(self.refresh_async(client, logger=logger))
+
+    async def _full(self, client: AsyncSpaceTradersClient, now: float, logger: Optional[logging.Logger]) -> Dict[str, Any]:
+        snapshot = await refresh_state_async(client, logger=logger)
+        self.world.update(snapshot)
+        stamp = _stamp(now)
+        previous = self.snapshot or {}
+        fresh_at = copy.deepcopy(previous.get("fresh_at") or {"ships": {}, "waypoints": {}, "markets": {}})
+        for key in ("agent", "contracts"):
+            if snapshot.get(key) is not None:
+                fresh_at[key] = stamp
+            else:
+                # Keep the last good copy; its stamp shows its age.
+                snapshot[key] = previous.get(key)
+        if snapshot.get("ships") is not None:
+            self._fetched = {symbol: now for symbol in self.world.ship_symbols()}
+            fresh_at["ships"] = {symbol: stamp for symbol in self._fetched}
+        else:
+            snapshot["ships"] = previous.get("ships")
+        fetched_markets = sorted(snapshot["markets"])
+        for key in ("waypoints", "markets"):
+            fresh_at[key].update({symbol: stamp for symbol in snapshot[key]})
+            snapshot[key] = {**previous.get(key, {}), **snapshot[key]}
+        snapshot["fresh_at"] = fresh_at
+        snapshot["refresh"] = {"mode": "full", "ships": sorted(self.world.ship_symbols()), "markets": fetched_markets}
+        self._dirty.clear()
+        self._agent_dirty = False
+        self._last_full = now
+        self.snapshot = snapshot
+        return snapshot
+
+    async def _incremental(
+        self, client: AsyncSpaceTradersClient, now: float, logger: Optional[logging.Logger]
+    ) -> Dict[str, Any]:
+        previous = self.snapshot
+        snapshot = {
+            **previous,
+            "waypoints": dict(previous["waypoints"]),
+            "markets": dict(previous["markets"]),
+            "fresh_at": copy.deepcopy(previous["fresh_at"]),
+            "errors": [],
+        }
+        stamp = _stamp(now)
+        due = self.due_ships(now)
+        fetch_agent = self._agent_dirty
+        results = await asyncio.gather(
+            # Due and dirty ships are refetched because the cached copy is stale,
+            # so a still-valid cache entry must not answer for them.
+            *(client.fetch_ship(symbol, logger=logger, fresh=True) for symbol in due),
+            *([client.fetch_my_agent(logger=logger)] if fetch_agent else []),
+        )
+        if fetch_agent and _store_result(snapshot, snapshot, "agent", "agent", results[-1]) is not None:
+            snapshot["fresh_at"]["agent"] = stamp
+            self._agent_dirty = False
+        refreshed = []
+        for symbol, res in zip(due, results):
+            fetched: Dict[str, Any] = {}
+            ship = _store_result(snapshot, fetched, symbol, f"ship {symbol}", res)
+            if ship is None:
+                continue  # keep the cached ship; it stays due
+            self.world.upsert_ship(ship)
+            self._fetched[symbol] = now
+            self._dirty.discard(symbol)
+            snapshot["fresh_at"]["ships"][symbol] = stamp
+            refreshed.append(ship)
+        snapshot["ships"] = self.world.fleet()
+
+        # Ships that landed or docked: their market is worth a fresh look.
+        settled = [ship for ship in refreshed if (ship.get("nav") or {}).get("status") != "IN_TRANSIT"]
+        located = {"waypoints": dict(snapshot["waypoints"]), "markets": {}, "errors": snapshot["errors"]}
+        await fetch_locations(client, located, ship_locations(settled), logger=logger)
+        for key in ("waypoints", "markets"):
+            for symbol, value in located[key].items():
+                if symbol not in snapshot[key] or key == "markets":
+                    snapshot[key][symbol] = value
+                    snapshot["fresh_at"][key][symbol] = stamp
+        self.world.update({"agent": snapshot["agent"], "waypoints": located["waypoints"], "markets": located["markets"]})
+        snapshot["refresh"] = {
+            "mode": "incremental",
+            "ships": [ship["symbol"] for ship in refreshed],
+            "markets": sorted(located["markets"]),
+        }
+        self.snapshot = snapshot
+        return snapshot
+
+
+def fetched_markets(snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Markets fetched by the pass that built `snapshot`, leaving out cached copies.
+
+    Use this for price recording: the merged `snapshot["markets"]` also holds
+    markets from earlier passes, which would otherwise be stored again as new
+    observations at the current time.
+    """
+    markets = snapshot.get("markets") or {}
+    refresh = snapshot.get("refresh")
+    symbols = markets if refresh is None else refresh.get("markets", ())
+    return [markets[symbol] for symbol in symbols if markets.get(symbol)]
+
+
+def _stamp(now: float) -> str:
+    return datetime.fromtimestamp(now, timezone.utc).isoformat()
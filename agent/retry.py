@@ -0,0 +1,214 @@
+"""Client-side retries for 429 and transient 5xx responses.
+
+A 429 from SpaceTraders carries the wait in its body
+(`{"error": {"code": 429, "data": {"retryAfter": 1.5, ...}}}`) and in the
+`x-ratelimit-reset` / `retry-after` headers. Rather than surfacing that to the
+caller (and, in the LLM loop, burning a whole turn on it), the client sleeps
+for exactly that long and re-sends. 502/503/504 are retried with full-jitter
+exponential backoff.
+
+Only the affected request waits: the sync client sleeps on the calling thread
+and the async client on its own task, and every attempt takes a fresh token
+from the shared rate limiter, so other ships' requests keep moving.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, FrozenSet, Mapping, Optional
+
+log = logging.getLogger("agent.retry")
+
+RATE_LIMITED = 429
+TRANSIENT_STATUSES: FrozenSet[int] = frozenset({502, 503, 504})
+IDEMPOTENT_METHODS: FrozenSet[str] = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BASE_DELAY_SEC = 0.5
+DEFAULT_MAX_DELAY_SEC = 30.0
+
+
+def _header(headers: Optional[Mapping[str, str]], name: str) -> Optional[str]:
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.title())
+    return value
+
+
+def _seconds_until(value: str, now: Callable[[], datetime]) -> Optional[float]:
+    try:
+        reset = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if reset.tzinfo is None:
+        reset = reset.replace(tzinfo=timezone.utc)
+    return max(0.0, (reset - now()).total_seconds())
+
+
+def retry_after_from(
+    body: Any = None,
+    headers: Optional[Mapping[str, str]] = None,
+    now: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+) -> Optional[float]:
+    """Seconds the server asked us to wait, or None if it did not say.
+
+    `body` may be raw bytes/str or an already parsed dict. The body's
+    `error.data.retryAfter` wins; then `retry-after`; then `x-ratelimit-reset`.
+    """
+
+    if isinstance(body, (bytes, str)) and body:
+        try:
+            body = json.loads(body)
+        except ValueError:
+            body = None
+    if isinstance(body, dict):
+        error = body.get("error") or {}
+        if isinstance(error, dict) and error.get("code") == RATE_LIMITED:
+            retry_after = (error.get("data") or {}).get("retryAfter")
+            if retry_after is not None:
+                try:
+                    return max(0.0, float(retry_after))
+                except (TypeError, ValueError):
+                    pass
+
+    value = _header(headers, "retry-after")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+    value = _header(headers, "x-ratelimit-reset")
+    if value:
+        return _seconds_until(value, now)
+    return None
+
+
+def is_rate_limited(status: int, body: Any = None) -> bool:
+    if status == RATE_LIMITED:
+        return True
+    if isinstance(body, dict):
+        error = body.get("error")
+        return isinstance(error, dict) and error.get("code") == RATE_LIMITED
+    return False
+
+
+@dataclass
+class RetryPolicy:
+    """When and how long to wait before re-sending a failed request.
+
+    5xx responses to mutations are not retried unless `retry_mutations` is
+    set: a 502/504 may mean the server acted but the reply was lost, and
+    replaying a purchase or jump is worse than reporting the error.
+    """
+
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    base_delay_sec: float = DEFAULT_BASE_DELAY_SEC
+    max_delay_sec: float = DEFAULT_MAX_DELAY_SEC
+    retry_mutations: bool = False
+    rng: Callable[[], float] = field(default=random.random, repr=False)
+
+    def should_retry(self, method: str, status: int, attempt: int) -> bool:
+        """`attempt` counts from 1 for the request that just failed."""
+
+        if attempt >= self.max_attempts:
+            return False
+        if status == RATE_LIMITED:
+            return True
+        if status in TRANSIENT_STATUSES or status == 0:
+            return self.retry_mutations or method.upper() in IDEMPOTENT_METHODS
+        return False
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, min(max, base * 2**(attempt-1)))."""
+
+        ceiling = min(self.max_delay_sec, self.base_delay_sec * (2 ** max(0, attempt - 1)))
+        return self.rng() * ceiling
+
+    def delay(self, status: int, attempt: int, body: Any = None, headers: Optional[Mapping[str, str]] = None) -> float:
+        if status == RATE_LIMITED:
+            retry_after = retry_after_from(body, headers)
+            if retry_after is not None:
+                # A few ms past the reset so we do not land just before it.
+                return min(self.max_delay_sec, retry_after) + 0.05 * self.rng()
+        return self.backoff(attempt)
+
+
+@dataclass
+class RetryStats:
+    retries: int = 0
+    rate_limited: int = 0
+    transient: int = 0
+    gave_up: int = 0
+    total_delay_sec: float = 0.0
+
+
+_default_policy = RetryPolicy()
+_stats = RetryStats()
+_stats_lock = threading.Lock()
+
+
+def get_retry_policy() -> RetryPolicy:
+    return _default_policy
+
+
+def set_retry_policy(policy: Optional[RetryPolicy]) -> None:
+    """Replace the process-wide policy (None restores the default)."""
+
+    global _default_policy
+    _default_policy = policy or RetryPolicy()
+
+
+def record_retry(status: int, delay: float) -> None:
+    with _stats_lock:
+        _stats.retries += 1
+        _stats.total_delay_sec += delay
+        if status == RATE_LIMITED:
+            _stats.rate_limited += 1
+        else:
+            _stats.transient += 1
+
+
+def record_give_up() -> None:
+    with _stats_lock:
+        _stats.gave_up += 1
+
+
+def retry_stats() -> dict:
+    with _stats_lock:
+        return dict(vars(_stats))
+
+
+def call_with_retry(
+    fn: Callable[[], Any],
+    policy: Optional[RetryPolicy] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    before_attempt: Optional[Callable[[], None]] = None,
+) -> Any:
+    """Retry an opaque call whose *result* is a SpaceTraders JSON body.
+
+    For callers that never see an HTTP status (e.g. the OpenAPI tool
+    invoker): retries while the returned dict is a 429 error body.
+    """
+
+    policy = policy or get_retry_policy()
+    attempt = 1
+    while True:
+        if before_attempt is not None:
+            before_attempt()
+        result = fn()
+        if not is_rate_limited(0, result) or not policy.should_retry("POST", RATE_LIMITED, attempt):
+            if is_rate_limited(0, result):
+                record_give_up()
+            return result
+        delay = policy.delay(RATE_LIMITED, attempt, body=result)
+        record_retry(RATE_LIMITED, delay)
+        log.info("Rate limited; retrying in %.2fs (attempt %d)", delay, attempt + 1)
+        sleep(delay)
+        attempt += 1
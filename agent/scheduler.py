@@ -0,0 +1,169 @@
+"""Timer-heap scheduler for the control loops.
+
+The loops used to `time.sleep(poll_interval_sec)` between iterations, so
+an arrival was noticed up to a full interval late and an idle agent still
+woke every few seconds to find nothing to do. `Scheduler` keeps a priority
+queue of wake-ups instead: ship arrivals, cooldown expiries, rate-limit
+windows, advisory checks and periodic jobs. `run()` sleeps exactly until
+the earliest one is due and dispatches only the handlers that are due.
+
+Timers are keyed. Scheduling a key that is already pending replaces it, so
+"wake me when the next ship is ready" can be re-armed after every pass
+without piling up stale entries. `call_soon` and `wake` are thread-safe, so
+other threads (such as a file watcher) can hand work to the loop and
+interrupt its sleep.
+
+Times are epoch seconds from `clock` (default `time.time`), which matches
+the arrival and cooldown timestamps the API returns.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+Handler = Callable[[], None]
+
+
+class _Timer:
+    __slots__ = ("when", "key", "handler", "interval", "cancelled")
+
+    def __init__(self, when: float, key: str, handler: Handler, interval: Optional[float]) -> None:
+        self.when = when
+        self.key = key
+        self.handler = handler
+        self.interval = interval
+        self.cancelled = False
+
+
+class Scheduler:
+    """Runs keyed one-shot and periodic handlers at their due times."""
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.time,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        self._clock = clock
+        self._log = logger or logging.getLogger("agent.scheduler")
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._heap: List[Tuple[float, int, _Timer]] = []
+        self._pending: Dict[str, _Timer] = {}
+        self._seq = itertools.count()
+        self._stopped = False
+        self.dispatched = 0
+
+    # ------------------------------------------------------------------ scheduling
+
+    def at(self, when: float, key: str, handler: Handler) -> None:
+        """Run `handler` at epoch time `when`, replacing any pending `key`."""
+        self._push(_Timer(when, key, handler, None))
+
+    def after(self, delay: float, key: str, handler: Handler) -> None:
+        self.at(self._clock() + max(0.0, delay), key, handler)
+
+    def every(self, interval: float, key: str, handler: Handler, first: Optional[float] = None) -> None:
+        """Run `handler` every `interval` seconds, first at `first` (default: now)."""
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self._push(_Timer(self._clock() if first is None else first, key, handler, interval))
+
+    def call_soon(self, key: str, handler: Handler) -> None:
+        """Run `handler` on the next dispatch; safe to call from any thread."""
+        self.at(self._clock(), key, handler)
+
+    def cancel(self, key: str) -> bool:
+        with self._lock:
+            timer = self._pending.pop(key, None)
+            if timer is not None:
+                timer.cancelled = True
+            return timer is not None
+
+    def pending(self, key: str) -> Optional[float]:
+        """When `key` is next due, or None if it is not scheduled."""
+        with self._lock:
+            timer = self._pending.get(key)
+            return None if timer is None else timer.when
+
+    def now(self) -> float:
+        return self._clock()
+
+    def next_due(self) -> Optional[float]:
+        with self._lock:
+            return self._peek()
+
+    # ------------------------------------------------------------------ running
+
+    def run_pending(self, now: Optional[float] = None) -> int:
+        """Dispatch every handler due at `now`, earliest first; returns how many ran.
+
+        Handlers scheduled while dispatching run in this pass only if they are
+        already due. A failing handler is logged and does not stop the others.
+        """
+        now = self._clock() if now is None else now
+        ran = 0
+        while True:
+            with self._lock:
+                due = self._peek()
+                if due is None or due > now:
+                    break
+                _, _, timer = heapq.heappop(self._heap)
+                del self._pending[timer.key]
+                if timer.interval is not None:
+                    # Re-armed from its due time so a slow handler does not drift the period.
+                    self._push_locked(_Timer(max(timer.when + timer.interval, now), timer.key, timer.handler, timer.interval))
+            try:
+                timer.handler()
+            except Exception:
+                self._log.exception("Scheduled handler %s failed", timer.key)
+            ran += 1
+        self.dispatched += ran
+        return ran
+
+    def run(self, until: Optional[Callable[[], bool]] = None) -> None:
+        """Dispatch due handlers and sleep until the next one, until `stop()` or `until()`."""
+        self._stopped = False
+        while not self._stopped and not (until and until()):
+            self.run_pending()
+            if self._stopped or (until and until()):
+                break
+            self._wakeup.clear()
+            due = self.next_due()
+            if due is None:
+                self._wakeup.wait()
+            else:
+                delay = due - self._clock()
+                if delay > 0:
+                    self._wakeup.wait(delay)
+
+    def wake(self) -> None:
+        """Interrupt `run()`'s sleep so it re-checks the queue."""
+        self._wakeup.set()
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._wakeup.set()
+
+    # ------------------------------------------------------------------ internals
+
+    def _push(self, timer: _Timer) -> None:
+        with self._lock:
+            self._push_locked(timer)
+        self._wakeup.set()
+
+    def _push_locked(self, timer: _Timer) -> None:
+        previous = self._pending.pop(timer.key, None)
+        if previous is not None:
+            previous.cancelled = True
+        self._pending[timer.key] = timer
+        heapq.heappush(self._heap, (timer.when, next(self._seq), timer))
+
+    def _peek(self) -> Optional[float]:
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
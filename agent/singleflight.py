@@ -0,0 +1,151 @@
+"""Single-flight coalescing of identical in-flight GET requests.
+
+When several loops or ship workers ask for the same market, waypoint or agent
+at nearly the same moment, only the first caller (the leader) hits the network.
+Callers that arrive while that request is still in flight wait for it and get
+the same result. Each coalesced duplicate is one rate-limit token not spent.
+
+Only GETs are coalesced; mutations always go out individually. Keys include
+the bearer token so different agents never share responses.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from .cache import normalize_query
+
+T = TypeVar("T")
+
+FlightKey = Tuple[str, str, str, str]
+
+
+def flight_key(token: Optional[str], method: str, path: str, query: str = "") -> Optional[FlightKey]:
+    """Return the coalescing key for a request, or None if it must not be shared."""
+
+    method = method.upper()
+    if method != "GET":
+        return None
+    return (token or "", method, path, normalize_query(query))
+
+
+@dataclass
+class FlightStats:
+    leaders: int = 0
+    coalesced: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = self.leaders + self.coalesced
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "hit_rate": self.coalesced / total if total else 0.0,
+        }
+
+
+@dataclass
+class _Call:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces duplicate calls across threads (sync client) and tasks (async client).
+
+    `do` is for threads; `do_async` is for coroutines on one event loop. The
+    two keep separate in-flight tables but share the counters.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[FlightKey, _Call] = {}
+        self._tasks: Dict[Tuple[int, FlightKey], "asyncio.Future[Any]"] = {}
+        self._stats = FlightStats()
+
+    def do(self, key: Optional[FlightKey], fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Run `fn` once per key at a time; returns (result, shared)."""
+
+        if key is None:
+            return fn(), False
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats.leaders += 1
+            else:
+                self._stats.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result, False
+
+    async def do_async(self, key: Optional[FlightKey], fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """Coroutine flavour of `do`; the shared future is shielded from follower cancellation."""
+
+        if key is None:
+            return await fn(), False
+        loop_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            future = self._tasks.get(loop_key)
+            leader = future is None
+            if leader:
+                future = self._tasks[loop_key] = asyncio.ensure_future(fn())
+                self._stats.leaders += 1
+            else:
+                self._stats.coalesced += 1
+
+        if leader:
+            future.add_done_callback(lambda _: self._forget(loop_key, future))
+        return await asyncio.shield(future), not leader
+
+    def _forget(self, loop_key: Tuple[int, FlightKey], future: "asyncio.Future[Any]") -> None:
+        with self._lock:
+            if self._tasks.get(loop_key) is future:
+                del self._tasks[loop_key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls) + len(self._tasks)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats.as_dict(), "in_flight": len(self._calls) + len(self._tasks)}
+
+
+_default_flight: Optional[SingleFlight] = None
+_default_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide coalescer shared by every API client."""
+
+    global _default_flight
+    with _default_lock:
+        if _default_flight is None:
+            _default_flight = SingleFlight()
+        return _default_flight
+
+
+def set_single_flight(flight: Optional[SingleFlight]) -> None:
+    """Replace the process-wide coalescer (None resets to a fresh default)."""
+
+    global _default_flight
+    with _default_lock:
+        _default_flight = flight
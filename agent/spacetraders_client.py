@@ -3,13 +3,19 @@ from __future__ import annotations
 import json
 import logging
 import os
+import socket
+import threading
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
 
 from dotenv import load_dotenv
 import sys
 from pathlib import Path
+import urllib3
 from httpx import Response as HTTPXResponse
+from urllib3.connection import HTTPConnection
 
 # Load environment variables from .env file
 load_dotenv()
@@ -20,13 +26,37 @@ _CODEGEN_PKG = _ROOT / "codegen" / "spacetraders_api_client"
 if str(_CODEGEN_PKG) not in sys.path:
     sys.path.insert(0, str(_CODEGEN_PKG))
 
-from spacetraders_api_client import ApiClient, Configuration
-from spacetraders_api_client.api.agents_api import AgentsApi
-from spacetraders_api_client.api.fleet_api import FleetApi
+from spacetraders_api_client import ApiClient, ApiResponse, Configuration, models, rest
+# The generated package resolves API classes and models lazily; keep it that
+# way by going through `generated_api` instead of importing endpoint modules.
+from spacetraders_api_client import api as generated_api
+from spacetraders_api_client.exceptions import ApiException
+
+from .cache import ResponseCache, get_response_cache
+from .fastmodels import construct
+from .ratelimit import RateLimiter, get_rate_limiter, lane_for_method
+from .retry import (
+    RATE_LIMITED,
+    TRANSIENT_STATUSES,
+    RetryPolicy,
+    get_retry_policy,
+    record_give_up,
+    record_retry,
+)
+from .singleflight import SingleFlight, flight_key, get_single_flight
 
 DEFAULT_BASE_URL = "https://api.spacetraders.io/v2"
 ENV_API_KEY = "SPACETRADERS_API_KEY"
+ENV_BASE_URL = "SPACETRADERS_BASE_URL"  # e.g. a local mock server for benchmarks
+ENV_CASSETTE = "SPACETRADERS_CASSETTE"  # record/replay traffic file, see agent.cassette
 ENV_LOG_API = "LOG_API"  # Set to "true" or "1" to enable verbose API logging
+ENV_POOL_MAXSIZE = "SPACETRADERS_POOL_MAXSIZE"
+ENV_HTTP2 = "SPACETRADERS_HTTP2"  # "true"/"1" to use the httpx HTTP/2 transport
+ENV_FAST_MODELS = "SPACETRADERS_FAST_MODELS"  # "true"/"1" to skip validation of 2xx bodies
+ENV_STRICT_VALIDATION = "SPACETRADERS_STRICT_VALIDATION"  # "true"/"1" forces full validation (debugging)
+# The server allows ~2 req/s, so a handful of warm connections is plenty;
+# the generator's cpu_count * 5 default just holds idle sockets open.
+DEFAULT_POOL_MAXSIZE = 8
 
 
 @dataclass
@@ -39,7 +69,7 @@ class APIResult:
 
 
 def _parse_response(resp_obj: Any, endpoint: str = "unknown", logger: Optional[logging.Logger] = None) -> APIResult:
-    # Support ApiResponse (status_code + raw_data) and httpx.Response
+    # Support ApiResponse (status_code + raw_data), urllib3.HTTPResponse and httpx.Response
     log_enabled = os.getenv(ENV_LOG_API, "").lower() in ("true", "1")
 
     # ApiResponse duck-typing
@@ -55,6 +85,19 @@ def _parse_response(resp_obj: Any, endpoint: str = "unknown", logger: Optional[l
         except Exception as e:
             return APIResult(ok=False, status=-1, json=None, raw=None, error=str(e))
 
+    # urllib3.HTTPResponse, as returned by the *_without_preload_content methods
+    if hasattr(resp_obj, "status") and hasattr(resp_obj, "data") and isinstance(getattr(resp_obj, "data"), bytes):
+        try:
+            status = int(resp_obj.status)
+            raw = resp_obj.data
+            parsed_json = json.loads(raw.decode("utf-8")) if raw else None
+            ok = 200 <= status < 300
+            if log_enabled and logger and parsed_json is not None:
+                logger.info("API Response [%s] status=%d:\n%s", endpoint, status, _pretty(parsed_json))
+            return APIResult(ok=ok, status=status, json=parsed_json, raw=raw)
+        except Exception as e:
+            return APIResult(ok=False, status=-1, json=None, raw=None, error=str(e))
+
     # httpx.Response fallback
     if isinstance(resp_obj, HTTPXResponse):
         status = resp_obj.status_code
@@ -79,13 +122,219 @@ def _pretty(data: Any) -> str:
         return str(data)
 
 
-def build_client(token: Optional[str] = None, base_url: str = DEFAULT_BASE_URL) -> Optional[ApiClient]:
-    """Create an ApiClient using Configuration and bearer token."""
+def _preloaded(response: rest.RESTResponse) -> rest.RESTResponse:
+    response.read()
+    return response
+
+
+def _copy_response(response: rest.RESTResponse) -> rest.RESTResponse:
+    """Give a coalesced caller its own RESTResponse over the leader's body."""
+    raw = urllib3.HTTPResponse(
+        body=response.data,
+        headers=dict(response.headers),
+        status=response.status,
+        reason=response.reason,
+        preload_content=True,
+    )
+    return rest.RESTResponse(raw)
+
+
+class SpaceTradersApiClient(ApiClient):
+    """ApiClient that routes every request through the shared cache and rate limiter.
+
+    All generated `*Api` methods funnel into `call_api`, so overriding it here
+    covers AgentsApi, FleetApi, SystemsApi, etc. without touching codegen.
+    Cache hits are answered locally and never spend a rate-limit token, and
+    identical GETs already in flight on another thread share its response.
+    429s and transient 5xx are retried here (see `agent.retry`), so callers
+    only ever see them once the retry budget is spent.
+
+    With `fast_deserialize` on, successful responses whose type is a plain
+    generated model are built with `fastmodels.construct` instead of
+    `from_dict`, skipping pydantic validation. `SPACETRADERS_STRICT_VALIDATION`
+    turns that back off without code changes.
+    """
+
+    def __init__(
+        self,
+        configuration: Optional[Configuration] = None,
+        limiter: Optional[RateLimiter] = None,
+        cache: Optional[ResponseCache] = None,
+        fast_deserialize: bool = False,
+        flight: Optional[SingleFlight] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> None:
+        super().__init__(configuration)
+        self.limiter = limiter
+        self.cache = cache
+        self.flight = flight
+        self.retry_policy = retry_policy
+        self.fast_deserialize = fast_deserialize and not _env_flag(ENV_STRICT_VALIDATION)
+
+    def _split_url(self, url: str) -> Tuple[str, str]:
+        """Return (path relative to the API base, query string)."""
+        parts = urlsplit(url)
+        base_path = urlsplit(self.configuration.host).path.rstrip("/")
+        path = parts.path[len(base_path):] if parts.path.startswith(base_path) else parts.path
+        return path or "/", parts.query
+
+    def call_api(self, method, url, header_params=None, body=None, post_params=None, _request_timeout=None):
+        cache = self.cache or get_response_cache()
+        token = self.configuration.access_token
+        path, query = self._split_url(url)
+        if cache is not None:
+            hit = cache.lookup(token, method, path, query)
+            if hit is not None:
+                return rest.RESTResponse(hit.to_http_response())
+
+        def send() -> rest.RESTResponse:
+            limiter = self.limiter or get_rate_limiter()
+            policy = self.retry_policy or get_retry_policy()
+            attempt = 1
+            while True:
+                # Every attempt queues for a fresh token; only this thread sleeps.
+                limiter.acquire(lane_for_method(method))
+                try:
+                    response = super(SpaceTradersApiClient, self).call_api(
+                        method,
+                        url,
+                        header_params=header_params,
+                        body=body,
+                        post_params=post_params,
+                        _request_timeout=_request_timeout,
+                    )
+                except (ApiException, urllib3.exceptions.HTTPError) as exc:
+                    # With urllib3's retries off, connection errors arrive raw
+                    # (only SSL errors are wrapped); like the httpx transport,
+                    # treat them as status 0.
+                    if isinstance(exc, ApiException) and exc.status != 0:
+                        raise
+                    if not policy.should_retry(method, 0, attempt):
+                        if attempt >= policy.max_attempts:
+                            record_give_up()
+                        raise
+                    delay = policy.backoff(attempt)
+                    status = 0
+                else:
+                    status = response.status
+                    if not policy.should_retry(method, status, attempt):
+                        break
+                    delay = policy.delay(status, attempt, response.read(), response.headers)
+                record_retry(status, delay)
+                logging.getLogger("agent.retry").info(
+                    "%s %s -> %s; retrying in %.2fs (attempt %d)", method, path, status or "network error", delay, attempt + 1
+                )
+                time.sleep(delay)
+                attempt += 1
+
+            if status == RATE_LIMITED or status in TRANSIENT_STATUSES:
+                record_give_up()
+            if cache is not None:
+                cache.store(token, method, path, query, response.status, response.read(), response.headers.get("content-type"))
+            return response
+
+        key = flight_key(token, method, path, query)
+        if key is None:
+            return send()
+        flight = self.flight or get_single_flight()
+        response, shared = flight.do(key, lambda: _preloaded(send()))
+        return _copy_response(response) if shared else response
+
+    def response_deserialize(self, response_data, response_types_map=None):
+        if self.fast_deserialize and 200 <= response_data.status <= 299 and response_types_map:
+            response_type = response_types_map.get(str(response_data.status)) or response_types_map.get("2XX")
+            model = getattr(models, response_type, None) if isinstance(response_type, str) else None
+            if isinstance(model, type) and response_data.data:
+                return ApiResponse(
+                    status_code=response_data.status,
+                    data=construct(model, json.loads(response_data.data)),
+                    headers=response_data.headers,
+                    raw_data=response_data.data,
+                )
+        return super().response_deserialize(response_data, response_types_map)
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("true", "1")
+
+
+def default_base_url() -> str:
+    return os.getenv(ENV_BASE_URL) or DEFAULT_BASE_URL
+
+
+def build_client(
+    token: Optional[str] = None,
+    base_url: Optional[str] = None,
+    pool_maxsize: Optional[int] = None,
+    http2: Optional[bool] = None,
+    fast_deserialize: Optional[bool] = None,
+) -> Optional[ApiClient]:
+    """Create a rate-limited ApiClient using Configuration and bearer token.
+
+    Prefer `get_client`, which reuses one client (and its warm connection
+    pool) per token/base URL instead of paying new TCP/TLS handshakes.
+    """
+    tok = token or os.getenv(ENV_API_KEY)
+    if not tok:
+        return None
+    cfg = Configuration(host=base_url or default_base_url(), access_token=tok)
+    cfg.connection_pool_maxsize = pool_maxsize or int(os.getenv(ENV_POOL_MAXSIZE, DEFAULT_POOL_MAXSIZE))
+    # TCP keep-alive so idle pooled sockets survive the gaps between iterations
+    cfg.socket_options = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    # Retries happen in SpaceTradersApiClient.call_api, which knows about
+    # retryAfter and the rate limiter; urllib3's own retries would bypass both.
+    # Connection errors then surface as urllib3 exceptions, which call_api
+    # retries like any other network failure.
+    cfg.retries = 0
+    client = SpaceTradersApiClient(
+        cfg,
+        fast_deserialize=_env_flag(ENV_FAST_MODELS) if fast_deserialize is None else fast_deserialize,
+    )
+    use_http2 = _env_flag(ENV_HTTP2) if http2 is None else http2
+    if use_http2:
+        from .transport import HttpxRESTClient
+
+        client.rest_client = HttpxRESTClient(cfg, pool_maxsize=cfg.connection_pool_maxsize, http2=True)
+    if os.getenv(ENV_CASSETTE):
+        from .cassette import RecordingRESTClient, ReplayRESTClient, cassette_mode, shared_cassette, shared_player
+
+        if cassette_mode() == "record":
+            client.rest_client = RecordingRESTClient(client.rest_client, shared_cassette())
+        else:
+            client.rest_client = ReplayRESTClient(shared_player())
+    return client
+
+
+_clients: Dict[Tuple[str, str], ApiClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(token: Optional[str] = None, base_url: Optional[str] = None) -> Optional[ApiClient]:
+    """Return the long-lived ApiClient for this token and base URL, creating it once."""
     tok = token or os.getenv(ENV_API_KEY)
     if not tok:
         return None
-    cfg = Configuration(host=base_url, access_token=tok)
-    return ApiClient(cfg)
+    base_url = base_url or default_base_url()
+    key = (tok, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = build_client(tok, base_url)
+            _clients[key] = client
+        return client
+
+
+def close_clients() -> None:
+    """Release every pooled connection held by `get_client` clients."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        rest_client = client.rest_client
+        if hasattr(rest_client, "close"):
+            rest_client.close()
+        else:
+            rest_client.pool_manager.clear()
 
 
 def fetch_my_agent(client: ApiClient, logger: Optional[logging.Logger] = None) -> APIResult:
@@ -95,7 +344,7 @@ def fetch_my_agent(client: ApiClient, logger: Optional[logging.Logger] = None) -
     if log_enabled and logger:
         logger.info("API Request [%s]", endpoint)
 
-    api = AgentsApi(client)
+    api = generated_api.AgentsApi(client)
     resp = api.get_my_agent_without_preload_content()
     return _parse_response(resp, endpoint=endpoint, logger=logger)
 
@@ -107,7 +356,7 @@ def fetch_my_ships(client: ApiClient, page: int = 1, limit: int = 10, logger: Op
     if log_enabled and logger:
         logger.info("API Request [%s]", endpoint)
 
-    api = FleetApi(client)
+    api = generated_api.FleetApi(client)
     resp = api.get_my_ships_without_preload_content(page=page, limit=limit)
     return _parse_response(resp, endpoint=endpoint, logger=logger)
 
@@ -1,39 +1,38 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
-from .spacetraders_client import APIResult, build_client, fetch_my_agent, fetch_my_ships
+from .async_client import AsyncSpaceTradersClient, get_async_client, run_sync
+from .pagination import aiter_my_contracts, aiter_my_ships, collect
+from .spacetraders_client import APIResult
+from .worldmodel import WorldModel
 
 
-def analyze_fleet_readiness(snapshot: Dict[str, Any]) -> Dict[str, Any]:
-    """Analyze ship readiness from state snapshot.
+def analyze_fleet_readiness(state: Union[WorldModel, Dict[str, Any]]) -> Dict[str, Any]:
+    """Analyze ship readiness from the world model (or a raw state snapshot).
 
     Returns a dict with:
     - total_ships: count of all ships
     - idle_ships: ships ready for new actions (docked, not in transit)
     - busy_ships: ships executing actions (in transit, refueling, etc)
     - ready_for_action: bool, true if any ships are idle
+
+    Counts come from the world model's nav-status index, so this costs one
+    pass over the distinct statuses rather than over the fleet.
     """
-    ships = snapshot.get("ships") or []
-    idle_count = 0
-    busy_count = 0
-
-    for ship in ships:
-        if isinstance(ship, dict):
-            # Check nav status: common patterns are "IN_TRANSIT", "DOCKED", "ANCHORED"
-            nav_status = ship.get("nav", {}).get("status", "").upper()
-            
-            # Ship is idle if it's docked or anchored (not actively moving)
-            if nav_status in ("DOCKED", "ANCHORED"):
-                idle_count += 1
-            elif nav_status in ("IN_TRANSIT", ""):
-                busy_count += 1
-            else:
-                # Default to idle if we can't determine status
-                idle_count += 1
-
-    total = len(ships)
+    world = state if isinstance(state, WorldModel) else WorldModel.from_snapshot(state)
+    total = len(world)
+    counts = world.status_counts()
+    # Ships without a nav status are counted as busy; IN_TRANSIT is busy;
+    # DOCKED, ANCHORED and anything else we can't place default to idle.
+    busy_count = total - sum(counts.values())
+    for status, count in counts.items():
+        if status.upper() == "IN_TRANSIT":
+            busy_count += count
+    idle_count = total - busy_count
+
     return {
         "total_ships": total,
         "idle_ships": idle_count,
@@ -42,33 +41,107 @@ def analyze_fleet_readiness(snapshot: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def refresh_state(logger: Optional[logging.Logger] = None) -> Dict[str, Any]:
-    """Fetch authoritative state from SpaceTraders API (if configured).
+def _store_result(snapshot: Dict[str, Any], target: Dict[str, Any], key: str, label: str, res: APIResult) -> Any:
+    """Copy `data` from a successful result into `target[key]`, else record the error."""
+    if res.ok and res.json is not None:
+        target[key] = res.json.get("data")
+        return target[key]
+    snapshot["errors"].append(f"{label}: {res.error or res.status}")
+    return None
 
-    Returns a dict summary safe for prompt inclusion and persistence.
-    If API token is missing, returns an empty snapshot with a reason.
+
+def ship_locations(ships: Iterable[Any]) -> List[Tuple[str, str]]:
+    """Sorted (system, waypoint) pairs the given ships are at or headed to."""
+    return sorted(
+        {
+            (ship["nav"]["systemSymbol"], ship["nav"]["waypointSymbol"])
+            for ship in ships
+            if isinstance(ship, dict) and ship.get("nav", {}).get("waypointSymbol")
+        }
+    )
+
+
+async def fetch_locations(
+    client: AsyncSpaceTradersClient,
+    snapshot: Dict[str, Any],
+    locations: Iterable[Tuple[str, str]],
+    logger: Optional[logging.Logger] = None,
+) -> None:
+    """Fetch waypoints, then markets at the marketplaces among them, into `snapshot`.
+
+    Waypoints already in `snapshot["waypoints"]` are reused rather than re-fetched;
+    markets are always fetched, since their prices move.
+    """
+    locations = list(locations)
+    missing = [(system, waypoint) for system, waypoint in locations if not snapshot["waypoints"].get(waypoint)]
+    waypoint_results = await asyncio.gather(
+        *(client.fetch_waypoint(system, waypoint, logger=logger) for system, waypoint in missing)
+    )
+    for (_, waypoint), res in zip(missing, waypoint_results):
+        _store_result(snapshot, snapshot["waypoints"], waypoint, f"waypoint {waypoint}", res)
+    marketplaces = []
+    for system, waypoint in locations:
+        traits = (snapshot["waypoints"].get(waypoint) or {}).get("traits") or []
+        if any(t.get("symbol") == "MARKETPLACE" for t in traits if isinstance(t, dict)):
+            marketplaces.append((system, waypoint))
+
+    market_results = await asyncio.gather(
+        *(client.fetch_market(system, waypoint, logger=logger) for system, waypoint in marketplaces)
+    )
+    for (_, waypoint), res in zip(marketplaces, market_results):
+        _store_result(snapshot, snapshot["markets"], waypoint, f"market {waypoint}", res)
+
+
+async def refresh_state_async(client: AsyncSpaceTradersClient, logger: Optional[logging.Logger] = None) -> Dict[str, Any]:
+    """Fetch agent, fleet, contracts and local waypoints/markets concurrently.
+
+    Ships and contracts are fully paginated. Requests are issued in
+    dependency waves (fleet first, then the waypoints
+    the fleet sits at, then markets at those waypoints); each wave is gathered
+    so wall time tracks the slowest call rather than the sum of all of them.
     """
-    client = build_client()
     snapshot: Dict[str, Any] = {
         "source": "SpaceTraders",
         "agent": None,
         "ships": None,
+        "contracts": None,
+        "waypoints": {},
+        "markets": {},
         "errors": [],
     }
-    if client is None:
-        snapshot["errors"].append("No SPACETRADERS_TOKEN configured or client unavailable")
-        return snapshot
 
-    agent_res: APIResult = fetch_my_agent(client, logger=logger)
-    if agent_res.ok and agent_res.json is not None:
-        snapshot["agent"] = agent_res.json.get("data")
-    else:
-        snapshot["errors"].append(f"agent: {agent_res.error or agent_res.status}")
+    async def _collect_into(key: str, iterator: Any) -> None:
+        try:
+            snapshot[key] = await collect(iterator)
+        except RuntimeError as exc:
+            snapshot["errors"].append(f"{key}: {exc}")
 
-    ships_res: APIResult = fetch_my_ships(client, page=1, limit=20, logger=logger)
-    if ships_res.ok and ships_res.json is not None:
-        snapshot["ships"] = ships_res.json.get("data")
-    else:
-        snapshot["errors"].append(f"ships: {ships_res.error or ships_res.status}")
+    agent_res, _, _ = await asyncio.gather(
+        client.fetch_my_agent(logger=logger),
+        _collect_into("ships", aiter_my_ships(client)),
+        _collect_into("contracts", aiter_my_contracts(client)),
+    )
+    _store_result(snapshot, snapshot, "agent", "agent", agent_res)
+    ships = snapshot["ships"] or []
+
+    await fetch_locations(client, snapshot, ship_locations(ships), logger=logger)
 
     return snapshot
+
+
+def refresh_state(logger: Optional[logging.Logger] = None) -> Dict[str, Any]:
+    """Fetch authoritative state from SpaceTraders API (if configured).
+
+    Returns a dict summary safe for prompt inclusion and persistence.
+    If API token is missing, returns an empty snapshot with a reason.
+    """
+    client = get_async_client()
+    if client is None:
+        return {
+            "source": "SpaceTraders",
+            "agent": None,
+            "ships": None,
+            "errors": ["No SPACETRADERS_TOKEN configured or client unavailable"],
+        }
+
+    return run_sync(refresh_state_async(client, logger=logger))
@@ -0,0 +1,82 @@
+"""Alternative HTTP transport for the generated client backed by httpx.
+
+The generated `RESTClientObject` uses urllib3, which only speaks HTTP/1.1.
+`HttpxRESTClient` implements the same `request()` contract on top of a
+long-lived `httpx.Client`, optionally with HTTP/2 so concurrent requests share
+one multiplexed TLS connection. HTTP/2 needs the optional `h2` package
+(`pip install httpx[http2]`); without it we fall back to HTTP/1.1.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import logging
+import ssl
+from typing import Any, Optional
+
+import httpx
+import urllib3
+
+from .spacetraders_client import ApiClient  # noqa: F401  (ensures codegen is on sys.path)
+
+from spacetraders_api_client import rest
+from spacetraders_api_client.exceptions import ApiException, ApiValueError
+
+log = logging.getLogger("agent.transport")
+
+
+def http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class HttpxRESTClient:
+    """Drop-in replacement for `rest.RESTClientObject` using httpx."""
+
+    def __init__(self, configuration: Any, pool_maxsize: int, http2: bool = False) -> None:
+        if http2 and not http2_available():
+            log.warning("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+        verify: Any = configuration.verify_ssl
+        if verify and configuration.ssl_ca_cert:
+            verify = ssl.create_default_context(cafile=configuration.ssl_ca_cert)
+        self.client = httpx.Client(http2=http2, limits=limits, verify=verify, proxy=configuration.proxy)
+
+    def request(self, method, url, headers=None, body=None, post_params=None, _request_timeout=None):
+        method = method.upper()
+        if post_params and body:
+            raise ApiValueError("body parameter cannot be used with post_params parameter.")
+
+        timeout: Optional[httpx.Timeout] = None
+        if isinstance(_request_timeout, (int, float)):
+            timeout = httpx.Timeout(_request_timeout)
+        elif isinstance(_request_timeout, tuple) and len(_request_timeout) == 2:
+            timeout = httpx.Timeout(_request_timeout[1], connect=_request_timeout[0])
+
+        kwargs: dict = {"headers": headers or {}}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        if body is not None:
+            kwargs["content"] = body if isinstance(body, (str, bytes)) else json.dumps(body)
+        elif post_params:
+            kwargs["data"] = dict(post_params)
+
+        try:
+            resp = self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            raise ApiException(status=0, reason=f"{type(e).__name__}\n{e}")
+
+        # Present the response as a urllib3.HTTPResponse so everything
+        # downstream (RESTResponse, _parse_response) sees the usual shape.
+        raw = urllib3.HTTPResponse(
+            body=resp.content,
+            headers=dict(resp.headers),
+            status=resp.status_code,
+            reason=resp.reason_phrase,
+            preload_content=True,
+        )
+        return rest.RESTResponse(raw)
+
+    def close(self) -> None:
+        self.client.close()
@@ -0,0 +1,262 @@
+"""Indexed, in-memory model of the game world.
+
+`refresh_state` returns a loose snapshot dict, and every consumer used to
+rescan its `ships` list to answer questions like "which ships are docked at
+X1-A-1?". `WorldModel` holds the same API dicts keyed by symbol and keeps
+secondary indexes up to date as objects are upserted:
+
+- ships by waypoint, nav status and registration role
+- waypoints by system, type and trait
+- markets by trade symbol (exports, imports, exchange and priced goods)
+
+Each lookup is a dict hit returning a `frozenset` of symbols. `ship(symbol)`
+and friends return read-only mappings over the stored dicts, and
+`ship_model(symbol)` returns a lazy view of the generated model
+(`fastmodels.lazy_view`), so planners and prompt building can read state
+without copying or validating it. Views are shallow: nested dicts are the
+stored ones and must not be modified.
+
+The model takes ownership of the dicts it is given and is not thread-safe;
+`IncrementalRefresher` owns one and updates it between loop iterations.
+Components that follow ship changes (see `readiness.py`) register with
+`add_ship_listener`.
+"""
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from .fastmodels import LazyModel, lazy_view
+from .spacetraders_client import models
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+# Called with (symbol, ship) after an upsert and (symbol, None) after a removal.
+ShipListener = Callable[[str, Optional[Dict[str, Any]]], None]
+
+
+class _Index:
+    """Maps keys to the set of symbols that carry them; one symbol may carry many keys."""
+
+    __slots__ = ("_members", "_keys")
+
+    def __init__(self) -> None:
+        self._members: Dict[str, Set[str]] = {}
+        self._keys: Dict[str, Tuple[str, ...]] = {}
+
+    def set(self, symbol: str, keys: Iterable[Optional[str]]) -> None:
+        new = tuple(sorted({key for key in keys if key}))
+        old = self._keys.get(symbol, ())
+        if new == old:
+            return
+        self.discard(symbol)
+        for key in new:
+            self._members.setdefault(key, set()).add(symbol)
+        if new:
+            self._keys[symbol] = new
+
+    def discard(self, symbol: str) -> None:
+        for key in self._keys.pop(symbol, ()):
+            members = self._members[key]
+            members.discard(symbol)
+            if not members:
+                del self._members[key]
+
+    def get(self, key: str) -> FrozenSet[str]:
+        members = self._members.get(key)
+        return frozenset(members) if members else _EMPTY
+
+    def counts(self) -> Dict[str, int]:
+        return {key: len(members) for key, members in self._members.items()}
+
+
+def _get(obj: Any, *path: str) -> Any:
+    for name in path:
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(name)
+    return obj
+
+
+def _symbols(items: Any) -> List[Optional[str]]:
+    return [item.get("symbol") for item in items or () if isinstance(item, dict)]
+
+
+def market_goods(market: Dict[str, Any]) -> List[Optional[str]]:
+    """Every trade symbol a market lists, priced or not."""
+    goods: List[Optional[str]] = []
+    for key in ("exports", "imports", "exchange", "tradeGoods"):
+        goods.extend(_symbols(market.get(key)))
+    return goods
+
+
+class WorldModel:
+    """Ships, waypoints, markets, contracts and the agent, indexed by symbol."""
+
+    def __init__(self) -> None:
+        self.agent: Optional[Dict[str, Any]] = None
+        self.contracts: Optional[List[Dict[str, Any]]] = None
+        self._ships: Dict[str, Dict[str, Any]] = {}
+        self._waypoints: Dict[str, Dict[str, Any]] = {}
+        self._markets: Dict[str, Dict[str, Any]] = {}
+        self._ships_by_waypoint = _Index()
+        self._ships_by_status = _Index()
+        self._ships_by_role = _Index()
+        self._waypoints_by_system = _Index()
+        self._waypoints_by_type = _Index()
+        self._waypoints_by_trait = _Index()
+        self._markets_by_good = _Index()
+        self._ship_listeners: List[ShipListener] = []
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Mapping[str, Any]) -> "WorldModel":
+        world = cls()
+        world.update(snapshot)
+        return world
+
+    def add_ship_listener(self, listener: ShipListener) -> None:
+        """Call `listener` whenever a ship is upserted or removed."""
+        self._ship_listeners.append(listener)
+
+    # ------------------------------------------------------------------ updates
+
+    def update(self, snapshot: Mapping[str, Any]) -> None:
+        """Merge a `refresh_state` snapshot.
+
+        Keys that are missing or None (a failed fetch) leave the current state
+        alone. A `ships` list is the whole fleet, so ships missing from it are
+        dropped; waypoints and markets are merged.
+        """
+        if snapshot.get("agent") is not None:
+            self.agent = snapshot["agent"]
+        if snapshot.get("contracts") is not None:
+            self.contracts = snapshot["contracts"]
+        if snapshot.get("ships") is not None:
+            self.replace_ships(snapshot["ships"])
+        for waypoint in (snapshot.get("waypoints") or {}).values():
+            self.upsert_waypoint(waypoint)
+        for market in (snapshot.get("markets") or {}).values():
+            self.upsert_market(market)
+
+    def replace_ships(self, ships: Iterable[Any]) -> None:
+        """Make `ships` the whole fleet."""
+        ships = [ship for ship in ships if isinstance(ship, dict) and ship.get("symbol")]
+        keep = {ship["symbol"] for ship in ships}
+        for symbol in [symbol for symbol in self._ships if symbol not in keep]:
+            self.remove_ship(symbol)
+        for ship in ships:
+            self.upsert_ship(ship)
+
+    def upsert_ship(self, ship: Dict[str, Any]) -> None:
+        symbol = ship["symbol"]
+        self._ships[symbol] = ship
+        self._ships_by_waypoint.set(symbol, [_get(ship, "nav", "waypointSymbol")])
+        self._ships_by_status.set(symbol, [_get(ship, "nav", "status")])
+        self._ships_by_role.set(symbol, [_get(ship, "registration", "role")])
+        for listener in self._ship_listeners:
+            listener(symbol, ship)
+
+    def remove_ship(self, symbol: str) -> None:
+        if self._ships.pop(symbol, None) is None:
+            return
+        for index in (self._ships_by_waypoint, self._ships_by_status, self._ships_by_role):
+            index.discard(symbol)
+        for listener in self._ship_listeners:
+            listener(symbol, None)
+
+    def upsert_waypoint(self, waypoint: Any) -> None:
+        if not isinstance(waypoint, dict) or not waypoint.get("symbol"):
+            return
+        symbol = waypoint["symbol"]
+        self._waypoints[symbol] = waypoint
+        self._waypoints_by_system.set(symbol, [waypoint.get("systemSymbol")])
+        self._waypoints_by_type.set(symbol, [waypoint.get("type")])
+        self._waypoints_by_trait.set(symbol, _symbols(waypoint.get("traits")))
+
+    def upsert_market(self, market: Any) -> None:
+        if not isinstance(market, dict) or not market.get("symbol"):
+            return
+        symbol = market["symbol"]
+        self._markets[symbol] = market
+        self._markets_by_good.set(symbol, market_goods(market))
+
+    # ------------------------------------------------------------------ views
+
+    def ship(self, symbol: str) -> Optional[Mapping[str, Any]]:
+        ship = self._ships.get(symbol)
+        return None if ship is None else MappingProxyType(ship)
+
+    def ship_model(self, symbol: str) -> Optional[LazyModel]:
+        """The ship as a lazy `models.Ship` view."""
+        return lazy_view(models.Ship, self._ships.get(symbol))
+
+    def waypoint(self, symbol: str) -> Optional[Mapping[str, Any]]:
+        waypoint = self._waypoints.get(symbol)
+        return None if waypoint is None else MappingProxyType(waypoint)
+
+    def waypoint_model(self, symbol: str) -> Optional[LazyModel]:
+        return lazy_view(models.Waypoint, self._waypoints.get(symbol))
+
+    def market(self, symbol: str) -> Optional[Mapping[str, Any]]:
+        market = self._markets.get(symbol)
+        return None if market is None else MappingProxyType(market)
+
+    def market_model(self, symbol: str) -> Optional[LazyModel]:
+        return lazy_view(models.Market, self._markets.get(symbol))
+
+    def ships(self, symbols: Optional[Iterable[str]] = None) -> Iterator[Mapping[str, Any]]:
+        """Read-only views of the given ships (default: the whole fleet)."""
+        for symbol in self._ships if symbols is None else symbols:
+            ship = self._ships.get(symbol)
+            if ship is not None:
+                yield MappingProxyType(ship)
+
+    def fleet(self) -> List[Dict[str, Any]]:
+        """The stored ship dicts, in insertion order, for snapshots and persistence."""
+        return list(self._ships.values())
+
+    def ship_symbols(self) -> FrozenSet[str]:
+        return frozenset(self._ships)
+
+    # ------------------------------------------------------------------ indexes
+
+    def ships_at(self, waypoint_symbol: str) -> FrozenSet[str]:
+        return self._ships_by_waypoint.get(waypoint_symbol)
+
+    def ships_with_status(self, status: str) -> FrozenSet[str]:
+        return self._ships_by_status.get(status)
+
+    def ships_with_role(self, role: str) -> FrozenSet[str]:
+        return self._ships_by_role.get(role)
+
+    def status_counts(self) -> Dict[str, int]:
+        """Ships per nav status; ships without one are not counted."""
+        return self._ships_by_status.counts()
+
+    def waypoints_in(self, system_symbol: str) -> FrozenSet[str]:
+        return self._waypoints_by_system.get(system_symbol)
+
+    def waypoints_of_type(self, waypoint_type: str) -> FrozenSet[str]:
+        return self._waypoints_by_type.get(waypoint_type)
+
+    def waypoints_with_trait(self, trait: str) -> FrozenSet[str]:
+        return self._waypoints_by_trait.get(trait)
+
+    def markets_trading(self, trade_symbol: str) -> FrozenSet[str]:
+        """Waypoints whose market lists `trade_symbol`."""
+        return self._markets_by_good.get(trade_symbol)
+
+    def __len__(self) -> int:
+        return len(self._ships)
+
+    # ------------------------------------------------------------------ export
+
+    def to_snapshot(self) -> Dict[str, Any]:
+        """The state as a `refresh_state`-shaped dict (shares the stored dicts)."""
+        return {
+            "agent": self.agent,
+            "ships": self.fleet(),
+            "contracts": self.contracts,
+            "waypoints": dict(self._waypoints),
+            "markets": dict(self._markets),
+        }
@@ -231,217 +231,447 @@ __all__ = [
 ]
 
 # import apis into sdk package
-from spacetraders_api_client.api.agents_api import AgentsApi as AgentsApi
-from spacetraders_api_client.api.contracts_api import ContractsApi as ContractsApi
-from spacetraders_api_client.api.data_api import DataApi as DataApi
-from spacetraders_api_client.api.factions_api import FactionsApi as FactionsApi
-from spacetraders_api_client.api.fleet_api import FleetApi as FleetApi
-from spacetraders_api_client.api.global_api import GlobalApi as GlobalApi
-from spacetraders_api_client.api.systems_api import SystemsApi as SystemsApi
 
 # import ApiClient
-from spacetraders_api_client.api_response import ApiResponse as ApiResponse
-from spacetraders_api_client.api_client import ApiClient as ApiClient
-from spacetraders_api_client.configuration import Configuration as Configuration
-from spacetraders_api_client.exceptions import OpenApiException as OpenApiException
-from spacetraders_api_client.exceptions import ApiTypeError as ApiTypeError
-from spacetraders_api_client.exceptions import ApiValueError as ApiValueError
-from spacetraders_api_client.exceptions import ApiKeyError as ApiKeyError
-from spacetraders_api_client.exceptions import ApiAttributeError as ApiAttributeError
-from spacetraders_api_client.exceptions import ApiException as ApiException
 
 # import models into sdk package
-from spacetraders_api_client.models.accept_contract200_response import AcceptContract200Response as AcceptContract200Response
-from spacetraders_api_client.models.accept_contract200_response_data import AcceptContract200ResponseData as AcceptContract200ResponseData
-from spacetraders_api_client.models.activity_level import ActivityLevel as ActivityLevel
-from spacetraders_api_client.models.agent import Agent as Agent
-from spacetraders_api_client.models.chart import Chart as Chart
-from spacetraders_api_client.models.construction import Construction as Construction
-from spacetraders_api_client.models.construction_material import ConstructionMaterial as ConstructionMaterial
-from spacetraders_api_client.models.contract import Contract as Contract
-from spacetraders_api_client.models.contract_deliver_good import ContractDeliverGood as ContractDeliverGood
-from spacetraders_api_client.models.contract_payment import ContractPayment as ContractPayment
-from spacetraders_api_client.models.contract_terms import ContractTerms as ContractTerms
-from spacetraders_api_client.models.cooldown import Cooldown as Cooldown
-from spacetraders_api_client.models.create_chart201_response import CreateChart201Response as CreateChart201Response
-from spacetraders_api_client.models.create_chart201_response_data import CreateChart201ResponseData as CreateChart201ResponseData
-from spacetraders_api_client.models.create_ship_ship_scan201_response import CreateShipShipScan201Response as CreateShipShipScan201Response
-from spacetraders_api_client.models.create_ship_ship_scan201_response_data import CreateShipShipScan201ResponseData as CreateShipShipScan201ResponseData
-from spacetraders_api_client.models.create_ship_system_scan201_response import CreateShipSystemScan201Response as CreateShipSystemScan201Response
-from spacetraders_api_client.models.create_ship_system_scan201_response_data import CreateShipSystemScan201ResponseData as CreateShipSystemScan201ResponseData
-from spacetraders_api_client.models.create_ship_waypoint_scan201_response import CreateShipWaypointScan201Response as CreateShipWaypointScan201Response
-from spacetraders_api_client.models.create_ship_waypoint_scan201_response_data import CreateShipWaypointScan201ResponseData as CreateShipWaypointScan201ResponseData
-from spacetraders_api_client.models.create_survey201_response import CreateSurvey201Response as CreateSurvey201Response
-from spacetraders_api_client.models.create_survey201_response_data import CreateSurvey201ResponseData as CreateSurvey201ResponseData
-from spacetraders_api_client.models.deliver_contract200_response import DeliverContract200Response as DeliverContract200Response
-from spacetraders_api_client.models.deliver_contract200_response_data import DeliverContract200ResponseData as DeliverContract200ResponseData
-from spacetraders_api_client.models.deliver_contract_request import DeliverContractRequest as DeliverContractRequest
-from spacetraders_api_client.models.dock_ship200_response import DockShip200Response as DockShip200Response
-from spacetraders_api_client.models.extract_resources201_response import ExtractResources201Response as ExtractResources201Response
-from spacetraders_api_client.models.extract_resources201_response_data import ExtractResources201ResponseData as ExtractResources201ResponseData
-from spacetraders_api_client.models.extract_resources_request import ExtractResourcesRequest as ExtractResourcesRequest
-from spacetraders_api_client.models.extract_resources_with_survey201_response import ExtractResourcesWithSurvey201Response as ExtractResourcesWithSurvey201Response
-from spacetraders_api_client.models.extract_resources_with_survey201_response_data import ExtractResourcesWithSurvey201ResponseData as ExtractResourcesWithSurvey201ResponseData
-from spacetraders_api_client.models.extraction import Extraction as Extraction
-from spacetraders_api_client.models.extraction_yield import ExtractionYield as ExtractionYield
-from spacetraders_api_client.models.faction import Faction as Faction
-from spacetraders_api_client.models.faction_symbol import FactionSymbol as FactionSymbol
-from spacetraders_api_client.models.faction_trait import FactionTrait as FactionTrait
-from spacetraders_api_client.models.faction_trait_symbol import FactionTraitSymbol as FactionTraitSymbol
-from spacetraders_api_client.models.fulfill_contract200_response import FulfillContract200Response as FulfillContract200Response
-from spacetraders_api_client.models.get_agents200_response import GetAgents200Response as GetAgents200Response
-from spacetraders_api_client.models.get_construction200_response import GetConstruction200Response as GetConstruction200Response
-from spacetraders_api_client.models.get_contract200_response import GetContract200Response as GetContract200Response
-from spacetraders_api_client.models.get_contracts200_response import GetContracts200Response as GetContracts200Response
-from spacetraders_api_client.models.get_faction200_response import GetFaction200Response as GetFaction200Response
-from spacetraders_api_client.models.get_factions200_response import GetFactions200Response as GetFactions200Response
-from spacetraders_api_client.models.get_jump_gate200_response import GetJumpGate200Response as GetJumpGate200Response
-from spacetraders_api_client.models.get_market200_response import GetMarket200Response as GetMarket200Response
-from spacetraders_api_client.models.get_mounts200_response import GetMounts200Response as GetMounts200Response
-from spacetraders_api_client.models.get_my_agent200_response import GetMyAgent200Response as GetMyAgent200Response
-from spacetraders_api_client.models.get_my_ship200_response import GetMyShip200Response as GetMyShip200Response
-from spacetraders_api_client.models.get_my_ship_cargo200_response import GetMyShipCargo200Response as GetMyShipCargo200Response
-from spacetraders_api_client.models.get_my_ships200_response import GetMyShips200Response as GetMyShips200Response
-from spacetraders_api_client.models.get_repair_ship200_response import GetRepairShip200Response as GetRepairShip200Response
-from spacetraders_api_client.models.get_repair_ship200_response_data import GetRepairShip200ResponseData as GetRepairShip200ResponseData
-from spacetraders_api_client.models.get_scrap_ship200_response import GetScrapShip200Response as GetScrapShip200Response
-from spacetraders_api_client.models.get_scrap_ship200_response_data import GetScrapShip200ResponseData as GetScrapShip200ResponseData
-from spacetraders_api_client.models.get_ship_cooldown200_response import GetShipCooldown200Response as GetShipCooldown200Response
-from spacetraders_api_client.models.get_ship_modules200_response import GetShipModules200Response as GetShipModules200Response
-from spacetraders_api_client.models.get_ship_nav200_response import GetShipNav200Response as GetShipNav200Response
-from spacetraders_api_client.models.get_shipyard200_response import GetShipyard200Response as GetShipyard200Response
-from spacetraders_api_client.models.get_status200_response import GetStatus200Response as GetStatus200Response
-from spacetraders_api_client.models.get_status200_response_announcements_inner import GetStatus200ResponseAnnouncementsInner as GetStatus200ResponseAnnouncementsInner
-from spacetraders_api_client.models.get_status200_response_leaderboards import GetStatus200ResponseLeaderboards as GetStatus200ResponseLeaderboards
-from spacetraders_api_client.models.get_status200_response_leaderboards_most_credits_inner import GetStatus200ResponseLeaderboardsMostCreditsInner as GetStatus200ResponseLeaderboardsMostCreditsInner
-from spacetraders_api_client.models.get_status200_response_leaderboards_most_submitted_charts_inner import GetStatus200ResponseLeaderboardsMostSubmittedChartsInner as GetStatus200ResponseLeaderboardsMostSubmittedChartsInner
-from spacetraders_api_client.models.get_status200_response_links_inner import GetStatus200ResponseLinksInner as GetStatus200ResponseLinksInner
-from spacetraders_api_client.models.get_status200_response_server_resets import GetStatus200ResponseServerResets as GetStatus200ResponseServerResets
-from spacetraders_api_client.models.get_status200_response_stats import GetStatus200ResponseStats as GetStatus200ResponseStats
-from spacetraders_api_client.models.get_supply_chain200_response import GetSupplyChain200Response as GetSupplyChain200Response
-from spacetraders_api_client.models.get_supply_chain200_response_data import GetSupplyChain200ResponseData as GetSupplyChain200ResponseData
-from spacetraders_api_client.models.get_system200_response import GetSystem200Response as GetSystem200Response
-from spacetraders_api_client.models.get_system_waypoints200_response import GetSystemWaypoints200Response as GetSystemWaypoints200Response
-from spacetraders_api_client.models.get_system_waypoints_traits_parameter import GetSystemWaypointsTraitsParameter as GetSystemWaypointsTraitsParameter
-from spacetraders_api_client.models.get_systems200_response import GetSystems200Response as GetSystems200Response
-from spacetraders_api_client.models.get_waypoint200_response import GetWaypoint200Response as GetWaypoint200Response
-from spacetraders_api_client.models.install_mount201_response import InstallMount201Response as InstallMount201Response
-from spacetraders_api_client.models.install_mount201_response_data import InstallMount201ResponseData as InstallMount201ResponseData
-from spacetraders_api_client.models.install_mount_request import InstallMountRequest as InstallMountRequest
-from spacetraders_api_client.models.install_ship_module201_response import InstallShipModule201Response as InstallShipModule201Response
-from spacetraders_api_client.models.install_ship_module201_response_data import InstallShipModule201ResponseData as InstallShipModule201ResponseData
-from spacetraders_api_client.models.install_ship_module201_response_data_transaction import InstallShipModule201ResponseDataTransaction as InstallShipModule201ResponseDataTransaction
-from spacetraders_api_client.models.install_ship_module_request import InstallShipModuleRequest as InstallShipModuleRequest
-from spacetraders_api_client.models.jettison200_response import Jettison200Response as Jettison200Response
-from spacetraders_api_client.models.jettison200_response_data import Jettison200ResponseData as Jettison200ResponseData
-from spacetraders_api_client.models.jettison_request import JettisonRequest as JettisonRequest
-from spacetraders_api_client.models.jump_gate import JumpGate as JumpGate
-from spacetraders_api_client.models.jump_ship200_response import JumpShip200Response as JumpShip200Response
-from spacetraders_api_client.models.jump_ship200_response_data import JumpShip200ResponseData as JumpShip200ResponseData
-from spacetraders_api_client.models.jump_ship_request import JumpShipRequest as JumpShipRequest
-from spacetraders_api_client.models.market import Market as Market
-from spacetraders_api_client.models.market_trade_good import MarketTradeGood as MarketTradeGood
-from spacetraders_api_client.models.market_transaction import MarketTransaction as MarketTransaction
-from spacetraders_api_client.models.meta import Meta as Meta
-from spacetraders_api_client.models.navigate_ship200_response import NavigateShip200Response as NavigateShip200Response
-from spacetraders_api_client.models.navigate_ship200_response_data import NavigateShip200ResponseData as NavigateShip200ResponseData
-from spacetraders_api_client.models.navigate_ship_request import NavigateShipRequest as NavigateShipRequest
-from spacetraders_api_client.models.negotiate_contract200_response import NegotiateContract200Response as NegotiateContract200Response
-from spacetraders_api_client.models.negotiate_contract200_response_data import NegotiateContract200ResponseData as NegotiateContract200ResponseData
-from spacetraders_api_client.models.orbit_ship200_response import OrbitShip200Response as OrbitShip200Response
-from spacetraders_api_client.models.orbit_ship200_response_data import OrbitShip200ResponseData as OrbitShip200ResponseData
-from spacetraders_api_client.models.patch_ship_nav200_response import PatchShipNav200Response as PatchShipNav200Response
-from spacetraders_api_client.models.patch_ship_nav200_response_data import PatchShipNav200ResponseData as PatchShipNav200ResponseData
-from spacetraders_api_client.models.patch_ship_nav_request import PatchShipNavRequest as PatchShipNavRequest
-from spacetraders_api_client.models.purchase_cargo201_response import PurchaseCargo201Response as PurchaseCargo201Response
-from spacetraders_api_client.models.purchase_cargo_request import PurchaseCargoRequest as PurchaseCargoRequest
-from spacetraders_api_client.models.purchase_ship201_response import PurchaseShip201Response as PurchaseShip201Response
-from spacetraders_api_client.models.purchase_ship201_response_data import PurchaseShip201ResponseData as PurchaseShip201ResponseData
-from spacetraders_api_client.models.purchase_ship_request import PurchaseShipRequest as PurchaseShipRequest
-from spacetraders_api_client.models.refuel_ship200_response import RefuelShip200Response as RefuelShip200Response
-from spacetraders_api_client.models.refuel_ship200_response_data import RefuelShip200ResponseData as RefuelShip200ResponseData
-from spacetraders_api_client.models.refuel_ship_request import RefuelShipRequest as RefuelShipRequest
-from spacetraders_api_client.models.register201_response import Register201Response as Register201Response
-from spacetraders_api_client.models.register201_response_data import Register201ResponseData as Register201ResponseData
-from spacetraders_api_client.models.register_request import RegisterRequest as RegisterRequest
-from spacetraders_api_client.models.remove_module201_response import RemoveModule201Response as RemoveModule201Response
-from spacetraders_api_client.models.remove_mount201_response import RemoveMount201Response as RemoveMount201Response
-from spacetraders_api_client.models.remove_mount201_response_data import RemoveMount201ResponseData as RemoveMount201ResponseData
-from spacetraders_api_client.models.remove_mount_request import RemoveMountRequest as RemoveMountRequest
-from spacetraders_api_client.models.remove_ship_module_request import RemoveShipModuleRequest as RemoveShipModuleRequest
-from spacetraders_api_client.models.repair_ship200_response import RepairShip200Response as RepairShip200Response
-from spacetraders_api_client.models.repair_ship200_response_data import RepairShip200ResponseData as RepairShip200ResponseData
-from spacetraders_api_client.models.repair_transaction import RepairTransaction as RepairTransaction
-from spacetraders_api_client.models.scanned_ship import ScannedShip as ScannedShip
-from spacetraders_api_client.models.scanned_ship_engine import ScannedShipEngine as ScannedShipEngine
-from spacetraders_api_client.models.scanned_ship_frame import ScannedShipFrame as ScannedShipFrame
-from spacetraders_api_client.models.scanned_ship_mounts_inner import ScannedShipMountsInner as ScannedShipMountsInner
-from spacetraders_api_client.models.scanned_ship_reactor import ScannedShipReactor as ScannedShipReactor
-from spacetraders_api_client.models.scanned_system import ScannedSystem as ScannedSystem
-from spacetraders_api_client.models.scanned_waypoint import ScannedWaypoint as ScannedWaypoint
-from spacetraders_api_client.models.scrap_ship200_response import ScrapShip200Response as ScrapShip200Response
-from spacetraders_api_client.models.scrap_ship200_response_data import ScrapShip200ResponseData as ScrapShip200ResponseData
-from spacetraders_api_client.models.scrap_transaction import ScrapTransaction as ScrapTransaction
-from spacetraders_api_client.models.sell_cargo201_response import SellCargo201Response as SellCargo201Response
-from spacetraders_api_client.models.sell_cargo201_response_data import SellCargo201ResponseData as SellCargo201ResponseData
-from spacetraders_api_client.models.sell_cargo_request import SellCargoRequest as SellCargoRequest
-from spacetraders_api_client.models.ship import Ship as Ship
-from spacetraders_api_client.models.ship_cargo import ShipCargo as ShipCargo
-from spacetraders_api_client.models.ship_cargo_item import ShipCargoItem as ShipCargoItem
-from spacetraders_api_client.models.ship_condition_event import ShipConditionEvent as ShipConditionEvent
-from spacetraders_api_client.models.ship_crew import ShipCrew as ShipCrew
-from spacetraders_api_client.models.ship_engine import ShipEngine as ShipEngine
-from spacetraders_api_client.models.ship_frame import ShipFrame as ShipFrame
-from spacetraders_api_client.models.ship_fuel import ShipFuel as ShipFuel
-from spacetraders_api_client.models.ship_fuel_consumed import ShipFuelConsumed as ShipFuelConsumed
-from spacetraders_api_client.models.ship_modification_transaction import ShipModificationTransaction as ShipModificationTransaction
-from spacetraders_api_client.models.ship_module import ShipModule as ShipModule
-from spacetraders_api_client.models.ship_mount import ShipMount as ShipMount
-from spacetraders_api_client.models.ship_nav import ShipNav as ShipNav
-from spacetraders_api_client.models.ship_nav_flight_mode import ShipNavFlightMode as ShipNavFlightMode
-from spacetraders_api_client.models.ship_nav_route import ShipNavRoute as ShipNavRoute
-from spacetraders_api_client.models.ship_nav_route_waypoint import ShipNavRouteWaypoint as ShipNavRouteWaypoint
-from spacetraders_api_client.models.ship_nav_status import ShipNavStatus as ShipNavStatus
-from spacetraders_api_client.models.ship_reactor import ShipReactor as ShipReactor
-from spacetraders_api_client.models.ship_refine201_response import ShipRefine201Response as ShipRefine201Response
-from spacetraders_api_client.models.ship_refine201_response_data import ShipRefine201ResponseData as ShipRefine201ResponseData
-from spacetraders_api_client.models.ship_refine201_response_data_produced_inner import ShipRefine201ResponseDataProducedInner as ShipRefine201ResponseDataProducedInner
-from spacetraders_api_client.models.ship_refine_request import ShipRefineRequest as ShipRefineRequest
-from spacetraders_api_client.models.ship_registration import ShipRegistration as ShipRegistration
-from spacetraders_api_client.models.ship_requirements import ShipRequirements as ShipRequirements
-from spacetraders_api_client.models.ship_role import ShipRole as ShipRole
-from spacetraders_api_client.models.ship_type import ShipType as ShipType
-from spacetraders_api_client.models.shipyard import Shipyard as Shipyard
-from spacetraders_api_client.models.shipyard_ship import ShipyardShip as ShipyardShip
-from spacetraders_api_client.models.shipyard_ship_crew import ShipyardShipCrew as ShipyardShipCrew
-from spacetraders_api_client.models.shipyard_ship_types_inner import ShipyardShipTypesInner as ShipyardShipTypesInner
-from spacetraders_api_client.models.shipyard_transaction import ShipyardTransaction as ShipyardTransaction
-from spacetraders_api_client.models.siphon import Siphon as Siphon
-from spacetraders_api_client.models.siphon_resources201_response import SiphonResources201Response as SiphonResources201Response
-from spacetraders_api_client.models.siphon_resources201_response_data import SiphonResources201ResponseData as SiphonResources201ResponseData
-from spacetraders_api_client.models.siphon_yield import SiphonYield as SiphonYield
-from spacetraders_api_client.models.supply_construction201_response import SupplyConstruction201Response as SupplyConstruction201Response
-from spacetraders_api_client.models.supply_construction201_response_data import SupplyConstruction201ResponseData as SupplyConstruction201ResponseData
-from spacetraders_api_client.models.supply_construction_request import SupplyConstructionRequest as SupplyConstructionRequest
-from spacetraders_api_client.models.supply_level import SupplyLevel as SupplyLevel
-from spacetraders_api_client.models.survey import Survey as Survey
-from spacetraders_api_client.models.survey_deposit import SurveyDeposit as SurveyDeposit
-from spacetraders_api_client.models.system import System as System
-from spacetraders_api_client.models.system_faction import SystemFaction as SystemFaction
-from spacetraders_api_client.models.system_type import SystemType as SystemType
-from spacetraders_api_client.models.system_waypoint import SystemWaypoint as SystemWaypoint
-from spacetraders_api_client.models.trade_good import TradeGood as TradeGood
-from spacetraders_api_client.models.trade_symbol import TradeSymbol as TradeSymbol
-from spacetraders_api_client.models.transfer_cargo200_response import TransferCargo200Response as TransferCargo200Response
-from spacetraders_api_client.models.transfer_cargo_request import TransferCargoRequest as TransferCargoRequest
-from spacetraders_api_client.models.warp_ship200_response import WarpShip200Response as WarpShip200Response
-from spacetraders_api_client.models.warp_ship200_response_data import WarpShip200ResponseData as WarpShip200ResponseData
-from spacetraders_api_client.models.waypoint import Waypoint as Waypoint
-from spacetraders_api_client.models.waypoint_faction import WaypointFaction as WaypointFaction
-from spacetraders_api_client.models.waypoint_modifier import WaypointModifier as WaypointModifier
-from spacetraders_api_client.models.waypoint_modifier_symbol import WaypointModifierSymbol as WaypointModifierSymbol
-from spacetraders_api_client.models.waypoint_orbital import WaypointOrbital as WaypointOrbital
-from spacetraders_api_client.models.waypoint_trait import WaypointTrait as WaypointTrait
-from spacetraders_api_client.models.waypoint_trait_symbol import WaypointTraitSymbol as WaypointTraitSymbol
-from spacetraders_api_client.models.waypoint_type import WaypointType as WaypointType
 
+# lazy imports (tools/lazy_init.py)
+import importlib
+import typing
+
+_LAZY_IMPORTS = {
+    "AgentsApi": "spacetraders_api_client.api.agents_api",
+    "ContractsApi": "spacetraders_api_client.api.contracts_api",
+    "DataApi": "spacetraders_api_client.api.data_api",
+    "FactionsApi": "spacetraders_api_client.api.factions_api",
+    "FleetApi": "spacetraders_api_client.api.fleet_api",
+    "GlobalApi": "spacetraders_api_client.api.global_api",
+    "SystemsApi": "spacetraders_api_client.api.systems_api",
+    "ApiResponse": "spacetraders_api_client.api_response",
+    "ApiClient": "spacetraders_api_client.api_client",
+    "Configuration": "spacetraders_api_client.configuration",
+    "OpenApiException": "spacetraders_api_client.exceptions",
+    "ApiTypeError": "spacetraders_api_client.exceptions",
+    "ApiValueError": "spacetraders_api_client.exceptions",
+    "ApiKeyError": "spacetraders_api_client.exceptions",
+    "ApiAttributeError": "spacetraders_api_client.exceptions",
+    "ApiException": "spacetraders_api_client.exceptions",
+    "AcceptContract200Response": "spacetraders_api_client.models.accept_contract200_response",
+    "AcceptContract200ResponseData": "spacetraders_api_client.models.accept_contract200_response_data",
+    "ActivityLevel": "spacetraders_api_client.models.activity_level",
+    "Agent": "spacetraders_api_client.models.agent",
+    "Chart": "spacetraders_api_client.models.chart",
+    "Construction": "spacetraders_api_client.models.construction",
+    "ConstructionMaterial": "spacetraders_api_client.models.construction_material",
+    "Contract": "spacetraders_api_client.models.contract",
+    "ContractDeliverGood": "spacetraders_api_client.models.contract_deliver_good",
+    "ContractPayment": "spacetraders_api_client.models.contract_payment",
+    "ContractTerms": "spacetraders_api_client.models.contract_terms",
+    "Cooldown": "spacetraders_api_client.models.cooldown",
+    "CreateChart201Response": "spacetraders_api_client.models.create_chart201_response",
+    "CreateChart201ResponseData": "spacetraders_api_client.models.create_chart201_response_data",
+    "CreateShipShipScan201Response": "spacetraders_api_client.models.create_ship_ship_scan201_response",
+    "CreateShipShipScan201ResponseData": "spacetraders_api_client.models.create_ship_ship_scan201_response_data",
+    "CreateShipSystemScan201Response": "spacetraders_api_client.models.create_ship_system_scan201_response",
+    "CreateShipSystemScan201ResponseData": "spacetraders_api_client.models.create_ship_system_scan201_response_data",
+    "CreateShipWaypointScan201Response": "spacetraders_api_client.models.create_ship_waypoint_scan201_response",
+    "CreateShipWaypointScan201ResponseData": "spacetraders_api_client.models.create_ship_waypoint_scan201_response_data",
+    "CreateSurvey201Response": "spacetraders_api_client.models.create_survey201_response",
+    "CreateSurvey201ResponseData": "spacetraders_api_client.models.create_survey201_response_data",
+    "DeliverContract200Response": "spacetraders_api_client.models.deliver_contract200_response",
+    "DeliverContract200ResponseData": "spacetraders_api_client.models.deliver_contract200_response_data",
+    "DeliverContractRequest": "spacetraders_api_client.models.deliver_contract_request",
+    "DockShip200Response": "spacetraders_api_client.models.dock_ship200_response",
+    "ExtractResources201Response": "spacetraders_api_client.models.extract_resources201_response",
+    "ExtractResources201ResponseData": "spacetraders_api_client.models.extract_resources201_response_data",
+    "ExtractResourcesRequest": "spacetraders_api_client.models.extract_resources_request",
+    "ExtractResourcesWithSurvey201Response": "spacetraders_api_client.models.extract_resources_with_survey201_response",
+    "ExtractResourcesWithSurvey201ResponseData": "spacetraders_api_client.models.extract_resources_with_survey201_response_data",
+    "Extraction": "spacetraders_api_client.models.extraction",
+    "ExtractionYield": "spacetraders_api_client.models.extraction_yield",
+    "Faction": "spacetraders_api_client.models.faction",
+    "FactionSymbol": "spacetraders_api_client.models.faction_symbol",
+    "FactionTrait": "spacetraders_api_client.models.faction_trait",
+    "FactionTraitSymbol": "spacetraders_api_client.models.faction_trait_symbol",
+    "FulfillContract200Response": "spacetraders_api_client.models.fulfill_contract200_response",
+    "GetAgents200Response": "spacetraders_api_client.models.get_agents200_response",
+    "GetConstruction200Response": "spacetraders_api_client.models.get_construction200_response",
+    "GetContract200Response": "spacetraders_api_client.models.get_contract200_response",
+    "GetContracts200Response": "spacetraders_api_client.models.get_contracts200_response",
+    "GetFaction200Response": "spacetraders_api_client.models.get_faction200_response",
+    "GetFactions200Response": "spacetraders_api_client.models.get_factions200_response",
+    "GetJumpGate200Response": "spacetraders_api_client.models.get_jump_gate200_response",
+    "GetMarket200Response": "spacetraders_api_client.models.get_market200_response",
+    "GetMounts200Response": "spacetraders_api_client.models.get_mounts200_response",
+    "GetMyAgent200Response": "spacetraders_api_client.models.get_my_agent200_response",
+    "GetMyShip200Response": "spacetraders_api_client.models.get_my_ship200_response",
+    "GetMyShipCargo200Response": "spacetraders_api_client.models.get_my_ship_cargo200_response",
+    "GetMyShips200Response": "spacetraders_api_client.models.get_my_ships200_response",
+    "GetRepairShip200Response": "spacetraders_api_client.models.get_repair_ship200_response",
+    "GetRepairShip200ResponseData": "spacetraders_api_client.models.get_repair_ship200_response_data",
+    "GetScrapShip200Response": "spacetraders_api_client.models.get_scrap_ship200_response",
+    "GetScrapShip200ResponseData": "spacetraders_api_client.models.get_scrap_ship200_response_data",
+    "GetShipCooldown200Response": "spacetraders_api_client.models.get_ship_cooldown200_response",
+    "GetShipModules200Response": "spacetraders_api_client.models.get_ship_modules200_response",
+    "GetShipNav200Response": "spacetraders_api_client.models.get_ship_nav200_response",
+    "GetShipyard200Response": "spacetraders_api_client.models.get_shipyard200_response",
+    "GetStatus200Response": "spacetraders_api_client.models.get_status200_response",
+    "GetStatus200ResponseAnnouncementsInner": "spacetraders_api_client.models.get_status200_response_announcements_inner",
+    "GetStatus200ResponseLeaderboards": "spacetraders_api_client.models.get_status200_response_leaderboards",
+    "GetStatus200ResponseLeaderboardsMostCreditsInner": "spacetraders_api_client.models.get_status200_response_leaderboards_most_credits_inner",
+    "GetStatus200ResponseLeaderboardsMostSubmittedChartsInner": "spacetraders_api_client.models.get_status200_response_leaderboards_most_submitted_charts_inner",
+    "GetStatus200ResponseLinksInner": "spacetraders_api_client.models.get_status200_response_links_inner",
+    "GetStatus200ResponseServerResets": "spacetraders_api_client.models.get_status200_response_server_resets",
+    "GetStatus200ResponseStats": "spacetraders_api_client.models.get_status200_response_stats",
+    "GetSupplyChain200Response": "spacetraders_api_client.models.get_supply_chain200_response",
+    "GetSupplyChain200ResponseData": "spacetraders_api_client.models.get_supply_chain200_response_data",
+    "GetSystem200Response": "spacetraders_api_client.models.get_system200_response",
+    "GetSystemWaypoints200Response": "spacetraders_api_client.models.get_system_waypoints200_response",
+    "GetSystemWaypointsTraitsParameter": "spacetraders_api_client.models.get_system_waypoints_traits_parameter",
+    "GetSystems200Response": "spacetraders_api_client.models.get_systems200_response",
+    "GetWaypoint200Response": "spacetraders_api_client.models.get_waypoint200_response",
+    "InstallMount201Response": "spacetraders_api_client.models.install_mount201_response",
+    "InstallMount201ResponseData": "spacetraders_api_client.models.install_mount201_response_data",
+    "InstallMountRequest": "spacetraders_api_client.models.install_mount_request",
+    "InstallShipModule201Response": "spacetraders_api_client.models.install_ship_module201_response",
+    "InstallShipModule201ResponseData": "spacetraders_api_client.models.install_ship_module201_response_data",
+    "InstallShipModule201ResponseDataTransaction": "spacetraders_api_client.models.install_ship_module201_response_data_transaction",
+    "InstallShipModuleRequest": "spacetraders_api_client.models.install_ship_module_request",
+    "Jettison200Response": "spacetraders_api_client.models.jettison200_response",
+    "Jettison200ResponseData": "spacetraders_api_client.models.jettison200_response_data",
+    "JettisonRequest": "spacetraders_api_client.models.jettison_request",
+    "JumpGate": "spacetraders_api_client.models.jump_gate",
+    "JumpShip200Response": "spacetraders_api_client.models.jump_ship200_response",
+    "JumpShip200ResponseData": "spacetraders_api_client.models.jump_ship200_response_data",
+    "JumpShipRequest": "spacetraders_api_client.models.jump_ship_request",
+    "Market": "spacetraders_api_client.models.market",
+    "MarketTradeGood": "spacetraders_api_client.models.market_trade_good",
+    "MarketTransaction": "spacetraders_api_client.models.market_transaction",
+    "Meta": "spacetraders_api_client.models.meta",
+    "NavigateShip200Response": "spacetraders_api_client.models.navigate_ship200_response",
+    "NavigateShip200ResponseData": "spacetraders_api_client.models.navigate_ship200_response_data",
+    "NavigateShipRequest": "spacetraders_api_client.models.navigate_ship_request",
+    "NegotiateContract200Response": "spacetraders_api_client.models.negotiate_contract200_response",
+    "NegotiateContract200ResponseData": "spacetraders_api_client.models.negotiate_contract200_response_data",
+    "OrbitShip200Response": "spacetraders_api_client.models.orbit_ship200_response",
+    "OrbitShip200ResponseData": "spacetraders_api_client.models.orbit_ship200_response_data",
+    "PatchShipNav200Response": "spacetraders_api_client.models.patch_ship_nav200_response",
+    "PatchShipNav200ResponseData": "spacetraders_api_client.models.patch_ship_nav200_response_data",
+    "PatchShipNavRequest": "spacetraders_api_client.models.patch_ship_nav_request",
+    "PurchaseCargo201Response": "spacetraders_api_client.models.purchase_cargo201_response",
+    "PurchaseCargoRequest": "spacetraders_api_client.models.purchase_cargo_request",
+    "PurchaseShip201Response": "spacetraders_api_client.models.purchase_ship201_response",
+    "PurchaseShip201ResponseData": "spacetraders_api_client.models.purchase_ship201_response_data",
+    "PurchaseShipRequest": "spacetraders_api_client.models.purchase_ship_request",
+    "RefuelShip200Response": "spacetraders_api_client.models.refuel_ship200_response",
+    "RefuelShip200ResponseData": "spacetraders_api_client.models.refuel_ship200_response_data",
+    "RefuelShipRequest": "spacetraders_api_client.models.refuel_ship_request",
+    "Register201Response": "spacetraders_api_client.models.register201_response",
+    "Register201ResponseData": "spacetraders_api_client.models.register201_response_data",
+    "RegisterRequest": "spacetraders_api_client.models.register_request",
+    "RemoveModule201Response": "spacetraders_api_client.models.remove_module201_response",
+    "RemoveMount201Response": "spacetraders_api_client.models.remove_mount201_response",
+    "RemoveMount201ResponseData": "spacetraders_api_client.models.remove_mount201_response_data",
+    "RemoveMountRequest": "spacetraders_api_client.models.remove_mount_request",
+    "RemoveShipModuleRequest": "spacetraders_api_client.models.remove_ship_module_request",
+    "RepairShip200Response": "spacetraders_api_client.models.repair_ship200_response",
+    "RepairShip200ResponseData": "spacetraders_api_client.models.repair_ship200_response_data",
+    "RepairTransaction": "spacetraders_api_client.models.repair_transaction",
+    "ScannedShip": "spacetraders_api_client.models.scanned_ship",
+    "ScannedShipEngine": "spacetraders_api_client.models.scanned_ship_engine",
+    "ScannedShipFrame": "spacetraders_api_client.models.scanned_ship_frame",
+    "ScannedShipMountsInner": "spacetraders_api_client.models.scanned_ship_mounts_inner",
+    "ScannedShipReactor": "spacetraders_api_client.models.scanned_ship_reactor",
+    "ScannedSystem": "spacetraders_api_client.models.scanned_system",
+    "ScannedWaypoint": "spacetraders_api_client.models.scanned_waypoint",
+    "ScrapShip200Response": "spacetraders_api_client.models.scrap_ship200_response",
+    "ScrapShip200ResponseData": "spacetraders_api_client.models.scrap_ship200_response_data",
+    "ScrapTransaction": "spacetraders_api_client.models.scrap_transaction",
+    "SellCargo201Response": "spacetraders_api_client.models.sell_cargo201_response",
+    "SellCargo201ResponseData": "spacetraders_api_client.models.sell_cargo201_response_data",
+    "SellCargoRequest": "spacetraders_api_client.models.sell_cargo_request",
+    "Ship": "spacetraders_api_client.models.ship",
+    "ShipCargo": "spacetraders_api_client.models.ship_cargo",
+    "ShipCargoItem": "spacetraders_api_client.models.ship_cargo_item",
+    "ShipConditionEvent": "spacetraders_api_client.models.ship_condition_event",
+    "ShipCrew": "spacetraders_api_client.models.ship_crew",
+    "ShipEngine": "spacetraders_api_client.models.ship_engine",
+    "ShipFrame": "spacetraders_api_client.models.ship_frame",
+    "ShipFuel": "spacetraders_api_client.models.ship_fuel",
+    "ShipFuelConsumed": "spacetraders_api_client.models.ship_fuel_consumed",
+    "ShipModificationTransaction": "spacetraders_api_client.models.ship_modification_transaction",
+    "ShipModule": "spacetraders_api_client.models.ship_module",
+    "ShipMount": "spacetraders_api_client.models.ship_mount",
+    "ShipNav": "spacetraders_api_client.models.ship_nav",
+    "ShipNavFlightMode": "spacetraders_api_client.models.ship_nav_flight_mode",
+    "ShipNavRoute": "spacetraders_api_client.models.ship_nav_route",
+    "ShipNavRouteWaypoint": "spacetraders_api_client.models.ship_nav_route_waypoint",
+    "ShipNavStatus": "spacetraders_api_client.models.ship_nav_status",
+    "ShipReactor": "spacetraders_api_client.models.ship_reactor",
+    "ShipRefine201Response": "spacetraders_api_client.models.ship_refine201_response",
+    "ShipRefine201ResponseData": "spacetraders_api_client.models.ship_refine201_response_data",
+    "ShipRefine201ResponseDataProducedInner": "spacetraders_api_client.models.ship_refine201_response_data_produced_inner",
+    "ShipRefineRequest": "spacetraders_api_client.models.ship_refine_request",
+    "ShipRegistration": "spacetraders_api_client.models.ship_registration",
+    "ShipRequirements": "spacetraders_api_client.models.ship_requirements",
+    "ShipRole": "spacetraders_api_client.models.ship_role",
+    "ShipType": "spacetraders_api_client.models.ship_type",
+    "Shipyard": "spacetraders_api_client.models.shipyard",
+    "ShipyardShip": "spacetraders_api_client.models.shipyard_ship",
+    "ShipyardShipCrew": "spacetraders_api_client.models.shipyard_ship_crew",
+    "ShipyardShipTypesInner": "spacetraders_api_client.models.shipyard_ship_types_inner",
+    "ShipyardTransaction": "spacetraders_api_client.models.shipyard_transaction",
+    "Siphon": "spacetraders_api_client.models.siphon",
+    "SiphonResources201Response": "spacetraders_api_client.models.siphon_resources201_response",
+    "SiphonResources201ResponseData": "spacetraders_api_client.models.siphon_resources201_response_data",
+    "SiphonYield": "spacetraders_api_client.models.siphon_yield",
+    "SupplyConstruction201Response": "spacetraders_api_client.models.supply_construction201_response",
+    "SupplyConstruction201ResponseData": "spacetraders_api_client.models.supply_construction201_response_data",
+    "SupplyConstructionRequest": "spacetraders_api_client.models.supply_construction_request",
+    "SupplyLevel": "spacetraders_api_client.models.supply_level",
+    "Survey": "spacetraders_api_client.models.survey",
+    "SurveyDeposit": "spacetraders_api_client.models.survey_deposit",
+    "System": "spacetraders_api_client.models.system",
+    "SystemFaction": "spacetraders_api_client.models.system_faction",
+    "SystemType": "spacetraders_api_client.models.system_type",
+    "SystemWaypoint": "spacetraders_api_client.models.system_waypoint",
+    "TradeGood": "spacetraders_api_client.models.trade_good",
+    "TradeSymbol": "spacetraders_api_client.models.trade_symbol",
+    "TransferCargo200Response": "spacetraders_api_client.models.transfer_cargo200_response",
+    "TransferCargoRequest": "spacetraders_api_client.models.transfer_cargo_request",
+    "WarpShip200Response": "spacetraders_api_client.models.warp_ship200_response",
+    "WarpShip200ResponseData": "spacetraders_api_client.models.warp_ship200_response_data",
+    "Waypoint": "spacetraders_api_client.models.waypoint",
+    "WaypointFaction": "spacetraders_api_client.models.waypoint_faction",
+    "WaypointModifier": "spacetraders_api_client.models.waypoint_modifier",
+    "WaypointModifierSymbol": "spacetraders_api_client.models.waypoint_modifier_symbol",
+    "WaypointOrbital": "spacetraders_api_client.models.waypoint_orbital",
+    "WaypointTrait": "spacetraders_api_client.models.waypoint_trait",
+    "WaypointTraitSymbol": "spacetraders_api_client.models.waypoint_trait_symbol",
+    "WaypointType": "spacetraders_api_client.models.waypoint_type",
+}
+
+if typing.TYPE_CHECKING:
+    from spacetraders_api_client.api.agents_api import AgentsApi as AgentsApi
+    from spacetraders_api_client.api.contracts_api import ContractsApi as ContractsApi
+    from spacetraders_api_client.api.data_api import DataApi as DataApi
+    from spacetraders_api_client.api.factions_api import FactionsApi as FactionsApi
+    from spacetraders_api_client.api.fleet_api import FleetApi as FleetApi
+    from spacetraders_api_client.api.global_api import GlobalApi as GlobalApi
+    from spacetraders_api_client.api.systems_api import SystemsApi as SystemsApi
+    from spacetraders_api_client.api_response import ApiResponse as ApiResponse
+    from spacetraders_api_client.api_client import ApiClient as ApiClient
+    from spacetraders_api_client.configuration import Configuration as Configuration
+    from spacetraders_api_client.exceptions import OpenApiException as OpenApiException
+    from spacetraders_api_client.exceptions import ApiTypeError as ApiTypeError
+    from spacetraders_api_client.exceptions import ApiValueError as ApiValueError
+    from spacetraders_api_client.exceptions import ApiKeyError as ApiKeyError
+    from spacetraders_api_client.exceptions import ApiAttributeError as ApiAttributeError
+    from spacetraders_api_client.exceptions import ApiException as ApiException
+    from spacetraders_api_client.models.accept_contract200_response import AcceptContract200Response as AcceptContract200Response
+    from spacetraders_api_client.models.accept_contract200_response_data import AcceptContract200ResponseData as AcceptContract200ResponseData
+    from spacetraders_api_client.models.activity_level import ActivityLevel as ActivityLevel
+    from spacetraders_api_client.models.agent import Agent as Agent
+    from spacetraders_api_client.models.chart import Chart as Chart
+    from spacetraders_api_client.models.construction import Construction as Construction
+    from spacetraders_api_client.models.construction_material import ConstructionMaterial as ConstructionMaterial
+    from spacetraders_api_client.models.contract import Contract as Contract
+    from spacetraders_api_client.models.contract_deliver_good import ContractDeliverGood as ContractDeliverGood
+    from spacetraders_api_client.models.contract_payment import ContractPayment as ContractPayment
+    from spacetraders_api_client.models.contract_terms import ContractTerms as ContractTerms
+    from spacetraders_api_client.models.cooldown import Cooldown as Cooldown
+    from spacetraders_api_client.models.create_chart201_response import CreateChart201Response as CreateChart201Response
+    from spacetraders_api_client.models.create_chart201_response_data import CreateChart201ResponseData as CreateChart201ResponseData
+    from spacetraders_api_client.models.create_ship_ship_scan201_response import CreateShipShipScan201Response as CreateShipShipScan201Response
+    from spacetraders_api_client.models.create_ship_ship_scan201_response_data import CreateShipShipScan201ResponseData as CreateShipShipScan201ResponseData
+    from spacetraders_api_client.models.create_ship_system_scan201_response import CreateShipSystemScan201Response as CreateShipSystemScan201Response
+    from spacetraders_api_client.models.create_ship_system_scan201_response_data import CreateShipSystemScan201ResponseData as CreateShipSystemScan201ResponseData
+    from spacetraders_api_client.models.create_ship_waypoint_scan201_response import CreateShipWaypointScan201Response as CreateShipWaypointScan201Response
+    from spacetraders_api_client.models.create_ship_waypoint_scan201_response_data import CreateShipWaypointScan201ResponseData as CreateShipWaypointScan201ResponseData
+    from spacetraders_api_client.models.create_survey201_response import CreateSurvey201Response as CreateSurvey201Response
+    from spacetraders_api_client.models.create_survey201_response_data import CreateSurvey201ResponseData as CreateSurvey201ResponseData
+    from spacetraders_api_client.models.deliver_contract200_response import DeliverContract200Response as DeliverContract200Response
+    from spacetraders_api_client.models.deliver_contract200_response_data import DeliverContract200ResponseData as DeliverContract200ResponseData
+    from spacetraders_api_client.models.deliver_contract_request import DeliverContractRequest as DeliverContractRequest
+    from spacetraders_api_client.models.dock_ship200_response import DockShip200Response as DockShip200Response
+    from spacetraders_api_client.models.extract_resources201_response import ExtractResources201Response as ExtractResources201Response
+    from spacetraders_api_client.models.extract_resources201_response_data import ExtractResources201ResponseData as ExtractResources201ResponseData
+    from spacetraders_api_client.models.extract_resources_request import ExtractResourcesRequest as ExtractResourcesRequest
+    from spacetraders_api_client.models.extract_resources_with_survey201_response import ExtractResourcesWithSurvey201Response as ExtractResourcesWithSurvey201Response
+    from spacetraders_api_client.models.extract_resources_with_survey201_response_data import ExtractResourcesWithSurvey201ResponseData as ExtractResourcesWithSurvey201ResponseData
+    from spacetraders_api_client.models.extraction import Extraction as Extraction
+    from spacetraders_api_client.models.extraction_yield import ExtractionYield as ExtractionYield
+    from spacetraders_api_client.models.faction import Faction as Faction
+    from spacetraders_api_client.models.faction_symbol import FactionSymbol as FactionSymbol
+    from spacetraders_api_client.models.faction_trait import FactionTrait as FactionTrait
+    from spacetraders_api_client.models.faction_trait_symbol import FactionTraitSymbol as FactionTraitSymbol
+    from spacetraders_api_client.models.fulfill_contract200_response import FulfillContract200Response as FulfillContract200Response
+    from spacetraders_api_client.models.get_agents200_response import GetAgents200Response as GetAgents200Response
+    from spacetraders_api_client.models.get_construction200_response import GetConstruction200Response as GetConstruction200Response
+    from spacetraders_api_client.models.get_contract200_response import GetContract200Response as GetContract200Response
+    from spacetraders_api_client.models.get_contracts200_response import GetContracts200Response as GetContracts200Response
+    from spacetraders_api_client.models.get_faction200_response import GetFaction200Response as GetFaction200Response
+    from spacetraders_api_client.models.get_factions200_response import GetFactions200Response as GetFactions200Response
+    from spacetraders_api_client.models.get_jump_gate200_response import GetJumpGate200Response as GetJumpGate200Response
+    from spacetraders_api_client.models.get_market200_response import GetMarket200Response as GetMarket200Response
+    from spacetraders_api_client.models.get_mounts200_response import GetMounts200Response as GetMounts200Response
+    from spacetraders_api_client.models.get_my_agent200_response import GetMyAgent200Response as GetMyAgent200Response
+    from spacetraders_api_client.models.get_my_ship200_response import GetMyShip200Response as GetMyShip200Response
+    from spacetraders_api_client.models.get_my_ship_cargo200_response import GetMyShipCargo200Response as GetMyShipCargo200Response
+    from spacetraders_api_client.models.get_my_ships200_response import GetMyShips200Response as GetMyShips200Response
+    from spacetraders_api_client.models.get_repair_ship200_response import GetRepairShip200Response as GetRepairShip200Response
+    from spacetraders_api_client.models.get_repair_ship200_response_data import GetRepairShip200ResponseData as GetRepairShip200ResponseData
+    from spacetraders_api_client.models.get_scrap_ship200_response import GetScrapShip200Response as GetScrapShip200Response
+    from spacetraders_api_client.models.get_scrap_ship200_response_data import GetScrapShip200ResponseData as GetScrapShip200ResponseData
+    from spacetraders_api_client.models.get_ship_cooldown200_response import GetShipCooldown200Response as GetShipCooldown200Response
+    from spacetraders_api_client.models.get_ship_modules200_response import GetShipModules200Response as GetShipModules200Response
+    from spacetraders_api_client.models.get_ship_nav200_response import GetShipNav200Response as GetShipNav200Response
+    from spacetraders_api_client.models.get_shipyard200_response import GetShipyard200Response as GetShipyard200Response
+    from spacetraders_api_client.models.get_status200_response import GetStatus200Response as GetStatus200Response
+    from spacetraders_api_client.models.get_status200_response_announcements_inner import GetStatus200ResponseAnnouncementsInner as GetStatus200ResponseAnnouncementsInner
+    from spacetraders_api_client.models.get_status200_response_leaderboards import GetStatus200ResponseLeaderboards as GetStatus200ResponseLeaderboards
+    from spacetraders_api_client.models.get_status200_response_leaderboards_most_credits_inner import GetStatus200ResponseLeaderboardsMostCreditsInner as GetStatus200ResponseLeaderboardsMostCreditsInner
+    from spacetraders_api_client.models.get_status200_response_leaderboards_most_submitted_charts_inner import GetStatus200ResponseLeaderboardsMostSubmittedChartsInner as GetStatus200ResponseLeaderboardsMostSubmittedChartsInner
+    from spacetraders_api_client.models.get_status200_response_links_inner import GetStatus200ResponseLinksInner as GetStatus200ResponseLinksInner
+    from spacetraders_api_client.models.get_status200_response_server_resets import GetStatus200ResponseServerResets as GetStatus200ResponseServerResets
+    from spacetraders_api_client.models.get_status200_response_stats import GetStatus200ResponseStats as GetStatus200ResponseStats
+    from spacetraders_api_client.models.get_supply_chain200_response import GetSupplyChain200Response as GetSupplyChain200Response
+    from spacetraders_api_client.models.get_supply_chain200_response_data import GetSupplyChain200ResponseData as GetSupplyChain200ResponseData
+    from spacetraders_api_client.models.get_system200_response import GetSystem200Response as GetSystem200Response
+    from spacetraders_api_client.models.get_system_waypoints200_response import GetSystemWaypoints200Response as GetSystemWaypoints200Response
+    from spacetraders_api_client.models.get_system_waypoints_traits_parameter import GetSystemWaypointsTraitsParameter as GetSystemWaypointsTraitsParameter
+    from spacetraders_api_client.models.get_systems200_response import GetSystems200Response as GetSystems200Response
+    from spacetraders_api_client.models.get_waypoint200_response import GetWaypoint200Response as GetWaypoint200Response
+    from spacetraders_api_client.models.install_mount201_response import InstallMount201Response as InstallMount201Response
+    from spacetraders_api_client.models.install_mount201_response_data import InstallMount201ResponseData as InstallMount201ResponseData
+    from spacetraders_api_client.models.install_mount_request import InstallMountRequest as InstallMountRequest
+    from spacetraders_api_client.models.install_ship_module201_response import InstallShipModule201Response as InstallShipModule201Response
+    from spacetraders_api_client.models.install_ship_module201_response_data import InstallShipModule201ResponseData as InstallShipModule201ResponseData
+    from spacetraders_api_client.models.install_ship_module201_response_data_transaction import InstallShipModule201ResponseDataTransaction as InstallShipModule201ResponseDataTransaction
+    from spacetraders_api_client.models.install_ship_module_request import InstallShipModuleRequest as InstallShipModuleRequest
+    from spacetraders_api_client.models.jettison200_response import Jettison200Response as Jettison200Response
+    from spacetraders_api_client.models.jettison200_response_data import Jettison200ResponseData as Jettison200ResponseData
+    from spacetraders_api_client.models.jettison_request import JettisonRequest as JettisonRequest
+    from spacetraders_api_client.models.jump_gate import JumpGate as JumpGate
+    from spacetraders_api_client.models.jump_ship200_response import JumpShip200Response as JumpShip200Response
+    from spacetraders_api_client.models.jump_ship200_response_data import JumpShip200ResponseData as JumpShip200ResponseData
+    from spacetraders_api_client.models.jump_ship_request import JumpShipRequest as JumpShipRequest
+    from spacetraders_api_client.models.market import Market as Market
+    from spacetraders_api_client.models.market_trade_good import MarketTradeGood as MarketTradeGood
+    from spacetraders_api_client.models.market_transaction import MarketTransaction as MarketTransaction
+    from spacetraders_api_client.models.meta import Meta as Meta
+    from spacetraders_api_client.models.navigate_ship200_response import NavigateShip200Response as NavigateShip200Response
+    from spacetraders_api_client.models.navigate_ship200_response_data import NavigateShip200ResponseData as NavigateShip200ResponseData
+    from spacetraders_api_client.models.navigate_ship_request import NavigateShipRequest as NavigateShipRequest
+    from spacetraders_api_client.models.negotiate_contract200_response import NegotiateContract200Response as NegotiateContract200Response
+    from spacetraders_api_client.models.negotiate_contract200_response_data import NegotiateContract200ResponseData as NegotiateContract200ResponseData
+    from spacetraders_api_client.models.orbit_ship200_response import OrbitShip200Response as OrbitShip200Response
+    from spacetraders_api_client.models.orbit_ship200_response_data import OrbitShip200ResponseData as OrbitShip200ResponseData
+    from spacetraders_api_client.models.patch_ship_nav200_response import PatchShipNav200Response as PatchShipNav200Response
+    from spacetraders_api_client.models.patch_ship_nav200_response_data import PatchShipNav200ResponseData as PatchShipNav200ResponseData
+    from spacetraders_api_client.models.patch_ship_nav_request import PatchShipNavRequest as PatchShipNavRequest
+    from spacetraders_api_client.models.purchase_cargo201_response import PurchaseCargo201Response as PurchaseCargo201Response
+    from spacetraders_api_client.models.purchase_cargo_request import PurchaseCargoRequest as PurchaseCargoRequest
+    from spacetraders_api_client.models.purchase_ship201_response import PurchaseShip201Response as PurchaseShip201Response
+    from spacetraders_api_client.models.purchase_ship201_response_data import PurchaseShip201ResponseData as PurchaseShip201ResponseData
+    from spacetraders_api_client.models.purchase_ship_request import PurchaseShipRequest as PurchaseShipRequest
+    from spacetraders_api_client.models.refuel_ship200_response import RefuelShip200Response as RefuelShip200Response
+    from spacetraders_api_client.models.refuel_ship200_response_data import RefuelShip200ResponseData as RefuelShip200ResponseData
+    from spacetraders_api_client.models.refuel_ship_request import RefuelShipRequest as RefuelShipRequest
+    from spacetraders_api_client.models.register201_response import Register201Response as Register201Response
+    from spacetraders_api_client.models.register201_response_data import Register201ResponseData as Register201ResponseData
+    from spacetraders_api_client.models.register_request import RegisterRequest as RegisterRequest
+    from spacetraders_api_client.models.remove_module201_response import RemoveModule201Response as RemoveModule201Response
+    from spacetraders_api_client.models.remove_mount201_response import RemoveMount201Response as RemoveMount201Response
+    from spacetraders_api_client.models.remove_mount201_response_data import RemoveMount201ResponseData as RemoveMount201ResponseData
+    from spacetraders_api_client.models.remove_mount_request import RemoveMountRequest as RemoveMountRequest
+    from spacetraders_api_client.models.remove_ship_module_request import RemoveShipModuleRequest as RemoveShipModuleRequest
+    from spacetraders_api_client.models.repair_ship200_response import RepairShip200Response as RepairShip200Response
+    from spacetraders_api_client.models.repair_ship200_response_data import RepairShip200ResponseData as RepairShip200ResponseData
+    from spacetraders_api_client.models.repair_transaction import RepairTransaction as RepairTransaction
+    from spacetraders_api_client.models.scanned_ship import ScannedShip as ScannedShip
+    from spacetraders_api_client.models.scanned_ship_engine import ScannedShipEngine as ScannedShipEngine
+    from spacetraders_api_client.models.scanned_ship_frame import ScannedShipFrame as ScannedShipFrame
+    from spacetraders_api_client.models.scanned_ship_mounts_inner import ScannedShipMountsInner as ScannedShipMountsInner
+    from spacetraders_api_client.models.scanned_ship_reactor import ScannedShipReactor as ScannedShipReactor
+    from spacetraders_api_client.models.scanned_system import ScannedSystem as ScannedSystem
+    from spacetraders_api_client.models.scanned_waypoint import ScannedWaypoint as ScannedWaypoint
+    from spacetraders_api_client.models.scrap_ship200_response import ScrapShip200Response as ScrapShip200Response
+    from spacetraders_api_client.models.scrap_ship200_response_data import ScrapShip200ResponseData as ScrapShip200ResponseData
+    from spacetraders_api_client.models.scrap_transaction import ScrapTransaction as ScrapTransaction
+    from spacetraders_api_client.models.sell_cargo201_response import SellCargo201Response as SellCargo201Response
+    from spacetraders_api_client.models.sell_cargo201_response_data import SellCargo201ResponseData as SellCargo201ResponseData
+    from spacetraders_api_client.models.sell_cargo_request import SellCargoRequest as SellCargoRequest
+    from spacetraders_api_client.models.ship import Ship as Ship
+    from spacetraders_api_client.models.ship_cargo import ShipCargo as ShipCargo
+    from spacetraders_api_client.models.ship_cargo_item import ShipCargoItem as ShipCargoItem
+    from spacetraders_api_client.models.ship_condition_event import ShipConditionEvent as ShipConditionEvent
+    from spacetraders_api_client.models.ship_crew import ShipCrew as ShipCrew
+    from spacetraders_api_client.models.ship_engine import ShipEngine as ShipEngine
+    from spacetraders_api_client.models.ship_frame import ShipFrame as ShipFrame
+    from spacetraders_api_client.models.ship_fuel import ShipFuel as ShipFuel
+    from spacetraders_api_client.models.ship_fuel_consumed import ShipFuelConsumed as ShipFuelConsumed
+    from spacetraders_api_client.models.ship_modification_transaction import ShipModificationTransaction as ShipModificationTransaction
+    from spacetraders_api_client.models.ship_module import ShipModule as ShipModule
+    from spacetraders_api_client.models.ship_mount import ShipMount as ShipMount
+    from spacetraders_api_client.models.ship_nav import ShipNav as ShipNav
+    from spacetraders_api_client.models.ship_nav_flight_mode import ShipNavFlightMode as ShipNavFlightMode
+    from spacetraders_api_client.models.ship_nav_route import ShipNavRoute as ShipNavRoute
+    from spacetraders_api_client.models.ship_nav_route_waypoint import ShipNavRouteWaypoint as ShipNavRouteWaypoint
+    from spacetraders_api_client.models.ship_nav_status import ShipNavStatus as ShipNavStatus
+    from spacetraders_api_client.models.ship_reactor import ShipReactor as ShipReactor
+    from spacetraders_api_client.models.ship_refine201_response import ShipRefine201Response as ShipRefine201Response
+    from spacetraders_api_client.models.ship_refine201_response_data import ShipRefine201ResponseData as ShipRefine201ResponseData
+    from spacetraders_api_client.models.ship_refine201_response_data_produced_inner import ShipRefine201ResponseDataProducedInner as ShipRefine201ResponseDataProducedInner
+    from spacetraders_api_client.models.ship_refine_request import ShipRefineRequest as ShipRefineRequest
+    from spacetraders_api_client.models.ship_registration import ShipRegistration as ShipRegistration
+    from spacetraders_api_client.models.ship_requirements import ShipRequirements as ShipRequirements
+    from spacetraders_api_client.models.ship_role import ShipRole as ShipRole
+    from spacetraders_api_client.models.ship_type import ShipType as ShipType
+    from spacetraders_api_client.models.shipyard import Shipyard as Shipyard
+    from spacetraders_api_client.models.shipyard_ship import ShipyardShip as ShipyardShip
+    from spacetraders_api_client.models.shipyard_ship_crew import ShipyardShipCrew as ShipyardShipCrew
+    from spacetraders_api_client.models.shipyard_ship_types_inner import ShipyardShipTypesInner as ShipyardShipTypesInner
+    from spacetraders_api_client.models.shipyard_transaction import ShipyardTransaction as ShipyardTransaction
+    from spacetraders_api_client.models.siphon import Siphon as Siphon
+    from spacetraders_api_client.models.siphon_resources201_response import SiphonResources201Response as SiphonResources201Response
+    from spacetraders_api_client.models.siphon_resources201_response_data import SiphonResources201ResponseData as SiphonResources201ResponseData
+    from spacetraders_api_client.models.siphon_yield import SiphonYield as SiphonYield
+    from spacetraders_api_client.models.supply_construction201_response import SupplyConstruction201Response as SupplyConstruction201Response
+    from spacetraders_api_client.models.supply_construction201_response_data import SupplyConstruction201ResponseData as SupplyConstruction201ResponseData
+    from spacetraders_api_client.models.supply_construction_request import SupplyConstructionRequest as SupplyConstructionRequest
+    from spacetraders_api_client.models.supply_level import SupplyLevel as SupplyLevel
+    from spacetraders_api_client.models.survey import Survey as Survey
+    from spacetraders_api_client.models.survey_deposit import SurveyDeposit as SurveyDeposit
+    from spacetraders_api_client.models.system import System as System
+    from spacetraders_api_client.models.system_faction import SystemFaction as SystemFaction
+    from spacetraders_api_client.models.system_type import SystemType as SystemType
+    from spacetraders_api_client.models.system_waypoint import SystemWaypoint as SystemWaypoint
+    from spacetraders_api_client.models.trade_good import TradeGood as TradeGood
+    from spacetraders_api_client.models.trade_symbol import TradeSymbol as TradeSymbol
+    from spacetraders_api_client.models.transfer_cargo200_response import TransferCargo200Response as TransferCargo200Response
+    from spacetraders_api_client.models.transfer_cargo_request import TransferCargoRequest as TransferCargoRequest
+    from spacetraders_api_client.models.warp_ship200_response import WarpShip200Response as WarpShip200Response
+    from spacetraders_api_client.models.warp_ship200_response_data import WarpShip200ResponseData as WarpShip200ResponseData
+    from spacetraders_api_client.models.waypoint import Waypoint as Waypoint
+    from spacetraders_api_client.models.waypoint_faction import WaypointFaction as WaypointFaction
+    from spacetraders_api_client.models.waypoint_modifier import WaypointModifier as WaypointModifier
+    from spacetraders_api_client.models.waypoint_modifier_symbol import WaypointModifierSymbol as WaypointModifierSymbol
+    from spacetraders_api_client.models.waypoint_orbital import WaypointOrbital as WaypointOrbital
+    from spacetraders_api_client.models.waypoint_trait import WaypointTrait as WaypointTrait
+    from spacetraders_api_client.models.waypoint_trait_symbol import WaypointTraitSymbol as WaypointTraitSymbol
+    from spacetraders_api_client.models.waypoint_type import WaypointType as WaypointType
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -1,11 +1,39 @@
 # flake8: noqa
 
 # import apis into api package
-from spacetraders_api_client.api.agents_api import AgentsApi
-from spacetraders_api_client.api.contracts_api import ContractsApi
-from spacetraders_api_client.api.data_api import DataApi
-from spacetraders_api_client.api.factions_api import FactionsApi
-from spacetraders_api_client.api.fleet_api import FleetApi
-from spacetraders_api_client.api.global_api import GlobalApi
-from spacetraders_api_client.api.systems_api import SystemsApi
 
+# lazy imports (tools/lazy_init.py)
+import importlib
+import typing
+
+_LAZY_IMPORTS = {
+    "AgentsApi": "spacetraders_api_client.api.agents_api",
+    "ContractsApi": "spacetraders_api_client.api.contracts_api",
+    "DataApi": "spacetraders_api_client.api.data_api",
+    "FactionsApi": "spacetraders_api_client.api.factions_api",
+    "FleetApi": "spacetraders_api_client.api.fleet_api",
+    "GlobalApi": "spacetraders_api_client.api.global_api",
+    "SystemsApi": "spacetraders_api_client.api.systems_api",
+}
+
+if typing.TYPE_CHECKING:
+    from spacetraders_api_client.api.agents_api import AgentsApi
+    from spacetraders_api_client.api.contracts_api import ContractsApi
+    from spacetraders_api_client.api.data_api import DataApi
+    from spacetraders_api_client.api.factions_api import FactionsApi
+    from spacetraders_api_client.api.fleet_api import FleetApi
+    from spacetraders_api_client.api.global_api import GlobalApi
+    from spacetraders_api_client.api.systems_api import SystemsApi
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
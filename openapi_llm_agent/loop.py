@@ -9,7 +9,6 @@ from __future__ import annotations
 import json
 import logging
 import os
-import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any, Optional
@@ -18,7 +17,13 @@ from dotenv import load_dotenv
 from jsonref import load_uri
 from rich.console import Console
 
-from .persistence.sqlite import SQLitePersistence
+from agent.advisory import AdvisoryChange, AdvisoryWatcher
+from agent.ratelimit import Lane, get_rate_limiter
+from agent.persistence.base import create_backend
+from agent.persistence.writebehind import write_behind_enabled
+from agent.retry import call_with_retry
+from agent.scheduler import Scheduler
+
 from .state import get_strategy_notes, save_strategy_notes, get_recent_log_entries
 
 # Load environment variables
@@ -218,7 +223,7 @@ def run_loop(
         logger: Optional logger instance
         prompt_debug: If True, display LLM input prompts
     """
-    store = SQLitePersistence(Path("agent.db"))
+    store = create_backend(Path("agent.db"), write_behind=write_behind_enabled())
     store.connect()
     log = logger or logging.getLogger("agent.loop")
     log.info("Starting OpenAPI-LLM loop input=%s poll=%.2fs once=%s", input_path, poll_interval_sec, once)
@@ -260,24 +265,47 @@ def run_loop(
 
     last_advisory = None
     iteration = 0
-    wait_until = None  # Track when we should resume after a wait
-    
-    while True:
+    # Iterations are timers on a scheduler: the next one is armed for when the
+    # last action's cooldown or arrival ends (or one poll interval later), and
+    # the loop sleeps until then instead of polling.
+    scheduler = Scheduler(logger=log)
+
+    def on_advisory(change: AdvisoryChange) -> None:
+        # A new advisory is acted on now rather than after the current wait
+        log.info("Advisory file changed (sha256 %s)", (change.digest or "none")[:12])
+        scheduler.call_soon("iteration", run_iteration)
+
+    # input.md is re-read only when inotify (or a changed stat) says it was written,
+    # and `current` only moves when its content hash does.
+    watcher = AdvisoryWatcher(
+        input_path,
+        scheduler,
+        on_advisory,
+        poll_interval_sec=poll_interval_sec,
+        use_inotify=False if once else None,
+        logger=log,
+    )
+
+    def run_iteration() -> None:
+        next_delay = poll_interval_sec
+        try:
+            next_delay = iterate()
+        finally:
+            # Re-arm (or stop) even if the iteration raised: the scheduler only logs
+            # handler errors, so skipping this would leave the loop waiting on nothing.
+            if once:
+                log.info("Single iteration complete, exiting")
+                scheduler.stop()
+            else:
+                scheduler.after(next_delay, "iteration", run_iteration)
+
+    def iterate() -> float:
+        """One iteration; returns the delay before the next one."""
+        nonlocal iteration, last_advisory
         iteration += 1
         ts = datetime.now(timezone.utc).isoformat()
-        
-        # Check if we need to wait
-        if wait_until:
-            now = datetime.now(timezone.utc)
-            if now < wait_until:
-                wait_sec = (wait_until - now).total_seconds()
-                log.info("Waiting %.1f more seconds before next iteration", wait_sec)
-                time.sleep(min(wait_sec, poll_interval_sec))
-                continue
-            else:
-                log.info("Wait period complete, resuming")
-                wait_until = None
-        
+        next_delay = poll_interval_sec
+
         log.info("=== Iteration %d ===", iteration)
         
         # Get current notes
@@ -287,7 +315,7 @@ def run_loop(
             save_strategy_notes(store, ts, notes, logger=log)
         
         # STEP 1: Check for new human input and update notes if needed
-        advisory = _read_input(input_path)
+        advisory = watcher.current.content
         if advisory != last_advisory and advisory:
             last_advisory = advisory
             store.append_log(ts, "advisory", advisory)
@@ -347,10 +375,7 @@ def run_loop(
                 if prompt_debug:
                     console.print(f"\n[yellow]The prompt that was sent (STEP2):[/yellow]")
                     console.print(prompt)
-                if once:
-                    break
-                time.sleep(poll_interval_sec)
-                continue
+                return poll_interval_sec
             
             tool_call = message.tool_calls[0]
             tool_name = tool_call.function.name
@@ -365,9 +390,15 @@ def run_loop(
             console.print(f"\n[green]LLM Decision:[/green] Calling tool [bold]{tool_name}[/bold]")
             console.print(f"  Arguments: {tool_call.function.arguments}")
             
-            # Execute tool via openapi_client
+            # Execute tool via openapi_client. The LLM's chosen tool is the
+            # foreground action, so it waits in the ship-action lane.
             try:
-                result = openapi_client.invoke(response)
+                # A 429 is retried here after its retryAfter rather than
+                # handed to the LLM, so it never costs a turn.
+                result = call_with_retry(
+                    lambda: openapi_client.invoke(response),
+                    before_attempt=lambda: get_rate_limiter().acquire(Lane.SHIP_ACTION),
+                )
                 store.append_log(ts, "tool_result", f"{tool_name}: success")
                 log.info("Tool executed successfully")
                 
@@ -378,8 +409,8 @@ def run_loop(
                 # Check for wait conditions
                 wait_duration = _extract_wait_duration(result, logger=log)
                 if wait_duration and wait_duration > 0:
-                    wait_until = datetime.now(timezone.utc) + timedelta(seconds=wait_duration)
-                    log.info("Setting wait until %s", wait_until)
+                    next_delay = wait_duration
+                    log.info("Setting wait until %s", datetime.now(timezone.utc) + timedelta(seconds=wait_duration))
                 
             except Exception as e:
                 result = {"error": str(e)}
@@ -424,14 +455,21 @@ def run_loop(
         except Exception as e:
             log.error("Failed to update notes with results: %s", e)
         
-        if once:
-            log.info("Single iteration complete, exiting")
-            break
-        
-        time.sleep(poll_interval_sec)
-    
-    log.info("Loop exited")
-    store.close()
+        compacted = store.maybe_compact()
+        if compacted:
+            log.info("Compacted agent.db: %s", compacted)
+
+        return next_delay
+
+    # The first check is due now, so it runs before the first iteration reads `current`.
+    try:
+        watcher.start()
+        scheduler.call_soon("iteration", run_iteration)
+        scheduler.run()
+    finally:
+        watcher.close()
+        log.info("Loop exited")
+        store.close()
 
 
 # Need to import timedelta
@@ -11,11 +11,7 @@ def get_strategy_notes(store, logger: Optional[logging.Logger] = None) -> Option
     including ships, locations, credits, and next steps.
     """
     try:
-        cursor = store._conn.execute(
-            "SELECT content FROM strategy_notes WHERE id = 1"
-        )
-        row = cursor.fetchone()
-        return row[0] if row else None
+        return store.fetch_strategy_notes()
     except Exception as exc:
         if logger:
             logger.warning("Failed to fetch strategy notes: %s", exc)
@@ -26,7 +22,7 @@ def save_strategy_notes(store, ts: str, content: str, logger: Optional[logging.L
     """Save updated strategy notes to persistence.
     
     Args:
-        store: SQLitePersistence instance
+        store: PersistenceBackend instance
         ts: Timestamp string
         content: Updated notes content from LLM
         logger: Optional logger
@@ -39,17 +35,24 @@ def save_strategy_notes(store, ts: str, content: str, logger: Optional[logging.L
         raise
 
 
-def get_recent_log_entries(store, limit: int = 20, logger: Optional[logging.Logger] = None) -> list[str]:
+def get_recent_log_entries(
+    store,
+    limit: int = 20,
+    logger: Optional[logging.Logger] = None,
+    category: Optional[str] = None,
+    text: Optional[str] = None,
+) -> list[str]:
     """Fetch recent log entries formatted for prompt inclusion.
     
     Returns a list of strings like: "2024-01-21 14:30:45 tool_call: get_my_agent"
+    With `category` and/or `text` only matching entries are returned, e.g.
+    category="tool_error", text="navigate_ship".
     """
     try:
-        cursor = store._conn.execute(
-            "SELECT ts, category, message FROM immutable_log ORDER BY id DESC LIMIT ?",
-            (limit,),
-        )
-        rows = cursor.fetchall()
+        if category or text:
+            rows = store.search_logs(text=text, category=category, limit=limit)
+        else:
+            rows = store.fetch_logs(limit)
         # Reverse to get chronological order
         return [f"{ts} {category}: {message}" for ts, category, message in reversed(rows)]
     except Exception as exc:
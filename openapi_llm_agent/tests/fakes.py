@@ -0,0 +1,11 @@
+"""Test doubles shared by several test modules."""
+
+
+class FakeClock:
+    """A `clock` callable that only moves when a test sets or advances `now`."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+
+import pytest
+
+from agent.advisory import AdvisoryWatcher, _libc
+from agent.scheduler import Scheduler
+from openapi_llm_agent.tests.fakes import FakeClock
+
+
+def test_stat_fallback_reads_only_on_change_and_reports_by_hash(tmp_path):
+    path = tmp_path / "input.md"
+    path.write_text("go mining", encoding="utf-8")
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    changes = []
+    watcher = AdvisoryWatcher(path, scheduler, changes.append, poll_interval_sec=5, use_inotify=False)
+    watcher.start()
+    assert watcher.mode == "stat"
+
+    scheduler.run_pending()
+    assert [c.content for c in changes] == ["go mining"] and watcher.reads == 1
+
+    for _ in range(3):  # untouched file: stat only, no read
+        clock.now += 5
+        scheduler.run_pending()
+    assert watcher.reads == 1
+
+    # Re-saved with the same text: read once, but no change is reported.
+    path.write_text("go mining", encoding="utf-8")
+    os.utime(path, ns=(0, 12345))
+    clock.now += 5
+    scheduler.run_pending()
+    assert watcher.reads == 2 and len(changes) == 1
+
+    path.unlink()
+    clock.now += 5
+    scheduler.run_pending()
+    assert changes[-1].content is None and changes[-1].digest is None
+    watcher.close()
+    assert scheduler.next_due() is None
+
+
+def test_notifications_are_debounced(tmp_path):
+    path = tmp_path / "input.md"
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    changes = []
+    watcher = AdvisoryWatcher(path, scheduler, changes.append, debounce_sec=0.5, use_inotify=False)
+    watcher.check()
+    for i in range(5):
+        path.write_text(f"draft {i}", encoding="utf-8")
+        watcher.notify()
+        clock.now += 0.1
+    assert scheduler.run_pending() == 0
+    clock.now += 0.5
+    scheduler.run_pending()
+    assert [c.content for c in changes] == ["draft 4"]
+    assert watcher.reads == 1
+
+
+@pytest.mark.skipif(_libc() is None, reason="inotify needs Linux libc")
+def test_inotify_wakes_the_scheduler(tmp_path):
+    path = tmp_path / "input.md"
+    path.write_text("first", encoding="utf-8")
+    scheduler = Scheduler()
+    changes = []
+
+    def on_change(change):
+        changes.append(change.content)
+        if len(changes) == 2:
+            scheduler.stop()
+
+    watcher = AdvisoryWatcher(path, scheduler, on_change, debounce_sec=0.05)
+    watcher.start()
+    if watcher.mode != "inotify":
+        watcher.close()
+        pytest.skip("inotify unavailable in this sandbox")
+
+    def edit():
+        time.sleep(0.1)
+        (tmp_path / "other.txt").write_text("ignored", encoding="utf-8")
+        path.write_text("second", encoding="utf-8")
+
+    thread = threading.Thread(target=edit)
+    start = time.monotonic()
+    thread.start()
+    scheduler.run()
+    thread.join()
+    watcher.close()
+    assert changes == ["first", "second"]
+    assert time.monotonic() - start < 5  # well under the 60 s safety poll
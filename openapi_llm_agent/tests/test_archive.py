@@ -0,0 +1,132 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agent.persistence.archive import CompactionPolicy, Compactor, default_archive_path
+from agent.persistence.sqlite import SQLitePersistence
+from openapi_llm_agent.persistence.sqlite import SQLitePersistence as OpenAPIPersistence
+
+NOW = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+def _ts(days_ago, minutes=0):
+    return (NOW - timedelta(days=days_ago, minutes=minutes)).isoformat()
+
+
+def _policy(**overrides):
+    values = dict(log_age_sec=7 * 86400, snapshot_age_sec=3 * 86400, interval_sec=3600, batch_rows=7)
+    values.update(overrides)
+    return CompactionPolicy(**values)
+
+
+def _store(cls, tmp_path, **kwargs):
+    store = cls(tmp_path / "agent.db", compaction=_policy(), **kwargs)
+    store.connect()
+    store._compactor._clock = NOW.timestamp
+    return store
+
+
+def _count(store, table):
+    return store._conn.execute(f"SELECT COUNT(*) FROM main.{table}").fetchone()[0]
+
+
+@pytest.mark.parametrize("cls", [SQLitePersistence, OpenAPIPersistence])
+def test_compact_moves_old_logs(tmp_path, cls):
+    store = _store(cls, tmp_path)
+    for day in (10, 9, 8, 1, 0):
+        for i in range(5):
+            store.append_log(_ts(day, i), "tool_error" if i % 2 else "tool_call", f"navigate_ship {day}/{i}")
+
+    result = store.compact()
+    assert result["logs"] == 15
+    assert _count(store, "immutable_log") == 10
+    assert default_archive_path(tmp_path / "agent.db").exists()
+    # The FTS index follows the hot table.
+    assert all(row[0] >= _ts(7) for row in store.search_logs("navigate_ship", limit=50))
+
+    archived = store.archived_logs(_ts(9, 60 * 24), _ts(7), category="tool_error")
+    assert [row[2] for row in archived] == ["navigate_ship 8/1", "navigate_ship 8/3", "navigate_ship 9/1", "navigate_ship 9/3"]
+    assert store.archived_logs(_ts(30), _ts(0), text="10/4", limit=5)[0][2] == "navigate_ship 10/4"
+    assert len(store.archived_logs(_ts(30), _ts(0), text="NAVIGATE_SHIP 8/", limit=50)) == 5
+
+    assert store.maybe_compact() is None
+    store._compactor._clock = lambda: NOW.timestamp() + 3600
+    assert store.maybe_compact()["logs"] == 0
+    store.close()
+
+
+def test_compaction_is_not_due_at_startup(tmp_path):
+    now = [NOW.timestamp()]
+    conn = sqlite3.connect(tmp_path / "hot.db")
+    compactor = Compactor(conn, tmp_path / "hot.db", _policy(), clock=lambda: now[0])
+    assert not compactor.due()
+    now[0] += 3600
+    assert compactor.due()
+    conn.close()
+
+
+def test_compact_keeps_history_chain_at_keyframe(tmp_path):
+    store = _store(SQLitePersistence, tmp_path, keyframe_interval=4)
+    states = {}
+    for i in range(12):
+        ts = _ts(6 - i * 0.5)
+        states[ts] = {"credits": i, "ships": [{"symbol": "S-1", "fuel": 100 - i}]}
+        store.save_snapshot(ts, states[ts])
+        store.save_state_snapshot(ts, str(states[ts]))
+
+    result = store.compact()
+    assert result["history"] > 0 and result["snapshots"] > 0
+    first_hot = store._conn.execute("SELECT keyframe, ts FROM main.state_history ORDER BY id LIMIT 1").fetchone()
+    assert first_hot[0] == 1 and first_hot[1] < _ts(3)
+    # Every state is still reachable, from the hot database or the archive.
+    for ts, state in states.items():
+        assert store.snapshot_at(ts) == state
+    assert [ts for ts, _ in store._compactor.archived_snapshots(_ts(10), _ts(3))] == sorted(
+        ts for ts in states if ts < _ts(3)
+    )
+    store.close()
+
+
+def test_existing_database_is_converted_to_incremental_vacuum(tmp_path):
+    db_path = tmp_path / "agent.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE immutable_log (id INTEGER PRIMARY KEY AUTOINCREMENT, ts TEXT NOT NULL,"
+                 " category TEXT NOT NULL, message TEXT NOT NULL)")
+    conn.executemany(
+        "INSERT INTO immutable_log (ts, category, message) VALUES (?, 'c', ?)",
+        [(_ts(30), "x" * 500) for _ in range(2000)],
+    )
+    conn.commit()
+    conn.close()
+
+    store = _store(SQLitePersistence, tmp_path)
+    assert store._conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+    # Compaction never runs the blocking full VACUUM on its own ...
+    assert store.compact()["freed_pages"] == 0
+    assert store._conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+    assert _count(store, "immutable_log") == 0
+    # ... it takes an explicit conversion.
+    assert store.convert_vacuum() and not store.convert_vacuum()
+    assert store._conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+    size = db_path.stat().st_size
+    for _ in range(2000):
+        store.append_log(_ts(30), "c", "y" * 500)
+    store.compact()
+    assert store._conn.execute("PRAGMA freelist_count").fetchone()[0] == 0
+    assert db_path.stat().st_size <= size * 1.5
+    store.close()
+
+
+def test_compactor_batches_large_backlogs(tmp_path):
+    conn = sqlite3.connect(tmp_path / "hot.db")
+    conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    conn.execute("CREATE TABLE immutable_log (id INTEGER PRIMARY KEY AUTOINCREMENT, ts TEXT, category TEXT, message TEXT)")
+    conn.executemany("INSERT INTO immutable_log (ts, category, message) VALUES (?, 'c', 'm')", [(_ts(20),)] * 50)
+    conn.commit()
+    compactor = Compactor(conn, tmp_path / "hot.db", _policy(batch_rows=8), clock=NOW.timestamp)
+    assert compactor.compact()["logs"] == 50
+    segments = conn.execute("SELECT COUNT(*), SUM(row_count) FROM archive.log_segments").fetchone()
+    assert segments == (7, 50)
+    conn.close()
@@ -0,0 +1,140 @@
+import copy
+
+import pytest
+
+from agent.mockserver import MockWorld
+from agent.persistence.base import PersistenceBackend, backend_kind, create_backend
+from agent.persistence.memory import MemoryPersistence
+from agent.persistence.null import NullPersistence
+from agent.persistence.sqlite import SQLitePersistence
+from agent.persistence.timeseries import FIVE_MINUTES, HOURLY, to_epoch
+from openapi_llm_agent.persistence.sqlite import SQLitePersistence as OpenAPIPersistence
+
+T0 = to_epoch("2024-01-01T00:00:00+00:00")
+
+
+def _ts(i):
+    return f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}+00:00"
+
+
+def _market(symbol, prices):
+    return {
+        "symbol": symbol,
+        "exports": [],
+        "imports": [],
+        "exchange": [{"symbol": good} for good in prices],
+        "tradeGoods": [
+            {"symbol": good, "type": "EXCHANGE", "tradeVolume": 10, "supply": "MODERATE",
+             "purchasePrice": price, "sellPrice": price - 2}
+            for good, price in prices.items()
+        ],
+    }
+
+
+def _exercise(store, world):
+    """Drive a backend through every protocol area; returns everything it reads back."""
+    out = {}
+    for i in range(30):
+        store.append_log(_ts(i), "tool_error" if i % 3 == 0 else "tool_call", f"navigate_ship MOCK-{i % 4} step {i}")
+    out["logs"] = list(store.fetch_logs(5))
+    out["limits"] = [len(list(store.fetch_logs(n))) for n in (0, -1)] + [len(store.search_logs("MOCK", limit=0))]
+    out["search"] = store.search_logs("MOCK-2", category="tool_error", since=_ts(3), until=_ts(28), limit=10)
+
+    store.save_strategy_notes(_ts(0), "a\nb\n")
+    store.save_strategy_notes(_ts(1), "a\nb\nc\n")
+    store.save_strategy_notes(_ts(2), "a\nb\n")
+    out["notes"] = store.fetch_strategy_notes()
+    out["notes_history"] = [row[:3] for row in store.notes_history()]
+    out["no_history"] = store.notes_history(0)
+    out["notes_at"] = [store.notes_at(_ts(i)) for i in range(3)] + [store.notes_at("2023")]
+    out["revision"] = store.notes_revision(out["notes_history"][1][1])
+
+    for i in range(8):
+        store.save_snapshot(_ts(i * 10), {"credits": i * 100, "ships": {"MOCK-1": {"fuel": 100 - i}}})
+    out["snapshots"] = [store.snapshot_at(_ts(i * 10 + 5)) for i in range(8)] + [store.snapshot_at(), store.snapshot_at("2023")]
+
+    store.save_error_context(_ts(1), "trade", "boom", "{}")
+    out["error"] = store.fetch_error_context()
+    store.clear_error_context()
+    out["cleared"] = store.fetch_error_context()
+
+    snapshot = {
+        "ships": copy.deepcopy(list(world.ships.values())),
+        "contracts": copy.deepcopy(world.contracts),
+        "waypoints": copy.deepcopy(world.waypoints),
+        "markets": copy.deepcopy(world.markets),
+    }
+    store.save_world("w1", snapshot)
+    listing_only = dict(snapshot["markets"])
+    first = sorted(listing_only)[0]
+    listing_only[first] = {key: value for key, value in listing_only[first].items() if key != "tradeGoods"}
+    store.save_world("w2", {"ships": snapshot["ships"][:2], "markets": listing_only})
+    system = next(iter(world.waypoints.values()))["systemSymbol"]
+    goods = sorted({good["symbol"] for market in world.markets.values() for good in market.get("tradeGoods", [])})
+    out["cheapest"] = {good: store.cheapest_purchase(good, system) for good in goods}
+    out["best_sell"] = {good: store.best_sell(good, system) for good in goods}
+    out["unlimited"] = [len(store.cheapest_purchase(goods[0], system, n)) + len(store.best_sell(goods[0], system, n)) for n in (0, -1)]
+    out["docked"] = store.ships_with_status("DOCKED") + store.ships_with_status("IN_ORBIT")
+    out["waypoint_types"] = {
+        kind: store.waypoints_of_type(system, kind) for kind in {w["type"] for w in world.waypoints.values()}
+    }
+
+    for minute, price in enumerate([100, 90, 120, 110, 95, 130]):
+        store.record_market_prices(T0 + minute * 120, [_market("X1-A1-M", {"FUEL": price, "ICE_WATER": 20 + minute})])
+    store.record_market_prices(T0 + 60, [_market("X1-A1-N", {"FUEL": 80})])
+    out["raw"] = store.price_history("X1-A1-M", "FUEL", T0, T0 + 3600)
+    out["five"] = store.price_history("X1-A1-M", "FUEL", T0, T0 + 3600, FIVE_MINUTES)
+    out["hourly"] = store.price_history("X1-A1-M", "ICE_WATER", T0 + 10, T0 + 7200, HOURLY)
+    out["latest"] = store.latest_price("X1-A1-M", "FUEL")
+    out["latest_all"] = store.latest_prices("FUEL")
+    store.flush()
+    return out
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_memory_backend_matches_sqlite(tmp_path, write_behind):
+    sqlite_store = SQLitePersistence(tmp_path / "agent.db", write_behind=write_behind)
+    sqlite_store.connect()
+    memory_store = MemoryPersistence()
+    memory_store.connect()
+
+    world = MockWorld(ships=4, waypoints=8, markets=5, contracts=1, seed=3)
+    expected = _exercise(sqlite_store, world)
+    actual = _exercise(memory_store, world)
+    sqlite_store.close()
+    for key in expected:
+        assert actual[key] == expected[key], key
+    assert expected["cheapest"] and expected["docked"] and expected["five"]
+
+
+def test_backends_satisfy_protocol(tmp_path):
+    for store in (SQLitePersistence(tmp_path / "a.db"), OpenAPIPersistence(tmp_path / "b.db"),
+                  MemoryPersistence(), NullPersistence()):
+        assert isinstance(store, PersistenceBackend)
+    assert OpenAPIPersistence is SQLitePersistence
+
+
+def test_null_backend_stores_nothing():
+    store = NullPersistence()
+    store.connect()
+    store.append_log("t", "c", "m")
+    store.save_strategy_notes("t", "notes")
+    store.save_snapshot("t", {"a": 1})
+    store.save_world("t", {"ships": []})
+    assert list(store.fetch_logs()) == []
+    assert store.fetch_strategy_notes() is None
+    assert store.snapshot_at() is None
+    assert store.ships_with_status("DOCKED") == []
+    store.close()
+
+
+def test_create_backend_from_env(tmp_path, monkeypatch):
+    monkeypatch.delenv("AGENT_PERSISTENCE", raising=False)
+    assert backend_kind() == "sqlite"
+    assert isinstance(create_backend(tmp_path / "agent.db"), SQLitePersistence)
+    monkeypatch.setenv("AGENT_PERSISTENCE", "memory")
+    assert isinstance(create_backend(tmp_path / "agent.db", write_behind=True), MemoryPersistence)
+    assert isinstance(create_backend(tmp_path / "agent.db", kind="null"), NullPersistence)
+    monkeypatch.setenv("AGENT_PERSISTENCE", "postgres")
+    with pytest.raises(ValueError):
+        backend_kind()
@@ -0,0 +1,78 @@
+import json
+
+from agent.cache import CacheTier, ResponseCache, tier_for
+from openapi_llm_agent.tests.fakes import FakeClock
+
+
+def _body(data):
+    return json.dumps({"data": data}).encode("utf-8")
+
+
+def test_tier_routing():
+    assert tier_for("GET", "/systems/X1-A/waypoints/X1-A-1") is CacheTier.STATIC
+    assert tier_for("GET", "/systems/X1-A/waypoints/X1-A-1/jump-gate") is CacheTier.STATIC
+    assert tier_for("GET", "/market/supply-chain") is CacheTier.STATIC
+    assert tier_for("GET", "/systems/X1-A/waypoints/X1-A-1/market") is CacheTier.MARKET
+    assert tier_for("GET", "/my/ships/S-1/nav") is CacheTier.VOLATILE
+    assert tier_for("POST", "/my/ships/S-1/navigate") is None
+    assert tier_for("GET", "/") is None
+
+
+def test_ttl_expiry_per_tier():
+    clock = FakeClock()
+    cache = ResponseCache(clock=clock)
+    cache.store("tok", "GET", "/systems/X1-A", "", 200, _body({"symbol": "X1-A"}))
+    cache.store("tok", "GET", "/my/agent", "", 200, _body({"credits": 1}))
+
+    clock.now += 60
+    assert cache.lookup("tok", "GET", "/systems/X1-A") is not None
+    assert cache.lookup("tok", "GET", "/my/agent") is None
+    assert cache.lookup("other-token", "GET", "/systems/X1-A") is None
+    assert cache.stats()["tiers"]["static"] == {"hits": 1, "misses": 1}
+
+
+def test_query_order_does_not_matter():
+    cache = ResponseCache()
+    cache.store("tok", "GET", "/systems/X1-A/waypoints", "page=1&limit=20", 200, _body([]))
+    assert cache.lookup("tok", "GET", "/systems/X1-A/waypoints", "limit=20&page=1") is not None
+
+
+def test_navigate_refreshes_nav_and_busts_ship():
+    cache = ResponseCache()
+    cache.store("tok", "GET", "/my/ships/S-1", "", 200, _body({"symbol": "S-1"}))
+    cache.store("tok", "GET", "/my/ships/S-10", "", 200, _body({"symbol": "S-10"}))
+    cache.store("tok", "GET", "/my/ships", "page=1&limit=20", 200, _body([]))
+
+    nav = {"status": "IN_TRANSIT", "waypointSymbol": "X1-A-2"}
+    cache.store("tok", "POST", "/my/ships/S-1/navigate", "", 200, _body({"nav": nav, "fuel": {}}))
+
+    assert cache.lookup("tok", "GET", "/my/ships/S-1") is None
+    assert cache.lookup("tok", "GET", "/my/ships", "page=1&limit=20") is None
+    assert cache.lookup("tok", "GET", "/my/ships/S-10") is not None
+    hit = cache.lookup("tok", "GET", "/my/ships/S-1/nav")
+    assert json.loads(hit.body) == {"data": nav}
+
+
+def test_trade_busts_market(tmp_path):
+    cache = ResponseCache(db_path=tmp_path / "cache.db")
+    market_path = "/systems/X1-A/waypoints/X1-A-1/market"
+    cache.store("tok", "GET", market_path, "", 200, _body({"tradeGoods": []}))
+
+    tx = {"waypointSymbol": "X1-A-1", "tradeSymbol": "FUEL"}
+    cache.store("tok", "POST", "/my/ships/S-1/purchase", "", 201, _body({"transaction": tx, "agent": {"credits": 5}}))
+
+    assert cache.lookup("tok", "GET", market_path) is None
+    assert json.loads(cache.lookup("tok", "GET", "/my/agent").body)["data"]["credits"] == 5
+
+
+def test_static_entries_survive_restart(tmp_path):
+    db = tmp_path / "cache.db"
+    cache = ResponseCache(db_path=db)
+    cache.store("tok", "GET", "/systems/X1-A", "", 200, _body({"symbol": "X1-A"}))
+    cache.store("tok", "GET", "/my/agent", "", 200, _body({"credits": 1}))
+    cache.close()
+
+    reopened = ResponseCache(db_path=db)
+    assert reopened.lookup("tok", "GET", "/systems/X1-A") is not None
+    assert reopened.lookup("tok", "GET", "/my/agent") is None
+    reopened.close()
@@ -0,0 +1,96 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from agent.async_client import AsyncSpaceTradersClient
+from agent.cache import ResponseCache
+from agent.cassette import (
+    Cassette,
+    CassetteMiss,
+    CassettePlayer,
+    RecordingRESTClient,
+    RecordingTransport,
+    ReplayRESTClient,
+    ReplayTransport,
+    load_interactions,
+)
+from agent.mockserver import DEFAULT_TOKEN, MockServerConfig, MockSpaceTradersServer
+from agent.ratelimit import RateLimiter
+from agent.spacetraders_client import SpaceTradersApiClient, fetch_my_agent
+from agent.state import refresh_state_async
+
+from spacetraders_api_client import Configuration
+from spacetraders_api_client.api.fleet_api import FleetApi
+
+
+def _limiter():
+    return RateLimiter(rate_per_sec=1000, burst_capacity=1000)
+
+
+@pytest.fixture
+def server():
+    with MockSpaceTradersServer(config=MockServerConfig(enforce_rate_limit=False)) as srv:
+        yield srv
+
+
+def _sync_client(base_url):
+    cfg = Configuration(host=base_url, access_token=DEFAULT_TOKEN)
+    return SpaceTradersApiClient(cfg, limiter=_limiter(), cache=ResponseCache(max_entries=0))
+
+
+def test_sync_record_then_replay_without_network(server, tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    client = _sync_client(server.base_url)
+    client.rest_client = RecordingRESTClient(client.rest_client, Cassette(path))
+    recorded_ships = FleetApi(client).get_my_ships(limit=20)
+    recorded_agent = fetch_my_agent(client)
+    client.rest_client.cassette.close()
+
+    interactions = load_interactions(path)
+    assert [(i.method, i.path) for i in interactions] == [("GET", "/v2/my/ships"), ("GET", "/v2/my/agent")]
+    assert json.loads(path.read_text().splitlines()[0])["cassette"] == 1
+
+    replay = _sync_client("http://replay.invalid/v2")
+    replay.rest_client = ReplayRESTClient(CassettePlayer(interactions))
+    assert FleetApi(replay).get_my_ships(limit=20) == recorded_ships
+    assert fetch_my_agent(replay).json == recorded_agent.json
+    with pytest.raises(CassetteMiss):
+        FleetApi(replay).get_my_ships(limit=5)
+
+
+def test_async_record_then_replay_refresh_state(server, tmp_path):
+    path = tmp_path / "traffic.jsonl"
+
+    async def refresh(transport, base_url):
+        client = AsyncSpaceTradersClient(
+            DEFAULT_TOKEN, base_url=base_url, limiter=_limiter(), cache=ResponseCache(max_entries=0), transport=transport
+        )
+        async with client:
+            return await refresh_state_async(client)
+
+    cassette = Cassette(path)
+    recorded = asyncio.run(refresh(RecordingTransport(httpx.AsyncHTTPTransport(), cassette), server.base_url))
+    cassette.close()
+    served_before = server.stats()["requests"]
+
+    player = CassettePlayer.from_file(path)
+    replayed = asyncio.run(refresh(ReplayTransport(player), server.base_url))
+    assert server.stats()["requests"] == served_before
+    assert replayed["ships"] == recorded["ships"]
+    assert replayed["agent"] == recorded["agent"]
+    assert player.served == served_before
+
+
+def test_replay_speed_scales_recorded_latency(tmp_path):
+    path = tmp_path / "traffic.jsonl"
+    cassette = Cassette(path, clock=iter([0.0, 10.0, 10.5]).__next__)
+    cassette.record("GET", "https://x/v2/my/agent", cassette.now(), 200, {"Content-Type": "application/json"}, b"{}")
+    cassette.close()
+
+    slept = []
+    client = ReplayRESTClient(CassettePlayer.from_file(path, speed=10.0), sleep=slept.append)
+    response = client.request("GET", "https://elsewhere/v2/my/agent")
+    assert response.status == 200 and response.getheader("content-type") == "application/json"
+    assert slept == [pytest.approx(0.05)]
@@ -0,0 +1,65 @@
+import json
+
+import httpx
+
+from agent.cache import ResponseCache
+from agent.fastmodels import LazyModel, construct, lazy_view
+from agent.spacetraders_client import SpaceTradersApiClient
+from agent.transport import HttpxRESTClient
+
+from spacetraders_api_client import Configuration
+from spacetraders_api_client.api.fleet_api import FleetApi
+from spacetraders_api_client.models import GetShipNav200Response, ShipNav, ShipNavStatus
+
+
+NAV = {
+    "systemSymbol": "X1-A",
+    "waypointSymbol": "X1-A-1",
+    "route": {
+        "destination": {"symbol": "X1-A-1", "type": "PLANET", "systemSymbol": "X1-A", "x": 1, "y": 2},
+        "origin": {"symbol": "X1-A-2", "type": "MOON", "systemSymbol": "X1-A", "x": 3, "y": 4},
+        "departureTime": "2024-01-01T00:00:00+00:00",
+        "arrival": "2024-01-01T00:05:00+00:00",
+    },
+    "status": "IN_TRANSIT",
+    "flightMode": "CRUISE",
+}
+
+
+def test_construct_matches_from_dict():
+    fast = construct(ShipNav, NAV)
+    slow = ShipNav.from_dict(NAV)
+    assert fast == slow
+    assert fast.status is ShipNavStatus.IN_TRANSIT
+    assert fast.route.arrival == slow.route.arrival
+    assert fast.to_dict() == slow.to_dict()
+
+
+def test_lazy_view_converts_on_access():
+    view = lazy_view(ShipNav, NAV)
+    assert isinstance(view.route, LazyModel)
+    assert view.route.destination.symbol == "X1-A-1"
+    assert view.status is ShipNavStatus.IN_TRANSIT
+    assert view.materialize() == ShipNav.from_dict(NAV)
+
+
+def _client(fast: bool) -> SpaceTradersApiClient:
+    cfg = Configuration(host="https://example.test/v2", access_token="tok")
+    client = SpaceTradersApiClient(cfg, cache=ResponseCache(), fast_deserialize=fast)
+    body = json.dumps({"data": NAV}).encode("utf-8")
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body, headers={"content-type": "application/json"}))
+    client.rest_client = HttpxRESTClient(cfg, pool_maxsize=1)
+    client.rest_client.client = httpx.Client(transport=transport)
+    return client
+
+
+def test_fast_deserialize_through_generated_api():
+    fast = FleetApi(_client(True)).get_ship_nav("S-1")
+    slow = FleetApi(_client(False)).get_ship_nav("S-1")
+    assert isinstance(fast, GetShipNav200Response)
+    assert fast == slow
+
+
+def test_strict_validation_env_overrides(monkeypatch):
+    monkeypatch.setenv("SPACETRADERS_STRICT_VALIDATION", "1")
+    assert _client(True).fast_deserialize is False
@@ -0,0 +1,201 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import httpx
+
+from agent.async_client import AsyncSpaceTradersClient
+from agent.cache import ResponseCache
+from agent.ratelimit import RateLimiter
+from agent.refresh import IncrementalRefresher, fetched_markets, next_change
+from agent.singleflight import SingleFlight
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _ship(i):
+    if i < 3:
+        nav = {"systemSymbol": "X1-A", "waypointSymbol": "X1-A-1", "status": "DOCKED"}
+    else:
+        nav = {
+            "systemSymbol": "X1-A",
+            "waypointSymbol": f"X1-A-{i}",
+            "status": "IN_TRANSIT",
+            "route": {"arrival": _iso(T0 + 60 * i)},
+        }
+    return {"symbol": f"S-{i}", "nav": nav, "cooldown": {"remainingSeconds": 0}}
+
+
+class FakeApi:
+    def __init__(self, ships=50):
+        self.ships = {f"S-{i}": _ship(i) for i in range(ships)}
+        self.calls = []
+
+    def land(self, symbol):
+        self.ships[symbol]["nav"]["status"] = "IN_ORBIT"
+
+    def handler(self, request):
+        path = request.url.path.removeprefix("/v2")
+        self.calls.append(path)
+        if path == "/my/agent":
+            body = {"data": {"symbol": "ME", "credits": len(self.calls)}}
+        elif path == "/my/ships":
+            page, limit = int(request.url.params["page"]), int(request.url.params["limit"])
+            ships = list(self.ships.values())
+            body = {"data": ships[(page - 1) * limit:page * limit], "meta": {"total": len(ships), "page": page, "limit": limit}}
+        elif path.startswith("/my/ships/"):
+            body = {"data": self.ships[path.rsplit("/", 1)[1]]}
+        elif path == "/my/contracts":
+            body = {"data": [], "meta": {"total": 0, "page": 1, "limit": 20}}
+        elif path.endswith("/market"):
+            body = {"data": {"symbol": path.split("/")[-2], "tradeGoods": [], "calls": len(self.calls)}}
+        elif path.startswith("/systems/"):
+            body = {"data": {"symbol": path.rsplit("/", 1)[1], "traits": [{"symbol": "MARKETPLACE"}]}}
+        else:
+            return httpx.Response(500)
+        return httpx.Response(200, content=json.dumps(body).encode(), headers={"content-type": "application/json"})
+
+
+def _run(api, refresher, steps, clock):
+    http = httpx.AsyncClient(base_url="https://test/v2", transport=httpx.MockTransport(api.handler))
+    client = AsyncSpaceTradersClient(
+        "tok",
+        base_url="https://test/v2",
+        limiter=RateLimiter(rate_per_sec=1000, burst_capacity=1000),
+        cache=ResponseCache(clock=clock),
+        flight=SingleFlight(),
+        http_client=http,
+    )
+
+    async def run():
+        results = []
+        async with client:
+            for step in steps:
+                step()
+                api.calls.clear()
+                snapshot = await refresher.refresh_async(client)
+                results.append((snapshot, list(api.calls)))
+        return results
+
+    return asyncio.run(run())
+
+
+def test_next_change_reads_arrival_and_cooldown():
+    assert next_change(_ship(0)) is None
+    assert next_change(_ship(5)) == T0 + 300
+    cooling = {"nav": {"status": "DOCKED"}, "cooldown": {"remainingSeconds": 30, "expiration": _iso(T0 + 30)}}
+    assert next_change(cooling) == T0 + 30
+
+
+def test_only_elapsed_and_dirty_ships_are_refetched():
+    api = FakeApi(ships=50)
+    now = [T0]
+    refresher = IncrementalRefresher(full_interval_sec=3600, clock=lambda: now[0])
+
+    def advance(seconds, land=()):
+        def step():
+            now[0] += seconds
+            for symbol in land:
+                api.land(symbol)
+        return step
+
+    full, idle, arrived, mutated = _run(api, refresher, [
+        lambda: None,
+        advance(30),
+        advance(200, land=["S-3"]),  # S-3 arrives at T0+180; S-4 is due at T0+240
+        lambda: refresher.mark_dirty("S-1"),
+    ], clock=lambda: now[0])
+
+    snapshot, calls = full
+    assert snapshot["refresh"]["mode"] == "full"
+    assert sum(path.startswith("/my/ships") for path in calls) == 3  # 50 ships, 20 per page
+    assert len(snapshot["ships"]) == 50
+    assert [market["symbol"] for market in fetched_markets(snapshot)] == snapshot["refresh"]["markets"] == sorted(snapshot["markets"])
+
+    snapshot, calls = idle
+    assert calls == []
+    assert snapshot["refresh"] == {"mode": "incremental", "ships": [], "markets": []}
+    assert snapshot["markets"] and fetched_markets(snapshot) == []  # cached prices are not new observations
+
+    snapshot, calls = arrived
+    # X1-A-3 was already known as S-3's destination; only its market is re-read.
+    assert sorted(calls) == ["/my/ships/S-3", "/systems/X1-A/waypoints/X1-A-3/market"]
+    assert snapshot["refresh"]["ships"] == ["S-3"]
+    ships = {ship["symbol"]: ship for ship in snapshot["ships"]}
+    assert ships["S-3"]["nav"]["status"] == "IN_ORBIT"
+    assert ships["S-4"]["nav"]["status"] == "IN_TRANSIT"
+    assert snapshot["fresh_at"]["ships"]["S-3"] == _iso(T0 + 230).replace("Z", "+00:00")
+    assert snapshot["fresh_at"]["ships"]["S-10"] == _iso(T0).replace("Z", "+00:00")
+    assert "X1-A-3" in snapshot["markets"]
+    assert [market["symbol"] for market in fetched_markets(snapshot)] == ["X1-A-3"]
+
+    snapshot, calls = mutated
+    assert sorted(calls) == ["/my/agent", "/my/ships/S-1", "/systems/X1-A/waypoints/X1-A-1/market"]
+    assert snapshot["fresh_at"]["agent"] == _iso(T0 + 230).replace("Z", "+00:00")
+    assert snapshot["agent"]["credits"] != full[0]["agent"]["credits"]
+    assert refresher.world.ships_with_status("IN_ORBIT") == {"S-3"}
+    assert refresher.world.agent is snapshot["agent"]
+
+
+def test_due_ship_is_not_served_from_the_response_cache():
+    api = FakeApi(ships=4)
+    now = [T0]
+    refresher = IncrementalRefresher(full_interval_sec=3600, clock=lambda: now[0])
+
+    def in_flight():
+        now[0] = T0 + 175
+        refresher.mark_dirty("S-3")  # cached for 10 s while still IN_TRANSIT
+
+    def landed():
+        now[0] = T0 + 181
+        api.land("S-3")
+
+    _, (cached, _), (snapshot, calls) = _run(api, refresher, [lambda: None, in_flight, landed], clock=lambda: now[0])
+    assert cached["refresh"]["ships"] == ["S-3"]
+    assert "/my/ships/S-3" in calls
+    assert snapshot["ships"][3]["nav"]["status"] == "IN_ORBIT"
+    assert refresher.world.ships_with_status("IN_ORBIT") == {"S-3"}
+
+
+def test_failed_ship_fetch_keeps_cache_and_stays_due():
+    api = FakeApi(ships=4)
+    now = [T0]
+    refresher = IncrementalRefresher(full_interval_sec=3600, clock=lambda: now[0])
+    original = api.handler
+    down = set()
+
+    def flaky(request):
+        if request.url.path.removeprefix("/v2/my/ships/") in down:
+            return httpx.Response(400, json={"error": {"code": 400, "message": "busy"}})
+        return original(request)
+
+    api.handler = flaky
+
+    def step(*outage):
+        def advance():
+            now[0] += 600
+            down.clear()
+            down.update(outage)
+        return advance
+
+    _, (first, _), (second, calls) = _run(api, refresher, [lambda: None, step("S-3"), step()], clock=lambda: now[0])
+    assert first["errors"] and first["ships"][3]["nav"]["status"] == "IN_TRANSIT"
+    assert first["refresh"]["ships"] == []
+    assert "/my/ships/S-3" in calls
+    assert second["refresh"]["ships"] == ["S-3"]
+
+
+def test_full_sweep_after_interval():
+    api = FakeApi(ships=2)
+    now = [T0]
+    refresher = IncrementalRefresher(full_interval_sec=60, clock=lambda: now[0])
+
+    def later():
+        now[0] += 61
+
+    results = _run(api, refresher, [lambda: None, later], clock=lambda: now[0])
+    assert [snapshot["refresh"]["mode"] for snapshot, _ in results] == ["full", "full"]
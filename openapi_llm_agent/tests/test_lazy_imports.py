@@ -0,0 +1,18 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+
+def test_client_import_does_not_load_every_model():
+    code = (
+        "import sys, agent.spacetraders_client\n"
+        "loaded = [m for m in sys.modules if m.startswith('spacetraders_api_client.models.')]\n"
+        "assert 'spacetraders_api_client.api.fleet_api' not in sys.modules\n"
+        "import spacetraders_api_client as s\n"
+        "assert s.FleetApi.__name__ == 'FleetApi' and s.models.Ship.__name__ == 'Ship'\n"
+        "print(len(loaded))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert int(out.stdout) < 10
@@ -0,0 +1,96 @@
+import sqlite3
+
+import pytest
+
+from agent.persistence.logindex import search_query
+from agent.persistence.sqlite import SQLitePersistence
+from openapi_llm_agent.persistence.sqlite import SQLitePersistence as OpenAPIPersistence
+from openapi_llm_agent.state import get_recent_log_entries
+
+
+def _fill(store):
+    store.append_log("2024-01-01T00:00:01Z", "tool_call", "navigate_ship")
+    store.append_log("2024-01-01T00:00:02Z", "tool_error", "navigate_ship: 400 insufficient fuel")
+    store.append_log("2024-01-01T00:00:03Z", "tool_error", "dock_ship: ship MOCK-1 in transit")
+    store.append_log("2024-01-01T00:00:04Z", "tool_result", "navigate_ship: success")
+    store.append_log("2024-01-01T00:00:05Z", "tool_error", "navigate_ship: 429 rate limited")
+    store.append_log("2024-01-01T00:00:06Z", "advisory", 'say "hello" 100% of the time')
+
+
+@pytest.mark.parametrize("cls", [SQLitePersistence, OpenAPIPersistence])
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_search_by_category_and_text(tmp_path, cls, write_behind):
+    store = cls(tmp_path / "agent.db", write_behind=write_behind)
+    store.connect()
+    _fill(store)
+
+    rows = store.search_logs("navigate_ship", category="tool_error")
+    assert [message for _, _, message in rows] == [
+        "navigate_ship: 429 rate limited",
+        "navigate_ship: 400 insufficient fuel",
+    ]
+    assert len(store.search_logs(category="tool_error", limit=2)) == 2
+    assert [row[0] for row in store.search_logs(category="tool_error", since="2024-01-01T00:00:03Z")] == [
+        "2024-01-01T00:00:05Z",
+        "2024-01-01T00:00:03Z",
+    ]
+    assert store.search_logs("MOCK-1")[0][2].startswith("dock_ship")
+    assert store.search_logs('"hello" 100%')[0][1] == "advisory"
+    assert store.search_logs("jump_ship") == []
+    store.close()
+
+
+def test_existing_rows_are_indexed_on_upgrade(tmp_path):
+    db_path = tmp_path / "agent.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE immutable_log (id INTEGER PRIMARY KEY AUTOINCREMENT, ts TEXT NOT NULL,"
+                 " category TEXT NOT NULL, message TEXT NOT NULL)")
+    conn.execute("INSERT INTO immutable_log (ts, category, message) VALUES ('t', 'tool_error', 'orbit_ship: boom')")
+    conn.commit()
+    conn.close()
+
+    store = SQLitePersistence(db_path)
+    store.connect()
+    assert store.search_logs("orbit_ship") == [("t", "tool_error", "orbit_ship: boom")]
+    store.close()
+
+
+def test_deleted_rows_leave_the_index(tmp_path):
+    store = SQLitePersistence(tmp_path / "agent.db")
+    store.connect()
+    _fill(store)
+    store._conn.execute("DELETE FROM immutable_log WHERE category = 'tool_error'")
+    store._conn.commit()
+    assert store.search_logs("navigate_ship", category="tool_error") == []
+    assert store._conn.execute(
+        "SELECT COUNT(*) FROM immutable_log_fts WHERE immutable_log_fts MATCH 'rate'"
+    ).fetchone()[0] == 0
+    store.close()
+
+
+def test_filters_use_indexes(tmp_path):
+    store = SQLitePersistence(tmp_path / "agent.db")
+    store.connect()
+    sql, params = search_query(True, category="tool_error")
+    plan = str(store._conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall())
+    assert "immutable_log_category_ts" in plan
+    sql, params = search_query(True, text="navigate_ship", category="tool_error")
+    plan = str(store._conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall())
+    assert "VIRTUAL TABLE INDEX" in plan
+    store.close()
+
+
+def test_like_fallback_escapes_wildcards():
+    sql, params = search_query(False, text="100%_x")
+    assert "LIKE" in sql and params[0] == "%100\\%\\_x%"
+
+
+def test_recent_entries_with_filters(tmp_path):
+    store = OpenAPIPersistence(tmp_path / "agent.db")
+    store.connect()
+    _fill(store)
+    assert get_recent_log_entries(store, limit=5, category="tool_error", text="navigate_ship") == [
+        "2024-01-01T00:00:02Z tool_error: navigate_ship: 400 insufficient fuel",
+        "2024-01-01T00:00:05Z tool_error: navigate_ship: 429 rate limited",
+    ]
+    store.close()
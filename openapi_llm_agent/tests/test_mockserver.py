@@ -0,0 +1,75 @@
+import asyncio
+
+import httpx
+import pytest
+
+from agent.async_client import AsyncSpaceTradersClient
+from agent.cache import ResponseCache
+from agent.mockserver import DEFAULT_TOKEN, MockServerConfig, MockSpaceTradersServer, MockWorld, conform
+from agent.pagination import iter_my_ships
+from agent.ratelimit import RateLimiter
+from agent.spacetraders_client import SpaceTradersApiClient
+from agent.state import refresh_state_async
+
+from spacetraders_api_client import Configuration
+from spacetraders_api_client.models import Contract
+
+AUTH = {"Authorization": f"Bearer {DEFAULT_TOKEN}"}
+
+
+@pytest.fixture
+def server():
+    with MockSpaceTradersServer(world=MockWorld(ships=25), config=MockServerConfig(enforce_rate_limit=False)) as srv:
+        yield srv
+
+
+def test_conform_fills_required_fields_and_enum_strings():
+    contract = conform(Contract, {"id": "c-1"})
+    assert contract["type"] == "PROCUREMENT"
+    assert Contract.from_dict(contract).id == "c-1"
+
+
+def test_generated_client_pages_through_mock_fleet(server):
+    cfg = Configuration(host=server.base_url, access_token=DEFAULT_TOKEN)
+    client = SpaceTradersApiClient(cfg, limiter=RateLimiter(rate_per_sec=1000, burst_capacity=1000), cache=ResponseCache())
+    ships = list(iter_my_ships(client))
+    assert sorted(s.symbol for s in ships) == sorted(server.world.ships)
+    assert server.stats()["by_status"] == {200: 2}
+
+
+def test_refresh_state_against_mock(server):
+    async def run():
+        client = AsyncSpaceTradersClient(
+            DEFAULT_TOKEN, base_url=server.base_url, limiter=RateLimiter(rate_per_sec=1000, burst_capacity=1000), cache=ResponseCache()
+        )
+        async with client:
+            return await refresh_state_async(client)
+
+    snapshot = asyncio.run(run())
+    assert snapshot["errors"] == []
+    assert len(snapshot["ships"]) == 25
+    assert snapshot["markets"]
+
+
+def test_rate_limit_and_error_injection():
+    config = MockServerConfig(rate_per_sec=1, burst_capacity=1, burst_window_sec=60)
+    with MockSpaceTradersServer(config=config) as srv, httpx.Client(base_url=srv.base_url, headers=AUTH) as http:
+        statuses = [http.get("/my/agent").status_code for _ in range(3)]
+        limited = http.get("/my/agent")
+        assert statuses[0] == 200 and 429 in statuses
+        body = limited.json()["error"]
+        assert body["code"] == 429 and body["data"]["retryAfter"] > 0
+        assert "x-ratelimit-reset" in limited.headers
+        assert http.get("/my/agent", headers={"Authorization": "Bearer nope"}).status_code == 401
+
+    with MockSpaceTradersServer(config=MockServerConfig(enforce_rate_limit=False, error_rate=1.0)) as srv:
+        assert httpx.get(srv.base_url + "/my/agent", headers=AUTH).status_code in (502, 503)
+
+
+def test_ship_responses_are_copies_not_live_state(server):
+    symbol = next(iter(server.world.ships))
+    status, ship, _, _ = server.handle("GET", f"/v2/my/ships/{symbol}", AUTH["Authorization"])
+    _, nav, _, _ = server.handle("GET", f"/v2/my/ships/{symbol}/nav", AUTH["Authorization"])
+    assert status == 200
+    server.world.set_nav_status(symbol, "IN_TRANSIT")
+    assert ship["data"]["nav"]["status"] == nav["data"]["status"] != "IN_TRANSIT"
@@ -0,0 +1,89 @@
+import pytest
+
+from agent.persistence import notes
+from agent.persistence.notes import apply_delta, content_hash, line_delta
+from agent.persistence.sqlite import SQLitePersistence
+from openapi_llm_agent.persistence.sqlite import SQLitePersistence as OpenAPIPersistence
+
+BASE = "".join(f"- goal {i}: trade route {i} via X1-AB{i:02d}\n" for i in range(40))
+
+
+def _ts(i):
+    return f"2024-03-01T00:{i // 60:02d}:{i % 60:02d}+00:00"
+
+
+def _revisions(store):
+    return store._conn.execute("SELECT hash, parent_hash, depth FROM notes_revisions").fetchall()
+
+
+def test_line_delta_round_trip():
+    old = BASE
+    new = BASE.replace("goal 3:", "goal 3 (done):") + "- new goal\n"
+    assert apply_delta(old, line_delta(old, new)) == new
+    assert apply_delta(old, line_delta(old, "")) == ""
+    assert apply_delta("", line_delta("", new)) == new
+    assert apply_delta("a\nb", line_delta("a\nb", "a\nb\nc")) == "a\nb\nc"
+
+
+@pytest.mark.parametrize("cls", [SQLitePersistence, OpenAPIPersistence])
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_every_revision_materializes(tmp_path, cls, write_behind):
+    store = cls(tmp_path / "agent.db", write_behind=write_behind)
+    store.connect()
+    versions = [BASE + "".join(f"- step {j}\n" for j in range(i)) for i in range(40)]
+    for i, text in enumerate(versions):
+        store.save_strategy_notes(_ts(i), text)
+
+    assert store.fetch_strategy_notes() == versions[-1]
+    store._notes._cache.clear()
+    for text in versions:
+        assert store.notes_revision(content_hash(text)) == text
+    assert store.notes_at(_ts(7)) == versions[7]
+    assert store.notes_at("2024-02-01T00:00:00+00:00") is None
+    assert store.notes_revision("0" * 64) is None
+
+    depths = [depth for _, _, depth in _revisions(store)]
+    assert max(depths) < notes.MAX_CHAIN
+    assert depths.count(0) == -(-len(versions) // notes.MAX_CHAIN)
+    store.close()
+
+
+@pytest.mark.parametrize("cls", [SQLitePersistence, OpenAPIPersistence])
+def test_identical_saves_share_one_revision(tmp_path, cls):
+    store = cls(tmp_path / "agent.db")
+    store.connect()
+    store.save_strategy_notes(_ts(0), BASE)
+    store.save_strategy_notes(_ts(1), BASE)
+    store.save_strategy_notes(_ts(2), BASE + "- x\n")
+    store.save_strategy_notes(_ts(3), BASE)
+
+    assert len(_revisions(store)) == 2
+    history = store.notes_history()
+    assert [row[1] for row in history] == [content_hash(t) for t in (BASE, BASE + "- x\n", BASE, BASE)]
+    assert store.notes_at(_ts(3)) == BASE
+    store.close()
+
+
+def test_unrelated_text_is_stored_in_full(tmp_path):
+    store = SQLitePersistence(tmp_path / "agent.db")
+    store.connect()
+    store.save_strategy_notes(_ts(0), BASE)
+    store.save_strategy_notes(_ts(1), "".join(f"completely different line {i}\n" for i in range(40)))
+    assert sorted(depth for _, _, depth in _revisions(store)) == [0, 0]
+    store.close()
+
+
+def test_history_survives_reconnect(tmp_path):
+    store = SQLitePersistence(tmp_path / "agent.db")
+    store.connect()
+    store.save_strategy_notes(_ts(0), BASE)
+    store.save_strategy_notes(_ts(1), BASE + "- a\n")
+    store.close()
+
+    store = SQLitePersistence(tmp_path / "agent.db")
+    store.connect()
+    store.save_strategy_notes(_ts(2), BASE + "- a\n- b\n")
+    store._notes._cache.clear()
+    assert store.notes_at(_ts(2)) == BASE + "- a\n- b\n"
+    assert [depth for _, _, _, depth in store.notes_history()] == [2, 1, 0]
+    store.close()
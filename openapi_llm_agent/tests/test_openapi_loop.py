@@ -5,7 +5,7 @@ import pytest
 from pathlib import Path
 from datetime import datetime, timezone
 
-from agent.loop import (
+from openapi_llm_agent.loop import (
     run_loop,
     _read_input,
     _extract_wait_duration,
@@ -13,8 +13,8 @@ from agent.loop import (
     STEP2_PROMPT_TEMPLATE,
     STEP3_PROMPT_TEMPLATE,
 )
-from agent.state import get_strategy_notes, save_strategy_notes, get_recent_log_entries
-from agent.persistence.sqlite import SQLitePersistence
+from openapi_llm_agent.state import get_strategy_notes, save_strategy_notes, get_recent_log_entries
+from openapi_llm_agent.persistence.sqlite import SQLitePersistence
 
 
 class TestInputReading:
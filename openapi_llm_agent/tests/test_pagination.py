@@ -0,0 +1,56 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agent.pagination import aiter_pages, collect, iter_pages
+from agent.spacetraders_client import APIResult
+from spacetraders_api_client.models.meta import Meta
+
+TOTAL = 47
+
+
+def _records(page, limit):
+    start = (page - 1) * limit
+    return list(range(start, min(start + limit, TOTAL)))
+
+
+def test_iter_pages_yields_every_record_from_models():
+    calls = []
+
+    def fetch_page(page, limit):
+        calls.append(page)
+        return SimpleNamespace(data=_records(page, limit), meta=Meta(total=TOTAL, page=page, limit=limit))
+
+    assert sorted(iter_pages(fetch_page)) == list(range(TOTAL))
+    assert sorted(calls) == [1, 2, 3]
+
+
+def test_iter_pages_until_stops_early():
+    calls = []
+
+    def fetch_page(page, limit):
+        calls.append(page)
+        return SimpleNamespace(data=_records(page, limit), meta=Meta(total=TOTAL, page=page, limit=limit))
+
+    assert list(iter_pages(fetch_page, until=lambda r: r == 5)) == [0, 1, 2, 3, 4, 5]
+    assert calls == [1]
+
+
+def test_iter_pages_raises_on_failed_page():
+    def fetch_page(page, limit):
+        return APIResult(ok=False, status=500, json=None, raw=None)
+
+    with pytest.raises(RuntimeError, match="page 1: 500"):
+        list(iter_pages(fetch_page))
+
+
+def test_aiter_pages_with_api_results():
+    async def fetch_page(page, limit):
+        await asyncio.sleep(0.01 * (4 - page))  # later pages finish first
+        body = {"data": _records(page, limit), "meta": {"total": TOTAL, "page": page, "limit": limit}}
+        return APIResult(ok=True, status=200, json=body, raw=None)
+
+    records = asyncio.run(collect(aiter_pages(fetch_page)))
+    assert sorted(records) == list(range(TOTAL))
+    assert records[:20] == list(range(20))
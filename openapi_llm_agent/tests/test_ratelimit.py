@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+import pytest
+
+from agent.ratelimit import Lane, RateLimiter, lane_for_method
+from openapi_llm_agent.tests.fakes import FakeClock
+
+
+def test_burst_pool_then_steady_rate():
+    clock = FakeClock(0.0)
+    limiter = RateLimiter(rate_per_sec=2, burst_capacity=3, burst_window_sec=60, clock=clock)
+
+    # 2 steady tokens + 3 burst tokens available up front
+    assert [limiter.try_acquire() for _ in range(6)] == [True] * 5 + [False]
+    assert limiter.seconds_until_available() == pytest.approx(0.5)
+
+    clock.now += 0.5  # one steady token refills
+    assert limiter.try_acquire()
+    assert not limiter.try_acquire()
+
+
+def test_ship_actions_take_priority_over_background():
+    limiter = RateLimiter(rate_per_sec=20, burst_capacity=0, burst_window_sec=60)
+    # Drain the steady bucket so both waiters have to queue
+    drained = 0
+    while limiter.try_acquire():
+        drained += 1
+
+    order = []
+    start = threading.Event()
+
+    def worker(lane):
+        start.wait()
+        limiter.acquire(lane)
+        order.append(lane)
+
+    threads = [threading.Thread(target=worker, args=(Lane.BACKGROUND,)) for _ in range(3)]
+    threads.append(threading.Thread(target=worker, args=(Lane.SHIP_ACTION,)))
+    for t in threads:
+        t.start()
+    start.set()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert order.index(Lane.SHIP_ACTION) <= 1
+    stats = limiter.stats()["lanes"]
+    assert stats["background"]["acquired"] == drained + 3
+    assert stats["ship_action"]["queue_depth"] == 0
+
+
+def test_acquire_timeout():
+    limiter = RateLimiter(rate_per_sec=0.01, burst_capacity=0, burst_window_sec=60)
+    while limiter.try_acquire():
+        pass
+    with pytest.raises(TimeoutError):
+        limiter.acquire(timeout=0.05)
+
+
+def test_acquire_async_records_wait():
+    limiter = RateLimiter(rate_per_sec=50, burst_capacity=0, burst_window_sec=60)
+
+    async def run():
+        return await asyncio.gather(*(limiter.acquire_async() for _ in range(60)))
+
+    waits = asyncio.run(run())
+    assert max(waits) > 0
+    assert limiter.stats()["lanes"]["background"]["acquired"] == 60
+
+
+def test_lane_for_method():
+    assert lane_for_method("get") is Lane.BACKGROUND
+    assert lane_for_method("POST") is Lane.SHIP_ACTION
@@ -0,0 +1,122 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from agent.persistence.readers import ReaderPool
+from agent.persistence.sqlite import SQLitePersistence
+from openapi_llm_agent.persistence.sqlite import SQLitePersistence as OpenAPIPersistence
+
+
+def _count(conn):
+    return conn.execute("SELECT COUNT(*) FROM immutable_log").fetchone()[0]
+
+
+@pytest.mark.parametrize("cls", [SQLitePersistence, OpenAPIPersistence])
+def test_queries_are_read_only(tmp_path, cls):
+    store = cls(tmp_path / "agent.db")
+    store.connect()
+    store.append_log("t1", "tool_call", "hello")
+    assert store.query("SELECT message FROM immutable_log") == [("hello",)]
+    with pytest.raises(sqlite3.OperationalError):
+        store.query("DELETE FROM immutable_log")
+    assert store.fetch_logs() == [("t1", "tool_call", "hello")]
+    store.close()
+
+
+def test_reads_do_not_wait_for_an_open_write(tmp_path):
+    db_path = tmp_path / "agent.db"
+    store = SQLitePersistence(db_path)
+    store.connect()
+    store.append_log("t1", "tool_call", "committed")
+
+    other = sqlite3.connect(db_path, timeout=0)
+    other.execute("BEGIN IMMEDIATE")
+    other.execute("INSERT INTO immutable_log (ts, category, message) VALUES ('t2', 'x', 'pending')")
+    assert store.search_logs("pending") == []
+    assert [row[2] for row in store.fetch_logs()] == ["committed"]
+    other.commit()
+    assert store.search_logs("pending")[0][2] == "pending"
+    other.close()
+    store.close()
+
+
+def test_checkout_sees_one_snapshot(tmp_path):
+    store = SQLitePersistence(tmp_path / "agent.db")
+    store.connect()
+    store.append_log("t1", "tool_call", "a")
+
+    def read_twice(conn):
+        before = _count(conn)
+        store.append_log("t2", "tool_call", "b")
+        return before, _count(conn)
+
+    assert store.read(read_twice) == (1, 1)
+    assert store.query("SELECT COUNT(*) FROM immutable_log") == [(2,)]
+    store.close()
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_concurrent_readers_and_writer(tmp_path, write_behind):
+    store = SQLitePersistence(tmp_path / "agent.db", write_behind=write_behind, readers=2, read_your_writes=False)
+    store.connect()
+    errors = []
+    done = threading.Event()
+
+    def reader():
+        try:
+            last = 0
+            while not done.is_set():
+                (count,) = store.query("SELECT COUNT(*) FROM immutable_log")[0]
+                assert count >= last
+                last = count
+                store.search_logs("tick", limit=5)
+        except Exception as exc:  # surfaced by the assertion below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(300):
+        store.append_log(f"t{i:04d}", "tool_call", f"tick {i}")
+        if i % 50 == 0:
+            store.save_strategy_notes(f"t{i:04d}", f"notes {i}")
+    done.set()
+    for thread in threads:
+        thread.join()
+    store.flush()
+    assert errors == []
+    assert store.query("SELECT COUNT(*) FROM immutable_log") == [(300,)]
+    assert store.fetch_strategy_notes() == "notes 250"
+    store.close()
+
+
+def test_async_queries(tmp_path):
+    store = OpenAPIPersistence(tmp_path / "agent.db")
+    store.connect()
+    store.append_log("t1", "tool_call", "a")
+    store.append_log("t2", "tool_call", "b")
+
+    async def main():
+        return await asyncio.gather(
+            store.aquery("SELECT message FROM immutable_log ORDER BY id"),
+            store.aread(_count),
+        )
+
+    assert asyncio.run(main()) == [[("a",), ("b",)], 2]
+    store.close()
+
+
+def test_pool_is_bounded(tmp_path):
+    db_path = tmp_path / "agent.db"
+    SQLitePersistence(db_path).connect()
+    pool = ReaderPool(db_path, size=1, timeout=0.05)
+    with pool.connection():
+        with pytest.raises(TimeoutError):
+            with pool.connection():
+                pass
+    assert pool.query("SELECT 1") == [(1,)]
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.query("SELECT 1")
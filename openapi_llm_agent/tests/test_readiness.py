@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+
+from agent.readiness import ReadinessEvent, ReadinessTracker, busy_until
+from agent.worldmodel import WorldModel
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+def _iso(epoch):
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def _ship(symbol, status, arrival=None, cooldown=None):
+    nav = {"systemSymbol": "X1-A", "waypointSymbol": "X1-A-1", "status": status}
+    if arrival is not None:
+        nav["route"] = {"arrival": _iso(arrival)}
+    ship = {"symbol": symbol, "nav": nav}
+    if cooldown is not None:
+        ship["cooldown"] = {"remainingSeconds": 1, "expiration": _iso(cooldown)}
+    return ship
+
+
+def test_busy_until():
+    assert busy_until(_ship("S", "DOCKED"), T0) == (False, None)
+    assert busy_until(_ship("S", "IN_TRANSIT", arrival=T0 + 60), T0) == (True, T0 + 60)
+    assert busy_until(_ship("S", "IN_TRANSIT", arrival=T0 - 1), T0) == (False, None)
+    assert busy_until(_ship("S", "IN_TRANSIT", arrival=T0 + 60, cooldown=T0 + 90), T0) == (True, T0 + 90)
+    assert busy_until(_ship("S", "IN_TRANSIT"), T0) == (True, None)
+    assert busy_until({"symbol": "S", "nav": {}}, T0) == (True, None)
+
+
+def test_timers_move_ships_to_idle():
+    now = [T0]
+    world = WorldModel()
+    world.upsert_ship(_ship("S-1", "DOCKED"))
+    tracker = ReadinessTracker(clock=lambda: now[0])
+    tracker.attach(world)
+    world.replace_ships([
+        _ship("S-1", "DOCKED"),
+        _ship("S-2", "IN_TRANSIT", arrival=T0 + 60),
+        _ship("S-3", "IN_ORBIT", cooldown=T0 + 30),
+        {"symbol": "S-4", "nav": {}},
+    ])
+    assert tracker.poll() == [ReadinessEvent("S-1", True, T0)]
+    assert tracker.summary() == {"total_ships": 4, "idle_ships": 1, "busy_ships": 3, "ready_for_action": True}
+    assert tracker.next_ready_at() == T0 + 30
+
+    # S-2's arrival is pushed back before its first timer fires: that timer is stale.
+    world.upsert_ship(_ship("S-2", "IN_TRANSIT", arrival=T0 + 100))
+    assert tracker.poll(T0 + 60) == [ReadinessEvent("S-3", True, T0 + 30)]
+    assert tracker.poll(T0 + 100) == [ReadinessEvent("S-2", True, T0 + 100)]
+    assert tracker.idle_ships == {"S-1", "S-2", "S-3"}
+    assert tracker.busy_ships == {"S-4"}
+    assert tracker.next_ready_at() is None
+
+    now[0] = T0 + 120
+    world.upsert_ship(_ship("S-1", "IN_TRANSIT", arrival=T0 + 300))
+    world.remove_ship("S-3")
+    assert tracker.poll() == [ReadinessEvent("S-1", False, T0 + 120)]
+    assert tracker.summary()["total_ships"] == 3
+    assert tracker.idle_ships == {"S-2"}
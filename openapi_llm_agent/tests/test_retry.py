@@ -0,0 +1,126 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+import urllib3
+
+from agent.async_client import AsyncSpaceTradersClient
+from agent.cache import ResponseCache
+from agent.ratelimit import RateLimiter
+from agent.retry import RetryPolicy, call_with_retry, retry_after_from, retry_stats
+from agent.spacetraders_client import SpaceTradersApiClient
+from agent.transport import HttpxRESTClient
+
+from spacetraders_api_client import Configuration
+
+RATE_LIMITED_BODY = {"error": {"code": 429, "message": "slow down", "data": {"retryAfter": 0.01}}}
+FAST = RetryPolicy(base_delay_sec=0.001, max_delay_sec=0.05)
+
+
+def _limiter():
+    return RateLimiter(rate_per_sec=1000, burst_capacity=1000)
+
+
+def test_retry_after_sources():
+    assert retry_after_from(json.dumps({"error": {"code": 429, "data": {"retryAfter": 1.5}}}).encode()) == 1.5
+    assert retry_after_from(None, {"Retry-After": "2"}) == 2.0
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    reset = {"x-ratelimit-reset": "2024-01-01T00:00:03.000Z"}
+    assert retry_after_from(b"", reset, now=lambda: now) == 3.0
+    assert retry_after_from({"error": {"code": 400}}) is None
+
+
+def test_backoff_is_full_jitter():
+    policy = RetryPolicy(base_delay_sec=1.0, max_delay_sec=5.0, rng=lambda: 1.0)
+    assert [policy.backoff(a) for a in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 5.0]
+    assert RetryPolicy(rng=lambda: 0.0).backoff(3) == 0.0
+    assert not RetryPolicy().should_retry("POST", 502, 1)
+    assert RetryPolicy().should_retry("POST", 429, 1)
+    assert not RetryPolicy(max_attempts=2).should_retry("GET", 503, 2)
+
+
+def _sync_client(responses, hits):
+    def handler(request):
+        hits.append(request.method)
+        status, body = responses.pop(0)
+        return httpx.Response(status, json=body)
+
+    cfg = Configuration(host="https://example.test/v2", access_token="tok")
+    client = SpaceTradersApiClient(cfg, limiter=_limiter(), cache=ResponseCache(), retry_policy=FAST)
+    client.rest_client = HttpxRESTClient(cfg, pool_maxsize=1)
+    client.rest_client.client = httpx.Client(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_sync_client_retries_429_then_succeeds():
+    hits = []
+    client = _sync_client([(429, RATE_LIMITED_BODY), (200, {"data": {"ok": True}})], hits)
+    resp = client.call_api("POST", "https://example.test/v2/my/ships/S-1/orbit")
+    assert resp.status == 200
+    assert hits == ["POST", "POST"]
+
+
+def test_sync_client_does_not_replay_mutation_on_5xx():
+    hits = []
+    client = _sync_client([(502, {"error": {"code": 502}}), (200, {})], hits)
+    assert client.call_api("POST", "https://example.test/v2/my/ships/S-1/purchase").status == 502
+    assert len(hits) == 1
+
+
+def test_sync_client_retries_raw_urllib3_connection_errors():
+    cfg = Configuration(host="http://127.0.0.1:1/v2", access_token="tok")
+    cfg.retries = 0
+    client = SpaceTradersApiClient(cfg, limiter=_limiter(), cache=ResponseCache(), retry_policy=FAST)
+    before = retry_stats()
+    with pytest.raises(urllib3.exceptions.HTTPError):
+        client.call_api("GET", "http://127.0.0.1:1/v2/my/agent")
+    after = retry_stats()
+    assert after["retries"] - before["retries"] == FAST.max_attempts - 1
+    assert after["gave_up"] - before["gave_up"] == 1
+
+
+def test_async_client_retries_transient_gets():
+    statuses = [503, 504, 200]
+
+    async def handler(request):
+        status = statuses.pop(0)
+        return httpx.Response(status, json={"data": {"symbol": "A"}} if status == 200 else {})
+
+    async def run():
+        http = httpx.AsyncClient(base_url="https://test/v2", transport=httpx.MockTransport(handler))
+        client = AsyncSpaceTradersClient(
+            "tok", base_url="https://test/v2", limiter=_limiter(), cache=ResponseCache(), retry_policy=FAST, http_client=http
+        )
+        async with client:
+            return await client.fetch_my_agent()
+
+    result = asyncio.run(run())
+    assert result.ok and result.json == {"data": {"symbol": "A"}}
+    assert statuses == []
+
+
+def test_async_client_counts_give_up_on_network_errors():
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    async def run():
+        http = httpx.AsyncClient(base_url="https://test/v2", transport=httpx.MockTransport(handler))
+        client = AsyncSpaceTradersClient(
+            "tok", base_url="https://test/v2", limiter=_limiter(), cache=ResponseCache(), retry_policy=FAST, http_client=http
+        )
+        async with client:
+            return await client.fetch_my_agent()
+
+    before = retry_stats()["gave_up"]
+    result = asyncio.run(run())
+    assert not result.ok and result.status == -1
+    assert retry_stats()["gave_up"] - before == 1
+
+
+def test_call_with_retry_for_tool_results():
+    results = [RATE_LIMITED_BODY, {"data": {"ok": True}}]
+    slept = []
+    assert call_with_retry(lambda: results.pop(0), policy=FAST, sleep=slept.append) == {"data": {"ok": True}}
+    assert len(slept) == 1 and slept[0] >= 0.01
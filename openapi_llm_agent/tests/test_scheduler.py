@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from agent.scheduler import Scheduler
+from openapi_llm_agent.tests.fakes import FakeClock
+
+
+def test_dispatches_only_due_handlers_in_time_order():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    ran = []
+    scheduler.at(1010, "arrival", lambda: ran.append("arrival"))
+    scheduler.at(1005, "cooldown", lambda: ran.append("cooldown"))
+    scheduler.after(30, "late", lambda: ran.append("late"))
+
+    assert scheduler.run_pending() == 0
+    assert scheduler.next_due() == 1005
+    assert scheduler.run_pending(1010) == 2
+    assert ran == ["cooldown", "arrival"]
+    assert scheduler.next_due() == 1030
+
+
+def test_keys_replace_and_cancel():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    ran = []
+    scheduler.at(1010, "ready", lambda: ran.append("first"))
+    scheduler.at(1020, "ready", lambda: ran.append("second"))
+    assert scheduler.pending("ready") == 1020
+    assert scheduler.run_pending(1015) == 0
+
+    scheduler.at(1030, "other", lambda: ran.append("other"))
+    assert scheduler.cancel("other") and not scheduler.cancel("other")
+    assert scheduler.run_pending(1100) == 1
+    assert ran == ["second"]
+    assert scheduler.next_due() is None
+
+
+def test_periodic_jobs_rearm_without_drift():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    ran = []
+    scheduler.every(10, "tick", lambda: ran.append(clock.now))
+    with pytest.raises(ValueError):
+        scheduler.every(0, "bad", lambda: None)
+
+    for now in (1000, 1004, 1010, 1021):
+        clock.now = now
+        scheduler.run_pending()
+    assert ran == [1000, 1010, 1021]
+    assert scheduler.pending("tick") == 1030
+
+
+def test_failing_handler_does_not_stop_others():
+    scheduler = Scheduler(clock=FakeClock())
+    ran = []
+    scheduler.call_soon("boom", lambda: 1 / 0)
+    scheduler.call_soon("ok", lambda: ran.append("ok"))
+    assert scheduler.run_pending() == 2
+    assert ran == ["ok"]
+
+
+def test_run_sleeps_until_woken_from_another_thread():
+    scheduler = Scheduler()
+    ran = []
+    scheduler.after(3600, "far", lambda: ran.append("far"))
+
+    def handoff():
+        time.sleep(0.05)
+        scheduler.call_soon("advisory", lambda: (ran.append("advisory"), scheduler.stop()))
+
+    thread = threading.Thread(target=handoff)
+    start = time.monotonic()
+    thread.start()
+    scheduler.run()
+    thread.join()
+    assert ran == ["advisory"]
+    assert time.monotonic() - start < 2
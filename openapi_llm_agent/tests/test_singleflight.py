@@ -0,0 +1,123 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+
+from agent.async_client import AsyncSpaceTradersClient
+from agent.cache import ResponseCache
+from agent.ratelimit import RateLimiter
+from agent.singleflight import SingleFlight, flight_key
+from agent.spacetraders_client import SpaceTradersApiClient
+from agent.transport import HttpxRESTClient
+
+from spacetraders_api_client import Configuration
+
+
+def test_flight_key_only_for_gets():
+    assert flight_key("tok", "get", "/my/agent", "b=2&a=1") == ("tok", "GET", "/my/agent", "a=1&b=2")
+    assert flight_key("tok", "POST", "/my/ships/S-1/orbit") is None
+
+
+def test_threads_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def slow():
+        calls.append(1)
+        release.wait(2)
+        return "result"
+
+    key = flight_key("tok", "GET", "/my/agent")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do(key, slow))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    while flight.stats()["coalesced"] < 3:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert sorted(shared for _, shared in results) == [False, True, True, True]
+    assert flight.stats()["hit_rate"] == 0.75
+    assert flight.in_flight() == 0
+
+
+def test_errors_reach_every_waiter():
+    flight = SingleFlight()
+    key = flight_key("tok", "GET", "/my/agent")
+
+    def boom():
+        raise RuntimeError("down")
+
+    for _ in range(2):
+        try:
+            flight.do(key, boom)
+        except RuntimeError as exc:
+            assert str(exc) == "down"
+    assert flight.in_flight() == 0
+
+
+def test_sync_client_coalesces_concurrent_gets():
+    hits = []
+    gate = threading.Event()
+
+    def handler(request):
+        hits.append(request.url.path)
+        gate.wait(2)
+        return httpx.Response(200, json={"data": {"symbol": "A"}})
+
+    cfg = Configuration(host="https://example.test/v2", access_token="tok")
+    flight = SingleFlight()
+    client = SpaceTradersApiClient(cfg, limiter=RateLimiter(rate_per_sec=1000, burst_capacity=1000), cache=ResponseCache(max_entries=0), flight=flight)
+    client.rest_client = HttpxRESTClient(cfg, pool_maxsize=4)
+    client.rest_client.client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    bodies = []
+
+    def fetch():
+        resp = client.call_api("GET", "https://example.test/v2/systems/X1-A")
+        bodies.append(json.loads(resp.read()))
+
+    threads = [threading.Thread(target=fetch) for _ in range(3)]
+    for t in threads:
+        t.start()
+    while flight.stats()["coalesced"] < 2:
+        time.sleep(0.01)
+    gate.set()
+    for t in threads:
+        t.join()
+
+    assert hits == ["/v2/systems/X1-A"]
+    assert bodies == [{"data": {"symbol": "A"}}] * 3
+
+
+def test_async_client_coalesces_gather():
+    hits = []
+
+    async def handler(request):
+        hits.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"data": {"credits": 1}})
+
+    async def run():
+        http = httpx.AsyncClient(base_url="https://test/v2", transport=httpx.MockTransport(handler))
+        client = AsyncSpaceTradersClient(
+            "tok",
+            base_url="https://test/v2",
+            limiter=RateLimiter(rate_per_sec=1000, burst_capacity=1000),
+            cache=ResponseCache(max_entries=0),
+            flight=SingleFlight(),
+            http_client=http,
+        )
+        async with client:
+            return await asyncio.gather(*(client.fetch_my_agent() for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert hits == ["/v2/my/agent"]
+    assert all(r is results[0] for r in results)
+    assert results[0].json == {"data": {"credits": 1}}
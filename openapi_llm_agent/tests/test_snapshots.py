@@ -0,0 +1,107 @@
+import sqlite3
+from datetime import datetime, timezone
+
+import pytest
+
+from agent.persistence import snapshots
+from agent.persistence.snapshots import SnapshotEncoder, diff, patch
+from agent.persistence.sqlite import SQLitePersistence
+
+
+def _state(i):
+    return {
+        "source": "SpaceTraders",
+        "agent": {"symbol": "AGENT", "credits": 1000 + i},
+        "ships": [
+            {"symbol": f"SHIP-{n}", "nav": {"status": "DOCKED" if (i + n) % 2 else "IN_ORBIT"}, "fuel": 100 - i}
+            for n in range(3 + i % 2)
+        ],
+        "waypoints": {
+            f"X1-A{n}": {"type": "PLANET", "x": n, "y": -n, "traits": [{"symbol": "MARKETPLACE"}]} for n in range(30)
+        },
+        "markets": {"X1-A1": {"goods": [{"symbol": "IRON_ORE", "price": 40 + i}]}},
+        "errors": [],
+    }
+
+
+@pytest.mark.parametrize(
+    "old,new",
+    [
+        ({"a": 1, "b": [1, 2, 3]}, {"a": 2, "b": [1, 3], "c": None}),
+        ([1, {"x": 1}], [1, {"x": 1, "y": 2}, 3]),
+        ({"a": 1}, [1]),
+        ({"a": 1}, {}),
+        (1, 1.0),
+        (True, 1),
+        ({"a": [1]}, {"a": [1]}),
+    ],
+)
+def test_patch_inverts_diff(old, new):
+    result = patch(diff(old, new), old)
+    assert result == new
+    assert type(result) is type(new)
+
+
+def test_equal_values_have_no_delta():
+    assert diff(_state(1), _state(1)) is None
+
+
+def test_encoder_emits_keyframes_on_interval():
+    encoder = SnapshotEncoder(keyframe_interval=4, codec=snapshots.CODEC_ZLIB)
+    kinds = [encoder.encode(_state(i))[0] for i in range(9)]
+    assert kinds == [True, False, False, False, True, False, False, False, True]
+
+
+def test_encoder_keyframes_when_delta_is_large():
+    encoder = SnapshotEncoder(keyframe_interval=100, codec=snapshots.CODEC_ZLIB)
+    encoder.encode({"a": "x" * 100})
+    assert encoder.encode({"b": "y" * 100})[0] is True
+
+
+@pytest.mark.parametrize("write_behind", [False, True])
+def test_snapshot_at_reconstructs_each_timestamp(tmp_path, write_behind):
+    store = SQLitePersistence(tmp_path / "agent.db", write_behind=write_behind, keyframe_interval=5)
+    store.connect()
+    assert store.snapshot_at() is None
+    for i in range(12):
+        store.save_snapshot(f"2024-01-01T00:00:{i:02d}+00:00", _state(i))
+
+    for i in range(12):
+        assert store.snapshot_at(f"2024-01-01T00:00:{i:02d}+00:00") == _state(i)
+    assert store.snapshot_at("2024-01-01T00:00:05.500+00:00") == _state(5)
+    assert store.snapshot_at("2023-12-31T23:59:59+00:00") is None
+    assert store.snapshot_at() == _state(11)
+    store.close()
+
+
+def test_snapshots_are_json_and_smaller_than_raw(tmp_path):
+    db_path = tmp_path / "agent.db"
+    store = SQLitePersistence(db_path)
+    store.connect()
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(20):
+        store.save_snapshot(f"ts{i:02d}", {**_state(i), "fetched": now})
+    assert store.snapshot_at()["fetched"] == str(now)
+    store.close()
+
+    conn = sqlite3.connect(db_path)
+    stored = conn.execute("SELECT SUM(LENGTH(data)) FROM state_history").fetchone()[0]
+    conn.close()
+    raw = sum(len(snapshots.dumps(_state(i))) for i in range(20))
+    assert stored < raw / 10
+
+
+def test_reconnect_starts_with_keyframe(tmp_path):
+    db_path = tmp_path / "agent.db"
+    store = SQLitePersistence(db_path)
+    store.connect()
+    store.save_snapshot("ts1", _state(1))
+    store.close()
+    store.connect()
+    store.save_snapshot("ts2", _state(2))
+    assert store.snapshot_at("ts2") == _state(2)
+    store.close()
+
+    conn = sqlite3.connect(db_path)
+    assert [row[0] for row in conn.execute("SELECT keyframe FROM state_history ORDER BY id")] == [1, 1]
+    conn.close()
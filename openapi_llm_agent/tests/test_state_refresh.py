@@ -0,0 +1,79 @@
+import asyncio
+import json
+
+import httpx
+
+from agent.async_client import AsyncSpaceTradersClient
+from agent.cache import ResponseCache
+from agent.ratelimit import RateLimiter
+from agent.state import refresh_state_async
+
+SHIPS = [
+    {"symbol": "S-1", "nav": {"systemSymbol": "X1-A", "waypointSymbol": "X1-A-1", "status": "DOCKED"}},
+    {"symbol": "S-2", "nav": {"systemSymbol": "X1-A", "waypointSymbol": "X1-A-2", "status": "IN_TRANSIT"}},
+]
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path.endswith("/my/agent"):
+        body = {"data": {"symbol": "ME", "credits": 100}}
+    elif path.endswith("/my/ships"):
+        body = {"data": SHIPS, "meta": {"total": 2, "page": 1, "limit": 20}}
+    elif path.endswith("/my/contracts"):
+        body = {"data": [], "meta": {"total": 0, "page": 1, "limit": 20}}
+    elif path.endswith("/X1-A-1/market"):
+        body = {"data": {"symbol": "X1-A-1", "tradeGoods": []}}
+    elif path.endswith("/waypoints/X1-A-1"):
+        body = {"data": {"symbol": "X1-A-1", "traits": [{"symbol": "MARKETPLACE"}]}}
+    elif path.endswith("/waypoints/X1-A-2"):
+        return httpx.Response(404, json={"error": {"code": 404, "message": "missing"}})
+    else:
+        return httpx.Response(500)
+    return httpx.Response(200, content=json.dumps(body).encode(), headers={"content-type": "application/json"})
+
+
+def test_refresh_state_async_fans_out():
+    limiter = RateLimiter(rate_per_sec=1000, burst_capacity=1000)
+    http = httpx.AsyncClient(base_url="https://test/v2", transport=httpx.MockTransport(_handler))
+    client = AsyncSpaceTradersClient(
+        "tok", base_url="https://test/v2", limiter=limiter, cache=ResponseCache(), http_client=http
+    )
+
+    async def run():
+        async with client:
+            return await refresh_state_async(client)
+
+    snapshot = asyncio.run(run())
+
+    assert snapshot["agent"]["symbol"] == "ME"
+    assert [s["symbol"] for s in snapshot["ships"]] == ["S-1", "S-2"]
+    assert snapshot["contracts"] == []
+    assert set(snapshot["waypoints"]) == {"X1-A-1"}
+    assert set(snapshot["markets"]) == {"X1-A-1"}
+    assert snapshot["errors"] == ["waypoint X1-A-2: 404"]
+    assert limiter.stats()["lanes"]["background"]["acquired"] == 6
+
+
+def test_get_client_reuses_pooled_client(monkeypatch):
+    from agent.spacetraders_client import DEFAULT_POOL_MAXSIZE, close_clients, get_client
+
+    monkeypatch.delenv("SPACETRADERS_POOL_MAXSIZE", raising=False)
+    client = get_client(token="tok", base_url="https://test/v2")
+    assert client is get_client(token="tok", base_url="https://test/v2")
+    assert client is not get_client(token="other", base_url="https://test/v2")
+    assert client.configuration.connection_pool_maxsize == DEFAULT_POOL_MAXSIZE
+
+    close_clients()
+    assert client is not get_client(token="tok", base_url="https://test/v2")
+    close_clients()
+
+
+def test_run_sync_keeps_one_loop_across_calls():
+    from agent.async_client import close_async_clients, run_sync
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    assert run_sync(current_loop()) is run_sync(current_loop())
+    close_async_clients()
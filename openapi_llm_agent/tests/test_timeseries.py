@@ -0,0 +1,132 @@
+import pytest
+
+from agent.persistence.memory import MemoryPersistence
+from agent.persistence.sqlite import SQLitePersistence
+from agent.persistence.timeseries import FIVE_MINUTES, HOURLY, Retention, to_epoch
+
+T0 = to_epoch("2024-01-01T00:00:00+00:00")
+
+
+def _market(symbol, goods):
+    return {
+        "symbol": symbol,
+        "exports": [],
+        "imports": [],
+        "exchange": [],
+        "tradeGoods": [
+            {
+                "symbol": good,
+                "type": "EXCHANGE",
+                "tradeVolume": 10,
+                "supply": "MODERATE",
+                "activity": "STRONG",
+                "purchasePrice": price,
+                "sellPrice": price - 2,
+            }
+            for good, price in goods.items()
+        ],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLitePersistence(tmp_path / "agent.db")
+    store.connect()
+    yield store
+    store.close()
+
+
+def test_to_epoch_accepts_iso_datetime_and_numbers():
+    assert to_epoch("2024-01-01T00:00:00Z") == T0
+    assert to_epoch("2024-01-01T00:00:00") == T0
+    assert to_epoch(T0 + 0.7) == T0
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "write_behind", "memory"])
+def test_repeat_observation_in_one_second_is_not_rolled_up_twice(tmp_path, backend):
+    if backend == "memory":
+        store = MemoryPersistence()
+    else:
+        store = SQLitePersistence(tmp_path / "agent.db", write_behind=backend == "write_behind")
+    store.connect()
+    store.record_market_prices(T0, [_market("X1-A-1", {"FUEL": 50})])
+    store.record_market_prices(T0, [_market("X1-A-1", {"FUEL": 90}), _market("X1-A-1", {"FUEL": 95})])
+    store.record_market_prices(T0 + 60, [_market("X1-A-1", {"FUEL": 55})])
+
+    assert [row[1] for row in store.price_history("X1-A-1", "FUEL", T0, T0 + 300)] == [50, 55]
+    five = store.price_history("X1-A-1", "FUEL", T0, T0 + 300, resolution=FIVE_MINUTES)
+    assert five[0][1:5] == (50, 55, 50, 55) and five[0][9] == 2
+    store.close()
+
+
+def test_rollups_track_ohlc(store):
+    prices = [50, 58, 45, 52, 60, 61]
+    for i, price in enumerate(prices):
+        store.record_market_prices(T0 + i * 60, [_market("X1-A-1", {"FUEL": price})])
+
+    raw = store.price_history("X1-A-1", "FUEL", T0, T0 + 3600)
+    assert [row[1] for row in raw] == prices
+    assert raw[0][3:] == ("MODERATE", "STRONG", 10)
+
+    five = store.price_history("X1-A-1", "FUEL", T0, T0 + 3600, resolution=FIVE_MINUTES)
+    assert [row[:5] for row in five] == [(T0, 50, 60, 45, 60), (T0 + 300, 61, 61, 61, 61)]
+    assert [row[9] for row in five] == [5, 1]
+    hourly = store.price_history("X1-A-1", "FUEL", T0 + 1800, T0 + 3600, resolution=HOURLY)
+    assert hourly[0][:5] == (T0, 50, 61, 45, 61)
+    assert hourly[0][5:9] == (48, 59, 43, 59)
+
+
+def test_out_of_order_points_keep_open_and_close(store):
+    store.record_market_prices(T0 + 120, [_market("X1-A-1", {"FUEL": 70})])
+    store.record_market_prices(T0 + 10, [_market("X1-A-1", {"FUEL": 40})])
+    store.record_market_prices(T0 + 60, [_market("X1-A-1", {"FUEL": 55})])
+    (row,) = store.price_history("X1-A-1", "FUEL", T0, T0 + 300, resolution=FIVE_MINUTES)
+    assert row[1:5] == (40, 70, 40, 70)
+
+
+def test_latest_prices_across_markets(store):
+    store.record_market_prices(T0, [_market("X1-A-1", {"FUEL": 80}), _market("X1-A-2", {"FUEL": 70, "ICE_WATER": 5})])
+    store.record_market_prices(T0 + 60, [_market("X1-A-1", {"FUEL": 65})])
+    store.record_market_prices(T0 + 60, [{"symbol": "X1-A-3", "exports": [], "imports": [], "exchange": []}])
+
+    assert store.latest_price("X1-A-1", "FUEL")[:2] == (T0 + 60, 65)
+    assert store.latest_price("X1-A-3", "FUEL") is None
+    assert [(row[0], row[2]) for row in store.latest_prices("FUEL")] == [("X1-A-1", 65), ("X1-A-2", 70)]
+    assert [row[0] for row in store.latest_prices("FUEL", since=T0 + 30)] == ["X1-A-1"]
+
+
+def test_unknown_trade_symbol_is_stored_as_sent(store):
+    store.record_market_prices(T0, [_market("X1-A-1", {"NEW_GOOD": 9})])
+    assert store.latest_price("X1-A-1", "NEW_GOOD")[1] == 9
+
+
+def test_range_queries_use_indexes(store):
+    plan = store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM market_prices WHERE trade_symbol = ? AND ts >= ?", ("FUEL", 0)
+    ).fetchall()
+    assert "market_prices_symbol_ts" in str(plan)
+    plan = store._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM market_price_rollups"
+        " WHERE resolution = ? AND waypoint_symbol = ? AND trade_symbol = ? AND bucket >= ?",
+        (300, "X1-A-1", "FUEL", 0),
+    ).fetchall()
+    assert "PRIMARY KEY" in str(plan)
+
+
+def test_retention_prunes_each_resolution(tmp_path):
+    retention = Retention(raw_sec=600, five_min_sec=7200, hourly_sec=86400, prune_interval_sec=0)
+    store = SQLitePersistence(tmp_path / "agent.db", write_behind=True, retention=retention)
+    store.connect()
+    for minutes in (0, 30, 180, 240):
+        store.record_market_prices(T0 + minutes * 60, [_market("X1-A-1", {"FUEL": 50 + minutes})])
+
+    end = T0 + 86400
+    assert [row[0] for row in store.price_history("X1-A-1", "FUEL", T0, end)] == [T0 + 240 * 60]
+    five = store.price_history("X1-A-1", "FUEL", T0, end, resolution=FIVE_MINUTES)
+    assert [row[0] for row in five] == [T0 + 180 * 60, T0 + 240 * 60]
+    hourly = store.price_history("X1-A-1", "FUEL", T0, end, resolution=HOURLY)
+    assert len(hourly) == 3
+
+    with pytest.raises(ValueError):
+        store.price_history("X1-A-1", "FUEL", T0, end, resolution=60)
+    store.close()
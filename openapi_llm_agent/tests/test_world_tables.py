@@ -0,0 +1,127 @@
+import copy
+
+import pytest
+
+from agent.mockserver import MockWorld
+from agent.persistence.sqlite import SQLitePersistence
+from spacetraders_api_client import models
+
+
+def _snapshot(world):
+    return {
+        "ships": copy.deepcopy(list(world.ships.values())),
+        "contracts": copy.deepcopy(world.contracts),
+        "waypoints": copy.deepcopy(world.waypoints),
+        "markets": copy.deepcopy(world.markets),
+        "errors": [],
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLitePersistence(tmp_path / "agent.db")
+    store.connect()
+    yield store
+    store.close()
+
+
+def _rows(store, sql, *params):
+    return store._conn.execute(sql, params).fetchall()
+
+
+def test_save_world_populates_tables(store):
+    world = MockWorld(ships=4, waypoints=6, markets=3, contracts=2, seed=1)
+    snapshot = _snapshot(world)
+    snapshot["surveys"] = [{
+        "signature": "X1-MOCK-A1-SIG",
+        "symbol": "X1-MOCK-A1",
+        "deposits": [{"symbol": "IRON_ORE"}, {"symbol": "IRON_ORE"}, {"symbol": "COPPER_ORE"}],
+        "expiration": "2030-01-01T00:00:00Z",
+        "size": "SMALL",
+    }]
+    store.save_world("ts1", snapshot)
+
+    assert _rows(store, "SELECT COUNT(*) FROM ships")[0][0] == 4
+    assert _rows(store, "SELECT COUNT(*) FROM waypoints")[0][0] == 6
+    assert _rows(store, "SELECT COUNT(*) FROM markets")[0][0] == 3
+    assert _rows(store, "SELECT COUNT(*) FROM market_trade_goods")[0][0] == 12
+    assert _rows(store, "SELECT COUNT(*) FROM contract_deliveries")[0][0] == 2
+    marketplaces = _rows(store, "SELECT COUNT(*) FROM waypoint_traits WHERE trait = 'MARKETPLACE'")[0][0]
+    assert marketplaces == 3
+    assert _rows(store, "SELECT trade_symbol FROM survey_deposits ORDER BY position") == [
+        ("IRON_ORE",), ("IRON_ORE",), ("COPPER_ORE",)
+    ]
+
+    docked = [row[0] for row in store.ships_with_status("DOCKED")]
+    assert docked == ["MOCK-1", "MOCK-3"]
+
+
+def test_cheapest_purchase_uses_index(store):
+    world = MockWorld(ships=1, waypoints=8, markets=8, seed=2)
+    store.save_world("ts1", _snapshot(world))
+    good = next(iter(world.markets.values()))["tradeGoods"][0]["symbol"]
+
+    expected = sorted(
+        (g["purchasePrice"], symbol)
+        for symbol, market in world.markets.items()
+        for g in market["tradeGoods"]
+        if g["symbol"] == good
+    )
+    rows = store.cheapest_purchase(good, world.system_symbol)
+    assert [(price, waypoint) for waypoint, price, *_ in rows] == expected[:5]
+    assert [row[1] for row in store.best_sell(good, world.system_symbol)] == sorted(
+        (g["sellPrice"] for m in world.markets.values() for g in m["tradeGoods"] if g["symbol"] == good),
+        reverse=True,
+    )[:5]
+
+    plan = " ".join(str(row) for row in _rows(
+        store,
+        "EXPLAIN QUERY PLAN SELECT waypoint_symbol FROM market_trade_goods"
+        " WHERE trade_symbol = ? AND system_symbol = ? AND purchase_price IS NOT NULL ORDER BY purchase_price",
+        good, world.system_symbol,
+    ))
+    assert "market_goods_purchase" in plan
+
+
+def test_full_listings_replace_previous_rows(store):
+    world = MockWorld(ships=3, contracts=2, seed=3)
+    store.save_world("ts1", _snapshot(world))
+    snapshot = _snapshot(world)
+    snapshot["ships"] = snapshot["ships"][:1]
+    snapshot["ships"][0]["cargo"]["inventory"] = [
+        {"symbol": "IRON_ORE", "name": "Iron ore", "description": "", "units": 12}
+    ]
+    snapshot["contracts"] = []
+    store.save_world("ts2", snapshot)
+
+    assert _rows(store, "SELECT symbol FROM ships") == [("MOCK-1",)]
+    assert _rows(store, "SELECT COUNT(*) FROM ship_nav")[0][0] == 1
+    assert _rows(store, "SELECT trade_symbol, units FROM cargo_items") == [("IRON_ORE", 12)]
+    assert _rows(store, "SELECT COUNT(*) FROM contracts")[0][0] == 0
+
+
+def test_listing_without_prices_keeps_last_prices(store):
+    world = MockWorld(ships=1, waypoints=2, markets=1, seed=4)
+    snapshot = _snapshot(world)
+    store.save_world("ts1", snapshot)
+    market = next(iter(snapshot["markets"].values()))
+    symbol = market["symbol"]
+    listing = {key: value for key, value in market.items() if key != "tradeGoods"}
+    store.save_world("ts2", {"markets": {symbol: listing}})
+
+    rows = _rows(store, "SELECT purchase_price FROM market_trade_goods WHERE waypoint_symbol = ?", symbol)
+    assert len(rows) == 4
+    assert all(price is not None for (price,) in rows)
+
+
+def test_accepts_generated_models(tmp_path):
+    store = SQLitePersistence(tmp_path / "agent.db", write_behind=True)
+    store.connect()
+    world = MockWorld(ships=2, waypoints=3, markets=1, seed=5)
+    ships = [models.Ship.from_dict(ship) for ship in world.ships.values()]
+    waypoint = models.Waypoint.from_dict(next(iter(world.waypoints.values())))
+    store.save_world("ts1", {"ships": ships, "waypoints": {waypoint.symbol: waypoint}})
+
+    assert len(store.ships_with_status("IN_ORBIT")) == 1
+    assert store.waypoints_of_type(world.system_symbol, waypoint.type.value)[0][0] == waypoint.symbol
+    store.close()
@@ -0,0 +1,72 @@
+import pytest
+
+from agent.mockserver import MockWorld
+from agent.state import analyze_fleet_readiness
+from agent.worldmodel import WorldModel
+
+
+def _ship(symbol, waypoint, status, role="HAULER"):
+    return {
+        "symbol": symbol,
+        "registration": {"role": role},
+        "nav": {"systemSymbol": "X1-A", "waypointSymbol": waypoint, "status": status},
+    }
+
+
+def test_indexes_follow_upserts_and_removals():
+    world = WorldModel()
+    world.replace_ships([_ship("S-1", "X1-A-1", "DOCKED"), _ship("S-2", "X1-A-1", "IN_ORBIT", "EXCAVATOR")])
+    assert world.ships_at("X1-A-1") == {"S-1", "S-2"}
+    assert world.ships_with_role("EXCAVATOR") == {"S-2"}
+
+    world.upsert_ship(_ship("S-1", "X1-A-2", "IN_TRANSIT"))
+    assert world.ships_at("X1-A-1") == {"S-2"}
+    assert world.ships_at("X1-A-2") == {"S-1"}
+    assert world.ships_with_status("DOCKED") == frozenset()
+    assert world.status_counts() == {"IN_TRANSIT": 1, "IN_ORBIT": 1}
+
+    world.replace_ships([_ship("S-3", "X1-A-1", "DOCKED")])
+    assert world.ship_symbols() == {"S-3"}
+    assert world.ships_at("X1-A-2") == frozenset()
+    assert world.ships_with_role("EXCAVATOR") == frozenset()
+
+
+def test_views_are_read_only():
+    world = WorldModel()
+    world.upsert_ship(_ship("S-1", "X1-A-1", "DOCKED"))
+    with pytest.raises(TypeError):
+        world.ship("S-1")["nav"] = {}
+    assert world.ship_model("S-1").nav.waypoint_symbol == "X1-A-1"
+    assert world.ship("missing") is None and world.ship_model("missing") is None
+
+
+def test_matches_a_scan_of_the_snapshot():
+    mock = MockWorld(ships=12, waypoints=10, markets=5, contracts=1, seed=7)
+    snapshot = {
+        "agent": dict(mock.agent),
+        "ships": list(mock.ships.values()),
+        "contracts": mock.contracts,
+        "waypoints": mock.waypoints,
+        "markets": mock.markets,
+    }
+    world = WorldModel.from_snapshot(snapshot)
+
+    for waypoint in mock.waypoints.values():
+        symbol = waypoint["symbol"]
+        assert world.ships_at(symbol) == {s["symbol"] for s in mock.ships.values() if s["nav"]["waypointSymbol"] == symbol}
+        for trait in waypoint["traits"]:
+            assert symbol in world.waypoints_with_trait(trait["symbol"])
+        assert symbol in world.waypoints_of_type(waypoint["type"])
+        assert symbol in world.waypoints_in(waypoint["systemSymbol"])
+    for market in mock.markets.values():
+        for good in market.get("tradeGoods", []):
+            assert market["symbol"] in world.markets_trading(good["symbol"])
+    assert world.to_snapshot()["ships"] == snapshot["ships"]
+
+
+def test_fleet_readiness_uses_status_counts():
+    ships = [_ship("S-1", "X1-A-1", "DOCKED"), _ship("S-2", "X1-A-1", "IN_TRANSIT"), {"symbol": "S-3", "nav": {}}]
+    expected = {"total_ships": 3, "idle_ships": 1, "busy_ships": 2, "ready_for_action": True}
+    assert analyze_fleet_readiness({"ships": ships}) == expected
+    assert analyze_fleet_readiness(WorldModel.from_snapshot({"ships": ships})) == expected
+    assert analyze_fleet_readiness({"ships": None})["ready_for_action"] is False
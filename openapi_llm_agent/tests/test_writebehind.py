@@ -0,0 +1,148 @@
+import sqlite3
+import threading
+
+import pytest
+
+from agent.persistence.sqlite import SQLitePersistence
+from agent.persistence.writebehind import WriteBehindWriter, _group
+from openapi_llm_agent.persistence.sqlite import SQLitePersistence as OpenAPIPersistence
+from openapi_llm_agent.state import get_recent_log_entries, get_strategy_notes
+
+
+def _count(db_path, table):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_group_keeps_submission_order():
+    batch = [("A", (1,)), ("A", (2,)), ("B", (3,)), ("A", (4,))]
+    assert _group(batch) == [("A", [(1,), (2,)]), ("B", [(3,)]), ("A", [(4,)])]
+
+
+def test_reads_see_queued_writes(tmp_path):
+    store = SQLitePersistence(tmp_path / "agent.db", write_behind=True, max_delay_sec=10)
+    store.connect()
+    for i in range(5):
+        store.append_log("2024-01-01T00:00:00Z", "test", f"line {i}")
+    logs = store.fetch_logs(limit=10)
+    assert [message for _, _, message in logs] == [f"line {i}" for i in reversed(range(5))]
+    store.close()
+
+
+def test_close_commits_everything_queued(tmp_path):
+    db_path = tmp_path / "agent.db"
+    store = SQLitePersistence(db_path, write_behind=True, batch_size=1000, max_delay_sec=60)
+    store.connect()
+    for i in range(300):
+        store.append_log("ts", "test", str(i))
+    store.save_state_snapshot("ts", "{}")
+    store.save_strategy_notes("ts", "notes")
+    store.close()
+
+    assert _count(db_path, "immutable_log") == 300
+    assert _count(db_path, "state_snapshot") == 1
+    assert _count(db_path, "strategy_notes") == 1
+
+
+def test_writes_are_group_committed(tmp_path):
+    db_path = tmp_path / "agent.db"
+    SQLitePersistence(db_path).connect()
+    writer = WriteBehindWriter(db_path, batch_size=50, max_delay_sec=60)
+    sql = "INSERT INTO immutable_log (ts, category, message) VALUES (?, ?, ?)"
+    for i in range(200):
+        writer.submit(sql, ("ts", "test", str(i)))
+    writer.close()
+
+    stats = writer.stats()
+    assert stats["statements"] == 200
+    assert stats["commits"] <= 200 // 50 + 1
+    assert _count(db_path, "immutable_log") == 200
+
+
+def test_bad_row_does_not_drop_batch(tmp_path):
+    db_path = tmp_path / "agent.db"
+    SQLitePersistence(db_path).connect()
+    writer = WriteBehindWriter(db_path, max_delay_sec=60)
+    sql = "INSERT INTO immutable_log (ts, category, message) VALUES (?, ?, ?)"
+    writer.submit(sql, ("ts", "test", "ok 1"))
+    writer.submit(sql, ("ts", "test", None))  # NOT NULL violation
+    writer.submit(sql, ("ts", "test", "ok 2"))
+    writer.close()
+
+    assert writer.stats()["errors"] == 1
+    assert _count(db_path, "immutable_log") == 2
+
+
+def test_bad_row_drops_its_whole_group(tmp_path):
+    db_path = tmp_path / "agent.db"
+    SQLitePersistence(db_path).connect()
+    writer = WriteBehindWriter(db_path, max_delay_sec=60)
+    sql = "INSERT INTO immutable_log (ts, category, message) VALUES (?, ?, ?)"
+    writer.submit(sql, ("ts", "test", "before"))
+    writer.submit_many([(sql, ("ts", "group", "first")), (sql, ("ts", "group", None))])
+    writer.submit_many([(sql, ("ts", "group", "kept"))])
+    writer.close()
+
+    assert writer.stats()["errors"] == 1
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute("SELECT message FROM immutable_log ORDER BY id").fetchall()
+    finally:
+        conn.close()
+    assert rows == [("before",), ("kept",)]
+
+
+def test_failed_commit_is_raised_not_hung(tmp_path):
+    db_path = tmp_path / "agent.db"
+    SQLitePersistence(db_path).connect()
+    writer = WriteBehindWriter(db_path, max_delay_sec=0, queue_size=2)
+
+    def broken(conn, batch):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    writer._commit = broken
+    sql = "INSERT INTO immutable_log (ts, category, message) VALUES (?, ?, ?)"
+    writer.submit(sql, ("ts", "test", "lost"))
+    with pytest.raises(sqlite3.OperationalError):
+        writer.flush()
+    with pytest.raises(sqlite3.OperationalError):
+        for i in range(5):  # more than the queue holds: must raise, not block
+            writer.submit(sql, ("ts", "test", str(i)))
+    assert writer.stats()["failed"]
+    writer.close()
+    assert _count(db_path, "immutable_log") == 0
+
+
+def test_concurrent_writers(tmp_path):
+    db_path = tmp_path / "agent.db"
+    store = SQLitePersistence(db_path, write_behind=True)
+    store.connect()
+
+    def worker(n):
+        for i in range(100):
+            store.append_log("ts", f"ship-{n}", str(i))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+    assert _count(db_path, "immutable_log") == 800
+
+
+def test_openapi_state_helpers_flush_first(tmp_path):
+    store = OpenAPIPersistence(tmp_path / "agent.db", write_behind=True, max_delay_sec=10)
+    store.connect()
+    store.save_strategy_notes("ts", "go mining")
+    store.append_log("ts", "tool_call", "get_my_agent")
+    store.save_error_context("ts", "intent", "boom", "{}")
+    assert get_strategy_notes(store) == "go mining"
+    assert get_recent_log_entries(store) == ["ts tool_call: get_my_agent"]
+    assert store.fetch_error_context()[2] == "boom"
+    store.clear_error_context()
+    assert store.fetch_error_context() is None
+    store.close()
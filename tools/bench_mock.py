@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmark agent loop iterations against the local mock SpaceTraders server.
+
+Starts `agent.mockserver.MockSpaceTradersServer`, points the clients at it via
+SPACETRADERS_BASE_URL, and runs the same steps as one `run_loop` iteration:
+refresh_state, readiness analysis, intent planning and execution. It reports
+server-side requests/sec and p50/p99 iteration latency.
+
+    python tools/bench_mock.py --iterations 30
+    python tools/bench_mock.py --unlimited --latency-ms 40 --error-rate 0.05
+    python tools/bench_mock.py --no-cache --ships 40
+
+By default both sides use the real 2 req/s + burst limits, so the numbers
+show what the live server would allow. `--unlimited` lifts both limits to
+measure client overhead alone. Planning always uses the deterministic
+fallback, never an LLM.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from agent import reasoning  # noqa: E402
+from agent.async_client import close_async_clients  # noqa: E402
+from agent.cache import ResponseCache, set_response_cache  # noqa: E402
+from agent.executor import execute_intent  # noqa: E402
+from agent.mockserver import DEFAULT_TOKEN, MockServerConfig, MockSpaceTradersServer, MockWorld  # noqa: E402
+from agent.persistence.base import create_backend  # noqa: E402
+from agent.persistence.writebehind import write_behind_enabled  # noqa: E402
+from agent.ratelimit import RateLimiter, set_rate_limiter  # noqa: E402
+from agent.refresh import IncrementalRefresher  # noqa: E402
+from agent.retry import retry_stats  # noqa: E402
+from agent.spacetraders_client import ENV_API_KEY, ENV_BASE_URL, close_clients  # noqa: E402
+from agent.state import analyze_fleet_readiness, refresh_state  # noqa: E402
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the agent loop against a local mock server")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--ships", type=int, default=8)
+    parser.add_argument("--waypoints", type=int, default=24)
+    parser.add_argument("--markets", type=int, default=6)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Fixed server latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 502/503")
+    parser.add_argument("--unlimited", action="store_true", help="Disable rate limits on both server and client")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the response cache")
+    parser.add_argument("--incremental", action="store_true", help="Refresh via IncrementalRefresher (timer-driven)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    reasoning.OpenAI = None  # deterministic planning; no network LLM calls
+
+    config = MockServerConfig(
+        latency_sec=args.latency_ms / 1000,
+        latency_jitter_sec=args.jitter_ms / 1000,
+        error_rate=args.error_rate,
+        enforce_rate_limit=not args.unlimited,
+        seed=args.seed,
+    )
+    world = MockWorld(ships=args.ships, waypoints=args.waypoints, markets=args.markets, seed=args.seed)
+    if args.unlimited:
+        set_rate_limiter(RateLimiter(rate_per_sec=1e6, burst_capacity=1_000_000))
+    set_response_cache(None if args.no_cache else ResponseCache())
+
+    with MockSpaceTradersServer(world=world, config=config) as server, tempfile.TemporaryDirectory() as tmp:
+        os.environ[ENV_BASE_URL] = server.base_url
+        os.environ[ENV_API_KEY] = DEFAULT_TOKEN
+        store = create_backend(Path(tmp) / "bench.db", write_behind=write_behind_enabled())
+        store.connect()
+        log = logging.getLogger("bench")
+        latencies: List[float] = []
+        errors = 0
+        refresher = IncrementalRefresher() if args.incremental else None
+        start = time.perf_counter()
+        try:
+            for _ in range(args.iterations):
+                t0 = time.perf_counter()
+                snapshot = refresher.refresh(logger=log) if refresher else refresh_state(logger=log)
+                analyze_fleet_readiness(refresher.world if refresher else snapshot)
+                intent = reasoning.plan_next_intent(state_snapshot=snapshot, logger=log)
+                execute_intent(intent, store, logger=log)
+                latencies.append(time.perf_counter() - t0)
+                errors += bool(snapshot.get("errors"))
+        finally:
+            elapsed = time.perf_counter() - start
+            close_clients()
+            close_async_clients()
+            store.close()
+        stats = server.stats()
+
+    print(f"iterations: {len(latencies)} in {elapsed:.2f}s ({errors} with state errors)")
+    print(f"requests:   {stats['requests']} ({stats['requests'] / elapsed:.1f} req/s) by status {stats['by_status']}")
+    print(f"iteration:  p50 {_percentile(latencies, 50) * 1000:.1f} ms  p99 {_percentile(latencies, 99) * 1000:.1f} ms"
+          f"  mean {statistics.fmean(latencies) * 1000:.1f} ms")
+    print(f"retries:    {retry_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Replay a recorded cassette through refresh_state for repeatable profiling.
+
+Capture real traffic once:
+
+    SPACETRADERS_CASSETTE=traffic.jsonl SPACETRADERS_CASSETTE_MODE=record python main.py --once
+
+then time (or profile) the client stack against it, with no network:
+
+    python tools/bench_replay.py traffic.jsonl --iterations 50
+    python tools/bench_replay.py traffic.jsonl --speed 1 --keep-limits   # real-time pacing
+    python tools/bench_replay.py traffic.jsonl --profile 25
+
+The response cache is off by default, so every iteration parses every
+response. The client rate limiter is lifted unless `--keep-limits` is given.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from agent.async_client import build_async_client  # noqa: E402
+from agent.cache import ResponseCache, set_response_cache  # noqa: E402
+from agent.cassette import ENV_CASSETTE_MODE, ENV_CASSETTE_SPEED, close_cassettes, shared_player  # noqa: E402
+from agent.ratelimit import RateLimiter, set_rate_limiter  # noqa: E402
+from agent.spacetraders_client import ENV_API_KEY, ENV_CASSETTE, close_clients  # noqa: E402
+from agent.state import refresh_state_async  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay a cassette through refresh_state")
+    parser.add_argument("cassette", type=Path)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--speed", type=float, default=0.0, help="0 = no delay, 1 = recorded latency, N = N times faster")
+    parser.add_argument("--cache", action="store_true", help="Keep the response cache enabled")
+    parser.add_argument("--keep-limits", action="store_true", help="Keep the 2 req/s client rate limiter")
+    parser.add_argument("--profile", type=int, default=0, metavar="N", help="Print the top N functions by cumulative time")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    os.environ[ENV_CASSETTE] = str(args.cassette)
+    os.environ[ENV_CASSETTE_MODE] = "replay"
+    os.environ[ENV_CASSETTE_SPEED] = str(args.speed)
+    os.environ.setdefault(ENV_API_KEY, "replay")
+    set_response_cache(ResponseCache() if args.cache else None)
+    if not args.keep_limits:
+        set_rate_limiter(RateLimiter(rate_per_sec=1e6, burst_capacity=1_000_000))
+
+    profiler = cProfile.Profile() if args.profile else None
+    latencies: List[float] = []
+
+    # Drive the async client on this thread (rather than via refresh_state's
+    # background loop) so the profiler sees the whole request path.
+    async def run() -> None:
+        async with build_async_client() as client:
+            for _ in range(args.iterations):
+                t0 = time.perf_counter()
+                snapshot = await refresh_state_async(client)
+                latencies.append(time.perf_counter() - t0)
+                if snapshot.get("errors"):
+                    print(f"state errors: {snapshot['errors']}", file=sys.stderr)
+
+    try:
+        if profiler:
+            profiler.enable()
+        asyncio.run(run())
+        if profiler:
+            profiler.disable()
+        player = shared_player()
+    finally:
+        close_clients()
+        close_cassettes()
+
+    ordered = sorted(latencies)
+    print(f"iterations: {len(latencies)}  responses served: {player.served}  misses: {player.misses}")
+    print(f"refresh:    p50 {ordered[len(ordered) // 2] * 1000:.2f} ms  "
+          f"p99 {ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000:.2f} ms  "
+          f"mean {statistics.fmean(latencies) * 1000:.2f} ms")
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.profile)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Measure cold-start import time of the agent entry point.
+
+Runs `python -X importtime -c "import main"` in fresh interpreters and reports
+the wall time and the cumulative import time of the target module, plus the
+slowest imports from the last run. Bytecode caches are warm after the first
+run, so the median reflects a normal restart.
+
+    python tools/bench_startup.py --runs 5 --top 15
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[int, int, str]]:
+    """Return (self_us, cumulative_us, module) rows from -X importtime output."""
+
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), module.strip()))
+    return rows
+
+
+def run_once(module: str) -> Tuple[float, List[Tuple[int, int, str]]]:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return time.perf_counter() - start, _parse_importtime(proc.stderr)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark agent startup import time")
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to time")
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest imports by cumulative time")
+    args = parser.parse_args()
+
+    walls, imports = [], []
+    rows: List[Tuple[int, int, str]] = []
+    for _ in range(max(1, args.runs)):
+        wall, rows = run_once(args.module)
+        walls.append(wall)
+        imports.append(next((cum for _, cum, name in rows if name == args.module), 0) / 1e6)
+
+    print(f"{args.module}: {len(walls)} runs")
+    print(f"  wall      median {statistics.median(walls) * 1000:8.1f} ms  min {min(walls) * 1000:8.1f} ms")
+    print(f"  import    median {statistics.median(imports) * 1000:8.1f} ms  min {min(imports) * 1000:8.1f} ms")
+    generated = [r for r in rows if r[2].startswith("spacetraders_api_client")]
+    print(f"  generated client modules loaded: {len(generated)}")
+    if args.top > 0:
+        print("  slowest imports (last run, cumulative):")
+        for self_us, cum_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[: args.top]:
+            print(f"    {cum_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f})  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
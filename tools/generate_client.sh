@@ -30,4 +30,7 @@ openapi-generator-cli generate \
   --additional-properties "$ADDITIONAL_PROPS" \
   --skip-validate-spec
 
+# Make the package __init__ files import API classes and models on first use
+python "$ROOT_DIR/tools/lazy_init.py" "$OUTPUT_DIR/spacetraders_api_client"
+
 echo "Client generated at: $OUTPUT_DIR"
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Rewrite the generated client's package __init__ files to import lazily.
+
+The generated `spacetraders_api_client/__init__.py` (and the `api` and
+`models` subpackages) import every API class and all ~190 model modules up
+front, and pydantic builds a schema for each one at import time. This script
+replaces those eager `from ... import ...` lines with a name -> module table
+and a PEP 562 module `__getattr__`, so a class is only imported the first time
+it is accessed. The original imports are kept under `TYPE_CHECKING` so type
+checkers and IDEs still see every name.
+
+It runs as part of tools/generate_client.sh and is idempotent.
+"""
+from __future__ import annotations
+
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_PACKAGE = ROOT / "codegen" / "spacetraders_api_client" / "spacetraders_api_client"
+SUBPACKAGES = ("", "api", "models")
+MARKER = "# lazy imports (tools/lazy_init.py)"
+
+_IMPORT_RE = re.compile(r"^from (?P<module>[\w.]+) import (?P<name>\w+)(?: as (?P<alias>\w+))?\s*$")
+
+_LOADER = '''
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+'''
+
+
+def rewrite(path: Path) -> bool:
+    """Rewrite one __init__.py in place; return False if already lazy."""
+
+    text = path.read_text(encoding="utf-8")
+    if MARKER in text:
+        return False
+
+    kept, imports, table = [], [], []
+    for line in text.splitlines():
+        match = _IMPORT_RE.match(line)
+        if match is None:
+            kept.append(line)
+            continue
+        name = match.group("alias") or match.group("name")
+        imports.append(line)
+        table.append(f'    "{name}": "{match.group("module")}",')
+
+    while kept and not kept[-1].strip():
+        kept.pop()
+    out = kept + [
+        "",
+        MARKER,
+        "import importlib",
+        "import typing",
+        "",
+        "_LAZY_IMPORTS = {",
+        *table,
+        "}",
+        "",
+        "if typing.TYPE_CHECKING:",
+        *(f"    {line}" for line in imports),
+        _LOADER,
+    ]
+    path.write_text("\n".join(out), encoding="utf-8")
+    return True
+
+
+def main(argv: list[str]) -> int:
+    package = Path(argv[1]) if len(argv) > 1 else DEFAULT_PACKAGE
+    for sub in SUBPACKAGES:
+        init = package / sub / "__init__.py"
+        changed = rewrite(init)
+        print(f"{'rewrote' if changed else 'already lazy'}: {init.relative_to(package.parent)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Convert an existing agent database to incremental auto-vacuum.
+
+Compaction frees space with `PRAGMA incremental_vacuum`, which only works on
+a database created with `auto_vacuum=INCREMENTAL`. A database from before
+that setting needs one full VACUUM. That rewrites the whole file and blocks
+writers while it runs, so the loop never does it on its own. Run this with
+the agent stopped:
+
+    python tools/vacuum_db.py agent.db
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from agent.persistence.sqlite import SQLitePersistence  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Enable incremental vacuum on an existing agent database")
+    parser.add_argument("db", type=Path, nargs="?", default=Path("agent.db"), help="Database file (default: agent.db)")
+    args = parser.parse_args()
+    if not args.db.exists():
+        print(f"{args.db}: no such file", file=sys.stderr)
+        return 1
+
+    store = SQLitePersistence(args.db)
+    store.connect()
+    try:
+        size = args.db.stat().st_size
+        start = time.perf_counter()
+        if not store.convert_vacuum():
+            print(f"{args.db}: already uses incremental vacuum")
+            return 0
+        elapsed = time.perf_counter() - start
+        print(f"{args.db}: converted in {elapsed:.1f}s ({size / 1e6:.1f} MB -> {args.db.stat().st_size / 1e6:.1f} MB)")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())